@@ -2,14 +2,28 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import MinMaxScaler
 from xlwings import Sheet
 from streamlit_option_menu import option_menu
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 import altair as alt
 import altair as alt  # dejar este import arriba en tu script
+from datos import cargar_csv, cargar_columnas, filas_unicas, resumen_filtros
+import catalogo
+import densidades
+import dispersion
+import fases
+import figuras
+import filtros
+import normalizacion
+import perfiles
+import poblaciones
+import posiciones
+import precalentar
+import rankings
+import identidad
+import similitud
+import vigilancia
 
 
 def scatter_interactivo_altair(
@@ -18,125 +32,80 @@ def scatter_interactivo_altair(
     y,
     size_col="Minutes",
     tooltip_cols=("Name","Team","Primary Position","Age","Nationality","Minutes"),
-    color_sel="#f9ae34",   # color para resaltados
-    color_base="#C5C5C5",  # color base
+    color_sel=dispersion.COLOR_SEL,
+    color_base=dispersion.COLOR_BASE,
     highlight_names=None,  # lista de jugadores a resaltar desde un multiselect
 ):
-    import pandas as pd
-    import altair as alt
-    import streamlit as st
-
-    df = df.copy()
+    # Spec podado a las columnas del gráfico, un solo dataset (dispersion.py)
+    chart = dispersion.scatter_altair(
+        df, x, y, size_col=size_col, tooltip_cols=tooltip_cols,
+        color_sel=color_sel, color_base=color_base, highlight_names=highlight_names,
+    )
+    st.altair_chart(chart, use_container_width=True, theme=None)
 
-    # Marcamos los jugadores resaltados por lista
-    highlight_names = set(highlight_names or [])
-    df["is_highlight"] = df["Name"].isin(highlight_names)
 
-    # Estilos
-    _axis_col = "#2B2B2B"
-    _mean_col = "#9A9A9A"
-    _bg       = "transparent"
+@st.fragment
+def panel_scatter(df, grupos_variables, size_col, tooltip_cols, familia="p90", prefijo=""):
+    """
+    Selectores de ejes X/Y, lista de resaltados y scatter de un perfil, como
+    fragmento: cambiar un eje o un resaltado vuelve a correr solo esta función
+    con el df ya filtrado y con rankings, sin recargar datos, filtros ni PCA.
+    familia "p90" (Perfil de Jugadores) o "alternas" (Ligas Alternas, con
+    `prefijo` en las claves de los widgets).
+    """
+    tipos = list(grupos_variables.keys())
+    if familia == "p90":
+        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
+        colx, coly = st.columns(2)
+        with colx:
+            tipo_x = st.selectbox("Grupo de variable para eje X", tipos, index=2, key="tipo_x")
+            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
+        with coly:
+            tipo_y = st.selectbox("Grupo de variable para eje Y", tipos, index=2, key="tipo_y")
+            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
 
-    # Promedios
-    x_mean = float(df[x].mean())
-    y_mean = float(df[y].mean())
+        st.markdown("#### Highlight players")
+        highlight_sel = st.multiselect(
+            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
+            sorted(df["Name"].dropna().astype(str).unique()),
+            default=[]
+        )
+    else:
+        colx, coly = st.columns(2)
+        with colx:
+            tipo_x = st.selectbox("Grupo X", tipos, index=2, key=f"{prefijo}_tipo_x")
+            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key=f"{prefijo}_var_x")
+        with coly:
+            tipo_y = st.selectbox("Grupo Y", tipos, index=2, key=f"{prefijo}_tipo_y")
+            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
+            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key=f"{prefijo}_var_y")
 
-    # Selección por clic (multi)
-    sel = alt.selection_multi(
-        fields=["Name", "Team"],
-        on="click",
-        clear="dblclick",
-        empty="none"
-    )
+        jugadores = sorted(df["Jugador"].dropna().astype(str).unique())
+        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key=f"{prefijo}_highlight")
 
-    # Base chart
-    base_chart = alt.Chart(df).encode(
-        x=alt.X(x, title=x, axis=alt.Axis(format=",.0f")),
-        y=alt.Y(y, title=y, axis=alt.Axis(format=",.0f")),
-        tooltip=[c for c in tooltip_cols if c in df.columns]
+    scatter_interactivo_altair(
+        df,
+        x=var_x,
+        y=var_y,
+        size_col=size_col,
+        tooltip_cols=tooltip_cols,
+        highlight_names=highlight_sel
     )
 
-    # Tamaño
-    if size_col in df.columns:
-        size_enc = alt.Size(size_col, legend=None, scale=alt.Scale(range=[30, 500]))
-    else:
-        size_enc = alt.value(120)
-
-    # 1) Base gris
-    pts_base = base_chart.mark_circle().encode(
-        size=size_enc,
-        color=alt.value(color_base),
-        opacity=alt.value(0.35)
-    )
 
-    # 2) Resaltados por multiselect (lista)
-    pts_list = base_chart.transform_filter(
-        alt.datum.is_highlight
-    ).mark_circle().encode(
-        size=size_enc,
-        color=alt.value(color_sel),
-        opacity=alt.value(1.0)
-    )
+# Configuración inicial
+st.set_page_config(page_title="Dashboard de Jugadores", layout="wide")
 
-    # 3) Resaltados por clic (selección)
-    pts_click = base_chart.mark_circle().encode(
-        size=size_enc,
-        color=alt.value(color_sel),
-        opacity=alt.value(1.0)
-    ).add_selection(sel).transform_filter(sel)
-
-    # Labels por lista
-    labels_list = base_chart.transform_filter(
-        alt.datum.is_highlight
-    ).mark_text(
-        dx=6, dy=-6, fontWeight="bold", color="#000000", clip=False
-    ).encode(text="Name")
-
-    # Labels por clic
-    labels_click = base_chart.transform_filter(
-        sel
-    ).mark_text(
-        dx=6, dy=-6, fontWeight="bold", color="#000000", clip=False
-    ).encode(text="Name")
-
-    # Líneas de promedio
-    vline = alt.Chart(pd.DataFrame({"v": [x_mean]})).mark_rule(
-        strokeDash=[5, 5], color=_mean_col, opacity=0.8
-    ).encode(x="v:Q")
-
-    hline = alt.Chart(pd.DataFrame({"h": [y_mean]})).mark_rule(
-        strokeDash=[5, 5], color=_mean_col, opacity=0.8
-    ).encode(y="h:Q")
-
-    chart = (
-        pts_base
-        + pts_list
-        + pts_click
-        + labels_list
-        + labels_click
-        + vline
-        + hline
-    ).properties(
-        height=520,
-        background=_bg,
-        padding={"left": 10, "right": 160, "top": 40, "bottom": 30}
-    ).configure_view(
-        strokeWidth=0
-    ).configure_axis(
-        grid=False,
-        domain=False,
-        tickColor=_axis_col,
-        labelColor=_axis_col,
-        titleColor=_axis_col
-    ).configure_title(
-        color=_axis_col
-    )
 
-    st.altair_chart(chart, use_container_width=True, theme=None)
+# Precalentamiento de caches y vigilancia de archivos: una vez por proceso,
+# en segundo plano (precalentar.py, vigilancia.py)
+@st.cache_resource
+def _arranque():
+    vigilancia.iniciar()
+    return precalentar.iniciar()
 
 
-# Configuración inicial
-st.set_page_config(page_title="Dashboard de Jugadores", layout="wide")
+_arranque()
 
 with st.sidebar:
     # Espacio visual arriba
@@ -157,11 +126,13 @@ with st.sidebar:
             "Pases al Espacio",
             "Movimientos sin Balón",
             "Ligas Alternas",
-            "Radares Ligas Alternas"
+            "Radares Ligas Alternas",
+            "Jugadores Similares",
+            "Ficha de Jugador"
         ],
         icons=[
             "person-badge", "radar", "activity",
-            "exclamation-triangle", "arrows-move", "shuffle", "globe", "radar"
+            "exclamation-triangle", "arrows-move", "shuffle", "globe", "radar", "people", "person-vcard"
         ],
         menu_icon="list",
         default_index=0,
@@ -190,6 +161,14 @@ with st.sidebar:
         }
     )
 
+    # Progreso del precalentamiento (solo mientras corre)
+    _prog = precalentar.estado()
+    if _prog["activo"]:
+        st.progress(
+            _prog["hechos"] / max(_prog["total"], 1),
+            text=f"Precargando datos… {_prog['hechos']}/{_prog['total']}"
+        )
+
 
 
 
@@ -203,123 +182,18 @@ if seleccion == "Perfil de Jugadores":
 
     st.sidebar.markdown("### Selecciona la Liga y Temporada")
 
-    ligas_temporadas = {
-        "Liga MX": ["2024/2025", "2025/2026"],
-        "Liga Profesional, Argentina": ["2025", "2026"],
-        "Jupiler Pro League, Bélgica": ["2024/2025", "2025/2026"],
-        "Serie A, Brasil": ["2025", "2026"],
-        "Primera División, Chile": ["2025", "2026"],
-        "Primera A, Colombia": ["2025", "2026"],
-        "Liga Pro, Ecuador": ["2025"],
-        "Premier League, Inglaterra": ["2024/2025", "2025/2026"],
-        "Ligue 1, Francia": ["2024/2025", "2025/2026"],
-        "1. Bundesliga, Alemania": ["2024/2025", "2025/2026"],
-        "Serie A, Italia": ["2024/2025", "2025/2026"],
-        "Serie B, Italia": ["2024/2025", "2025/2026"],
-        "Eredivisie, Países Bajos": ["2024/2025", "2025/2026"],
-        "División Profesional, Paraguay": ["2025", "2026"],
-        "Primeira Liga, Portugal": ["2024/2025", "2025/2026"],
-        "Premier League, Rusia": ["2024/2025", "2025/2026"],
-        "Pro League, Arabia": ["2024/2025", "2025/2026"],
-        "La Liga, España": ["2024/2025", "2025/2026"],
-        "La Liga 2, España": ["2024/2025", "2025/2026"],
-        "Primera División, Uruguay": ["2025"],
-        "MLS, Estados Unidos": ["2025", "2026"],
-
-
-    }
-
-    archivos_csv = {
-        ("Liga MX", "2024/2025"): "ligamxp902425.csv",
-        ("Liga MX", "2025/2026"): "ligamxp902526.csv",
-        ("Liga Profesional, Argentina", "2025"): "argp902025.csv",
-        ("Liga Profesional, Argentina", "2026"): "argp902026.csv",
-        ("Jupiler Pro League, Bélgica", "2024/2025"): "belp902425.csv",
-        ("Jupiler Pro League, Bélgica", "2025/2026"): "belp902526.csv",
-        ("Serie A, Brasil", "2025"): "brap902025.csv",
-        ("Serie A, Brasil", "2026"): "brap902026.csv",
-        ("Primera División, Chile", "2025"): "chip902025.csv",
-        ("Primera División, Chile", "2026"): "chip902026.csv",
-        ("Primera A, Colombia", "2025"): "colp902025.csv",
-        ("Primera A, Colombia", "2026"): "colp902026.csv",
-        ("Liga Pro, Ecuador", "2025"): "ecup902025.csv",
-        ("Premier League, Inglaterra", "2024/2025"): "engp902425.csv",
-        ("Premier League, Inglaterra", "2025/2026"): "engp902526.csv",
-        ("Ligue 1, Francia", "2024/2025"): "frap902425.csv",
-        ("Ligue 1, Francia", "2025/2026"): "frap902526.csv",
-        ("1. Bundesliga, Alemania", "2024/2025"): "gerp902425.csv",
-        ("1. Bundesliga, Alemania", "2025/2026"): "gerp902526.csv",
-        ("Serie A, Italia", "2025/2026"): "ita1p902526.csv",
-        ("Serie A, Italia", "2024/2025"): "ita1p902425.csv",
-        ("Serie B, Italia", "2024/2025"): "seriebp902425.csv",
-        ("Serie B, Italia", "2025/2026"): "ita2p902526.csv",
-        ("Eredivisie, Países Bajos", "2024/2025"): "nedp902425.csv",
-        ("Eredivisie, Países Bajos", "2025/2026"): "nedp902526.csv",
-        ("División Profesional, Paraguay", "2025"): "parp902025.csv",
-        ("División Profesional, Paraguay", "2026"): "parp902026.csv",
-        ("Primeira Liga, Portugal", "2024/2025"): "porp902425.csv",
-        ("Primeira Liga, Portugal", "2025/2026"): "porp902526.csv",
-        ("Premier League, Rusia", "2024/2025"): "rusp902425.csv",
-        ("Premier League, Rusia", "2025/2026"): "rusp902526.csv",
-        ("Pro League, Arabia", "2024/2025"): "arap902425.csv",
-        ("Pro League, Arabia", "2025/2026"): "arap902526.csv",
-        ("La Liga, España", "2024/2025"): "espp902425.csv",
-        ("La Liga, España", "2025/2026"): "laligap902526.csv",
-        ("La Liga 2, España", "2024/2025"): "esp2p902425.csv",
-        ("La Liga 2, España", "2025/2026"): "laliga22526.csv",
-        ("Primera División, Uruguay", "2025"): "urup902025.csv",
-        ("MLS, Estados Unidos", "2025"): "mlsp902025.csv",
-        ("MLS, Estados Unidos", "2026"): "mlsp902026.csv",
-
-    }
-
-    ligas_disponibles = list(ligas_temporadas.keys())
+    # Ligas/temporadas/archivos salen del catálogo único (catalogo.py)
+    ligas_disponibles = catalogo.ligas("p90")
     liga_seleccionada = st.sidebar.selectbox("Liga", ligas_disponibles, index=0)
-    temporadas_disponibles = ligas_temporadas[liga_seleccionada]
+    temporadas_disponibles = catalogo.temporadas("p90", liga_seleccionada)
     temporada_seleccionada = st.sidebar.selectbox("Temporada", temporadas_disponibles, index=0)
 
-    archivo = archivos_csv.get((liga_seleccionada, temporada_seleccionada))
-    if archivo:
-        df = pd.read_csv(archivo)
-    else:
+    archivo = catalogo.archivo("p90", liga_seleccionada, temporada_seleccionada)
+    precalentar.anotar_uso("p90", liga_seleccionada)
+    if not archivo:
         st.error("No hay datos disponibles para esta combinación de liga y temporada.")
         st.stop()
 
-    df["Competition"] = df["Competition"].astype(str).str.strip()
-
-    # Mapeo de nombre visible a nombre real en la base de datos
-    nombre_base_liga = {
-
-        "Liga Profesional, Argentina": "Liga Profesional",
-        "Jupiler Pro League, Bélgica": "Jupiler Pro League",
-        "Primera División, Chile": "Primera División",
-        "Primera A, Colombia": "Primera A",
-        "Liga Pro, Ecuador": "Liga Pro",
-        "Premier League, Inglaterra": "Premier League",
-        "Ligue 1, Francia": "Ligue 1",
-        "1. Bundesliga, Alemania": "1. Bundesliga",
-        "Serie B, Italia": "Serie B",
-        "Eredivisie, Países Bajos": "Eredivisie",
-        "División Profesional, Paraguay": "División Profesional, Paraguay",
-        "Primeira Liga, Portugal": "Primeira Liga",
-        "Premier League, Rusia": "Premier League",
-        "Pro League, Arabia": "Pro League",
-        "La Liga, España": "La Liga",
-        "La Liga 2, España": "La Liga 2",
-        "Primera División, Uruguay": "Primera División",
-        "MLS, Estados Unidos": "Major League Soccer",
-
-    }.get(liga_seleccionada, liga_seleccionada)
-    df["Season"] = df["Season"].astype(str).str.strip()
-    df_filtrado = df[
-        (df["Competition"] == str(nombre_base_liga)) &
-        (df["Season"] == str(temporada_seleccionada))
-    ].copy()
-
-    if df_filtrado.empty:
-        st.warning("No hay datos disponibles en la base para esta liga y temporada.")
-        st.stop()
-
     st.sidebar.markdown("### Grupo de Posición")
     grupos_posicion = [
         "Porteros", "Centrales", "Carrileros/Laterales", "Contenciones",
@@ -327,44 +201,68 @@ if seleccion == "Perfil de Jugadores":
     ]
     grupo_seleccionado = st.sidebar.radio("Grupo", grupos_posicion)
 
+    # =========================
+    # Variables y rankings por grupo (perfiles.py; definen también qué columnas se cargan)
+    # =========================
+    VARIABLES_PERFIL = perfiles.VARIABLES_P90
+
+    # Solo identidad + variables del grupo activo (cache por archivo y conjunto de columnas)
+    df = cargar_columnas(archivo, perfiles.columnas(grupo_seleccionado), familia="p90")
+
+    # Mapeo de nombre visible a nombre real en la base de datos
+    nombre_base_liga = catalogo.nombre_base_liga("p90", liga_seleccionada, temporada_seleccionada)
+
+    # Filtros como máscaras sobre el frame cacheado; cada perfil agrega las suyas
+    # y materializa el subconjunto una sola vez (filtros.py)
+    df_filtrado = (
+        filtros.filtrar(df)
+        .igual("Competition", nombre_base_liga)
+        .igual("Season", temporada_seleccionada)
+    )
+
+    if len(df_filtrado) == 0:
+        st.warning("No hay datos disponibles en la base para esta liga y temporada.")
+        st.stop()
+
     st.markdown(f"Has seleccionado: **{grupo_seleccionado}** en {liga_seleccionada} – {temporada_seleccionada}")
 
+    # Cotas de los sliders y nacionalidades del grupo: índice de filtros del archivo (datos.py)
+    filtros_grupo = resumen_filtros(archivo, "p90", grupo_seleccionado)
+    # Grupo sin filas (o sin minutos/edad válidos) en el archivo: sin cotas para los sliders
+    if filtros_grupo.minutos is None or filtros_grupo.edad is None:
+        st.warning(f"No hay datos válidos de minutos o edad para {grupo_seleccionado} en este archivo.")
+        st.stop()
+
 
 
     ### Para Porteros
-    def perfil_porteros(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"] == "Goalkeeper"]
+    def perfil_porteros(filtro):
+        filtro = filtro.igual("Grupo", "Porteros")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 36)
+            perfiles.EDAD_DEFECTO["Porteros"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -372,24 +270,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-            "PSxG Faced", 'GSAA', 'Save%', 'xSv%', 'Shot Stopping%', 'Shots Faced', 'Shots Faced OT%', 'Goalkeeper OBV'
-        ]
-        variables_ball = [
-            'GK Aggressive Dist.', 'Claims%', 'Pass OBV', 'OP Passes', 'Passing%', 'Passes Pressured%', 'Pass Forward%', 'Carries', 'Successful Dribbles'
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
+        variables_def = VARIABLES_PERFIL["Porteros"]["def"]
+        variables_ball = VARIABLES_PERFIL["Porteros"]["ball"]
 
-        df["Ranking General Atajadas"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking Juego de Pies"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Porteros")))
 
         grupos_variables = {
             "Con Balón": variables_ball,
@@ -397,35 +291,16 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Atajadas", "Ranking Juego de Pies"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-
-
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición", "Ranking General Atajadas", "Ranking Juego de Pies"
             ],
-            highlight_names=highlight_sel
         )
 
 
@@ -433,39 +308,33 @@ if seleccion == "Perfil de Jugadores":
         perfil_porteros(df_filtrado)
 
  ### Para Centrales
-    def perfil_centrales(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"].isin(["Left Centre Back", "Centre Back", "Right Centre Back"])]
+    def perfil_centrales(filtro):
+        filtro = filtro.igual("Grupo", "Centrales")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 37)
+            perfiles.EDAD_DEFECTO["Centrales"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -473,25 +342,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-            'PAdj Tackles', 'PAdj Interceptions', 'Blocks/Shot', 'Clearances', 'Aerial Win%', 'Aerial Wins', 'Dribbles Stopped%', 'DA OBV', 'Aggressive Actions', 'PAdj Pressures',
-            'Ball Recoveries', 'Counterpress Regains'
-        ]
-        variables_ball = [
-            'xGBuildup', 'xGChain', 'OBV', 'Pass OBV', 'Long Ball%', 'Long Balls', 'Passing%', 'Passes Pressured%', 'OP F3 Passes', 'Pass Forward%', 'OP Passes'
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
+        variables_def = VARIABLES_PERFIL["Centrales"]["def"]
+        variables_ball = VARIABLES_PERFIL["Centrales"]["ball"]
 
-        df["Ranking General Defensivo"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking General Con Balón"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Centrales")))
 
         grupos_variables = {
             "Con Balón": variables_ball,
@@ -499,34 +363,16 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Con Balón", "Ranking General Defensivo"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición"
             ],
-            highlight_names=highlight_sel
         )
 
 
@@ -535,39 +381,33 @@ if seleccion == "Perfil de Jugadores":
 
 
 ### Para Carrileros
-    def perfil_carrileros(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"].isin(["Left Back", "Left Wing Back", "Right Back", "Right Wing Back"])]
+    def perfil_carrileros(filtro):
+        filtro = filtro.igual("Grupo", "Carrileros/Laterales")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 37)
+            perfiles.EDAD_DEFECTO["Carrileros/Laterales"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -575,26 +415,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-           'PAdj Interceptions', 'PAdj Clearances', 'Blocks/Shot', 'Defensive Regains', 'Ball Recoveries', 'PAdj Tackles', 'Dribbles Stopped%',
-            'Pressure Regains', 'Counterpress Regains', "DA OBV"
-        ]
-        variables_ball = [
-            'Assists', 'xG Assisted', 'Key Passes', 'Successful Dribbles', 'Dribble%', 'OP Passes', 'Passing%', 'Deep Progressions', 'xGBuildup', 'xGChain', 
-            'Carries', 'PintoB', 'PinTin', 'Successful Box Cross%', 'Successful Crosses', 'Deep Completions', 'Pass OBV', 'D&C OBV', "OBV"
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
+        variables_def = VARIABLES_PERFIL["Carrileros/Laterales"]["def"]
+        variables_ball = VARIABLES_PERFIL["Carrileros/Laterales"]["ball"]
 
-        df["Ranking General Defensivo"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking General Ofensivo"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Carrileros/Laterales")))
 
         grupos_variables = {
             "Ofensivas": variables_ball,
@@ -602,72 +436,49 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Ofensivo", "Ranking General Defensivo"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición", "Ranking General Ofensivo"
             ],
-            highlight_names=highlight_sel
         )
 
     if grupo_seleccionado == "Carrileros/Laterales":
         perfil_carrileros(df_filtrado)
 
 ### Para Contenciones
-    def perfil_contenciones(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"].isin(["Centre Defensive Midfielder", "Left Defensive Midfielder", "Right Defensive Midfielder"])]
+    def perfil_contenciones(filtro):
+        filtro = filtro.igual("Grupo", "Contenciones")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 37)
+            perfiles.EDAD_DEFECTO["Contenciones"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -675,29 +486,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-            'PAdj Interceptions', 'Defensive Regains', 'PAdj Tackles', 'Dribbles Stopped%',
-            'PAdj Pressures', 'Counterpress Regains', 'Blocks/Shot',
-            'DA OBV', 'Aggressive Actions'
+        variables_def = VARIABLES_PERFIL["Contenciones"]["def"]
+        variables_ball = VARIABLES_PERFIL["Contenciones"]["ball"]
 
-        ]
-        variables_ball = [
-           'xG', 'Shooting%', 'Assists', 'xG Assisted', 'Key Passes', 'Successful Dribbles',
-            'OP Passes', 'Deep Progressions', 'xGBuildup', 'xGChain', 'Carries',
-            'PintoB', 'Throughballs', 'Pass OBV', 'Shot OBV', 'OBV'
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
-
-        df["Ranking General Defensivo"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking General Con Balón"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Contenciones")))
 
         grupos_variables = {
             "Con Balón": variables_ball,
@@ -705,34 +507,16 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Con Balón", "Ranking General Defensivo"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-        
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición"
             ],
-            highlight_names=highlight_sel
         )
 
     if grupo_seleccionado == "Contenciones":
@@ -740,39 +524,33 @@ if seleccion == "Perfil de Jugadores":
 
 
 ### Para Interiores
-    def perfil_interiores(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"].isin(["Right Centre Midfielder", "Left Centre Midfielder"])]
+    def perfil_interiores(filtro):
+        filtro = filtro.igual("Grupo", "Interiores")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 37)
+            perfiles.EDAD_DEFECTO["Interiores"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -780,29 +558,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-            'PAdj Interceptions', 'Defensive Regains', 'PAdj Tackles', 'Dribbles Stopped%',
-            'PAdj Pressures', 'Counterpress Regains', 'Blocks/Shot', 'Dribbles Stopped%',
-            'DA OBV', 'Aggressive Actions'
+        variables_def = VARIABLES_PERFIL["Interiores"]["def"]
+        variables_ball = VARIABLES_PERFIL["Interiores"]["ball"]
 
-        ]
-        variables_ball = [
-           'xG', 'Shooting%', 'Assists', 'xG Assisted', 'Key Passes', 'Successful Dribbles',
-            'OP Passes', 'Deep Progressions', 'xGBuildup', 'xGChain', 'Carries',
-            'PintoB', 'Throughballs', 'Pass OBV', 'Shot OBV', 'OBV'
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
-
-        df["Ranking General Defensivo"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking General Con Balón"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Interiores")))
 
         grupos_variables = {
             "Con Balón": variables_ball,
@@ -810,73 +579,49 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Con Balón", "Ranking General Defensivo"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición"
             ],
-            highlight_names=highlight_sel
         )
 
     if grupo_seleccionado == "Interiores":
         perfil_interiores(df_filtrado)
 
 ### Para Volantes Ofensivos
-    def perfil_volantes(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"].isin(["Centre Attacking Midfielder", "Right Attacking Midfielder", "Left Attacking Midfielder"])]
+    def perfil_volantes(filtro):
+        filtro = filtro.igual("Grupo", "Volantes Ofensivos")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 37)
+            perfiles.EDAD_DEFECTO["Volantes Ofensivos"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -884,26 +629,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-            'xG Assisted', 'Key Passes', 'Assists', 'Throughballs', 'OP F3 Passes', 'F3 Pass Forward%', 'Passes Inside Box', 'PintoB', 'xGChain', 'OBV', 'Pass OBV', 'D&C OBV',
-            'Counterpress Regains', 'Pressures', 'Deep Progressions', 'Carries', 'Dribbles'
-
-        ]
-        variables_ball = [
-           'Shot OBV', 'NP Goals', 'xG/Shot', 'Shot Touch%', 'PSxG', 'Shots', 'Goal Conversion%'
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
+        variables_def = VARIABLES_PERFIL["Volantes Ofensivos"]["def"]
+        variables_ball = VARIABLES_PERFIL["Volantes Ofensivos"]["ball"]
 
-        df["Ranking General Creación"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking General Definición"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Volantes Ofensivos")))
 
         grupos_variables = {
             "Definición": variables_ball,
@@ -911,34 +650,16 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Creación", "Ranking General Definición"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición"
             ],
-            highlight_names=highlight_sel
         )
 
     if grupo_seleccionado == "Volantes Ofensivos":
@@ -946,39 +667,33 @@ if seleccion == "Perfil de Jugadores":
 
 
 ### Para Extremos
-    def perfil_extremos(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"].isin(["Left Wing", "Right Wing", "Left Midfielder", "Right Midfielder"])]
+    def perfil_extremos(filtro):
+        filtro = filtro.igual("Grupo", "Extremos")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 37)
+            perfiles.EDAD_DEFECTO["Extremos"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -986,26 +701,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-            'xG Assisted', 'Key Passes', 'Assists', 'Throughballs', 'OP F3 Passes', 'F3 Pass Forward%', 'Passes Inside Box', 'PintoB', 'xGChain', 'OBV', 'Pass OBV', 'D&C OBV',
-            'Counterpress Regains', 'Pressures', 'Deep Progressions', 'Carries', 'Successful Dribbles', 'Defensive Regains'
-
-        ]
-        variables_ball = [
-           'Shot OBV', 'NP Goals', 'xG/Shot', 'Shot Touch%', 'PSxG', 'Shots', 'Goal Conversion%'
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
+        variables_def = VARIABLES_PERFIL["Extremos"]["def"]
+        variables_ball = VARIABLES_PERFIL["Extremos"]["ball"]
 
-        df["Ranking General Creación"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking General Definición"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Extremos")))
 
         grupos_variables = {
             "Definición": variables_ball,
@@ -1013,34 +722,16 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Creación", "Ranking General Definición"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición"
             ],
-            highlight_names=highlight_sel
         )
 
     if grupo_seleccionado == "Extremos":
@@ -1049,39 +740,33 @@ if seleccion == "Perfil de Jugadores":
 
 
 ### Para Delanteros
-    def perfil_delanteros(df):
-        df = df.copy()
-        df["PosPrim"] = df["Primary Position"].astype(str).str.strip()
-        df = df[df["PosPrim"].isin(["Centre Forward", "Left Centre Forward", 'Right Centre Forward'])]
+    def perfil_delanteros(filtro):
+        filtro = filtro.igual("Grupo", "Delanteros")
 
         st.sidebar.markdown("### Minutos Jugados")
-        min_mins = int(df["Minutes"].min())
-        max_mins = int(df["Minutes"].max())
-        min_default = max(600, min_mins)
+        min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
+        min_default = max(perfiles.MINUTOS_DEFECTO, min_mins)
 
         minutos_sel = st.sidebar.slider(
             "Rango de Minutos Jugados",
             min_mins, max_mins,
             (min_default, max_mins)
         )
-        df = df[df["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+        filtro = filtro.entre("Minutes", minutos_sel[0], minutos_sel[1])
 
-        df["Birth Date"] = pd.to_datetime(df["Date of Birth"], errors="coerce")
-        df["Age"] = ((pd.to_datetime("today") - df["Birth Date"]).dt.days / 365.25).astype(int)
 
         st.sidebar.markdown("### Edad")
-        min_age = int(df["Age"].min())
-        max_age = int(df["Age"].max())
+        min_age, max_age = (int(v) for v in filtros_grupo.edad)
 
         edad_sel = st.sidebar.slider(
             "Rango de Edad",
             min_age, max_age,
-            (17, 37)
+            perfiles.EDAD_DEFECTO["Delanteros"]
         )
-        df = df[df["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
 
         st.sidebar.markdown("### Filtrar por Nacionalidad")
-        nationalities = sorted(df["Nationality"].dropna().astype(str).unique())
+        nationalities = list(filtros_grupo.nacionalidades)
         select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
 
         if select_all:
@@ -1089,26 +774,20 @@ if seleccion == "Perfil de Jugadores":
         else:
             selected_nats = st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
 
-        df = df[df["Nationality"].isin(selected_nats)]
+        filtro = filtro.en("Nationality", selected_nats)
+
+        # Un solo frame para liga + grupo + minutos + edad + nacionalidad
+        df = filtro.aplicar()
+        df["Age"] = df["Age"].astype(int)   # años cumplidos (Age/Birth Date vienen de datos.py)
 
         if df.empty:
             st.warning("No hay jugadores que cumplan los filtros."); st.stop()
 
-        variables_def = [
-            'xG Assisted', 'Key Passes', 'Assists', 'Throughballs', 'OP F3 Passes', 'F3 Pass Forward%', 'Passes Inside Box', 'PintoB', 'xGChain', 'OBV', 'Pass OBV', 'D&C OBV',
-            'Counterpress Regains', 'Pressures', 'Deep Progressions', 'Carries', 'Dribbles', 'Aerial Win%'
-
-        ]
-        variables_ball = [
-           'Shot OBV', 'NP Goals', 'xG/Shot', 'Shot Touch%', 'PSxG', 'Shots', 'Goal Conversion%'
-        ]
-
-        scaler = MinMaxScaler()
-        df["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_def].fillna(0)))
-        df["_ball"] = PCA(n_components=1).fit_transform(scaler.fit_transform(df[variables_ball].fillna(0)))
+        variables_def = VARIABLES_PERFIL["Delanteros"]["def"]
+        variables_ball = VARIABLES_PERFIL["Delanteros"]["ball"]
 
-        df["Ranking General Creación"] = 100 * (df["_def"] - df["_def"].min()) / (df["_def"].max() - df["_def"].min())
-        df["Ranking General Definición"] = 100 * (df["_ball"] - df["_ball"].min()) / (df["_ball"].max() - df["_ball"].min())
+        # Rankings PCA → 0–100 (cacheados por subconjunto filtrado en rankings.py)
+        df = df.assign(**rankings.rankings(df, perfiles.bloques("Delanteros")))
 
         grupos_variables = {
             "Definición": variables_ball,
@@ -1116,34 +795,16 @@ if seleccion == "Perfil de Jugadores":
             "Rankings": ["Ranking General Creación", "Ranking General Definición"]
         }
 
-        st.markdown("<h3 style='margin-bottom: 15px;'>Variables del gráfico</h3>", unsafe_allow_html=True)
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo de variable para eje X", list(grupos_variables.keys()), index=2, key="tipo_x")
-            var_x = st.selectbox("Variable en eje X", grupos_variables[tipo_x], index=0, key="var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo de variable para eje Y", list(grupos_variables.keys()), index=2, key="tipo_y")
-            var_y = st.selectbox("Variable en eje Y", grupos_variables[tipo_y], index=1, key="var_y")
-
-        st.markdown("#### Highlight players")
-        jugadores_disponibles = sorted(df["Name"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect(
-            "Selecciona jugadores a resaltar (además del clic en el gráfico)",
-            jugadores_disponibles,
-            default=[]
-        )
-
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             df,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutes",
             tooltip_cols=[
                 "Name","Team","Primary Position","Age","Nationality","Minutes",
                 "Ranking General Defensivo","Ranking General Con Balón",
                 "Ranking General Creación","Ranking General Definición"
             ],
-            highlight_names=highlight_sel
         )
 
     if grupo_seleccionado == "Delanteros":
@@ -1174,26 +835,6 @@ elif seleccion == "Radares Estadísticos":
     # =========================
     # Utils / Helpers
     # =========================
-    def _normalize_metrics(df, metrics, invert=None):
-        """
-        Normaliza 0–1 por métrica con coerción a numérico.
-        Si está en 'invert', aplica 1 - z. NaN -> 0.5
-        """
-        invert = set(invert or [])
-        out = df.copy()
-        for m in metrics:
-            if m not in out.columns:
-                continue
-            s = pd.to_numeric(out[m], errors="coerce")
-            mn, mx = s.min(), s.max()
-            if pd.isna(mn) or pd.isna(mx) or mx == mn:
-                out[m] = 0.5
-            else:
-                z = (s - mn) / (mx - mn)
-                out[m] = (1 - z) if m in invert else z
-                out[m] = out[m].fillna(0.5)
-        return out
-
     # Radar genérico (barras por fase, contorno perimetral, etiquetas)
     def radar_barras_plotly(
         jugador,
@@ -1202,7 +843,8 @@ elif seleccion == "Radares Estadísticos":
         invertir_vars=None,
         colores_fases=("rgba(59,130,246,0.90)", "rgba(245,158,11,0.90)", "rgba(16,185,129,0.90)"),
         chart_height=640,   # tamaño del radar
-        show_silueta=False  # polígono de valores (opcional)
+        show_silueta=False, # polígono de valores (opcional)
+        poblacion=None      # poblaciones.Poblacion multi-liga (None = solo el grupo filtrado)
     ):
         if "Name" not in df.columns:
             st.warning("La base no tiene la columna 'Name'."); return None
@@ -1221,10 +863,9 @@ elif seleccion == "Radares Estadísticos":
         if not atributos:
             st.warning("No hay variables presentes para construir el radar."); return None
 
-        # Normalización → 0–100
-        df_norm = _normalize_metrics(df, atributos, invert=invertir)
-        row = df_norm.loc[df_norm["Name"] == jugador].iloc[0]
-        r_vals = [float(row[a]) * 100 for a in atributos]
+        # Percentiles 0–100 dentro del grupo filtrado o contra la población multi-liga (normalizacion.py)
+        ordenados = poblacion.vectores(atributos) if poblacion is not None else None
+        r_vals = normalizacion.percentiles_jugador(df, df["Name"] == jugador, atributos, invertir, ordenados)
 
         # Ángulos
         n = len(atributos)
@@ -1305,213 +946,36 @@ elif seleccion == "Radares Estadísticos":
         )
         return fig
 
-    # -------- Distribution plots (Altair KDE) en grilla 3×N --------
-    def _kde_chart_altair(
-        df,
-        metric,
-        jugador_val,
-        fill_color=FILL_ORANGE,
-        line_color=LINE_BLACK,
-        height=120
-    ):
-        """KDE compacto: relleno naranja, contorno/curva negro."""
-        if metric not in df.columns:
-            return None
-
-        serie = (
-            pd.to_numeric(df[metric], errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-            .astype(float)
-        )
-        if serie.empty or pd.isna(jugador_val):
+    # -------- Distribution plots (Altair KDE): una sola grilla 3×N --------
+    def build_kde_grid(df, jugador, fases_juego, height_each=120):
+        """Una sola grilla Altair (3 por fila) con la distribución de cada métrica y el valor del jugador."""
+        if "Name" not in df.columns or jugador not in df["Name"].values:
             return None
-
-        # Dominio con margen
-        mn, mx = float(serie.min()), float(serie.max())
-        if mn == mx:
-            pad = max(abs(mn), 1.0) * 0.1
-            mn, mx = mn - pad, mx + pad
-        else:
-            pad = (mx - mn) * 0.10
-            mn, mx = mn - pad, mx + pad
-
-        data_num = pd.DataFrame({"value": serie})
-
-        base = alt.Chart(data_num).transform_density(
-            "value", as_=["x", "density"], extent=[mn, mx], steps=200
-        )
-
-        # Relleno naranja bajo la curva hasta el valor del jugador
-        area = base.transform_filter(
-            alt.datum.x <= float(jugador_val)
-        ).mark_area(
-            opacity=0.22, color=fill_color
-        ).encode(
-            x=alt.X("x:Q", title=None),
-            y=alt.Y("density:Q", title=None)
-        )
-
-        # Curva/contorno negro
-        line = base.mark_line(color=line_color, size=1.4).encode(
-            x="x:Q", y="density:Q"
-        )
-
-        # Regla vertical del jugador en negro
-        rule = alt.Chart(pd.DataFrame({"x": [float(jugador_val)]})).mark_rule(
-            color=line_color, strokeWidth=2
-        ).encode(
-            x="x:Q",
-            tooltip=[alt.Tooltip("x:Q", title="Valor", format=".3f")]
-        )
-
-        title = alt.TitleParams(metric, fontSize=12, anchor="middle", color="#1F2937")
-        chart = (area + line + rule).properties(height=height, title=title)
-
-        # Estilo
-        chart = chart.configure_axis(
-            grid=False, domain=True, domainColor="#E6E6E6", labelColor="#2B2B2B"
-        ).configure_view(
-            strokeWidth=0
-        ).configure_title(
-            font="Inter", color="#111111", anchor="middle"
+        valores = {
+            m: pd.to_numeric(df.loc[df["Name"] == jugador, m], errors="coerce").iloc[0]
+            for vars_fase in fases_juego.values() for m in vars_fase if m in df.columns
+        }
+        return densidades.grilla_altair(
+            df, valores, alto=height_each,
+            relleno=FILL_ORANGE, linea=LINE_BLACK, opacidad=0.22, grosor=1.4
         )
 
-        return chart
-
-    def build_kde_charts(df, jugador, fases_juego, height_each=120):
-        """Devuelve una lista de charts Altair (uno por métrica)."""
-        charts = []
-        if "Name" not in df.columns or jugador not in df["Name"].values:
-            return charts
-        for fase, vars_fase in fases_juego.items():
-            presentes = [v for v in vars_fase if v in df.columns]
-            for m in presentes:
-                val = pd.to_numeric(df.loc[df["Name"] == jugador, m], errors="coerce").iloc[0]
-                ch = _kde_chart_altair(
-                    df, m, val,
-                    fill_color=FILL_ORANGE,
-                    line_color=LINE_BLACK,
-                    height=height_each
-                )
-                if ch is not None:
-                    charts.append(ch)
-        return charts
-
     # =========================
     # Selección de liga / temporada (mismo catálogo que Perfil)
     # =========================
     st.sidebar.markdown("### Selecciona la Liga y Temporada")
 
-    ligas_temporadas = {
-        "Liga MX": ["2024/2025", "2025/2026"],
-        "Liga Profesional, Argentina": ["2025", "2026"],
-        "Jupiler Pro League, Bélgica": ["2024/2025", "2025/2026"],
-        "Serie A, Brasil": ["2025", "2026"],
-        "Primera División, Chile": ["2025", "2026"],
-        "Primera A, Colombia": ["2025", "2026"],
-        "Liga Pro, Ecuador": ["2025"],
-        "Premier League, Inglaterra": ["2024/2025", "2025/2026"],
-        "Ligue 1, Francia": ["2024/2025", "2025/2026"],
-        "1. Bundesliga, Alemania": ["2024/2025", "2025/2026"],
-        "Serie A, Italia": ["2024/2025", "2025/2026"],
-        "Serie B, Italia": ["2024/2025", "2025/2026"],
-        "Eredivisie, Países Bajos": ["2024/2025", "2025/2026"],
-        "División Profesional, Paraguay": ["2025", "2026"],
-        "Primeira Liga, Portugal": ["2024/2025", "2025/2026"],
-        "Premier League, Rusia": ["2024/2025", "2025/2026"],
-        "Pro League, Arabia": ["2024/2025", "2025/2026"],
-        "La Liga, España": ["2024/2025", "2025/2026"],
-        "La Liga 2, España": ["2024/2025", "2025/2026"],
-        "Primera División, Uruguay": ["2025"],
-        "MLS, Estados Unidos": ["2025", "2026"],
-    }
-
-    archivos_csv = {
-        ("Liga MX", "2024/2025"): "ligamxp902425.csv",
-        ("Liga MX", "2025/2026"): "ligamxp902526.csv",
-        ("Liga Profesional, Argentina", "2025"): "argp902025.csv",
-        ("Liga Profesional, Argentina", "2026"): "argp902026.csv",
-        ("Jupiler Pro League, Bélgica", "2024/2025"): "belp902425.csv",
-        ("Jupiler Pro League, Bélgica", "2025/2026"): "belp902526.csv",
-        ("Serie A, Brasil", "2025"): "brap902025.csv",
-        ("Serie A, Brasil", "2026"): "brap902026.csv",
-        ("Primera División, Chile", "2025"): "chip902025.csv",
-        ("Primera División, Chile", "2026"): "chip902026.csv",
-        ("Primera A, Colombia", "2025"): "colp902025.csv",
-        ("Primera A, Colombia", "2026"): "colp902026.csv",
-        ("Liga Pro, Ecuador", "2025"): "ecup902025.csv",
-        ("Premier League, Inglaterra", "2024/2025"): "engp902425.csv",
-        ("Premier League, Inglaterra", "2025/2026"): "engp902526.csv",
-        ("Ligue 1, Francia", "2024/2025"): "frap902425.csv",
-        ("Ligue 1, Francia", "2025/2026"): "frap902526.csv",
-        ("1. Bundesliga, Alemania", "2024/2025"): "gerp902425.csv",
-        ("1. Bundesliga, Alemania", "2025/2026"): "gerp902526.csv",
-        ("Serie A, Italia", "2025/2026"): "ita1p902526.csv",
-        ("Serie A, Italia", "2024/2025"): "ita1p902425.csv",
-        ("Serie B, Italia", "2024/2025"): "seriebp902425.csv",
-        ("Serie B, Italia", "2025/2026"): "ita2p902526.csv",
-        ("Eredivisie, Países Bajos", "2024/2025"): "nedp902425.csv",
-        ("Eredivisie, Países Bajos", "2025/2026"): "nedp902526.csv",
-        ("División Profesional, Paraguay", "2025"): "parp902025.csv",
-        ("División Profesional, Paraguay", "2026"): "parp902026.csv",
-        ("Primeira Liga, Portugal", "2024/2025"): "porp902425.csv",
-        ("Primeira Liga, Portugal", "2025/2026"): "porp902526.csv",
-        ("Premier League, Rusia", "2024/2025"): "rusp902425.csv",
-        ("Premier League, Rusia", "2025/2026"): "rusp902526.csv",
-        ("Pro League, Arabia", "2024/2025"): "arap902425.csv",
-        ("Pro League, Arabia", "2025/2026"): "arap902526.csv",
-        ("La Liga, España", "2024/2025"): "espp902425.csv",
-        ("La Liga, España", "2025/2026"): "laligap902526.csv",
-        ("La Liga 2, España", "2024/2025"): "esp2p902425.csv",
-        ("La Liga 2, España", "2025/2026"): "laliga22526.csv",
-        ("Primera División, Uruguay", "2025"): "urup902025.csv",
-        ("MLS, Estados Unidos", "2025"): "mlsp902025.csv",
-        ("MLS, Estados Unidos", "2026"): "mlsp902026.csv",
-
-    }
-
-    ligas_disponibles = list(ligas_temporadas.keys())
+    # Ligas/temporadas/archivos salen del catálogo único (catalogo.py)
+    ligas_disponibles = catalogo.ligas("p90")
     liga_seleccionada = st.sidebar.selectbox("Liga", ligas_disponibles, index=0)
-    temporadas_disponibles = ligas_temporadas[liga_seleccionada]
+    temporadas_disponibles = catalogo.temporadas("p90", liga_seleccionada)
     temporada_seleccionada = st.sidebar.selectbox("Temporada", temporadas_disponibles, index=0)
 
-    archivo = archivos_csv.get((liga_seleccionada, temporada_seleccionada))
+    archivo = catalogo.archivo("p90", liga_seleccionada, temporada_seleccionada)
+    precalentar.anotar_uso("p90", liga_seleccionada)
     if not archivo:
         st.error("No hay datos disponibles para esta combinación de liga y temporada."); st.stop()
 
-    df_radar = pd.read_csv(archivo)
-    df_radar["Competition"] = df_radar["Competition"].astype(str).str.strip()
-    nombre_base_liga = {
-        "Liga Profesional, Argentina": "Liga Profesional",
-        "Jupiler Pro League, Bélgica": "Jupiler Pro League",
-        "Primera División, Chile": "Primera División",
-        "Primera A, Colombia": "Primera A",
-        "Liga Pro, Ecuador": "Liga Pro",
-        "Premier League, Inglaterra": "Premier League",
-        "Ligue 1, Francia": "Ligue 1",
-        "1. Bundesliga, Alemania": "1. Bundesliga",
-        "Serie B, Italia": "Serie B",
-        "Eredivisie, Países Bajos": "Eredivisie",
-        "División Profesional, Paraguay": "División Profesional, Paraguay",
-        "Primeira Liga, Portugal": "Primeira Liga",
-        "Premier League, Rusia": "Premier League",
-        "Pro League, Arabia": "Pro League",
-        "La Liga, España": "La Liga",
-        "La Liga 2, España": "La Liga 2",
-        "Primera División, Uruguay": "Primera División",
-        "MLS, Estados Unidos": "Major League Soccer",
-    }.get(liga_seleccionada, liga_seleccionada)
-
-    df_radar["Season"] = df_radar["Season"].astype(str).str.strip()
-    df_radar = df_radar[
-        (df_radar["Competition"] == str(nombre_base_liga)) &
-        (df_radar["Season"] == str(temporada_seleccionada))
-    ].copy()
-
-    if df_radar.empty:
-        st.warning("No hay datos disponibles en la base para esta liga y temporada."); st.stop()
-
     # =========================
     # Grupo de Posición (incluye todos)
     # =========================
@@ -1526,59 +990,40 @@ elif seleccion == "Radares Estadísticos":
         index=0
     )
 
-    df_radar["PosPrim"] = df_radar["Primary Position"].astype(str).str.strip()
+    # Fases del radar por grupo (definen también qué columnas se cargan; fases.py)
+    FASES_RADAR = fases.RADAR_P90
 
-    if grupo == "Porteros":
-        df_radar = df_radar[df_radar["PosPrim"] == "Goalkeeper"].copy()
-    elif grupo == "Centrales":
-        df_radar = df_radar[df_radar["PosPrim"].isin(
-            ["Left Centre Back", "Centre Back", "Right Centre Back"]
-        )].copy()
-    elif grupo == "Carrileros/Laterales":
-        df_radar = df_radar[df_radar["PosPrim"].isin(
-            ["Left Back", "Left Wing Back", "Right Back", "Right Wing Back"]
-        )].copy()
-    elif grupo == "Contenciones":
-        df_radar = df_radar[df_radar["PosPrim"].isin(
-            ["Centre Defensive Midfielder", "Left Defensive Midfielder", "Right Defensive Midfielder"]
-        )].copy()
-    elif grupo == "Interiores":
-        pos_interiores = [
-            "Centre Midfielder", "Central Midfielder",
-            "Left Centre Midfielder", "Right Centre Midfielder"
-        ]
-        df_radar = df_radar[df_radar["PosPrim"].isin(pos_interiores)].copy()
-    elif grupo == "Volantes Ofensivos":
-        pos_vo = [
-            "Centre Attacking Midfielder", "Right Attacking Midfielder", "Left Attacking Midfielder"
-        ]
-        df_radar = df_radar[df_radar["PosPrim"].isin(pos_vo)].copy()
-    elif grupo == "Extremos":
-        pos_extremos = [
-            "Left Wing", "Right Wing",
-            "Left Winger", "Right Winger",
-            "Left Midfielder", "Right Midfielder"
-        ]
-        df_radar = df_radar[df_radar["PosPrim"].isin(pos_extremos)].copy()
-    else:  # Delanteros
-        pos_del = [
-            "Centre Forward", "Left Centre Forward", "Right Centre Forward",
-            "Striker", "Second Striker",
-            "Left Forward", "Right Forward", "Forward"
-        ]
-        df_radar = df_radar[df_radar["PosPrim"].isin(pos_del)].copy()
+    # Solo identidad + métricas de las fases del grupo activo
+    df_radar = cargar_columnas(
+        archivo, [m for vars_fase in FASES_RADAR[grupo].values() for m in vars_fase], familia="p90"
+    )
+    nombre_base_liga = catalogo.nombre_base_liga("p90", liga_seleccionada, temporada_seleccionada)
+
+    # Filtros como máscaras (filtros.py); el subconjunto se materializa tras la nacionalidad
+    filtro_radar = (
+        filtros.filtrar(df_radar)
+        .igual("Competition", nombre_base_liga)
+        .igual("Season", temporada_seleccionada)
+    )
+
+    if len(filtro_radar) == 0:
+        st.warning("No hay datos disponibles en la base para esta liga y temporada."); st.stop()
+
+    # Grupo precalculado en la ingesta con la taxonomía de posiciones.py
+    filtro_radar = filtro_radar.igual("Grupo", grupo)
 
     # Minutos (convertimos a numérico por si vienen strings)
     st.sidebar.markdown("### Minutos Jugados")
-    if not df_radar.empty and "Minutes" in df_radar.columns:
-        df_radar["Minutes"] = pd.to_numeric(df_radar["Minutes"], errors="coerce")
-        if df_radar["Minutes"].notna().any():
-            min_mins = int(np.nanmin(df_radar["Minutes"]))
-            max_mins = int(np.nanmax(df_radar["Minutes"]))
+    rango_minutos = None   # también acota la población multi-liga de percentiles
+    filtros_grupo = resumen_filtros(archivo, "p90", grupo)   # cotas y opciones (índice de filtros, datos.py)
+    if len(filtro_radar) > 0 and "Minutes" in df_radar.columns:
+        if filtros_grupo.minutos is not None:
+            min_mins, max_mins = (int(v) for v in filtros_grupo.minutos)
             min_default = max(600, min_mins)
             if min_mins < max_mins:
                 minutos_sel = st.sidebar.slider("Rango de Minutos Jugados", min_mins, max_mins, (min_default, max_mins))
-                df_radar = df_radar[df_radar["Minutes"].between(minutos_sel[0], minutos_sel[1])]
+                filtro_radar = filtro_radar.entre("Minutes", minutos_sel[0], minutos_sel[1])
+                rango_minutos = tuple(minutos_sel)
             else:
                 st.sidebar.info(f"Todos los jugadores tienen {min_mins} minutos — se omite el filtro.")
         else:
@@ -1588,263 +1033,145 @@ elif seleccion == "Radares Estadísticos":
 
     # Nacionalidad
     st.sidebar.markdown("### Filtrar por Nacionalidad")
-    nationalities = sorted(df_radar["Nationality"].dropna().astype(str).unique())
+    nationalities = list(filtros_grupo.nacionalidades)
     select_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True)
     selected_nats = nationalities if select_all else st.sidebar.multiselect("Nacionalidades", nationalities, default=nationalities)
-    df_radar = df_radar[df_radar["Nationality"].isin(selected_nats)]
+    df_radar = filtro_radar.en("Nationality", selected_nats).aplicar()
     if df_radar.empty:
         st.warning("No hay jugadores que cumplan los filtros."); st.stop()
+    df_radar["Minutes"] = pd.to_numeric(df_radar["Minutes"], errors="coerce")
+
+    # Población de referencia de los percentiles (poblaciones.py): el grupo
+    # filtrado de esta liga, o el mismo grupo en varias ligas/temporadas
+    st.sidebar.markdown("### Percentiles contra")
+    referencia = st.sidebar.radio(
+        "Población de referencia",
+        ["Liga seleccionada"] + list(poblaciones.PRESETS) + ["Ligas elegidas"],
+        index=0
+    )
+    poblacion_ref = None
+    if referencia != "Liga seleccionada":
+        if referencia == "Ligas elegidas":
+            opciones_ref = catalogo.entradas("p90")
+            entradas_ref = st.sidebar.multiselect(
+                "Ligas y temporadas", opciones_ref,
+                default=[e for e in opciones_ref if (e.liga, e.temporada) == (liga_seleccionada, temporada_seleccionada)],
+                format_func=lambda e: f"{e.liga} · {e.temporada}"
+            )
+        else:
+            entradas_ref = poblaciones.entradas_preset(referencia)
+        # Mismos filtros que el radar (minutos y, si se acotó, nacionalidad); "todas" no filtra otras ligas
+        poblacion_ref = poblaciones.poblacion(
+            entradas_ref, grupo, rango_minutos,
+            nacionalidades=None if select_all else selected_nats,
+        ) if entradas_ref else None
+        if poblacion_ref is None or len(poblacion_ref.matriz) == 0:
+            st.sidebar.warning("La población elegida no tiene jugadores; se usa la liga seleccionada.")
+            poblacion_ref = None
+        else:
+            st.sidebar.caption(
+                f"{len(poblacion_ref.matriz)} jugadores: {poblacion_ref.descripcion} "
+                "(con los filtros de minutos y nacionalidad del sidebar)"
+            )
 
     # =========================
     # Fases por grupo + métricas a invertir
     # =========================
-    if grupo == "Porteros":
-        fases_juego = {
-            "Defensivas": [
-                "PSxG Faced", "GSAA", "Save%", "xSv%", "Shot Stopping%", "Shots Faced", "Shots Faced OT%"
-            ],
-            "Posesión": [
-                "GK Aggressive Dist.", "Claims%", "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
-                "Carries", "Successful Dribbles"
-            ],
-            "Ofensivas": [
-                "Pass OBV", "Goalkeeper OBV"
-            ],
-        }
-        invertir_vars = {"PSxG Faced", "Shots Faced", "Shots Faced OT%"}
-
-    elif grupo == "Centrales":
-        fases_juego = {
-            "Defensivas": [
-                "PAdj Tackles", "PAdj Interceptions", "Blocks/Shot", "Clearances",
-                "Aerial Win%", "Aerial Wins", "Dribbles Stopped%", "DA OBV",
-                "Aggressive Actions", "PAdj Pressures", "Ball Recoveries", "Counterpress Regains"
-            ],
-            "Posesión": [
-                "Pass OBV", "xGBuildup", "xGChain", "OP Passes", "OP F3 Passes",
-                "Pass Forward%", "Passing%", "Passes Pressured%",
-                "Long Balls", "Long Ball%", "Carries"
-            ],
-            "Ofensivas": [
-                "Assists", "xG Assisted", "Key Passes", "D&C OBV", "OBV", "Shot OBV", "Throughballs"
-            ],
-        }
-        invertir_vars = {"Dribbled Past", "Errors Leading to Shots"} & set(df_radar.columns)
-
-    elif grupo == "Carrileros/Laterales":
-        fases_juego = {
-            "Defensivas": [
-                "PAdj Interceptions", "PAdj Clearances",
-                "Defensive Regains", "Ball Recoveries", "PAdj Tackles",
-                "Dribbles Stopped%", "Counterpress Regains",
-                "DA OBV"
-            ],
-            "Posesión": [
-                "OP Passes", "Passing%",
-                "Carries", "Successful Dribbles", "Deep Progressions",
-                "xGBuildup", "xGChain", "Long Ball%",
-                "Pass OBV", "D&C OBV"
-            ],
-            "Ofensivas": [
-                "xG Assisted", "Key Passes", "Assists", "Successful Crosses", "Successful Box Cross%",
-                "Passes Inside Box", "PintoB", "Shot OBV", "OBV"
-            ],
-        }
-        invertir_vars = {"Dribbled Past", "Errors Leading to Shots"} & set(df_radar.columns)
-
-    elif grupo == "Contenciones":
-        fases_juego = {
-            "Defensivas": [
-                "PAdj Interceptions", "Defensive Regains", "PAdj Tackles",
-                "Dribbles Stopped%", "PAdj Pressures", "Counterpress Regains",
-                "Blocks/Shot", "DA OBV", "Aggressive Actions", "Ball Recoveries"
-            ],
-            "Posesión": [
-                "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
-                "Carries", "Successful Dribbles", "Deep Progressions",
-                "xGBuildup", "xGChain", "Pass OBV", "D&C OBV"
-            ],
-            "Ofensivas": [
-                "Assists", "xG Assisted", "Key Passes",
-                "Throughballs", "PintoB", "Shot OBV", "OBV",
-                "xG", "Shooting%"
-            ],
-        }
-        invertir_vars = {"Dribbled Past", "Errors Leading to Shots"} & set(df_radar.columns)
-
-    elif grupo == "Interiores":
-        fases_juego = {
-            "Defensivas": [
-                "PAdj Interceptions", "Defensive Regains", "PAdj Tackles",
-                "Dribbles Stopped%", "PAdj Pressures", "Counterpress Regains",
-                "Blocks/Shot", "DA OBV", "Aggressive Actions", "Ball Recoveries"
-            ],
-            "Posesión": [
-                "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
-                "Carries", "Successful Dribbles", "Deep Progressions",
-                "xGBuildup", "xGChain", "Pass OBV", "D&C OBV"
-            ],
-            "Ofensivas": [
-                "Assists", "xG Assisted", "Key Passes",
-                "Throughballs", "PintoB", "Shot OBV", "OBV",
-                "xG", "Shooting%"
-            ],
-        }
-        invertir_vars = {"Dribbled Past", "Errors Leading to Shots"} & set(df_radar.columns)
-
-    elif grupo == "Volantes Ofensivos":
-        fases_juego = {
-            "Defensivas": [
-                "Counterpress Regains", "PAdj Pressures", "Pressures",
-                "Ball Recoveries", "PAdj Tackles", "PAdj Interceptions"
-            ],
-            "Posesión": [
-                "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
-                "Carries", "Successful Dribbles", "Deep Progressions",
-                "xGBuildup", "xGChain", "OP F3 Passes", "F3 Pass Forward%",
-                "Passes Inside Box", "PintoB",
-                "Pass OBV", "D&C OBV"
-            ],
-            "Ofensivas": [
-                "Assists", "xG Assisted", "Key Passes", "Throughballs",
-                "OBV", "Shot OBV",
-                "NP Goals", "xG/Shot", "PSxG", "Shots", "Goal Conversion%"
-            ],
-        }
-        invertir_vars = {"Dribbled Past", "Errors Leading to Shots"} & set(df_radar.columns)
-
-    elif grupo == "Extremos":
-        fases_juego = {
-            "Defensivas": [
-                "Counterpress Regains", "Pressures", "PAdj Pressures",
-                "Defensive Regains", "Ball Recoveries",
-                "PAdj Tackles", "PAdj Interceptions", "Dribbles Stopped%"
-            ],
-            "Posesión": [
-                "Carries", "Successful Dribbles", "Deep Progressions",
-                "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
-                "OP F3 Passes", "F3 Pass Forward%",
-                "xGBuildup", "xGChain",
-                "Pass OBV", "D&C OBV"
-            ],
-            "Ofensivas": [
-                "xG Assisted", "Key Passes", "Assists",
-                "Successful Crosses", "Successful Box Cross%",
-                "Passes Inside Box", "PintoB",
-                "OBV", "Shot OBV",
-                "NP Goals", "xG/Shot", "PSxG", "Shots", "Goal Conversion%"
-            ],
-        }
-        invertir_vars = {"Dribbled Past", "Errors Leading to Shots"} & set(df_radar.columns)
-
-    else:  # Delanteros
-        fases_juego = {
-            "Defensivas": [
-                "Counterpress Regains", "Pressures", "PAdj Pressures",
-                "Ball Recoveries", "PAdj Tackles", "PAdj Interceptions",
-                "Dribbles Stopped%", "Aerial Wins", "Aerial Win%"
-            ],
-            "Posesión": [
-                "Carries", "Successful Dribbles", "Deep Progressions",
-                "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
-                "OP F3 Passes", "F3 Pass Forward%",
-                "Passes Inside Box", "xGBuildup", "xGChain",
-                "PintoB", "Pass OBV", "D&C OBV"
-            ],
-            "Ofensivas": [
-                "Shot OBV", "OBV",
-                "NP Goals", "xG/Shot", "PSxG", "Shots", "Goal Conversion%",
-                "xG Assisted", "Key Passes", "Assists", "Throughballs"
-            ],
-        }
-        invertir_vars = {"Dribbled Past", "Errors Leading to Shots"} & set(df_radar.columns)
-
-    # Jugador
-    st.markdown("### Jugador")
-    jugadores_disponibles = sorted(df_radar["Name"].dropna().astype(str).unique())
-    if not jugadores_disponibles:
-        st.warning("No hay jugadores tras aplicar filtros."); st.stop()
-    jugador_sel = st.selectbox("Jugador", jugadores_disponibles, index=0)
-
-    # =========================
-    # Modo de selección de variables
-    # =========================
-    st.markdown("### Modo de variables para el radar")
-    modo_radar = st.radio(
-        "Elige cómo quieres armar el radar:",
-        ["Radar predeterminado", "Seleccionar variables para el radar"],
-        index=0,
-        horizontal=True
-    )
-
-    # Construimos el diccionario de fases efectivas según el modo
-    fases_activas = {}
-
-    if modo_radar == "Radar predeterminado":
-        # Usamos todas las variables definidas originalmente
-        fases_activas = {
-            fase: [v for v in vars_fase if v in df_radar.columns]
-            for fase, vars_fase in fases_juego.items()
-        }
-        # Quitamos fases vacías
-        fases_activas = {f: vs for f, vs in fases_activas.items() if vs}
-
-    else:
-        # Modo personalizado: el usuario elige variables por fase
-        st.markdown("#### Selecciona las variables por fase de juego")
-        st.caption("Solo se muestran variables que existen en la base filtrada.")
-        for fase, vars_fase in fases_juego.items():
-            disponibles = [v for v in vars_fase if v in df_radar.columns]
-            if not disponibles:
-                continue
-
-            seleccionadas = st.multiselect(
-                f"{fase}",
-                options=disponibles,
-                default=disponibles,   # si quieres obligar a elegir desde cero, pon default=[]
-                key=f"ms_{fase}_{grupo}"
-            )
-            if seleccionadas:
-                fases_activas[fase] = seleccionadas
+    fases_juego = FASES_RADAR[grupo]
+    invertir_vars = fases.invertidas_p90(grupo)
+    if grupo != "Porteros":
+        invertir_vars &= set(df_radar.columns)
+
+    # Jugador, modo y render en un fragmento: cambiar de jugador o de modo
+    # rehace solo el radar y la grilla, con df_radar y la población ya armados
+    @st.fragment
+    def panel_radar(df_radar, fases_juego, invertir_vars, poblacion_ref):
+        # Jugador
+        st.markdown("### Jugador")
+        jugadores_disponibles = sorted(df_radar["Name"].dropna().astype(str).unique())
+        if not jugadores_disponibles:
+            st.warning("No hay jugadores tras aplicar filtros."); return
+        jugador_sel = st.selectbox("Jugador", jugadores_disponibles, index=0)
+
+        # =========================
+        # Modo de selección de variables
+        # =========================
+        st.markdown("### Modo de variables para el radar")
+        modo_radar = st.radio(
+            "Elige cómo quieres armar el radar:",
+            ["Radar predeterminado", "Seleccionar variables para el radar"],
+            index=0,
+            horizontal=True
+        )
+
+        # Construimos el diccionario de fases efectivas según el modo
+        fases_activas = {}
+
+        if modo_radar == "Radar predeterminado":
+            # Usamos todas las variables definidas originalmente
+            fases_activas = {
+                fase: [v for v in vars_fase if v in df_radar.columns]
+                for fase, vars_fase in fases_juego.items()
+            }
+            # Quitamos fases vacías
+            fases_activas = {f: vs for f, vs in fases_activas.items() if vs}
 
-        if not fases_activas:
-            st.warning("No has seleccionado ninguna métrica para el radar.")
-            st.stop()
+        else:
+            # Modo personalizado: el usuario elige variables por fase
+            st.markdown("#### Selecciona las variables por fase de juego")
+            st.caption("Solo se muestran variables que existen en la base filtrada.")
+            for fase, vars_fase in fases_juego.items():
+                disponibles = [v for v in vars_fase if v in df_radar.columns]
+                if not disponibles:
+                    continue
+
+                seleccionadas = st.multiselect(
+                    f"{fase}",
+                    options=disponibles,
+                    default=disponibles,   # si quieres obligar a elegir desde cero, pon default=[]
+                    key=f"ms_{fase}_{grupo}"
+                )
+                if seleccionadas:
+                    fases_activas[fase] = seleccionadas
+
+            if not fases_activas:
+                st.warning("No has seleccionado ninguna métrica para el radar.")
+                return
+
+        # =========================
+        # Render: radar centrado + grilla 3×N de distribuciones
+        # =========================
+        if jugador_sel and fases_activas:
+            # Radar centrado
+            left, mid, right = st.columns([0.05, 0.90, 0.05])
+            with mid:
+                # Figura cacheada por subconjunto, jugador, fases e invertidas (figuras.py)
+                fig = figuras.radar(
+                    radar_barras_plotly,
+                    jugador=jugador_sel,
+                    df=df_radar,
+                    fases_juego=fases_activas,   # usamos fases activas (default o custom)
+                    invertir_vars=invertir_vars,
+                    colores_fases=("rgba(59,130,246,0.90)", "rgba(245,158,11,0.90)", "rgba(16,185,129,0.90)"),
+                    chart_height=640,
+                    show_silueta=False,
+                    poblacion=poblacion_ref
+                )
+                if fig is not None:
+                    st.plotly_chart(fig, use_container_width=True, theme=None)
 
-    # =========================
-    # Render: radar centrado + grilla 3×N de distribuciones
-    # =========================
-    if jugador_sel and fases_activas:
-        # Radar centrado
-        left, mid, right = st.columns([0.05, 0.90, 0.05])
-        with mid:
-            fig = radar_barras_plotly(
-                jugador=jugador_sel,
+            # Distribuciones en grilla 3×N (relleno naranja, línea negra)
+            st.markdown("#### Distribuciones por métrica")
+            grilla = build_kde_grid(
                 df=df_radar,
-                fases_juego=fases_activas,   # usamos fases activas (default o custom)
-                invertir_vars=invertir_vars,
-                colores_fases=("rgba(59,130,246,0.90)", "rgba(245,158,11,0.90)", "rgba(16,185,129,0.90)"),
-                chart_height=640,
-                show_silueta=False
+                jugador=jugador_sel,
+                fases_juego=fases_activas,   # también solo para las variables activas
+                height_each=120
             )
-            if fig is not None:
-                st.plotly_chart(fig, use_container_width=True, theme=None)
+            if grilla is not None:
+                st.altair_chart(grilla, use_container_width=False, theme=None)
 
-        # Distribuciones en grilla 3×N (relleno naranja, línea negra)
-        st.markdown("#### Distribuciones por métrica")
-        charts = build_kde_charts(
-            df=df_radar,
-            jugador=jugador_sel,
-            fases_juego=fases_activas,   # también solo para las variables activas
-            height_each=120
-        )
-        if charts:
-            for i in range(0, len(charts), 3):
-                cols = st.columns(3, gap="large")
-                for j in range(3):
-                    if i + j < len(charts):
-                        with cols[j]:
-                            st.altair_chart(charts[i + j], use_container_width=True, theme=None)
+    panel_radar(df_radar, fases_juego, invertir_vars, poblacion_ref)
 
 
 
@@ -1858,7 +1185,6 @@ elif seleccion == "Estadísticas Físicas":
     import pandas as pd
     import altair as alt
     import plotly.graph_objects as go
-    import unicodedata
 
     st.markdown("<h3 style='margin-bottom: 15px;'>Estadísticas Físicas</h3>", unsafe_allow_html=True)
 
@@ -1873,83 +1199,8 @@ elif seleccion == "Estadísticas Físicas":
     # Helpers
     # =========================
     def _load_fisico(path: str) -> pd.DataFrame:
-        """Lee CSV delimitado por ';' y castea numéricos en lo posible."""
-        df = pd.read_csv(path, sep=";")
-        non_numeric = {"Player","Short Name","Player ID","Birthdate","Position","Position Group"}
-        for c in df.columns:
-            if c not in non_numeric:
-                df[c] = pd.to_numeric(df[c], errors="coerce")
-        if "Player" in df.columns:
-            df["Player"] = df["Player"].astype(str).str.strip()
-        return df
-
-    def _pick_mpm_column(df: pd.DataFrame) -> str | None:
-        """Intenta detectar la columna 'minutos por partido' si existiera (por nombre)."""
-        explicit = [
-            "Minutes per Match", "Minutos por Partido", "Min/Match", "Minutes/Match",
-            "Minutos promedio por partido", "Min per match", "MPM"
-        ]
-        for c in explicit:
-            if c in df.columns:
-                return c
-        for c in df.columns:
-            cl = c.lower()
-            if ("min" in cl or "minut" in cl) and ("match" in cl or "partido" in cl or "/match" in cl or " per " in cl):
-                return c
-        return None
-
-    def _norm_text(s: str) -> str:
-        if not isinstance(s, str):
-            s = "" if pd.isna(s) else str(s)
-        s = s.strip()
-        s = unicodedata.normalize("NFKD", s)
-        s = "".join(ch for ch in s if not unicodedata.combining(ch))
-        s = " ".join(s.split())
-        return s
-
-    def _player_key_series(df: pd.DataFrame) -> pd.Series:
-        if "Player ID" in df.columns and df["Player ID"].notna().any():
-            return df["Player ID"].astype(str).str.strip()
-        if "Player" in df.columns:
-            return df["Player"].astype(str).map(_norm_text)
-        return pd.Series([f"row_{i}" for i in range(len(df))], index=df.index)
-
-    def _map_grupo(pos_code: str) -> str:
-        """Mapea códigos de posición a grupos estándar (sin GK/Otros en selector)."""
-        if not isinstance(pos_code, str):
-            return "Otros"
-        p = pos_code.upper().strip()
-        if p in {"CB","LCB","RCB"}: return "Centrales"
-        if p in {"LB","LWB","RB","RWB"}: return "Carrileros/Laterales"
-        if p in {"DM","CDM","LDM","RDM"}: return "Contenciones"
-        if p in {"CM","LCM","RCM","CMF","LM","RM"}: return "Interiores"
-        if p in {"AM","CAM"}: return "Volantes Ofensivos"
-        if p in {"LW","RW"}: return "Extremos"
-        if p in {"CF","ST","LF","RF","SS","FW","FWD"}: return "Delanteros"
-        if p in {"GK","GKP","GOALKEEPER"}: return "Porteros"
-        return "Otros"
-
-    def _dedupe_by_player_within_group(df: pd.DataFrame, mpm_col: str | None, minutes_fallback: str = "Minutes") -> pd.DataFrame:
-        """
-        Conservar UNA fila por (Jugador, Grupo):
-        - Prioriza mayor Minutes (si existe),
-        - Si no existe Minutes, usa mayor minutos/partido (MPM).
-        """
-        key = _player_key_series(df)
-        df = df.copy()
-        df["_PlayerKey"] = key
-
-        if "Minutes" in df.columns and df["Minutes"].notna().any():
-            base = pd.to_numeric(df["Minutes"], errors="coerce").fillna(-1e12)
-        elif mpm_col and mpm_col in df.columns:
-            base = pd.to_numeric(df[mpm_col], errors="coerce").fillna(-1e12)
-        else:
-            base = pd.Series(-1e12, index=df.index, dtype=float)
-
-        df["_score"] = base
-        idx = df.groupby(["_PlayerKey", "Grupo"], dropna=False)["_score"].idxmax()
-        out = df.loc[idx].copy()
-        return out.drop(columns=["_score"])
+        """Lee el CSV ya tipado (esquema "fisico" de datos.py: métricas float32, Position categórica)."""
+        return cargar_csv(path, familia="fisico")
 
     def _numeric_cols(df: pd.DataFrame, exclude_cols=(), exclude_contains=()):
         out = []
@@ -1960,13 +1211,6 @@ elif seleccion == "Estadísticas Físicas":
             if pd.api.types.is_numeric_dtype(df[c]): out.append(c)
         return out
 
-    def _compute_age_col(df: pd.DataFrame) -> pd.Series:
-        if "Birthdate" not in df.columns:
-            return pd.Series([np.nan]*len(df), index=df.index)
-        bd = pd.to_datetime(df["Birthdate"], errors="coerce", utc=True)
-        today = pd.Timestamp("today", tz="UTC")
-        return (today - bd).dt.days / 365.25
-
     def _domain_with_pad(series: pd.Series, pad_ratio=0.08):
         s = pd.to_numeric(series, errors="coerce").dropna()
         if s.empty:
@@ -1984,22 +1228,6 @@ elif seleccion == "Estadísticas Físicas":
         n = name.lower()
         return ("time to hsr" in n) or ("time to sprint" in n)
 
-    # Normalización (0–1) para radar
-    def _normalize_metrics(df, metrics, invert=None):
-        invert = set(invert or [])
-        out = df.copy()
-        for m in metrics:
-            if m not in out.columns: continue
-            s = pd.to_numeric(out[m], errors="coerce")
-            mn, mx = s.min(), s.max()
-            if pd.isna(mn) or pd.isna(mx) or mx == mn:
-                out[m] = 0.5
-            else:
-                z = (s - mn) / (mx - mn)
-                out[m] = (1 - z) if m in invert else z
-                out[m] = out[m].fillna(0.5)
-        return out
-
     # ------------- Radar por fases (Plotly) -------------
     def radar_barras_plotly_player(
         jugador,
@@ -2025,9 +1253,7 @@ elif seleccion == "Estadísticas Físicas":
         if not atributos:
             st.warning("No hay variables presentes para construir el radar."); return None
 
-        df_norm = _normalize_metrics(df, atributos, invert=invertir)
-        row = df_norm.loc[df_norm[id_col] == jugador].iloc[0]
-        r_vals = [float(row[a]) * 100 for a in atributos]
+        r_vals = normalizacion.percentiles_jugador(df, df[id_col] == jugador, atributos, invertir)
 
         n = len(atributos)
         thetas = np.linspace(0, 360, n, endpoint=False)
@@ -2081,150 +1307,34 @@ elif seleccion == "Estadísticas Físicas":
         return fig
 
     # ---------- KDE (relleno naranja, línea/contorno negro, con inversión opcional) ----------
-    def _kde_chart_altair(df, metric, jugador_val, invert=False, fill_color=ORANGE, height=120):
-        serie = (
-            pd.to_numeric(df[metric], errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-            .astype(float)
-        )
-        if serie.empty or pd.isna(jugador_val):
-            return None
-
-        mn, mx = float(serie.min()), float(serie.max())
-        if mn == mx:
-            pad = max(abs(mn), 1.0) * 0.10
-            mn, mx = mn - pad, mx + pad
-        else:
-            pad = (mx - mn) * 0.10
-            mn, mx = mn - pad, mx + pad
-
-        data_num = pd.DataFrame({"value": serie})
-
-        base = alt.Chart(data_num).transform_density(
-            "value", as_=["x", "density"], extent=[mn, mx], steps=200
-        )
-
-        # Relleno naranja hasta el valor del jugador
-        area = base.transform_filter(
-            alt.datum.x <= float(jugador_val)
-        ).mark_area(
-            opacity=0.28, color=fill_color
-        ).encode(
-            x=alt.X("x:Q", title=None, scale=alt.Scale(reverse=bool(invert))),
-            y=alt.Y("density:Q", title=None)
-        )
-
-        # Línea/contorno negro
-        line = base.mark_line(color="#000000", size=1.2).encode(
-            x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))),
-            y="density:Q"
-        )
-
-        # Regla negra en el valor del jugador
-        rule = alt.Chart(pd.DataFrame({"x": [float(jugador_val)]})).mark_rule(
-            color="#000000", strokeWidth=2
-        ).encode(
-            x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))),
-            tooltip=[alt.Tooltip("x:Q", title="Valor", format=".3f")]
-        )
-
-        title = alt.TitleParams(metric, fontSize=12, anchor="middle", color="#1F2937")
-        chart = (area + line + rule).properties(height=height, title=title)
-
-        chart = chart.configure_axis(
-            grid=False, domain=True, domainColor="#E6E6E6", labelColor="#2B2B2B"
-        ).configure_view(
-            strokeWidth=0
-        ).configure_title(
-            font="Inter", color="#111111", anchor="middle"
-        )
-        return chart
-
-    def build_kde_charts(
-        df,
-        jugador,
-        fases_juego,
-        id_col="Player",
-        invertir_vars_kde=None,   # set con nombres a invertir
-        height_each=120
-    ):
-        invertir_vars_kde = set(invertir_vars_kde or [])
-        charts = []
+    def build_kde_grid(df, jugador, fases_juego, id_col="Player", invertir_vars_kde=None, height_each=120):
+        """Una sola grilla Altair (3 por fila) con la distribución de cada métrica y el valor del jugador."""
         if id_col not in df.columns or jugador not in df[id_col].values:
-            return charts
-
+            return None
         row = df.loc[df[id_col] == jugador].iloc[0]
-        for fase, vars_fase in fases_juego.items():
-            presentes = [v for v in vars_fase if v in df.columns]
-            for m in presentes:
-                val = pd.to_numeric(row.get(m, np.nan), errors="coerce")
-                ch = _kde_chart_altair(
-                    df, m, val,
-                    invert=(m in invertir_vars_kde),
-                    fill_color=ORANGE,
-                    height=height_each
-                )
-                if ch is not None:
-                    charts.append(ch)
-        return charts
-
-    # =========================
-    # Catálogo ligas/temporadas (físico)
-    # =========================
-    ligas_temporadas_fis = {
-        "Liga MX": ["2024/2025"],  # agrega más aquí
-        "Liga Profesional, Argentina": ["2024"],  # agrega más aquí
-        "Jupiler Pro League, Bélgica": ["2024/2025"],  # agrega más aquí
-        "Serie A, Brasil": ["2024"],  # agrega más aquí
-        "Primera División, Chile": ["2024"],  # agrega más aquí
-        "Primera A, Colombia": ["2024"],  # agrega más aquí
-        "Liga Pro, Ecuador": ["2024"],  # agrega más aquí
-        "Premier League, Inglaterra": ["2024/2025"],  # agrega más aqui
-        "La Liga, España": ["2024/2025"],  # agrega más aquí
-        "Ligue 1, Francia": ["2024/2025"],  # agrega más aquí
-        "Bundesliga, Alemania": ["2024/2025"],  # agrega más aquí
-        "Serie A, Italia": ["2024/2025"],  # agrega más aquí
-        "Primeira Liga, Portugal": ["2024/2025"],  # agrega más aqu
-        "Primera División, Uruguay": ["2024"],  # agrega más aqu
-        "MLS, Estados Unidos": ["2024"],  # agrega más aquí
-
-
-    }
-    archivos_fis = {
-        ("Liga MX", "2024/2025"): "ligamxfisico.csv",
-        ("Liga Profesional, Argentina", "2024"): "argfisico.csv",
-        ("Jupiler Pro League, Bélgica", "2024/2025"): "belfisico.csv",
-        ("Serie A, Brasil", "2024"): "brafisico.csv",
-        ("Primera División, Chile", "2024"): "chifisico.csv",
-        ("Primera A, Colombia", "2024"): "colfisico.csv",
-        ("Liga Pro, Ecuador", "2024"): "ecufisico.csv",
-        ("Premier League, Inglaterra", "2024/2025"): "engfisico.csv",
-        ("La Liga, España", "2024/2025"): "espfisico.csv",
-        ("Ligue 1, Francia", "2024/2025"): "frafisico.csv",
-        ("Bundesliga, Alemania", "2024/2025"): "gerfisico.csv",
-        ("Serie A, Italia", "2024/2025"): "itafisico.csv",
-        ("Primeira Liga, Portugal", "2024/2025"): "porfisico.csv",
-        ("Primera División, Uruguay", "2024"): "urufisico.csv",
-        ("MLS, Estados Unidos", "2024"): "usafisico.csv",
-    }
+        valores = {
+            m: pd.to_numeric(row.get(m, np.nan), errors="coerce")
+            for vars_fase in fases_juego.values() for m in vars_fase if m in df.columns
+        }
+        return densidades.grilla_altair(
+            df, valores, invertir=invertir_vars_kde, alto=height_each,
+            relleno=ORANGE, linea="#000000", opacidad=0.28, grosor=1.2
+        )
 
     # =========================
-    # Sidebar (Liga -> Vista -> Grupo -> Filtros)
+    # Sidebar (Liga -> Vista -> Grupo -> Filtros); catálogo en catalogo.py
     # =========================
     with st.sidebar:
         st.markdown("### Liga y Temporada")
-        liga = st.selectbox("Liga", list(ligas_temporadas_fis.keys()), index=0)
-        temporada = st.selectbox("Temporada", ligas_temporadas_fis[liga], index=0)
+        liga = st.selectbox("Liga", catalogo.ligas("fisico"), index=0)
+        temporada = st.selectbox("Temporada", catalogo.temporadas("fisico", liga), index=0)
 
-        path = archivos_fis.get((liga, temporada))
+        path = catalogo.archivo("fisico", liga, temporada)
+        precalentar.anotar_uso("fisico", liga)
         if not path:
             st.error("No hay archivo configurado para esa liga/temporada."); st.stop()
-        df_f = _load_fisico(path)
-
-        MPM_COL = _pick_mpm_column(df_f)   # para posible fallback
-        df_f["Grupo"] = df_f["Position"].apply(_map_grupo)
-        df_f["Age"] = _compute_age_col(df_f)
+        # Una fila por (jugador, grupo), elegida en la ingesta por minutos (datos.py)
+        df_f = filas_unicas(_load_fisico(path))
 
         st.markdown("### Vista")
         modo = st.radio("Selecciona", ["Scatterplot", "Radares Físicos"], index=0, horizontal=False)
@@ -2234,21 +1344,19 @@ elif seleccion == "Estadísticas Físicas":
         grupo_sel = st.radio("Grupo", grupos_ok, index=0)
 
         st.markdown("### Filtros")
-        if df_f["Age"].notna().any():
-            age_min = int(np.nanmin(df_f["Age"]))
-            age_max = int(np.nanmax(df_f["Age"]))
+        edades = resumen_filtros(path, "fisico").edad   # índice de filtros del archivo (datos.py)
+        if edades is not None:
+            age_min, age_max = (int(v) for v in edades)
             edad_sel = st.slider("Edad", min_value=age_min, max_value=age_max, value=(max(17, age_min), age_max))
         else:
             edad_sel = None
             st.caption("No se pudo derivar 'Edad' desde Birthdate.")
 
     # Subset por grupo y filtros
-    df_view = df_f[df_f["Grupo"] == grupo_sel].copy()
+    filtro = filtros.filtrar(df_f).igual("Grupo", grupo_sel)
     if edad_sel:
-        df_view = df_view[df_view["Age"].between(edad_sel[0], edad_sel[1])]
-
-    # Deduplicar por jugador dentro del grupo (Minutes -> MPM -> fallback)
-    df_view = _dedupe_by_player_within_group(df_view, MPM_COL, minutes_fallback="Minutes")
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
+    df_view = filtro.aplicar()
 
     if df_view.empty:
         st.info("No hay jugadores tras aplicar los filtros seleccionados."); st.stop()
@@ -2256,14 +1364,15 @@ elif seleccion == "Estadísticas Físicas":
     # =========================
     # SCATTERPLOT
     # =========================
-    if modo == "Scatterplot":
+    @st.fragment
+    def vista_scatter(df_view):
         st.markdown("#### Variables del gráfico (elige X e Y)")
 
         exclude_exact = {"Player","Short Name","Player ID","Birthdate","Position","Position Group","Grupo","Age","Minutes"}
         exclude_contains = {"Count Performances"}
         num_cols = _numeric_cols(df_view, exclude_cols=exclude_exact, exclude_contains=exclude_contains)
         if not num_cols:
-            st.warning("No se encontraron métricas físicas numéricas válidas para graficar."); st.stop()
+            st.warning("No se encontraron métricas físicas numéricas válidas para graficar."); return
 
         def _first_present(cands, pool):
             for c in cands:
@@ -2293,12 +1402,12 @@ elif seleccion == "Estadísticas Físicas":
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         hi_sel = st.multiselect("Resalta jugadores", jugadores, default=[])
 
-        d = df_view.copy()
-        d["is_highlight"] = d["Player"].isin(hi_sel)
+        # Solo las columnas que usa el gráfico viajan al navegador
+        d = dispersion.datos_scatter(df_view, [x_var, y_var, SIZE_COL, "Player", "Position", "Grupo"], "Player", hi_sel)
 
         sel = alt.selection_point(fields=["Player"], on="click", toggle=True, clear="dblclick", empty="none")
 
-        base = alt.Chart(d).encode(
+        base = alt.Chart().encode(
             x=alt.X(x_var, title=x_var, axis=alt.Axis(format="~s"), scale=x_scale),
             y=alt.Y(y_var, title=y_var, axis=alt.Axis(format="~s"), scale=y_scale),
             tooltip=[
@@ -2324,7 +1433,7 @@ elif seleccion == "Estadísticas Físicas":
         vline  = alt.Chart(pd.DataFrame({"v":[x_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(x="v:Q")
         hline  = alt.Chart(pd.DataFrame({"h":[y_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(y="h:Q")
 
-        chart = (pts_base + pts_sel + pts_list + labels_sel + labels_list + vline + hline).properties(
+        chart = alt.layer(pts_base, pts_sel, pts_list, labels_sel, labels_list, vline, hline, data=d).properties(
             height=560, background="transparent",
             padding={"left": 10, "right": 160, "top": 40, "bottom": 30}
         ).configure_view(strokeWidth=0).configure_axis(
@@ -2336,7 +1445,8 @@ elif seleccion == "Estadísticas Físicas":
     # =========================
     # Radares FÍSICOS + KDE
     # =========================
-    else:
+    @st.fragment
+    def vista_radar(df_view):
         st.markdown("#### Radares Físicos")
 
         fases_fisicas = {
@@ -2359,13 +1469,15 @@ elif seleccion == "Estadísticas Físicas":
 
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         if not jugadores:
-            st.warning("No hay jugadores tras aplicar filtros."); st.stop()
+            st.warning("No hay jugadores tras aplicar filtros."); return
         jugador_sel = st.selectbox("Jugador", jugadores, index=0)
 
         # Radar centrado
         left, mid, right = st.columns([0.05, 0.90, 0.05])
         with mid:
-            fig = radar_barras_plotly_player(
+            # Figura cacheada por subconjunto, jugador, fases e invertidas (figuras.py)
+            fig = figuras.radar(
+                radar_barras_plotly_player,
                 jugador=jugador_sel,
                 df=df_view,
                 fases_juego=fases_fisicas,
@@ -2379,7 +1491,7 @@ elif seleccion == "Estadísticas Físicas":
 
         # KDE por métrica (3 por fila), con inversión de eje para métricas inversas
         st.markdown("#### Distribuciones por métrica")
-        charts = build_kde_charts(
+        grilla = build_kde_grid(
             df=df_view,
             jugador=jugador_sel,
             fases_juego=fases_fisicas,
@@ -2387,16 +1499,14 @@ elif seleccion == "Estadísticas Físicas":
             invertir_vars_kde=invertir_vars,
             height_each=120
         )
-        if charts:
-            for i in range(0, len(charts), 3):
-                cols = st.columns(3, gap="large")
-                for j in range(3):
-                    if i + j < len(charts):
-                        with cols[j]:
-                            st.altair_chart(charts[i + j], use_container_width=True, theme=None)
-
-
+        if grilla is not None:
+            st.altair_chart(grilla, use_container_width=False, theme=None)
 
+    # Vista elegida como fragmento: sus widgets no vuelven a cargar ni deduplicar
+    if modo == "Scatterplot":
+        vista_scatter(df_view)
+    else:
+        vista_radar(df_view)
 
 
 
@@ -2425,63 +1535,8 @@ elif seleccion == "Juego Bajo Presión":
     # Helpers
     # =========================
     def _load_presion(path: str) -> pd.DataFrame:
-        # Intentar ';' y fallback a ','
-        try:
-            df = pd.read_csv(path, sep=";")
-            if df.shape[1] == 1:
-                df = pd.read_csv(path)  # fallback coma
-        except Exception:
-            df = pd.read_csv(path)
-
-        # Cast a numérico lo que no sea texto/ID
-        non_numeric = {"Player","Short name","Player ID","Birthdate","Position","third","channel"}
-        for c in df.columns:
-            if c not in non_numeric:
-                df[c] = pd.to_numeric(df[c], errors="coerce")
-        if "Player" in df.columns:
-            df["Player"] = df["Player"].astype(str).str.strip()
-        return df
-
-    def _minutes_for_score_original(df: pd.DataFrame) -> pd.Series:
-        """
-        Construye un score de 'minutos por partido' usando SOLO nombres ORIGINALES,
-        para deduplicar ANTES de renombrar/descartar columnas.
-        Orden de prioridad:
-        1) Minutes played per match
-        2) Adjusted min TIP per match
-        3) Count Pressures received in sample (proxy)
-        """
-        cands = [
-            "Minutes played per match",
-            "Adjusted min TIP per match",
-            "Count Pressures received in sample"
-        ]
-        base = pd.Series(-1e12, index=df.index, dtype=float)
-        for c in cands:
-            if c in df.columns:
-                s = pd.to_numeric(df[c], errors="coerce")
-                base = pd.Series(np.where(base < 0, s, base), index=df.index)
-        return base
-
-    def _map_grupo(pos_code: str) -> str:
-        if not isinstance(pos_code, str): return "Otros"
-        p = pos_code.upper().strip()
-        if p in {"CB","LCB","RCB"}: return "Centrales"
-        if p in {"LB","LWB","RB","RWB"}: return "Carrileros/Laterales"
-        if p in {"DM","CDM","LDM","RDM"}: return "Contenciones"
-        if p in {"CM","LCM","RCM","CMF","LM","RM"}: return "Interiores"
-        if p in {"AM","CAM"}: return "Volantes Ofensivos"
-        if p in {"LW","RW"}: return "Extremos"
-        if p in {"CF","ST","LF","RF","SS","FW","FWD"}: return "Delanteros"
-        if p in {"GK","GKP","GOALKEEPER"}: return "Porteros"
-        return "Otros"
-
-    def _compute_age_col(df: pd.DataFrame) -> pd.Series:
-        if "Birthdate" not in df.columns:
-            return pd.Series([np.nan]*len(df), index=df.index)
-        bd = pd.to_datetime(df["Birthdate"], errors="coerce", utc=True)
-        today = pd.Timestamp("today", tz="UTC")
-        return (today - bd).dt.days / 365.25
+        # Formato y tipos (métricas float32, third/channel categóricas) resueltos en datos.py
+        return cargar_csv(path, familia="presion")
 
     def _domain_with_pad(series: pd.Series, pad_ratio=0.08):
         s = pd.to_numeric(series, errors="coerce").dropna()
@@ -2493,21 +1548,6 @@ elif seleccion == "Juego Bajo Presión":
         span = (mx - mn) * pad_ratio
         return [mn - span, mx + span]
 
-    def _normalize_metrics(df, metrics, invert=None):
-        invert = set(invert or [])
-        out = df.copy()
-        for m in metrics:
-            if m not in out.columns: continue
-            s = pd.to_numeric(out[m], errors="coerce")
-            mn, mx = s.min(), s.max()
-            if pd.isna(mn) or pd.isna(mx) or mx == mn:
-                out[m] = 0.5
-            else:
-                z = (s - mn) / (mx - mn)
-                out[m] = (1 - z) if m in invert else z
-                out[m] = out[m].fillna(0.5)
-        return out
-
     # ----- Radar (idéntico estilo al de Físicos) -----
     def radar_barras_plotly_player(
         jugador, df, fases_juego, id_col="Player",
@@ -2526,9 +1566,7 @@ elif seleccion == "Juego Bajo Presión":
             fase_idx.extend([i]*len(prs))
         if not atributos: return None
 
-        df_norm = _normalize_metrics(df, atributos, invert=invertir)
-        row = df_norm.loc[df_norm[id_col] == jugador].iloc[0]
-        r_vals = [float(row[a])*100 for a in atributos]
+        r_vals = normalizacion.percentiles_jugador(df, df[id_col] == jugador, atributos, invertir)
 
         n = len(atributos)
         thetas = np.linspace(0, 360, n, endpoint=False)
@@ -2581,103 +1619,31 @@ elif seleccion == "Juego Bajo Presión":
         return fig
 
     # ----- KDE (mismo estilo que Físicos) -----
-    def _kde_chart_altair(df, metric, jugador_val, invert=False, fill_color=ORANGE, height=120):
-        serie = (
-            pd.to_numeric(df[metric], errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-            .astype(float)
-        )
-        if serie.empty or pd.isna(jugador_val): return None
-
-        mn, mx = float(serie.min()), float(serie.max())
-        if mn == mx:
-            pad = max(abs(mn), 1.0) * 0.10; mn, mx = mn - pad, mx + pad
-        else:
-            pad = (mx - mn) * 0.10; mn, mx = mn - pad, mx + pad
-
-        data_num = pd.DataFrame({"value": serie})
-        base = alt.Chart(data_num).transform_density("value", as_=["x","density"], extent=[mn, mx], steps=200)
-
-        area = base.transform_filter(alt.datum.x <= float(jugador_val)).mark_area(opacity=0.28, color=fill_color)\
-            .encode(x=alt.X("x:Q", title=None, scale=alt.Scale(reverse=bool(invert))),
-                    y=alt.Y("density:Q", title=None))
-        line = base.mark_line(color=LINE_BLACK, size=1.2)\
-            .encode(x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))), y="density:Q")
-        rule = alt.Chart(pd.DataFrame({"x":[float(jugador_val)]})).mark_rule(color=LINE_BLACK, strokeWidth=2)\
-            .encode(x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))),
-                    tooltip=[alt.Tooltip("x:Q", title="Valor", format=".3f")])
-
-        chart = (area + line + rule).properties(height=height, title=alt.TitleParams(metric, fontSize=12, anchor="middle", color="#1F2937"))\
-            .configure_axis(grid=False, domain=True, domainColor="#E6E6E6", labelColor=AXIS_COL)\
-            .configure_view(strokeWidth=0)\
-            .configure_title(font="Inter", color="#111111", anchor="middle")
-        return chart
-
-    def build_kde_charts(df, jugador, fases_juego, id_col="Player", invertir_vars_kde=None, height_each=120):
-        invertir_vars_kde = set(invertir_vars_kde or [])
-        charts = []
+    def build_kde_grid(df, jugador, fases_juego, id_col="Player", invertir_vars_kde=None, height_each=120):
+        """Una sola grilla Altair (3 por fila) con la distribución de cada métrica y el valor del jugador."""
         if id_col not in df.columns or jugador not in df[id_col].values:
-            return charts
+            return None
         row = df.loc[df[id_col] == jugador].iloc[0]
-        for _, vars_fase in fases_juego.items():
-            prs = [v for v in vars_fase if v in df.columns]
-            for m in prs:
-                val = pd.to_numeric(row.get(m, np.nan), errors="coerce")
-                ch = _kde_chart_altair(df, m, val, invert=(m in invertir_vars_kde), fill_color=ORANGE, height=height_each)
-                if ch is not None: charts.append(ch)
-        return charts
+        valores = {
+            m: pd.to_numeric(row.get(m, np.nan), errors="coerce")
+            for vars_fase in fases_juego.values() for m in vars_fase if m in df.columns
+        }
+        return densidades.grilla_altair(
+            df, valores, invertir=invertir_vars_kde, alto=height_each,
+            relleno=ORANGE, linea=LINE_BLACK, opacidad=0.28, grosor=1.2
+        )
 
     # =========================
     # Sidebar (Liga / Temporada)
     # =========================
 
-# =========================
-    # Catálogo ligas/temporadas (físico)
-    # =========================
-    ligas_temporadas_presion = {
-        "Liga MX": ["2024/2025"],  # agrega más aquí
-        "Liga Profesional, Argentina": ["2024"],  # agrega más aquí
-        "Jupiler Pro League, Bélgica": ["2024/2025"],  # agrega más aquí
-        "Serie A, Brasil": ["2024"],  # agrega más aquí
-        "Primera División, Chile": ["2024"],  # agrega más aquí
-        "Primera A, Colombia": ["2024"],  # agrega más aquí
-        "Liga Pro, Ecuador": ["2024"],  # agrega más aquí
-        "Premier League, Inglaterra": ["2024/2025"],  # agrega más aqui
-        "La Liga, España": ["2024/2025"],  # agrega más aquí
-        "Ligue 1, Francia": ["2024/2025"],  # agrega más aquí
-        "Bundesliga, Alemania": ["2024/2025"],  # agrega más aquí
-        "Serie A, Italia": ["2024/2025"],  # agrega más aquí
-        "Primeira Liga, Portugal": ["2024/2025"],  # agrega más aqu
-        "Primera División, Uruguay": ["2024"],  # agrega más aqu
-        "MLS, Estados Unidos": ["2024"],  # agrega más aquí
-
-
-    }
-    archivos_presion = {
-        ("Liga MX", "2024/2025"): "ligamxpresion.csv",
-        ("Liga Profesional, Argentina", "2024"): "argpresion.csv",
-        ("Jupiler Pro League, Bélgica", "2024/2025"): "belpresion.csv",
-        ("Serie A, Brasil", "2024"): "brapresion.csv",
-        ("Primera División, Chile", "2024"): "chipresion.csv",
-        ("Primera A, Colombia", "2024"): "colpresion.csv",
-        ("Liga Pro, Ecuador", "2024"): "ecupresion.csv",
-        ("Premier League, Inglaterra", "2024/2025"): "engpresion.csv",
-        ("La Liga, España", "2024/2025"): "esppresion.csv",
-        ("Ligue 1, Francia", "2024/2025"): "frapresion.csv",
-        ("Bundesliga, Alemania", "2024/2025"): "gerpresion.csv",
-        ("Serie A, Italia", "2024/2025"): "itapresion.csv",
-        ("Primeira Liga, Portugal", "2024/2025"): "porpresion.csv",
-        ("Primera División, Uruguay", "2024"): "urupresion.csv",
-        ("MLS, Estados Unidos", "2024"): "usapresion.csv",
-    }
-
     with st.sidebar:
         st.markdown("### Liga y Temporada")
-        liga = st.selectbox("Liga", list(ligas_temporadas_presion.keys()), index=0)
-        temporada = st.selectbox("Temporada", ligas_temporadas_presion[liga], index=0)
+        liga = st.selectbox("Liga", catalogo.ligas("presion"), index=0)
+        temporada = st.selectbox("Temporada", catalogo.temporadas("presion", liga), index=0)
 
-        path = archivos_presion.get((liga, temporada))
+        path = catalogo.archivo("presion", liga, temporada)
+        precalentar.anotar_uso("presion", liga)
         if not path:
             st.error("No hay archivo configurado para esa liga/temporada."); st.stop()
 
@@ -2685,14 +1651,10 @@ elif seleccion == "Juego Bajo Presión":
         # 1) Cargar (RAW)
         df_p_raw = _load_presion(path)
 
-        # 2) Asignar Grupo (antes de deduplicar)
-        df_p_raw["Grupo"] = df_p_raw["Position"].apply(_map_grupo)
+        # 2) Grupo viene asignado desde la ingesta (datos.py)
 
-        # 3) Deduplicar por (Jugador, Grupo) usando minutos del archivo ORIGINAL
-        d = df_p_raw.copy()
-        d["_score_min"] = _minutes_for_score_original(d)
-        idx = d.groupby(["Player","Grupo"], dropna=False)["_score_min"].idxmax()
-        df_p = d.loc[idx].drop(columns=["_score_min"])
+        # 3) Una fila por (Jugador, Grupo): elegida en la ingesta por minutos (datos.py)
+        df_p = filas_unicas(df_p_raw)
 
         # 4) Crear columna interna de tamaño (_MinutesSize) ANTES de renombrar y dropear
         size_cands = ["Minutes played per match", "Adjusted min TIP per match", "Count Pressures received in sample"]
@@ -2745,9 +1707,6 @@ elif seleccion == "Juego Bajo Presión":
         drop_cols = [c for c in df_p.columns if c in NEVER_OFFER_ORIGINAL or c in NEVER_OFFER_SPANISH]
         df_p = df_p.drop(columns=drop_cols, errors="ignore")
 
-        # 7) Edad
-        df_p["Age"] = _compute_age_col(df_p)
-
         st.markdown("### Vista")
         modo = st.radio("Selecciona", ["Scatterplot", "Radares Presión"], index=0, horizontal=False)
 
@@ -2756,28 +1715,31 @@ elif seleccion == "Juego Bajo Presión":
         grupo_sel = st.radio("Grupo", grupos_ok, index=0)
 
         st.markdown("### Filtros")
-        if df_p["Age"].notna().any():
-            age_min = int(np.nanmin(df_p["Age"])); age_max = int(np.nanmax(df_p["Age"]))
+        edades = resumen_filtros(path, "presion").edad   # índice de filtros del archivo (datos.py)
+        if edades is not None:
+            age_min, age_max = (int(v) for v in edades)
             edad_sel = st.slider("Edad", min_value=age_min, max_value=age_max, value=(max(17, age_min), age_max))
         else:
             edad_sel = None
             st.caption("No se pudo derivar 'Edad' desde Birthdate.")
 
     # -------- Subset + filtros (ahora con dedupe por grupo) --------
-    df_view = df_p[df_p["Grupo"] == grupo_sel].copy()
+    filtro = filtros.filtrar(df_p).igual("Grupo", grupo_sel)
     if edad_sel:
-        df_view = df_view[df_view["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
+    df_view = filtro.aplicar()
     if df_view.empty:
         st.info("No hay jugadores tras aplicar los filtros seleccionados."); st.stop()
 
     # ========================= Scatter =========================
-    if modo == "Scatterplot":
+    @st.fragment
+    def vista_scatter(df_view):
         st.markdown("#### Variables del gráfico (elige X e Y)")
 
         exclude_exact = {"Player","Short name","Player ID","Birthdate","Position","Grupo","third","channel","Age","_MinutesSize"}
         num_cols = [c for c in df_view.columns if c not in exclude_exact and not c.startswith("_") and pd.api.types.is_numeric_dtype(df_view[c])]
         if not num_cols:
-            st.warning("No se encontraron métricas numéricas válidas para graficar."); st.stop()
+            st.warning("No se encontraron métricas numéricas válidas para graficar."); return
 
         SIZE_COL = "_MinutesSize" if "_MinutesSize" in df_view.columns and pd.api.types.is_numeric_dtype(df_view["_MinutesSize"]) else None
 
@@ -2802,11 +1764,12 @@ elif seleccion == "Juego Bajo Presión":
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         hi_sel = st.multiselect("Resalta jugadores", jugadores, default=[])
 
-        d = df_view.copy(); d["is_highlight"] = d["Player"].isin(hi_sel)
+        # Solo las columnas que usa el gráfico viajan al navegador
+        d = dispersion.datos_scatter(df_view, [x_var, y_var, SIZE_COL, "Player", "Position", "Grupo"], "Player", hi_sel)
 
         sel = alt.selection_point(fields=["Player"], on="click", toggle=True, clear="dblclick", empty="none")
 
-        base = alt.Chart(d).encode(
+        base = alt.Chart().encode(
             x=alt.X(x_var, title=x_var, axis=alt.Axis(format="~s"), scale=x_scale),
             y=alt.Y(y_var, title=y_var, axis=alt.Axis(format="~s"), scale=y_scale),
             tooltip=[
@@ -2831,7 +1794,7 @@ elif seleccion == "Juego Bajo Presión":
         vline  = alt.Chart(pd.DataFrame({"v":[x_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(x="v:Q")
         hline  = alt.Chart(pd.DataFrame({"h":[y_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(y="h:Q")
 
-        chart = (pts_base + pts_sel + pts_list + labels_sel + labels_list + vline + hline).properties(
+        chart = alt.layer(pts_base, pts_sel, pts_list, labels_sel, labels_list, vline, hline, data=d).properties(
             height=560, background="transparent",
             padding={"left": 10, "right": 160, "top": 40, "bottom": 30}
         ).configure_view(strokeWidth=0).configure_axis(
@@ -2840,7 +1803,8 @@ elif seleccion == "Juego Bajo Presión":
         st.altair_chart(chart, use_container_width=True, theme=None)
 
     # ========================= Radar + KDE =========================
-    else:
+    @st.fragment
+    def vista_radar(df_view):
         st.markdown("#### Radares de Presión")
 
         fases_presion = {
@@ -2867,12 +1831,14 @@ elif seleccion == "Juego Bajo Presión":
 
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         if not jugadores:
-            st.warning("No hay jugadores tras aplicar filtros."); st.stop()
+            st.warning("No hay jugadores tras aplicar filtros."); return
         jugador_sel = st.selectbox("Jugador", jugadores, index=0)
 
         left, mid, right = st.columns([0.05, 0.90, 0.05])
         with mid:
-            fig = radar_barras_plotly_player(
+            # Figura cacheada por subconjunto, jugador, fases e invertidas (figuras.py)
+            fig = figuras.radar(
+                radar_barras_plotly_player,
                 jugador=jugador_sel,
                 df=df_view,
                 fases_juego=fases_presion,
@@ -2885,7 +1851,7 @@ elif seleccion == "Juego Bajo Presión":
                 st.plotly_chart(fig, use_container_width=True, theme=None)
 
         st.markdown("#### Distribuciones por métrica")
-        charts = build_kde_charts(
+        grilla = build_kde_grid(
             df=df_view,
             jugador=jugador_sel,
             fases_juego=fases_presion,
@@ -2893,13 +1859,15 @@ elif seleccion == "Juego Bajo Presión":
             invertir_vars_kde=invertir_vars,
             height_each=120
         )
-        if charts:
-            for i in range(0, len(charts), 3):
-                cols = st.columns(3, gap="large")
-                for j in range(3):
-                    if i + j < len(charts):
-                        with cols[j]:
-                            st.altair_chart(charts[i + j], use_container_width=True, theme=None)
+        if grilla is not None:
+            st.altair_chart(grilla, use_container_width=False, theme=None)
+
+    # Vista elegida como fragmento: sus widgets no vuelven a cargar ni deduplicar
+    if modo == "Scatterplot":
+        vista_scatter(df_view)
+    else:
+        vista_radar(df_view)
+
 
 
 
@@ -2925,62 +1893,8 @@ elif seleccion == "Pases al Espacio":
     # Helpers
     # =========================
     def _load_espacio(path: str) -> pd.DataFrame:
-        """Lee CSV delimitado por ';' y convierte columnas numéricas."""
-        # Intentar ';' y fallback a ','
-        try:
-            df = pd.read_csv(path, sep=";")
-            if df.shape[1] == 1:
-                df = pd.read_csv(path)  # fallback coma
-        except Exception:
-            df = pd.read_csv(path)
-
-        non_numeric = {"Player","Short name","Player ID","Birthdate","Position","third","channel"}
-        for c in df.columns:
-            if c not in non_numeric:
-                df[c] = pd.to_numeric(df[c], errors="coerce")
-        if "Player" in df.columns:
-            df["Player"] = df["Player"].astype(str).str.strip()
-        return df
-
-    def _minutes_for_score_original(df: pd.DataFrame) -> pd.Series:
-        """
-        Score para deduplicar por (Jugador, Grupo) usando SOLO nombres ORIGINALES.
-        Prioridad:
-        1) Minutes played per match
-        2) Adjusted min TIP per match
-        3) Count opportunities to pass to Runs in sample (proxy)
-        """
-        cands = [
-            "Minutes played per match",
-            "Adjusted min TIP per match",
-            "Count opportunities to pass to Runs in sample"
-        ]
-        base = pd.Series(-1e12, index=df.index, dtype=float)
-        for c in cands:
-            if c in df.columns:
-                s = pd.to_numeric(df[c], errors="coerce")
-                base = np.where(base < 0, s, base)
-        return pd.to_numeric(base, errors="coerce")
-
-    def _map_grupo(pos_code: str) -> str:
-        if not isinstance(pos_code, str): return "Otros"
-        p = pos_code.upper().strip()
-        if p in {"CB","LCB","RCB"}: return "Centrales"
-        if p in {"LB","LWB","RB","RWB"}: return "Carrileros/Laterales"
-        if p in {"DM","CDM","LDM","RDM"}: return "Contenciones"
-        if p in {"CM","LCM","RCM","CMF","LM","RM"}: return "Interiores"
-        if p in {"AM","CAM"}: return "Volantes Ofensivos"
-        if p in {"LW","RW"}: return "Extremos"
-        if p in {"CF","ST","LF","RF","SS","FW","FWD"}: return "Delanteros"
-        if p in {"GK","GKP","GOALKEEPER"}: return "Porteros"
-        return "Otros"
-
-    def _compute_age_col(df: pd.DataFrame) -> pd.Series:
-        if "Birthdate" not in df.columns:
-            return pd.Series([np.nan]*len(df), index=df.index)
-        bd = pd.to_datetime(df["Birthdate"], errors="coerce", utc=True)
-        today = pd.Timestamp("today", tz="UTC")
-        return (today - bd).dt.days / 365.25
+        """Lee el CSV ya tipado (esquema "espacio" de datos.py: métricas float32)."""
+        return cargar_csv(path, familia="espacio")
 
     def _domain_with_pad(series: pd.Series, pad_ratio=0.08):
         s = pd.to_numeric(series, errors="coerce").dropna()
@@ -2992,21 +1906,6 @@ elif seleccion == "Pases al Espacio":
         span = (mx - mn) * pad_ratio
         return [mn - span, mx + span]
 
-    def _normalize_metrics(df, metrics, invert=None):
-        invert = set(invert or [])
-        out = df.copy()
-        for m in metrics:
-            if m not in out.columns: continue
-            s = pd.to_numeric(out[m], errors="coerce")
-            mn, mx = s.min(), s.max()
-            if pd.isna(mn) or pd.isna(mx) or mx == mn:
-                out[m] = 0.5
-            else:
-                z = (s - mn) / (mx - mn)
-                out[m] = (1 - z) if m in invert else z
-                out[m] = out[m].fillna(0.5)
-        return out
-
     # ----- Radar (igual estilo al de otras secciones) -----
     def radar_barras_plotly_player(
         jugador, df, fases_juego, id_col="Player",
@@ -3026,9 +1925,7 @@ elif seleccion == "Pases al Espacio":
         if not atributos:
             return None
 
-        df_norm = _normalize_metrics(df, atributos, invert=invertir)
-        row = df_norm.loc[df_norm[id_col] == jugador].iloc[0]
-        r_vals = [float(row[a])*100 for a in atributos]
+        r_vals = normalizacion.percentiles_jugador(df, df[id_col] == jugador, atributos, invertir)
 
         n = len(atributos)
         thetas = np.linspace(0, 360, n, endpoint=False)
@@ -3080,110 +1977,31 @@ elif seleccion == "Pases al Espacio":
         )
         return fig
 
-    # ----- KDE -----
-    def _kde_chart_altair(df, metric, jugador_val, invert=False, fill_color=ORANGE, height=120):
-        serie = (
-            pd.to_numeric(df[metric], errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-            .astype(float)
-        )
-        if serie.empty or pd.isna(jugador_val):
-            return None
-
-        mn, mx = float(serie.min()), float(serie.max())
-        if mn == mx:
-            pad = max(abs(mn), 1.0) * 0.10; mn, mx = mn - pad, mx + pad
-        else:
-            pad = (mx - mn) * 0.10; mn, mx = mn - pad, mx + pad
-
-        data_num = pd.DataFrame({"value": serie})
-        base = alt.Chart(data_num).transform_density("value", as_=["x","density"], extent=[mn, mx], steps=200)
-
-        area = base.transform_filter(alt.datum.x <= float(jugador_val)).mark_area(opacity=0.28, color=fill_color)\
-            .encode(x=alt.X("x:Q", title=None, scale=alt.Scale(reverse=bool(invert))),
-                    y=alt.Y("density:Q", title=None))
-        line = base.mark_line(color=LINE_BLACK, size=1.2)\
-            .encode(x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))), y="density:Q")
-        rule = alt.Chart(pd.DataFrame({"x":[float(jugador_val)]})).mark_rule(color=LINE_BLACK, strokeWidth=2)\
-            .encode(x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))),
-                    tooltip=[alt.Tooltip("x:Q", title="Valor", format=".3f")])
-
-        chart = (area + line + rule).properties(
-            height=height,
-            title=alt.TitleParams(metric, fontSize=12, anchor="middle", color="#1F2937")
-        ).configure_axis(
-            grid=False, domain=True, domainColor="#E6E6E6", labelColor=AXIS_COL
-        ).configure_view(
-            strokeWidth=0
-        ).configure_title(
-            font="Inter", color="#111111", anchor="middle"
-        )
-        return chart
-
-    def build_kde_charts(df, jugador, fases_juego, id_col="Player", invertir_vars_kde=None, height_each=120):
-        invertir_vars_kde = set(invertir_vars_kde or [])
-        charts = []
+    # ----- KDE (una sola grilla; curvas en densidades.py) -----
+    def build_kde_grid(df, jugador, fases_juego, id_col="Player", invertir_vars_kde=None, height_each=120):
+        """Una sola grilla Altair (3 por fila) con la distribución de cada métrica y el valor del jugador."""
         if id_col not in df.columns or jugador not in df[id_col].values:
-            return charts
+            return None
         row = df.loc[df[id_col] == jugador].iloc[0]
-        for _, vars_fase in fases_juego.items():
-            prs = [v for v in vars_fase if v in df.columns]
-            for m in prs:
-                val = pd.to_numeric(row.get(m, np.nan), errors="coerce")
-                ch = _kde_chart_altair(df, m, val, invert=(m in invertir_vars_kde), fill_color=ORANGE, height=height_each)
-                if ch is not None:
-                    charts.append(ch)
-        return charts
+        valores = {
+            m: pd.to_numeric(row.get(m, np.nan), errors="coerce")
+            for vars_fase in fases_juego.values() for m in vars_fase if m in df.columns
+        }
+        return densidades.grilla_altair(
+            df, valores, invertir=invertir_vars_kde, alto=height_each,
+            relleno=ORANGE, linea=LINE_BLACK, opacidad=0.28, grosor=1.2
+        )
 
     # =========================
     # Sidebar (Liga / Temporada)
     # =========================
-
-    
-    ligas_temporadas_espacio = {
-        "Liga MX": ["2024/2025"],  # agrega más aquí
-        "Liga Profesional, Argentina": ["2024"],  # agrega más aquí
-        "Jupiler Pro League, Bélgica": ["2024/2025"],  # agrega más aquí
-        "Serie A, Brasil": ["2024"],  # agrega más aquí
-        "Primera División, Chile": ["2024"],  # agrega más aquí
-        "Primera A, Colombia": ["2024"],  # agrega más aquí
-        "Liga Pro, Ecuador": ["2024"],  # agrega más aquí
-        "Premier League, Inglaterra": ["2024/2025"],  # agrega más aqui
-        "La Liga, España": ["2024/2025"],  # agrega más aquí
-        "Ligue 1, Francia": ["2024/2025"],  # agrega más aquí
-        "Bundesliga, Alemania": ["2024/2025"],  # agrega más aquí
-        "Serie A, Italia": ["2024/2025"],  # agrega más aquí
-        "Primeira Liga, Portugal": ["2024/2025"],  # agrega más aqu
-        "Primera División, Uruguay": ["2024"],  # agrega más aqu
-        "MLS, Estados Unidos": ["2024"],  # agrega más aquí
-
-
-    }
-    archivos_espacio = {
-        ("Liga MX", "2024/2025"): "ligamxespacio.csv",
-        ("Liga Profesional, Argentina", "2024"): "argespacio.csv",
-        ("Jupiler Pro League, Bélgica", "2024/2025"): "belespacio.csv",
-        ("Serie A, Brasil", "2024"): "braespacio.csv",
-        ("Primera División, Chile", "2024"): "chiespacio.csv",
-        ("Primera A, Colombia", "2024"): "colespacio.csv",
-        ("Liga Pro, Ecuador", "2024"): "ecuespacio.csv",
-        ("Premier League, Inglaterra", "2024/2025"): "engespacio.csv",
-        ("La Liga, España", "2024/2025"): "espespacio.csv",
-        ("Ligue 1, Francia", "2024/2025"): "fraespacio.csv",
-        ("Bundesliga, Alemania", "2024/2025"): "gerespacio.csv",
-        ("Serie A, Italia", "2024/2025"): "itaespacio.csv",
-        ("Primeira Liga, Portugal", "2024/2025"): "porespacio.csv",
-        ("Primera División, Uruguay", "2024"): "uruespacio.csv",
-        ("MLS, Estados Unidos", "2024"): "usaespacio.csv",
-    }
-
     with st.sidebar:
         st.markdown("### Liga y Temporada")
-        liga = st.selectbox("Liga", list(ligas_temporadas_espacio.keys()), index=0)
-        temporada = st.selectbox("Temporada", ligas_temporadas_espacio[liga], index=0)
+        liga = st.selectbox("Liga", catalogo.ligas("espacio"), index=0)
+        temporada = st.selectbox("Temporada", catalogo.temporadas("espacio", liga), index=0)
 
-        path = archivos_espacio.get((liga, temporada))
+        path = catalogo.archivo("espacio", liga, temporada)
+        precalentar.anotar_uso("espacio", liga)
         if not path:
             st.error("No hay archivo configurado para esa liga/temporada."); st.stop()
 
@@ -3191,14 +2009,9 @@ elif seleccion == "Pases al Espacio":
         df_e_raw = _load_espacio(path)
 
         # 2) Grupo, Edad
-        df_e_raw["Grupo"] = df_e_raw["Position"].apply(_map_grupo)
-        df_e_raw["Age"] = _compute_age_col(df_e_raw)
 
-        # 3) Deduplicar por (Jugador, Grupo) usando minutos/partido del archivo ORIGINAL
-        d = df_e_raw.copy()
-        d["_score_min"] = _minutes_for_score_original(d)
-        idx = d.groupby(["Player","Grupo"], dropna=False)["_score_min"].idxmax()
-        df_e = d.loc[idx].drop(columns=["_score_min"])
+        # 3) Una fila por (Jugador, Grupo): elegida en la ingesta por minutos (datos.py)
+        df_e = filas_unicas(df_e_raw)
 
         # 4) _MinutesSize para tamaño de puntos (antes de renombrar/dropear)
         size_cands = [
@@ -3268,28 +2081,31 @@ elif seleccion == "Pases al Espacio":
         grupo_sel = st.radio("Grupo", grupos_ok, index=0)
 
         st.markdown("### Filtros")
-        if df_e["Age"].notna().any():
-            age_min = int(np.nanmin(df_e["Age"])); age_max = int(np.nanmax(df_e["Age"]))
+        edades = resumen_filtros(path, "espacio").edad   # índice de filtros del archivo (datos.py)
+        if edades is not None:
+            age_min, age_max = (int(v) for v in edades)
             edad_sel = st.slider("Edad", min_value=age_min, max_value=age_max, value=(max(17, age_min), age_max))
         else:
             edad_sel = None
             st.caption("No se pudo derivar 'Edad' desde Birthdate.")
 
     # -------- Subset + filtros --------
-    df_view = df_e[df_e["Grupo"] == grupo_sel].copy()
+    filtro = filtros.filtrar(df_e).igual("Grupo", grupo_sel)
     if edad_sel:
-        df_view = df_view[df_view["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
+    df_view = filtro.aplicar()
     if df_view.empty:
         st.info("No hay jugadores tras aplicar los filtros seleccionados."); st.stop()
 
     # ========================= Scatter =========================
-    if modo == "Scatterplot":
+    @st.fragment
+    def vista_scatter(df_view):
         st.markdown("#### Variables del gráfico (elige X e Y)")
 
         exclude_exact = {"Player","Short name","Player ID","Birthdate","Position","Grupo","third","channel","Age","_MinutesSize"}
         num_cols = [c for c in df_view.columns if c not in exclude_exact and not c.startswith("_") and pd.api.types.is_numeric_dtype(df_view[c])]
         if not num_cols:
-            st.warning("No se encontraron métricas válidas para graficar."); st.stop()
+            st.warning("No se encontraron métricas válidas para graficar."); return
 
         # Defaults simples
         def _first_present(cands, pool):
@@ -3315,11 +2131,12 @@ elif seleccion == "Pases al Espacio":
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         hi_sel = st.multiselect("Resalta jugadores", jugadores, default=[])
 
-        d = df_view.copy(); d["is_highlight"] = d["Player"].isin(hi_sel)
+        # Solo las columnas que usa el gráfico viajan al navegador
+        d = dispersion.datos_scatter(df_view, [x_var, y_var, SIZE_COL, "Player", "Position", "Grupo"], "Player", hi_sel)
 
         sel = alt.selection_point(fields=["Player"], on="click", toggle=True, clear="dblclick", empty="none")
 
-        base = alt.Chart(d).encode(
+        base = alt.Chart().encode(
             x=alt.X(x_var, title=x_var, axis=alt.Axis(format="~s"), scale=x_scale),
             y=alt.Y(y_var, title=y_var, axis=alt.Axis(format="~s"), scale=y_scale),
             tooltip=[
@@ -3344,7 +2161,7 @@ elif seleccion == "Pases al Espacio":
         vline  = alt.Chart(pd.DataFrame({"v":[x_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(x="v:Q")
         hline  = alt.Chart(pd.DataFrame({"h":[y_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(y="h:Q")
 
-        chart = (pts_base + pts_sel + pts_list + labels_sel + labels_list + vline + hline).properties(
+        chart = alt.layer(pts_base, pts_sel, pts_list, labels_sel, labels_list, vline, hline, data=d).properties(
             height=560, background="transparent",
             padding={"left": 10, "right": 160, "top": 40, "bottom": 30}
         ).configure_view(
@@ -3357,7 +2174,8 @@ elif seleccion == "Pases al Espacio":
         st.altair_chart(chart, use_container_width=True, theme=None)
 
     # ========================= Radar + KDE =========================
-    else:
+    @st.fragment
+    def vista_radar(df_view):
         st.markdown("#### Radares de Pases al Espacio")
 
         fases_espacio = {
@@ -3385,12 +2203,14 @@ elif seleccion == "Pases al Espacio":
 
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         if not jugadores:
-            st.warning("No hay jugadores tras aplicar filtros."); st.stop()
+            st.warning("No hay jugadores tras aplicar filtros."); return
         jugador_sel = st.selectbox("Jugador", jugadores, index=0)
 
         left, mid, right = st.columns([0.05, 0.90, 0.05])
         with mid:
-            fig = radar_barras_plotly_player(
+            # Figura cacheada por subconjunto, jugador, fases e invertidas (figuras.py)
+            fig = figuras.radar(
+                radar_barras_plotly_player,
                 jugador=jugador_sel,
                 df=df_view,
                 fases_juego=fases_espacio,
@@ -3403,7 +2223,7 @@ elif seleccion == "Pases al Espacio":
                 st.plotly_chart(fig, use_container_width=True, theme=None)
 
         st.markdown("#### Distribuciones por métrica")
-        charts = build_kde_charts(
+        grilla = build_kde_grid(
             df=df_view,
             jugador=jugador_sel,
             fases_juego=fases_espacio,
@@ -3411,14 +2231,14 @@ elif seleccion == "Pases al Espacio":
             invertir_vars_kde=invertir_vars,
             height_each=120
         )
-        if charts:
-            for i in range(0, len(charts), 3):
-                cols = st.columns(3, gap="large")
-                for j in range(3):
-                    if i + j < len(charts):
-                        with cols[j]:
-                            st.altair_chart(charts[i + j], use_container_width=True, theme=None)
+        if grilla is not None:
+            st.altair_chart(grilla, use_container_width=False, theme=None)
 
+    # Vista elegida como fragmento: sus widgets no vuelven a cargar ni deduplicar
+    if modo == "Scatterplot":
+        vista_scatter(df_view)
+    else:
+        vista_radar(df_view)
 
 
 
@@ -3447,80 +2267,18 @@ elif seleccion == "Movimientos sin Balón":
     # Helpers
     # =========================
     def _load_desmarque(path: str) -> pd.DataFrame:
-        """Lee CSV delimitado por ';' (fallback a ',') y castea números."""
-        try:
-            df = pd.read_csv(path, sep=";")
-            if df.shape[1] == 1:
-                df = pd.read_csv(path)
-        except Exception:
-            df = pd.read_csv(path)
-
-        non_numeric = {"Player","Short name","Player ID","Birthdate","Position","third","channel"}
-        for c in df.columns:
-            if c not in non_numeric:
-                df[c] = pd.to_numeric(df[c], errors="coerce")
-        if "Player" in df.columns:
-            df["Player"] = df["Player"].astype(str).str.strip()
-        return df
-
-    def _map_grupo(pos_code: str) -> str:
-        if not isinstance(pos_code, str): return "Otros"
-        p = pos_code.upper().strip()
-        if p in {"CB","LCB","RCB"}: return "Centrales"
-        if p in {"LB","LWB","RB","RWB"}: return "Carrileros/Laterales"
-        if p in {"DM","CDM","LDM","RDM"}: return "Contenciones"
-        if p in {"CM","LCM","RCM","CMF","LM","RM"}: return "Interiores"
-        if p in {"AM","CAM"}: return "Volantes Ofensivos"
-        if p in {"LW","RW"}: return "Extremos"
-        if p in {"CF","ST","LF","RF","SS","FW","FWD"}: return "Delanteros"
-        if p in {"GK","GKP","GOALKEEPER"}: return "Porteros"
-        return "Otros"
-
-    def _compute_age_col(df: pd.DataFrame) -> pd.Series:
-        if "Birthdate" not in df.columns:
-            return pd.Series([np.nan]*len(df), index=df.index)
-        bd = pd.to_datetime(df["Birthdate"], errors="coerce", utc=True)
-        today = pd.Timestamp("today", tz="UTC")
-        return (today - bd).dt.days / 365.25
+        """Lee el CSV ya tipado (esquema "desmarque" de datos.py: métricas float32)."""
+        return cargar_csv(path, familia="desmarque")
 
     def _domain_with_pad(series: pd.Series, pad_ratio=0.08):
         s = pd.to_numeric(series, errors="coerce").dropna()
         if s.empty: return None
-        mn, mx = float(s.min()), float(s.max())
-        if mn == mx:
-            pad = max(abs(mn), 1.0) * pad_ratio
-            return [mn - pad, mx + pad]
-        span = (mx - mn) * pad_ratio
-        return [mn - span, mx + span]
-
-    def _normalize_metrics(df, metrics, invert=None):
-        invert = set(invert or [])
-        out = df.copy()
-        for m in metrics:
-            if m not in out.columns: continue
-            s = pd.to_numeric(out[m], errors="coerce")
-            mn, mx = s.min(), s.max()
-            if pd.isna(mn) or pd.isna(mx) or mx == mn:
-                out[m] = 0.5
-            else:
-                z = (s - mn) / (mx - mn)
-                out[m] = (1 - z) if m in invert else z
-                out[m] = out[m].fillna(0.5)
-        return out
-
-    # Score para dedupe usando columnas del archivo ORIGINAL
-    def _minutes_score_original(df: pd.DataFrame) -> pd.Series:
-        cands = [
-            "Minutes",
-            "Minutes played per match",
-            "Adjusted min TIP per match",
-        ]
-        base = pd.Series(-1e12, index=df.index, dtype=float)
-        for c in cands:
-            if c in df.columns:
-                s = pd.to_numeric(df[c], errors="coerce")
-                base = pd.Series(np.where(base < 0, s, base), index=df.index)
-        return base
+        mn, mx = float(s.min()), float(s.max())
+        if mn == mx:
+            pad = max(abs(mn), 1.0) * pad_ratio
+            return [mn - pad, mx + pad]
+        span = (mx - mn) * pad_ratio
+        return [mn - span, mx + span]
 
     # ----- Radar -----
     def radar_barras_plotly_player(
@@ -3540,9 +2298,7 @@ elif seleccion == "Movimientos sin Balón":
             fase_idx.extend([i]*len(prs))
         if not atributos: return None
 
-        df_norm = _normalize_metrics(df, atributos, invert=invertir)
-        row = df_norm.loc[df_norm[id_col] == jugador].iloc[0]
-        r_vals = [float(row[a])*100 for a in atributos]
+        r_vals = normalizacion.percentiles_jugador(df, df[id_col] == jugador, atributos, invertir)
 
         n = len(atributos)
         thetas = np.linspace(0, 360, n, endpoint=False)
@@ -3594,100 +2350,32 @@ elif seleccion == "Movimientos sin Balón":
         )
         return fig
 
-    # ----- KDE -----
-    def _kde_chart_altair(df, metric, jugador_val, invert=False, fill_color=ORANGE, height=120):
-        serie = (
-            pd.to_numeric(df[metric], errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-            .astype(float)
-        )
-        if serie.empty or pd.isna(jugador_val): return None
-
-        mn, mx = float(serie.min()), float(serie.max())
-        if mn == mx:
-            pad = max(abs(mn), 1.0) * 0.10; mn, mx = mn - pad, mx + pad
-        else:
-            pad = (mx - mn) * 0.10; mn, mx = mn - pad, mx + pad
-
-        data_num = pd.DataFrame({"value": serie})
-        base = alt.Chart(data_num).transform_density("value", as_=["x","density"], extent=[mn, mx], steps=200)
-
-        area = base.transform_filter(alt.datum.x <= float(jugador_val)).mark_area(opacity=0.28, color=fill_color)\
-            .encode(x=alt.X("x:Q", title=None, scale=alt.Scale(reverse=bool(invert))),
-                    y=alt.Y("density:Q", title=None))
-        line = base.mark_line(color=LINE_BLACK, size=1.2)\
-            .encode(x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))), y="density:Q")
-        rule = alt.Chart(pd.DataFrame({"x":[float(jugador_val)]})).mark_rule(color=LINE_BLACK, strokeWidth=2)\
-            .encode(x=alt.X("x:Q", scale=alt.Scale(reverse=bool(invert))),
-                    tooltip=[alt.Tooltip("x:Q", title="Valor", format=".3f")])
-
-        chart = (area + line + rule).properties(height=height, title=alt.TitleParams(metric, fontSize=12, anchor="middle", color="#1F2937"))\
-            .configure_axis(grid=False, domain=True, domainColor="#E6E6E6", labelColor=AXIS_COL)\
-            .configure_view(strokeWidth=0)\
-            .configure_title(font="Inter", color="#111111", anchor="middle")
-        return chart
-
-    def build_kde_charts(df, jugador, fases_juego, id_col="Player", invertir_vars_kde=None, height_each=120):
-        invertir_vars_kde = set(invertir_vars_kde or [])
-        charts = []
+    # ----- KDE (una sola grilla; curvas en densidades.py) -----
+    def build_kde_grid(df, jugador, fases_juego, id_col="Player", invertir_vars_kde=None, height_each=120):
+        """Una sola grilla Altair (3 por fila) con la distribución de cada métrica y el valor del jugador."""
         if id_col not in df.columns or jugador not in df[id_col].values:
-            return charts
+            return None
         row = df.loc[df[id_col] == jugador].iloc[0]
-        for _, vars_fase in fases_juego.items():
-            prs = [v for v in vars_fase if v in df.columns]
-            for m in prs:
-                val = pd.to_numeric(row.get(m, np.nan), errors="coerce")
-                ch = _kde_chart_altair(df, m, val, invert=(m in invertir_vars_kde), fill_color=ORANGE, height=height_each)
-                if ch is not None: charts.append(ch)
-        return charts
+        valores = {
+            m: pd.to_numeric(row.get(m, np.nan), errors="coerce")
+            for vars_fase in fases_juego.values() for m in vars_fase if m in df.columns
+        }
+        return densidades.grilla_altair(
+            df, valores, invertir=invertir_vars_kde, alto=height_each,
+            relleno=ORANGE, linea=LINE_BLACK, opacidad=0.28, grosor=1.2
+        )
 
     # =========================
     # Sidebar (Liga / Temporada)
     # =========================
-    ligas_temporadas_desmarque = {
-        "Liga MX": ["2024/2025"],  # agrega más aquí
-        "Liga Profesional, Argentina": ["2024"],  # agrega más aquí
-        "Jupiler Pro League, Bélgica": ["2024/2025"],  # agrega más aquí
-        "Serie A, Brasil": ["2024"],  # agrega más aquí
-        "Primera División, Chile": ["2024"],  # agrega más aquí
-        "Primera A, Colombia": ["2024"],  # agrega más aquí
-        "Liga Pro, Ecuador": ["2024"],  # agrega más aquí
-        "Premier League, Inglaterra": ["2024/2025"],  # agrega más aqui
-        "La Liga, España": ["2024/2025"],  # agrega más aquí
-        "Ligue 1, Francia": ["2024/2025"],  # agrega más aquí
-        "Bundesliga, Alemania": ["2024/2025"],  # agrega más aquí
-        "Serie A, Italia": ["2024/2025"],  # agrega más aquí
-        "Primeira Liga, Portugal": ["2024/2025"],  # agrega más aqu
-        "Primera División, Uruguay": ["2024"],  # agrega más aqu
-        "MLS, Estados Unidos": ["2024"],  # agrega más aquí
-
-
-    }
-    archivos_desmarque = {
-        ("Liga MX", "2024/2025"): "ligamxdesmarque.csv",
-        ("Liga Profesional, Argentina", "2024"): "argdesmarque.csv",
-        ("Jupiler Pro League, Bélgica", "2024/2025"): "beldesmarque.csv",
-        ("Serie A, Brasil", "2024"): "bradesmarque.csv",
-        ("Primera División, Chile", "2024"): "chidesmarque.csv",
-        ("Primera A, Colombia", "2024"): "coldesmarque.csv",
-        ("Liga Pro, Ecuador", "2024"): "ecudesmarque.csv",
-        ("Premier League, Inglaterra", "2024/2025"): "engdesmarque.csv",
-        ("La Liga, España", "2024/2025"): "espdesmarque.csv",
-        ("Ligue 1, Francia", "2024/2025"): "fradesmarque.csv",
-        ("Bundesliga, Alemania", "2024/2025"): "gerdesmarque.csv",
-        ("Serie A, Italia", "2024/2025"): "itadesmarque.csv",
-        ("Primeira Liga, Portugal", "2024/2025"): "pordesmarque.csv",
-        ("Primera División, Uruguay", "2024"): "urudesmarque.csv",
-        ("MLS, Estados Unidos", "2024"): "usadesmarque.csv",
-    }
 
     with st.sidebar:
         st.markdown("### Liga y Temporada")
-        liga = st.selectbox("Liga", list(ligas_temporadas_desmarque.keys()), index=0)
-        temporada = st.selectbox("Temporada", ligas_temporadas_desmarque[liga], index=0)
+        liga = st.selectbox("Liga", catalogo.ligas("desmarque"), index=0)
+        temporada = st.selectbox("Temporada", catalogo.temporadas("desmarque", liga), index=0)
 
-        path = archivos_desmarque.get((liga, temporada))
+        path = catalogo.archivo("desmarque", liga, temporada)
+        precalentar.anotar_uso("desmarque", liga)
         if not path:
             st.error("No hay archivo configurado para esa liga/temporada."); st.stop()
 
@@ -3695,14 +2383,9 @@ elif seleccion == "Movimientos sin Balón":
         df_d_raw = _load_desmarque(path)
 
         # 2) Grupo + Edad (antes de dedupe)
-        df_d_raw["Grupo"] = df_d_raw["Position"].apply(_map_grupo)
-        df_d_raw["Age"] = _compute_age_col(df_d_raw)
 
-        # 3) Dedupe por (Player, Grupo) con score de minutos del ORIGINAL
-        d = df_d_raw.copy()
-        d["_score_min"] = _minutes_score_original(d)
-        idx = d.groupby(["Player","Grupo"], dropna=False)["_score_min"].idxmax()
-        df_d = d.loc[idx].drop(columns=["_score_min"])
+        # 3) Una fila por (Jugador, Grupo): elegida en la ingesta por minutos (datos.py)
+        df_d = filas_unicas(df_d_raw)
 
         # 4) Construir columna de tamaño ANTES de renombrar (igual que en Presión)
         size_cands = ["Minutes", "Minutes played per match", "Adjusted min TIP per match"]
@@ -3773,28 +2456,31 @@ elif seleccion == "Movimientos sin Balón":
         grupo_sel = st.radio("Grupo", grupos_ok, index=0)
 
         st.markdown("### Filtros")
-        if df_d["Age"].notna().any():
-            age_min = int(np.nanmin(df_d["Age"])); age_max = int(np.nanmax(df_d["Age"]))
+        edades = resumen_filtros(path, "desmarque").edad   # índice de filtros del archivo (datos.py)
+        if edades is not None:
+            age_min, age_max = (int(v) for v in edades)
             edad_sel = st.slider("Edad", min_value=age_min, max_value=age_max, value=(max(17, age_min), age_max))
         else:
             edad_sel = None
             st.caption("No se pudo derivar 'Edad' desde Birthdate.")
 
     # -------- Subset + filtros --------
-    df_view = df_d[df_d["Grupo"] == grupo_sel].copy()
+    filtro = filtros.filtrar(df_d).igual("Grupo", grupo_sel)
     if edad_sel:
-        df_view = df_view[df_view["Age"].between(edad_sel[0], edad_sel[1])]
+        filtro = filtro.entre("Age", edad_sel[0], edad_sel[1], truncar=True)   # años cumplidos
+    df_view = filtro.aplicar()
     if df_view.empty:
         st.info("No hay jugadores tras aplicar los filtros seleccionados."); st.stop()
 
     # ========================= Scatter =========================
-    if modo == "Scatterplot":
+    @st.fragment
+    def vista_scatter(df_view):
         st.markdown("#### Variables del gráfico (elige X e Y)")
 
         exclude_exact = {"Player","Short name","Player ID","Birthdate","Position","Grupo","third","channel","Age","_MinutesSize"}
         num_cols = [c for c in df_view.columns if c not in exclude_exact and not c.startswith("_") and pd.api.types.is_numeric_dtype(df_view[c])]
         if not num_cols:
-            st.warning("No se encontraron métricas válidas para graficar."); st.stop()
+            st.warning("No se encontraron métricas válidas para graficar."); return
 
         default_x = num_cols[0]
         default_y = num_cols[1] if len(num_cols) > 1 else num_cols[0]
@@ -3815,12 +2501,12 @@ elif seleccion == "Movimientos sin Balón":
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         hi_sel = st.multiselect("Resalta jugadores", jugadores, default=[])
 
-        d = df_view.copy()
-        d["is_highlight"] = d["Player"].isin(hi_sel)
+        # Solo las columnas que usa el gráfico viajan al navegador
+        d = dispersion.datos_scatter(df_view, [x_var, y_var, SIZE_COL, "Player", "Position", "Grupo"], "Player", hi_sel)
 
         sel = alt.selection_point(fields=["Player"], on="click", toggle=True, clear="dblclick", empty="none")
 
-        base = alt.Chart(d).encode(
+        base = alt.Chart().encode(
             x=alt.X(x_var, title=x_var, axis=alt.Axis(format="~s"), scale=x_scale),
             y=alt.Y(y_var, title=y_var, axis=alt.Axis(format="~s"), scale=y_scale),
             tooltip=[
@@ -3845,7 +2531,7 @@ elif seleccion == "Movimientos sin Balón":
         vline  = alt.Chart(pd.DataFrame({"v":[x_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(x="v:Q")
         hline  = alt.Chart(pd.DataFrame({"h":[y_mean]})).mark_rule(strokeDash=[5,5], color="#9A9A9A", opacity=0.8).encode(y="h:Q")
 
-        chart = (pts_base + pts_sel + pts_list + labels_sel + labels_list + vline + hline).properties(
+        chart = alt.layer(pts_base, pts_sel, pts_list, labels_sel, labels_list, vline, hline, data=d).properties(
             height=560, background="transparent",
             padding={"left": 10, "right": 160, "top": 40, "bottom": 30}
         ).configure_view(strokeWidth=0).configure_axis(
@@ -3855,7 +2541,8 @@ elif seleccion == "Movimientos sin Balón":
         st.altair_chart(chart, use_container_width=True, theme=None)
 
     # ========================= Radar + KDE =========================
-    else:
+    @st.fragment
+    def vista_radar(df_view):
         st.markdown("#### Radares de Movimientos sin Balón")
 
 
@@ -3882,12 +2569,14 @@ elif seleccion == "Movimientos sin Balón":
 
         jugadores = sorted(df_view["Player"].dropna().astype(str).unique())
         if not jugadores:
-            st.warning("No hay jugadores tras aplicar filtros."); st.stop()
+            st.warning("No hay jugadores tras aplicar filtros."); return
         jugador_sel = st.selectbox("Jugador", jugadores, index=0)
 
         left, mid, right = st.columns([0.05, 0.90, 0.05])
         with mid:
-            fig = radar_barras_plotly_player(
+            # Figura cacheada por subconjunto, jugador, fases e invertidas (figuras.py)
+            fig = figuras.radar(
+                radar_barras_plotly_player,
                 jugador=jugador_sel,
                 df=df_view,
                 fases_juego=fases_desmarque,
@@ -3900,7 +2589,7 @@ elif seleccion == "Movimientos sin Balón":
                 st.plotly_chart(fig, use_container_width=True, theme=None)
 
         st.markdown("#### Distribuciones por métrica")
-        charts = build_kde_charts(
+        grilla = build_kde_grid(
             df=df_view,
             jugador=jugador_sel,
             fases_juego=fases_desmarque,
@@ -3908,13 +2597,14 @@ elif seleccion == "Movimientos sin Balón":
             invertir_vars_kde=invertir_vars,
             height_each=120
         )
-        if charts:
-            for i in range(0, len(charts), 3):
-                cols = st.columns(3, gap="large")
-                for j in range(3):
-                    if i + j < len(charts):
-                        with cols[j]:
-                            st.altair_chart(charts[i + j], use_container_width=True, theme=None)
+        if grilla is not None:
+            st.altair_chart(grilla, use_container_width=False, theme=None)
+
+    # Vista elegida como fragmento: sus widgets no vuelven a cargar ni deduplicar
+    if modo == "Scatterplot":
+        vista_scatter(df_view)
+    else:
+        vista_radar(df_view)
 
 
 
@@ -3929,132 +2619,36 @@ elif seleccion == "Movimientos sin Balón":
 if seleccion == "Ligas Alternas":
     import pandas as pd
     import numpy as np
-    from sklearn.preprocessing import MinMaxScaler
-    from sklearn.decomposition import PCA
 
     st.markdown("<h3 style='margin-bottom: 15px; text-align: center;'>Ligas Alternas</h3>", unsafe_allow_html=True)
 
     # ========= LIGA / TEMPORADA controladas por ti =========
     st.sidebar.markdown("### Selecciona la Liga y Temporada (Ligas Alternas)")
 
-    # 1) Define aquí las ligas y sus temporadas
-    ligas_temporadas_la = {
-        # EDITA/AGREGA AQUÍ
-        "MLS Next Pro, USA": ["2025"],
-        "Liga de Expansión, México": ["24/25", "25/26"],
-        "Liga MX Sub-21, México": ["25/26"],
-        "Liga MX Sub-23, México": ["24/25"],
-        "Liga 1, Perú": ["2025"],
-        "Copa Tigo, Bolivia": ["2025"],
-        "Liga Futve, Venezuela": ["2025"],
-        "Challenger Pro, Bélgica": ["24/25", "25/26"],
-        "Série B, Brasil": ["2025"],
-        "Primera División, Costa Rica": ["24/25", "25/26"],
-        "Superleague, Croacia": ["24/25"],
-        "Chance Liga, Rep. Checa": ["24/25"],
-        "Superliga, Dinamarca": ["24/25"],
-        "Championship, Inglaterra": ["24/25"],
-        "Ligue 2, Francia": ["24/25"],
-        "Bundesliga 2, Alemania": ["24/25", "25/26"],
-        "Super League, Grecia": ["24/25", "25/26"],
-        "J1 League, Japón": ["2025"],
-        "K League, Korea": ["2025"],
-        "Liga Profesional, Panamá": ["2025"],
-        "Primera División, Polonia": ["24/25"],
-        "Segunda Liga, Portugal": ["24/25"],
-        "Pro League, Arabia": ["24/25"],
-        "Premiership, Escocia": ["24/25", "25/26"],
-        "Primera RFEF, España": ["24/25"],
-        "Segunda RFEF, España": ["24/25"],
-        "Primera División, Turquía": ["24/25"],
-        "Bundesliga, Austria": ["24/25"],
-        "Super League, Suiza": ["24/25"],
-        "Stars League, Qatar": ["24/25"],
-        "Pro League, Emiratos Árabes": ["24/25"],
-
-    }
-
-    # 2) Mapea (liga, temporada) -> archivo CSV (ya filtrado como tú quieras)
-    archivos_csv_la = {
-        # EDITA/AGREGA AQUÍ
-        ("MLS Next Pro, USA", "2025"): "nextpro2025.csv",
-        ("Liga de Expansión, México", "24/25"): "expansion2425.csv",
-        ("Liga de Expansión, México", "25/26"): "expansion2526.csv",
-        ("Liga MX Sub-21, México", "25/26"): "sub212526.csv",
-        ("Liga MX Sub-23, México", "24/25"): "sub232425.csv",
-        ("Liga 1, Perú", "2025"): "peru2025.csv",
-        ("Copa Tigo, Bolivia", "2025"): "bolivia2025.csv",
-        ("Liga Futve, Venezuela", "2025"): "venezuela2025.csv",
-        ("Challenger Pro, Bélgica", "24/25"): "challengerpro2425.csv",
-        ("Challenger Pro, Bélgica", "25/26"): "challengerpro2526.csv",
-        ("Série B, Brasil", "2025"): "serieb2025.csv",
-        ("Primera División, Costa Rica", "24/25"): "costarica2425.csv",
-        ("Primera División, Costa Rica", "25/26"): "costarica2526.csv",
-        ("Superleague, Croacia", "24/25"): "croacia2425.csv",
-        ("Chance Liga, Rep. Checa", "24/25"): "checa2425.csv",
-        ("Superliga, Dinamarca", "24/25"): "denmark2425.csv",
-        ("Championship, Inglaterra", "24/25"): "championship2425.csv",
-        ("Ligue 2, Francia", "24/25"): "ligue22425.csv",
-        ("Bundesliga 2, Alemania", "24/25"): "bundes22425.csv",
-        ("Bundesliga 2, Alemania", "25/26"): "bundes22526.csv",
-        ("Super League, Grecia", "24/25"): "grecia2425.csv",
-        ("Super League, Grecia", "25/26"): "grecia2526.csv",
-        ("J1 League, Japón", "2025"): "japan2025.csv",
-        ("K League, Korea", "2025"): "korea2025.csv",
-        ("Liga Profesional, Panamá", "2025"): "panama2025.csv",
-        ("Primera División, Polonia", "24/25"): "polonia2425.csv",
-        ("Segunda Liga, Portugal", "24/25"): "portugal22425.csv",
-        ("Pro League, Arabia", "24/25"): "arabia2425.csv",
-        ("Premiership, Escocia", "24/25"): "escocia2425.csv",
-        ("Premiership, Escocia", "25/26"): "escocia2526.csv",
-        ("Primera RFEF, España", "24/25"): "primerarfef2425.csv",
-        ("Segunda RFEF, España", "24/25"): "segundarfef2425.csv",
-        ("Primera División, Turquía", "24/25"): "turquia2425.csv",
-        ("Bundesliga, Austria", "24/25"): "austria2425.csv",
-        ("Super League, Suiza", "24/25"): "suiza2425.csv",
-        ("Stars League, Qatar", "24/25"): "qatar2425.csv",
-        ("Pro League, Emiratos Árabes", "24/25"): "uae2425.csv",
-       
-    }
-
+    # 1) Ligas, temporadas y archivos: ver catalogo.py (familia "alternas")
 
-    # 3) Selectores
-    ligas_disponibles_la = list(ligas_temporadas_la.keys())
+    # 2) Selectores
+    ligas_disponibles_la = catalogo.ligas("alternas")
     if not ligas_disponibles_la:
-        st.error("Configura al menos una liga en 'ligas_temporadas_la'.")
+        st.error("Configura al menos una liga alterna en catalogo.py.")
         st.stop()
 
     liga_seleccionada = st.sidebar.selectbox("Liga (Ligas Alternas)", ligas_disponibles_la, index=0)
 
-    temporadas_disponibles_la = ligas_temporadas_la.get(liga_seleccionada, [])
+    temporadas_disponibles_la = catalogo.temporadas("alternas", liga_seleccionada)
     if not temporadas_disponibles_la:
         st.error("Configura al menos una temporada para la liga seleccionada.")
         st.stop()
 
     temporada_seleccionada = st.sidebar.selectbox("Temporada", temporadas_disponibles_la, index=0)
 
-    # 4) Carga del CSV exacto según el mapeo (SIN verificar columnas internas)
-    archivo_la = archivos_csv_la.get((liga_seleccionada, temporada_seleccionada))
+    # 3) Carga del CSV exacto según el mapeo (SIN verificar columnas internas)
+    archivo_la = catalogo.archivo("alternas", liga_seleccionada, temporada_seleccionada)
+    precalentar.anotar_uso("alternas", liga_seleccionada)
     if not archivo_la:
         st.error("No hay archivo CSV mapeado para esta liga/temporada.")
         st.stop()
 
-    # Lectura robusta (coma o punto y coma)
-    try:
-        df_all = pd.read_csv(archivo_la)
-    except Exception:
-        df_all = pd.read_csv(archivo_la, sep=";")
-
-    # Limpieza mínima de headers
-    df_all.columns = df_all.columns.str.strip()
-
-    # >>> SIN filtro por Competition/Season: usas todo el CSV seleccionado
-    df_filtrado = df_all.copy()
-
-    if df_filtrado.empty:
-        st.warning("El CSV seleccionado no tiene datos.")
-        st.stop()
-
     # ========== GRUPO DE POSICIÓN ==========
     st.sidebar.markdown("### Grupo de Posición")
     grupos_posicion = ["Porteros", "Centrales", "Carrileros/Laterales", "Contenciones",
@@ -4076,76 +2670,48 @@ if seleccion == "Ligas Alternas":
     )
 
 
-    # ========================
-    # Auxiliares
-    # ========================
-    def _as_num(df_, cols):
-        X = df_[cols].copy()
-        for c in cols:
-            X[c] = pd.to_numeric(X[c], errors="coerce")
-        return X.fillna(0.0)
-
-    def _minmax_0_100(s):
-        s = pd.to_numeric(s, errors="coerce")
-        lo, hi = np.nanmin(s), np.nanmax(s)
-        if not np.isfinite(lo) or not np.isfinite(hi) or hi == lo:
-            return pd.Series([50.0]*len(s), index=s.index)
-        return 100.0 * (s - lo) / (hi - lo)
-
     # ========================
     # PORTEROS
     # ========================
-    def_vars_gk = [
-        "Porterías imbatidas en los 90", "Paradas, %", "xG en contra", "Goles evitados", "Salidas/90", "Duelos aéreos en los 90"
-    ]
-    ball_vars_gk = [
-        "Pases/90", "Pases recibidos /90", "Precisión pases, %", "Pases largos/90", "Precisión pases largos, %",
-        "Pases progresivos/90", "Precisión pases progresivos, %"
-    ]
 
-    def perfil_porteros_la(df_in):
-        dfp = df_in.copy()
-        dfp = dfp[dfp["Posición específica"].astype(str).str.contains("GK", case=False)].copy()
+    def perfil_porteros_la(filtro):
+        filtro = filtro.donde(
+            ("posicion", "Porteros"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Porteros", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Porteros")   # índice de filtros del archivo (datos.py)
 
         # Minutos
-        dfp["Minutos jugados"] = pd.to_numeric(dfp["Minutos jugados"], errors="coerce")
-        mins_validos = dfp["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para porteros."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val, (min_default, max_val), key="gk_mins")
-        dfp = dfp[dfp["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # Edad
-        dfp["Edad"] = pd.to_numeric(dfp["Edad"], errors="coerce")
-        edad_validos = dfp["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para porteros."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="gk_age")
-        dfp = dfp[dfp["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # Nacionalidad
-        nats = sorted(dfp["País de nacimiento"].dropna().unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="gk_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="gk_nat_list")
-        dfp = dfp[dfp["País de nacimiento"].isin(selected)]
-
-        # Rankings
-        scaler = MinMaxScaler()
-        def_cols = [c for c in def_vars_gk if c in dfp.columns]
-        bal_cols = [c for c in ball_vars_gk if c in dfp.columns]
+        filtro = filtro.en("País de nacimiento", selected)
 
-        if "xG en contra" in def_cols:
-            dfp["xG en contra (inv)"] = -pd.to_numeric(dfp["xG en contra"], errors="coerce")
-            def_cols = [c if c != "xG en contra" else "xG en contra (inv)" for c in def_cols]
-
-        dfp["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(_as_num(dfp, def_cols))) if len(def_cols) >= 2 else 0.0
-        dfp["_bal"] = PCA(n_components=1).fit_transform(scaler.fit_transform(_as_num(dfp, bal_cols))) if len(bal_cols) >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dfp = filtro.aplicar()
+        dfp["Minutos jugados"] = pd.to_numeric(dfp["Minutos jugados"], errors="coerce")
+        dfp["Edad"] = pd.to_numeric(dfp["Edad"], errors="coerce")
 
-        dfp["Ranking General Atajadas"] = _minmax_0_100(dfp["_def"])
-        dfp["Ranking Juego de Pies"]    = _minmax_0_100(dfp["_bal"])
+        # Rankings (variables e invertidas: perfiles.py, las mismas que precalienta)
+        dfp = perfiles.invertir_alternas(dfp)
+        bloques_la = perfiles.bloques_alternas("Porteros", dfp.columns)
+        def_cols, bal_cols = bloques_la["Ranking General Atajadas"], bloques_la["Ranking Juego de Pies"]
+        dfp = dfp.assign(**rankings.rankings(dfp, bloques_la))
 
         # Variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4153,85 +2719,63 @@ if seleccion == "Ligas Alternas":
             "Defensivas": def_cols if def_cols else ["Ranking General Atajadas"],
             "Rankings": ["Ranking General Atajadas", "Ranking Juego de Pies"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="gk_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="gk_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="gk_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="gk_var_y")
-
-        # Highlight
-        jugadores = sorted(dfp["Jugador"].dropna().unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="gk_highlight")
 
         # Alias para helper + preservar Equipo en tooltip
         dfp["Name"] = dfp["Jugador"]
         dfp["Team"] = dfp["Equipo"]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dfp,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=["Jugador","Equipo","Posición específica","Edad","País de nacimiento","Minutos jugados","Ranking General Atajadas","Ranking Juego de Pies"],
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="gk"
         )
 
     # ========================
     # CENTRALES
     # ========================
-    def_vars_cb = [
-        "Acciones defensivas realizadas/90", "Duelos defensivos/90", "Duelos defensivos ganados, %", "Duelos aéreos en los 90",
-        "Duelos aéreos ganados, %", "Entradas/90", "Posesión conquistada después de una entrada", "Tiros interceptados/90",
-        "Interceptaciones/90", "Posesión conquistada después de una interceptación"
-    ]
-    ball_vars_cb = [
-        "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %", "Pases hacia adelante/90",
-        "Pases largos/90", "Precisión pases largos, %", "Pases en profundidad/90", "Pases progresivos/90"
-    ]
 
-    def perfil_centrales_la(df_in):
-        dfc = df_in.copy()
+    def perfil_centrales_la(filtro):
         # Abreviaturas tipo "CB", "LCB", "RCB", combinaciones "RCB, CB", etc.
-        dfc = dfc[dfc["Posición específica"].astype(str).str.contains("CB", na=False)].copy()
+        filtro = filtro.donde(
+            ("posicion", "Centrales"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Centrales", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Centrales")   # índice de filtros del archivo (datos.py)
 
         # Minutos
-        dfc["Minutos jugados"] = pd.to_numeric(dfc["Minutos jugados"], errors="coerce")
-        mins_validos = dfc["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para centrales."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val, (min_default, max_val), key="cb_mins")
-        dfc = dfc[dfc["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # Edad
-        dfc["Edad"] = pd.to_numeric(dfc["Edad"], errors="coerce")
-        edad_validos = dfc["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para centrales."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="cb_age")
-        dfc = dfc[dfc["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # Nacionalidad
-        nats = sorted(dfc["País de nacimiento"].dropna().unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="cb_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="cb_nat_list")
-        dfc = dfc[dfc["País de nacimiento"].isin(selected)]
-
-        # Rankings
-        scaler = MinMaxScaler()
-        def_cols = [c for c in def_vars_cb if c in dfc.columns]
-        bal_cols = [c for c in ball_vars_cb if c in dfc.columns]
+        filtro = filtro.en("País de nacimiento", selected)
 
-        dfc["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(_as_num(dfc, def_cols))) if len(def_cols) >= 2 else 0.0
-        dfc["_bal"] = PCA(n_components=1).fit_transform(scaler.fit_transform(_as_num(dfc, bal_cols))) if len(bal_cols) >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dfc = filtro.aplicar()
+        dfc["Minutos jugados"] = pd.to_numeric(dfc["Minutos jugados"], errors="coerce")
+        dfc["Edad"] = pd.to_numeric(dfc["Edad"], errors="coerce")
 
-        dfc["Ranking General Defensivo"] = _minmax_0_100(dfc["_def"])
-        dfc["Ranking Con Balón"] = _minmax_0_100(dfc["_bal"])
+        # Rankings (variables: perfiles.py, las mismas que precalienta)
+        bloques_la = perfiles.bloques_alternas("Centrales", dfc.columns)
+        def_cols, bal_cols = bloques_la["Ranking General Defensivo"], bloques_la["Ranking Con Balón"]
+        dfc = dfc.assign(**rankings.rankings(dfc, bloques_la))
 
         # Variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4239,88 +2783,62 @@ if seleccion == "Ligas Alternas":
             "Defensivas": def_cols if def_cols else ["Ranking General Defensivo"],
             "Rankings": ["Ranking General Defensivo", "Ranking Con Balón"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="cb_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="cb_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="cb_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="cb_var_y")
-
-        # Highlight
-        jugadores = sorted(dfc["Jugador"].dropna().unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="cb_highlight")
 
         # Alias
         dfc["Name"] = dfc["Jugador"]
         dfc["Team"] = dfc["Equipo"]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dfc,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=["Jugador","Equipo","Posición específica","Edad","País de nacimiento","Minutos jugados","Ranking General Defensivo","Ranking Con Balón"],
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="cb"
         )
 
     # ========================
     # CARRILEROS / LATERALES
     # ========================
-    def_vars_wb = [
-        "Acciones defensivas realizadas/90", "Duelos defensivos ganados, %", "Entradas/90",
-        "Posesión conquistada después de una entrada", "Interceptaciones/90",
-        "Posesión conquistada después de una interceptación", "Duelos defensivos/90", "Tiros interceptados/90"
-    ]
-    ball_vars_wb = [
-        "Carreras en progresión/90", "Aceleraciones/90", "Acciones de ataque exitosas/90",
-        "Goles (excepto los penaltis)", "xG/90", "Remates", "Remates/90", "Tiros a la portería, %",
-        "Asistencias/90", "Centros/90", "Precisión centros, %", "Regates/90", "Duelos atacantes ganados, %",
-        "Toques en el área de penalti/90", "Pases/90", "Pases hacia adelante/90", "xA/90",
-        "Second assists/90", "Third assists/90", "Desmarques/90", "Precisión desmarques, %",
-        "Jugadas claves/90", "Pases en el último tercio/90", "Centros desde el último tercio/90", "Pases progresivos/90"
-    ]
 
-    def perfil_laterales_la(df_in):
-        dfl = df_in.copy()
-        dfl = dfl[dfl["Posición específica"].astype(str).str.contains("RB|LB|RWB|LWB", na=False)].copy()
+    def perfil_laterales_la(filtro):
+        filtro = filtro.donde(
+            ("posicion", "Carrileros/Laterales"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Carrileros/Laterales", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Carrileros/Laterales")   # índice de filtros del archivo (datos.py)
 
         # Minutos
-        dfl["Minutos jugados"] = pd.to_numeric(dfl["Minutos jugados"], errors="coerce")
-        mins_validos = dfl["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para laterales."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val, (min_default, max_val), key="wb_mins")
-        dfl = dfl[dfl["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # Edad
-        dfl["Edad"] = pd.to_numeric(dfl["Edad"], errors="coerce")
-        edad_validos = dfl["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para laterales."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="wb_age")
-        dfl = dfl[dfl["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # Nacionalidad
-        nats = sorted(dfl["País de nacimiento"].dropna().unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="wb_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="wb_nat_list")
-        dfl = dfl[dfl["País de nacimiento"].isin(selected)]
+        filtro = filtro.en("País de nacimiento", selected)
 
-        # Rankings
-        scaler = MinMaxScaler()
-        def_cols = [c for c in def_vars_wb if c in dfl.columns]
-        bal_cols = [c for c in ball_vars_wb if c in dfl.columns]
-
-        dfl["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(_as_num(dfl, def_cols))) if len(def_cols) >= 2 else 0.0
-        dfl["_bal"] = PCA(n_components=1).fit_transform(scaler.fit_transform(_as_num(dfl, bal_cols))) if len(bal_cols) >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dfl = filtro.aplicar()
+        dfl["Minutos jugados"] = pd.to_numeric(dfl["Minutos jugados"], errors="coerce")
+        dfl["Edad"] = pd.to_numeric(dfl["Edad"], errors="coerce")
 
-        dfl["Ranking General Defensivo"] = _minmax_0_100(dfl["_def"])
-        dfl["Ranking Con Balón"]         = _minmax_0_100(dfl["_bal"])
+        # Rankings (variables: perfiles.py, las mismas que precalienta)
+        bloques_la = perfiles.bloques_alternas("Carrileros/Laterales", dfl.columns)
+        def_cols, bal_cols = bloques_la["Ranking General Defensivo"], bloques_la["Ranking Con Balón"]
+        dfl = dfl.assign(**rankings.rankings(dfl, bloques_la))
 
         # Variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4328,91 +2846,63 @@ if seleccion == "Ligas Alternas":
             "Defensivas": def_cols if def_cols else ["Ranking General Defensivo"],
             "Rankings": ["Ranking General Defensivo", "Ranking Con Balón"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="wb_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="wb_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="wb_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="wb_var_y")
-
-        # Highlight (definido ANTES de llamar al helper)
-        jugadores = sorted(dfl["Jugador"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="wb_highlight")
 
         # Alias
         dfl["Name"] = dfl["Jugador"]
         dfl["Team"] = dfl["Equipo"]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dfl,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=["Jugador","Equipo","Posición específica","Edad","País de nacimiento","Minutos jugados","Ranking General Defensivo","Ranking Con Balón"],
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="wb"
         )
 
-    def perfil_contenciones_la(df_in):
-        dfd = df_in.copy()
+    # ========================
+    # CONTENCIONES
+    # ========================
+
+    def perfil_contenciones_la(filtro):
         # Filtrar posiciones de contención (CDM, RDM, LDM, etc.)
-        dfd = dfd[dfd["Posición específica"].astype(str).str.contains("DM", na=False)].copy()
+        filtro = filtro.donde(
+            ("posicion", "Contenciones"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Contenciones", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Contenciones")   # índice de filtros del archivo (datos.py)
 
         # Minutos
-        dfd["Minutos jugados"] = pd.to_numeric(dfd["Minutos jugados"], errors="coerce")
-        mins_validos = dfd["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para contenciones."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val, (min_default, max_val), key="dm_mins")
-        dfd = dfd[dfd["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # Edad
-        dfd["Edad"] = pd.to_numeric(dfd["Edad"], errors="coerce")
-        edad_validos = dfd["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para contenciones."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="dm_age")
-        dfd = dfd[dfd["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # Nacionalidad
-        nats = sorted(dfd["País de nacimiento"].dropna().unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="dm_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="dm_nat_list")
-        dfd = dfd[dfd["País de nacimiento"].isin(selected)]
-
-        # ------- VARIABLES (las que me diste) -------
-        def_vars_dm = [
-            "Acciones defensivas realizadas/90", "Duelos defensivos ganados, %", "Entradas/90",
-            "Posesión conquistada después de una entrada", "Interceptaciones/90", "Posesión conquistada después de una interceptación"
-        ]
-        ball_vars_dm = [
-            "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %", "Pases hacia adelante/90",
-            "Pases largos/90", "Precisión pases largos, %", "Pases en profundidad/90", "Pases progresivos/90",
-            "Acciones de ataque exitosas/90", "Remates/90", "Asistencias/90", "Pases recibidos /90", "Second assists/90",
-            "Third assists/90", "Jugadas claves/90", "Pases en el último tercio/90", "Pases al área de penalti/90",
-            "Precisión pases, %", "Pases recibidos /90", "Pases largos/90", "Precisión pases largos, %", "Longitud media pases, m"
-        ]
-
-        # ------- RANKINGS con deduplicación segura -------
-        scaler = MinMaxScaler()
-
-        # limpiar listas para evitar duplicados y sólo columnas existentes
-        def_cols = [c for c in dict.fromkeys(def_vars_dm) if c in dfd.columns]
-        bal_cols = [c for c in dict.fromkeys(ball_vars_dm) if c in dfd.columns]
-
-        # matrices numéricas robustas (dedup y coerción)
-        X_def = _as_num(dfd, def_cols)
-        X_bal = _as_num(dfd, bal_cols)
+        filtro = filtro.en("País de nacimiento", selected)
 
-        dfd["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_def)) if X_def.shape[1] >= 2 else 0.0
-        dfd["_bal"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_bal)) if X_bal.shape[1] >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dfd = filtro.aplicar()
+        dfd["Minutos jugados"] = pd.to_numeric(dfd["Minutos jugados"], errors="coerce")
+        dfd["Edad"] = pd.to_numeric(dfd["Edad"], errors="coerce")
 
-        dfd["Ranking General Defensivo"] = _minmax_0_100(dfd["_def"])
-        dfd["Ranking Con Balón"]         = _minmax_0_100(dfd["_bal"])
+        # Rankings (variables: perfiles.py, las mismas que precalienta)
+        bloques_la = perfiles.bloques_alternas("Contenciones", dfd.columns)
+        def_cols, bal_cols = bloques_la["Ranking General Defensivo"], bloques_la["Ranking Con Balón"]
+        dfd = dfd.assign(**rankings.rankings(dfd, bloques_la))
 
         # Variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4420,95 +2910,64 @@ if seleccion == "Ligas Alternas":
             "Defensivas": def_cols if def_cols else ["Ranking General Defensivo"],
             "Rankings": ["Ranking General Defensivo", "Ranking Con Balón"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="dm_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="dm_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="dm_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="dm_var_y")
-
-        # Highlight
-        jugadores = sorted(dfd["Jugador"].dropna().unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="dm_highlight")
 
         # Alias
         dfd["Name"] = dfd["Jugador"]
         dfd["Team"] = dfd["Equipo"]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dfd,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=["Jugador","Equipo","Posición específica","Edad","País de nacimiento","Minutos jugados","Ranking General Defensivo","Ranking Con Balón"],
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="dm"
         )
 
 
     # ========================
     # INTERIORES
     # ========================
-    def_vars_cm = [
-        "Acciones defensivas realizadas/90", "Duelos defensivos ganados, %", "Entradas/90",
-        "Posesión conquistada después de una entrada", "Interceptaciones/90", "Posesión conquistada después de una interceptación"
-    ]
-    ball_vars_cm = [
-        "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %", "Pases hacia adelante/90",
-        "Pases largos/90", "Precisión pases largos, %", "Pases en profundidad/90", "Pases progresivos/90",
-        "Acciones de ataque exitosas/90", "Remates/90", "Asistencias/90", "Pases recibidos /90", "Second assists/90",
-        "Third assists/90", "Jugadas claves/90", "Pases en el último tercio/90", "Pases al área de penalti/90",
-        "Precisión pases, %", "Pases recibidos /90", "Pases largos/90", "Precisión pases largos, %", "Longitud media pases, m"
-    ]
 
-    def perfil_interiores_la(df_in):
-        dfi = df_in.copy()
+    def perfil_interiores_la(filtro):
         # Filtrar interiores (CM, RCM, LCM, etc.)
-        dfi = dfi[dfi["Posición específica"].astype(str).str.contains("CM", na=False)].copy()
+        filtro = filtro.donde(
+            ("posicion", "Interiores"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Interiores", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Interiores")   # índice de filtros del archivo (datos.py)
 
         # Minutos (robusto a NaN)
-        dfi["Minutos jugados"] = pd.to_numeric(dfi["Minutos jugados"], errors="coerce")
-        mins_validos = dfi["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para interiores."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val, (min_default, max_val), key="cm_mins")
-        dfi = dfi[dfi["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # Edad (robusto a NaN)
-        dfi["Edad"] = pd.to_numeric(dfi["Edad"], errors="coerce")
-        edad_validos = dfi["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para interiores."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="cm_age")
-        dfi = dfi[dfi["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # Nacionalidad
-        nats = sorted(dfi["País de nacimiento"].dropna().astype(str).unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="cm_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="cm_nat_list")
-        dfi = dfi[dfi["País de nacimiento"].isin(selected)]
+        filtro = filtro.en("País de nacimiento", selected)
 
-        # ===== Rankings (PCA → 0–100) con deduplicación segura =====
-        from sklearn.preprocessing import MinMaxScaler
-        from sklearn.decomposition import PCA
-        scaler = MinMaxScaler()
-
-        # listas deduplicadas y solo columnas presentes
-        def_cols = [c for c in dict.fromkeys(def_vars_cm) if c in dfi.columns]
-        bal_cols = [c for c in dict.fromkeys(ball_vars_cm) if c in dfi.columns]
-
-        X_def = _as_num(dfi, def_cols)
-        X_bal = _as_num(dfi, bal_cols)
-
-        dfi["_def"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_def)) if X_def.shape[1] >= 2 else 0.0
-        dfi["_bal"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_bal)) if X_bal.shape[1] >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dfi = filtro.aplicar()
+        dfi["Minutos jugados"] = pd.to_numeric(dfi["Minutos jugados"], errors="coerce")
+        dfi["Edad"] = pd.to_numeric(dfi["Edad"], errors="coerce")
 
-        dfi["Ranking General Defensivo"] = _minmax_0_100(dfi["_def"])
-        dfi["Ranking Con Balón"]         = _minmax_0_100(dfi["_bal"])
+        # Rankings (variables: perfiles.py, las mismas que precalienta)
+        bloques_la = perfiles.bloques_alternas("Interiores", dfi.columns)
+        def_cols, bal_cols = bloques_la["Ranking General Defensivo"], bloques_la["Ranking Con Balón"]
+        dfi = dfi.assign(**rankings.rankings(dfi, bloques_la))
 
         # Variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4516,18 +2975,6 @@ if seleccion == "Ligas Alternas":
             "Defensivas": def_cols if def_cols else ["Ranking General Defensivo"],
             "Rankings": ["Ranking General Defensivo", "Ranking Con Balón"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="cm_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="cm_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="cm_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="cm_var_y")
-
-        # Highlight
-        jugadores = sorted(dfi["Jugador"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="cm_highlight")
 
         # Alias para tu helper y mantener 'Equipo' en tooltip
         dfi["Name"] = dfi["Jugador"]
@@ -4539,80 +2986,59 @@ if seleccion == "Ligas Alternas":
             "Ranking General Defensivo","Ranking Con Balón"
         ] if c in dfi.columns]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dfi,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=tooltip_cols,
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="cm"
         )
     
 
     # ========================
     # VOLANTES OFENSIVOS
     # ========================
-    def_vars_am = [
-        "Goles", "xG", "Asistencias", "xA", "Remates", "Tiros a la portería, %",
-        "Goles hechos, %", "Second assists/90", "Third assists/90", "Jugadas claves/90"
-    ]
-    ball_vars_am = [
-        "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %", "Pases hacia adelante/90",
-        "Pases largos/90", "Precisión pases largos, %", "Pases en profundidad/90", "Pases progresivos/90",
-        "Acciones de ataque exitosas/90", "Remates/90", "Asistencias/90", "Pases recibidos /90", "Second assists/90",
-        "Third assists/90", "Jugadas claves/90", "Pases en el último tercio/90", "Pases al área de penalti/90",
-        "Precisión pases, %", "Pases recibidos /90", "Pases largos/90", "Precisión pases largos, %", "Longitud media pases, m"
-    ]
 
-    def perfil_volantes_of_la(df_in):
-        dfv = df_in.copy()
+    def perfil_volantes_of_la(filtro):
         # Filtrar volantes ofensivos (AM, CAM, LAM, RAM, etc.)
-        dfv = dfv[dfv["Posición específica"].astype(str).str.contains("AM", na=False)].copy()
+        filtro = filtro.donde(
+            ("posicion", "Volantes Ofensivos"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Volantes Ofensivos", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Volantes Ofensivos")   # índice de filtros del archivo (datos.py)
 
         # Minutos (robusto a NaN)
-        dfv["Minutos jugados"] = pd.to_numeric(dfv["Minutos jugados"], errors="coerce")
-        mins_validos = dfv["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para volantes ofensivos."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val, (min_default, max_val), key="am_mins")
-        dfv = dfv[dfv["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # Edad (robusto a NaN)
-        dfv["Edad"] = pd.to_numeric(dfv["Edad"], errors="coerce")
-        edad_validos = dfv["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para volantes ofensivos."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="am_age")
-        dfv = dfv[dfv["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # Nacionalidad
-        nats = sorted(dfv["País de nacimiento"].dropna().astype(str).unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="am_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="am_nat_list")
-        dfv = dfv[dfv["País de nacimiento"].isin(selected)]
-
-        # ===== Rankings (PCA → 0–100) con deduplicación segura =====
-        from sklearn.preprocessing import MinMaxScaler
-        from sklearn.decomposition import PCA
-        scaler = MinMaxScaler()
+        filtro = filtro.en("País de nacimiento", selected)
 
-        # Dedup + sólo columnas presentes
-        crea_cols = [c for c in dict.fromkeys(ball_vars_am) if c in dfv.columns]   # Creación
-        defi_cols = [c for c in dict.fromkeys(def_vars_am) if c in dfv.columns]    # Definición
-
-        X_crea = _as_num(dfv, crea_cols)
-        X_defi = _as_num(dfv, defi_cols)
-
-        # PCA (si hay al menos 2 columnas válidas)
-        dfv["_crea"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_crea)) if X_crea.shape[1] >= 2 else 0.0
-        dfv["_defi"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_defi)) if X_defi.shape[1] >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dfv = filtro.aplicar()
+        dfv["Minutos jugados"] = pd.to_numeric(dfv["Minutos jugados"], errors="coerce")
+        dfv["Edad"] = pd.to_numeric(dfv["Edad"], errors="coerce")
 
-        # 0–100
-        dfv["Ranking Creación"]   = _minmax_0_100(dfv["_crea"])
-        dfv["Ranking Definición"] = _minmax_0_100(dfv["_defi"])
+        # Rankings (variables: perfiles.py, las mismas que precalienta)
+        bloques_la = perfiles.bloques_alternas("Volantes Ofensivos", dfv.columns)
+        crea_cols, defi_cols = bloques_la["Ranking Creación"], bloques_la["Ranking Definición"]
+        dfv = dfv.assign(**rankings.rankings(dfv, bloques_la))
 
         # Selector de variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4620,18 +3046,6 @@ if seleccion == "Ligas Alternas":
             "Definición": defi_cols if defi_cols else ["Ranking Definición"],
             "Rankings": ["Ranking Creación", "Ranking Definición"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="am_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="am_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="am_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="am_var_y")
-
-        # Highlight
-        jugadores = sorted(dfv["Jugador"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="am_highlight")
 
         # Alias para helper + mantener 'Equipo' en tooltip
         dfv["Name"] = dfv["Jugador"]
@@ -4642,80 +3056,60 @@ if seleccion == "Ligas Alternas":
             "Ranking Creación","Ranking Definición"
         ] if c in dfv.columns]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dfv,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=tooltip_cols,
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="am"
         )
 
 
     # ========================
     # EXTREMOS (Creación / Definición)
     # ========================
-    def_vars_w = [
-        "Goles", "xG", "Asistencias", "xA", "Remates", "Tiros a la portería, %",
-        "Goles hechos, %", "Second assists/90", "Third assists/90", "Jugadas claves/90",
-        "Remates/90", "Centros/90", "Precisión centros, %", "Pases hacía el área pequeña, %"
-    ]
-    ball_vars_w = [
-        "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %",
-        "Pases en profundidad/90", "Pases progresivos/90", "Acciones de ataque exitosas/90",
-        "Pases recibidos /90", "Pases en el último tercio/90", "Pases al área de penalti/90",
-        "Regates/90", "Regates realizados, %", "Duelos atacantes ganados, %",
-        "Desmarques/90", "Precisión desmarques, %"
-    ]
 
-    def perfil_extremos_la(df_in):
-        dfx = df_in.copy()
+    def perfil_extremos_la(filtro):
         # Filtrar extremos: LW / RW (excluir WB para no mezclar con carrileros)
-        pos = dfx["Posición específica"].astype(str)
-        dfx = dfx[pos.str.contains(r"\bLW\b|\bRW\b", na=False) & ~pos.str.contains("WB", na=False)].copy()
+        filtro = filtro.donde(
+            ("posicion", "Extremos"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Extremos", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Extremos")   # índice de filtros del archivo (datos.py)
 
         # ---- Minutos
-        dfx["Minutos jugados"] = pd.to_numeric(dfx["Minutos jugados"], errors="coerce")
-        mins_validos = dfx["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para extremos."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val,
                                     (min_default, max_val), key="w_mins")
-        dfx = dfx[dfx["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # ---- Edad
-        dfx["Edad"] = pd.to_numeric(dfx["Edad"], errors="coerce")
-        edad_validos = dfx["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para extremos."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="w_age")
-        dfx = dfx[dfx["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # ---- Nacionalidad
-        nats = sorted(dfx["País de nacimiento"].dropna().astype(str).unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="w_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="w_nat_list")
-        dfx = dfx[dfx["País de nacimiento"].isin(selected)]
-
-        # ===== Rankings (PCA → 0–100) deduplicando columnas =====
-        from sklearn.preprocessing import MinMaxScaler
-        from sklearn.decomposition import PCA
-        scaler = MinMaxScaler()
-
-        crea_cols = [c for c in dict.fromkeys(ball_vars_w) if c in dfx.columns]   # Creación
-        defi_cols = [c for c in dict.fromkeys(def_vars_w)  if c in dfx.columns]   # Definición
+        filtro = filtro.en("País de nacimiento", selected)
 
-        X_crea = _as_num(dfx, crea_cols)
-        X_defi = _as_num(dfx, defi_cols)
-
-        dfx["_crea"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_crea)) if X_crea.shape[1] >= 2 else 0.0
-        dfx["_defi"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_defi)) if X_defi.shape[1] >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dfx = filtro.aplicar()
+        dfx["Minutos jugados"] = pd.to_numeric(dfx["Minutos jugados"], errors="coerce")
+        dfx["Edad"] = pd.to_numeric(dfx["Edad"], errors="coerce")
 
-        dfx["Ranking Creación"]   = _minmax_0_100(dfx["_crea"])
-        dfx["Ranking Definición"] = _minmax_0_100(dfx["_defi"])
+        # Rankings (variables: perfiles.py, las mismas que precalienta)
+        bloques_la = perfiles.bloques_alternas("Extremos", dfx.columns)
+        crea_cols, defi_cols = bloques_la["Ranking Creación"], bloques_la["Ranking Definición"]
+        dfx = dfx.assign(**rankings.rankings(dfx, bloques_la))
 
         # ---- Variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4723,18 +3117,6 @@ if seleccion == "Ligas Alternas":
             "Definición": defi_cols if defi_cols else ["Ranking Definición"],
             "Rankings": ["Ranking Creación", "Ranking Definición"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="w_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="w_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="w_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="w_var_y")
-
-        # ---- Highlight
-        jugadores = sorted(dfx["Jugador"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="w_highlight")
 
         # ---- Alias helper y tooltips
         dfx["Name"] = dfx["Jugador"]
@@ -4745,80 +3127,59 @@ if seleccion == "Ligas Alternas":
             "Ranking Creación","Ranking Definición"
         ] if c in dfx.columns]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dfx,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=tooltip_cols,
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="w"
         )
 
     # ========================
     # DELANTEROS (Creación / Definición)
     # ========================
-    ball_vars_st = [
-    "Goles", "xG", "Asistencias", "xA", "Remates", "Tiros a la portería, %",
-    "Goles hechos, %", "Second assists/90", "Third assists/90", "Jugadas claves/90",
-    "Remates/90", "Centros/90", "Precisión centros, %", "Pases hacía el área pequeña, %"
-    ]
-    def_vars_st = [
-        "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %",
-        "Pases en profundidad/90", "Pases progresivos/90", "Acciones de ataque exitosas/90", "Pases recibidos /90",
-        "Pases en el último tercio/90", "Pases al área de penalti/90",
-        "Regates/90", "Regates realizados, %", "Duelos atacantes ganados, %", "Desmarques/90", "Precisión desmarques, %"
-    ]
 
-    def perfil_delanteros_la(df_in):
-        dff = df_in.copy()
+    def perfil_delanteros_la(filtro):
         # Filtrar delanteros: ST / CF
-        pos = dff["Posición específica"].astype(str)
-        dff = dff[pos.str.contains(r"\bST\b|\bCF\b", na=False)].copy()
+        filtro = filtro.donde(
+            ("posicion", "Delanteros"),
+            lambda d: posiciones.mascara(d["Posición específica"], "Delanteros", "wyscout"),
+        )
+        cotas = resumen_filtros(archivo_la, "alternas", "Delanteros")   # índice de filtros del archivo (datos.py)
 
         # ---- Minutos
-        dff["Minutos jugados"] = pd.to_numeric(dff["Minutos jugados"], errors="coerce")
-        mins_validos = dff["Minutos jugados"].dropna()
-        if mins_validos.empty:
+        if cotas.minutos is None:
             st.warning("No hay datos válidos de minutos para delanteros."); st.stop()
-        min_val, max_val = int(mins_validos.min()), int(mins_validos.max())
+        min_val, max_val = (int(v) for v in cotas.minutos)
         min_default = max(600, min_val)
         rango_mins = st.sidebar.slider("Rango de Minutos Jugados", min_val, max_val,
                                     (min_default, max_val), key="st_mins")
-        dff = dff[dff["Minutos jugados"].between(rango_mins[0], rango_mins[1])]
+        filtro = filtro.entre("Minutos jugados", rango_mins[0], rango_mins[1])
 
         # ---- Edad
-        dff["Edad"] = pd.to_numeric(dff["Edad"], errors="coerce")
-        edad_validos = dff["Edad"].dropna()
-        if edad_validos.empty:
+        if cotas.edad is None:
             st.warning("No hay datos válidos de edad para delanteros."); st.stop()
-        amin, amax = int(edad_validos.min()), int(edad_validos.max())
+        amin, amax = (int(v) for v in cotas.edad)
         rango_edad = st.sidebar.slider("Rango de Edad", amin, amax, (17, 36), key="st_age")
-        dff = dff[dff["Edad"].between(rango_edad[0], rango_edad[1])]
+        filtro = filtro.entre("Edad", rango_edad[0], rango_edad[1])
 
         # ---- Nacionalidad
-        nats = sorted(dff["País de nacimiento"].dropna().astype(str).unique())
+        nats = list(cotas.nacionalidades)
         sel_all = st.sidebar.checkbox("Seleccionar todas las nacionalidades", value=True, key="st_nat_all")
         selected = nats if sel_all else st.sidebar.multiselect("Nacionalidades", nats, default=nats, key="st_nat_list")
-        dff = dff[dff["País de nacimiento"].isin(selected)]
-
-        # ===== Rankings (PCA → 0–100) deduplicando columnas =====
-        from sklearn.preprocessing import MinMaxScaler
-        from sklearn.decomposition import PCA
-        scaler = MinMaxScaler()
-
-        # Definición (finishing): viene de ball_vars_st
-        defi_cols = [c for c in dict.fromkeys(ball_vars_st) if c in dff.columns]
-        # Creación (build-up): viene de def_vars_st
-        crea_cols = [c for c in dict.fromkeys(def_vars_st)  if c in dff.columns]
-
-        X_defi = _as_num(dff, defi_cols)
-        X_crea = _as_num(dff, crea_cols)
+        filtro = filtro.en("País de nacimiento", selected)
 
-        dff["_defi"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_defi)) if X_defi.shape[1] >= 2 else 0.0
-        dff["_crea"] = PCA(n_components=1).fit_transform(scaler.fit_transform(X_crea)) if X_crea.shape[1] >= 2 else 0.0
+        # Un solo frame para posición + minutos + edad + nacionalidad
+        dff = filtro.aplicar()
+        dff["Minutos jugados"] = pd.to_numeric(dff["Minutos jugados"], errors="coerce")
+        dff["Edad"] = pd.to_numeric(dff["Edad"], errors="coerce")
 
-        dff["Ranking Definición"] = _minmax_0_100(dff["_defi"])
-        dff["Ranking Creación"]   = _minmax_0_100(dff["_crea"])
+        # Rankings (variables: perfiles.py, las mismas que precalienta)
+        bloques_la = perfiles.bloques_alternas("Delanteros", dff.columns)
+        crea_cols, defi_cols = bloques_la["Ranking Creación"], bloques_la["Ranking Definición"]
+        dff = dff.assign(**rankings.rankings(dff, bloques_la))
 
         # ---- Variables (baseline: dos rankings distintos)
         grupos_variables = {
@@ -4826,18 +3187,6 @@ if seleccion == "Ligas Alternas":
             "Definición": defi_cols if defi_cols else ["Ranking Definición"],
             "Rankings": ["Ranking Creación", "Ranking Definición"]
         }
-        colx, coly = st.columns(2)
-        with colx:
-            tipo_x = st.selectbox("Grupo X", list(grupos_variables.keys()), index=2, key="st_tipo_x")
-            var_x = st.selectbox("Variable X", grupos_variables[tipo_x], index=0, key="st_var_x")
-        with coly:
-            tipo_y = st.selectbox("Grupo Y", list(grupos_variables.keys()), index=2, key="st_tipo_y")
-            default_idx_y = 1 if (tipo_y == "Rankings" and len(grupos_variables[tipo_y]) > 1) else 0
-            var_y = st.selectbox("Variable Y", grupos_variables[tipo_y], index=default_idx_y, key="st_var_y")
-
-        # ---- Highlight
-        jugadores = sorted(dff["Jugador"].dropna().astype(str).unique())
-        highlight_sel = st.multiselect("Highlight jugadores", jugadores, default=[], key="st_highlight")
 
         # ---- Alias helper y tooltips
         dff["Name"] = dff["Jugador"]
@@ -4848,17 +3197,33 @@ if seleccion == "Ligas Alternas":
             "Ranking Creación","Ranking Definición"
         ] if c in dff.columns]
 
-        scatter_interactivo_altair(
+        # Ejes, resaltados y scatter: fragmento aparte (panel_scatter)
+        panel_scatter(
             dff,
-            x=var_x,
-            y=var_y,
+            grupos_variables,
             size_col="Minutos jugados",
             tooltip_cols=tooltip_cols,
-            highlight_names=highlight_sel
+            familia="alternas",
+            prefijo="st"
         )
 
 
 
+    # Solo identidad + variables del grupo activo (perfiles.py; cache por archivo y conjunto de columnas)
+    # Coma o punto y coma: el formato se detecta una vez (datos.py)
+    df_all = cargar_columnas(archivo_la, perfiles.columnas_alternas(grupo_seleccionado), familia="alternas")
+
+    # Limpieza mínima de headers
+    df_all.columns = df_all.columns.str.strip()
+
+    # >>> SIN filtro por Competition/Season: usas todo el CSV seleccionado
+    # (cada perfil agrega sus máscaras y materializa una vez; filtros.py)
+    df_filtrado = filtros.filtrar(df_all)
+
+    if len(df_filtrado) == 0:
+        st.warning("El CSV seleccionado no tiene datos.")
+        st.stop()
+
     if grupo_seleccionado == "Porteros":
         perfil_porteros_la(df_filtrado)
     elif grupo_seleccionado == "Centrales":
@@ -4904,26 +3269,6 @@ if seleccion == "Radares Ligas Alternas":
     ]
 
     # --------- Utils ---------
-    def _normalize_metrics(df, metrics, invert=None):
-        """
-        Normaliza 0–1 por métrica con coerción a numérico.
-        Si está en 'invert', aplica 1 - z. NaN -> 0.5
-        """
-        invert = set(invert or [])
-        out = df.copy()
-        for m in metrics:
-            if m not in out.columns:
-                continue
-            s = pd.to_numeric(out[m], errors="coerce")
-            mn, mx = s.min(), s.max()
-            if pd.isna(mn) or pd.isna(mx) or mx == mn:
-                out[m] = 0.5
-            else:
-                z = (s - mn) / (mx - mn)
-                out[m] = (1 - z) if m in invert else z
-                out[m] = out[m].fillna(0.5)
-        return out
-
     def radar_barras_plotly(
         jugador,
         df,
@@ -4954,10 +3299,8 @@ if seleccion == "Radares Ligas Alternas":
         if not atributos:
             st.warning("No hay variables presentes para construir el radar."); return None
 
-        # Normalización a 0–100
-        df_norm = _normalize_metrics(df, atributos, invert=invertir)
-        row = df_norm.loc[df_norm["Name"] == jugador].iloc[0]
-        r_vals = [float(row[a]) * 100 for a in atributos]
+        # Percentiles 0–100 dentro del grupo filtrado (normalizacion.py)
+        r_vals = normalizacion.percentiles_jugador(df, df["Name"] == jugador, atributos, invertir)
 
         # Ángulos
         n = len(atributos)
@@ -5039,154 +3382,39 @@ if seleccion == "Radares Ligas Alternas":
         )
         return fig
 
-    # --------- KDE (Altair) ---------
-    def _kde_chart_altair(df, metric, jugador_val, fill_color=FILL_ORANGE, line_color=LINE_BLACK, height=120):
-        if metric not in df.columns:
-            return None
-        serie = (
-            pd.to_numeric(df[metric], errors="coerce")
-            .replace([np.inf, -np.inf], np.nan)
-            .dropna()
-            .astype(float)
-        )
-        if serie.empty or pd.isna(jugador_val):
-            return None
-        mn, mx = float(serie.min()), float(serie.max())
-        if mn == mx:
-            pad = max(abs(mn), 1.0) * 0.1
-            mn, mx = mn - pad, mx + pad
-        else:
-            pad = (mx - mn) * 0.10
-            mn, mx = mn - pad, mx + pad
-
-        data_num = pd.DataFrame({"value": serie})
-        base = alt.Chart(data_num).transform_density("value", as_=["x", "density"], extent=[mn, mx], steps=200)
-
-        area = base.transform_filter(alt.datum.x <= float(jugador_val)).mark_area(opacity=0.22, color=fill_color).encode(
-            x=alt.X("x:Q", title=None), y=alt.Y("density:Q", title=None)
-        )
-        line = base.mark_line(color=line_color, size=1.4).encode(x="x:Q", y="density:Q")
-        rule = alt.Chart(pd.DataFrame({"x": [float(jugador_val)]})).mark_rule(color=line_color, strokeWidth=2).encode(
-            x="x:Q", tooltip=[alt.Tooltip("x:Q", title="Valor", format=".3f")]
-        )
-        title = alt.TitleParams(metric, fontSize=12, anchor="middle", color="#1F2937")
-        chart = (area + line + rule).properties(height=height, title=title).configure_axis(
-            grid=False, domain=True, domainColor="#E6E6E6", labelColor="#2B2B2B"
-        ).configure_view(strokeWidth=0).configure_title(font="Inter", color="#111111", anchor="middle")
-        return chart
-
-    def build_kde_charts(df, jugador, fases_juego, height_each=120):
-        charts = []
+    # --------- KDE (Altair, una sola grilla; curvas en densidades.py) ---------
+    def build_kde_grid(df, jugador, fases_juego, height_each=120):
+        """Una sola grilla Altair (3 por fila) con la distribución de cada métrica y el valor del jugador."""
         if "Name" not in df.columns and "Jugador" in df.columns:
             df = df.copy()
             df["Name"] = df["Jugador"]
         if "Name" not in df.columns or jugador not in df["Name"].values:
-            return charts
-        for _, vars_fase in fases_juego.items():
-            presentes = [v for v in vars_fase if v in df.columns]
-            for m in presentes:
-                val = pd.to_numeric(df.loc[df["Name"] == jugador, m], errors="coerce").iloc[0]
-                ch = _kde_chart_altair(df, m, val, fill_color=FILL_ORANGE, line_color=LINE_BLACK, height=height_each)
-                if ch is not None:
-                    charts.append(ch)
-        return charts
+            return None
+        valores = {
+            m: pd.to_numeric(df.loc[df["Name"] == jugador, m], errors="coerce").iloc[0]
+            for vars_fase in fases_juego.values() for m in vars_fase if m in df.columns
+        }
+        return densidades.grilla_altair(
+            df, valores, alto=height_each,
+            relleno=FILL_ORANGE, linea=LINE_BLACK, opacidad=0.22, grosor=1.4
+        )
 
     # =========================
     # Liga/Temporada -> CSV
     # =========================
     st.sidebar.markdown("### Selecciona la Liga y Temporada (Ligas Alternas)")
 
-    ligas_temporadas_la = {
-        "MLS Next Pro, USA": ["2025"],
-        "Liga de Expansión, México": ["24/25", "25/26"],
-        "Liga MX Sub-21, México": ["25/26"],
-        "Liga MX Sub-23, México": ["24/25"],
-        "Liga 1, Perú": ["2025"],
-        "Copa Tigo, Bolivia": ["2025"],
-        "Liga Futve, Venezuela": ["2025"],
-        "Challenger Pro, Bélgica": ["24/25", "25/26"],
-        "Série B, Brasil": ["2025"],
-        "Primera División, Costa Rica": ["24/25", "25/26"],
-        "Superleague, Croacia": ["24/25"],
-        "Chance Liga, Rep. Checa": ["24/25"],
-        "Superliga, Dinamarca": ["24/25"],
-        "Championship, Inglaterra": ["24/25"],
-        "Ligue 2, Francia": ["24/25"],
-        "Bundesliga 2, Alemania": ["24/25", "25/26"],
-        "Super League, Grecia": ["24/25", "25/26"],
-        "J1 League, Japón": ["2025"],
-        "K League, Korea": ["2025"],
-        "Liga Profesional, Panamá": ["2025"],
-        "Primera División, Polonia": ["24/25"],
-        "Segunda Liga, Portugal": ["24/25"],
-        "Pro League, Arabia": ["24/25"],
-        "Premiership, Escocia": ["24/25", "25/26"],
-        "Primera RFEF, España": ["24/25"],
-        "Segunda RFEF, España": ["24/25"],
-        "Primera División, Turquía": ["24/25"],
-        "Bundesliga, Austria": ["24/25"],
-        "Super League, Suiza": ["24/25"],
-        "Stars League, Qatar": ["24/25"],
-        "Pro League, Emiratos Árabes": ["24/25"],
-
-
-    }
-
-    archivos_csv_la = {
-        ("MLS Next Pro, USA", "2025"): "nextpro2025.csv",
-        ("Liga de Expansión, México", "24/25"): "expansion2425.csv",
-        ("Liga de Expansión, México", "25/26"): "expansion2526.csv",
-        ("Liga MX Sub-21, México", "25/26"): "sub212526.csv",
-        ("Liga MX Sub-23, México", "24/25"): "sub232425.csv",
-        ("Liga 1, Perú", "2025"): "peru2025.csv",
-        ("Copa Tigo, Bolivia", "2025"): "bolivia2025.csv",
-        ("Liga Futve, Venezuela", "2025"): "venezuela2025.csv",
-        ("Challenger Pro, Bélgica", "24/25"): "challengerpro2425.csv",
-        ("Challenger Pro, Bélgica", "25/26"): "challengerpro2526.csv",
-        ("Série B, Brasil", "2025"): "serieb2025.csv",
-        ("Primera División, Costa Rica", "24/25"): "costarica2425.csv",
-        ("Primera División, Costa Rica", "25/26"): "costarica2526.csv",
-        ("Superleague, Croacia", "24/25"): "croacia2425.csv",
-        ("Chance Liga, Rep. Checa", "24/25"): "checa2425.csv",
-        ("Superliga, Dinamarca", "24/25"): "denmark2425.csv",
-        ("Championship, Inglaterra", "24/25"): "championship2425.csv",
-        ("Ligue 2, Francia", "24/25"): "ligue22425.csv",
-        ("Bundesliga 2, Alemania", "24/25"): "bundes22425.csv",
-        ("Bundesliga 2, Alemania", "25/26"): "bundes22526.csv",
-        ("Super League, Grecia", "24/25"): "grecia2425.csv",
-        ("Super League, Grecia", "25/26"): "grecia2526.csv",
-        ("J1 League, Japón", "2025"): "japan2025.csv",
-        ("K League, Korea", "2025"): "korea2025.csv",
-        ("Liga Profesional, Panamá", "2025"): "panama2025.csv",
-        ("Primera División, Polonia", "24/25"): "polonia2425.csv",
-        ("Segunda Liga, Portugal", "24/25"): "portugal22425.csv",
-        ("Pro League, Arabia", "24/25"): "arabia2425.csv",
-        ("Premiership, Escocia", "24/25"): "escocia2425.csv",
-        ("Premiership, Escocia", "25/26"): "escocia2526.csv",
-        ("Primera RFEF, España", "24/25"): "primerarfef2425.csv",
-        ("Segunda RFEF, España", "24/25"): "segundarfef2425.csv",
-        ("Primera División, Turquía", "24/25"): "turquia2425.csv",
-        ("Bundesliga, Austria", "24/25"): "austria2425.csv",
-        ("Super League, Suiza", "24/25"): "suiza2425.csv",
-        ("Stars League, Qatar", "24/25"): "qatar2425.csv",
-        ("Pro League, Emiratos Árabes", "24/25"): "uae2425.csv",
-
-
-    }
-
-    ligas_disponibles_la = list(ligas_temporadas_la.keys())
+    ligas_disponibles_la = catalogo.ligas("alternas")
     liga_sel_la = st.sidebar.selectbox("Liga (Ligas Alternas)", ligas_disponibles_la, index=0)
-    temporadas_disp_la = ligas_temporadas_la.get(liga_sel_la, [])
+    temporadas_disp_la = catalogo.temporadas("alternas", liga_sel_la)
     temp_sel_la = st.sidebar.selectbox("Temporada", temporadas_disp_la, index=0)
 
-    archivo_la = archivos_csv_la.get((liga_sel_la, temp_sel_la))
+    archivo_la = catalogo.archivo("alternas", liga_sel_la, temp_sel_la)
+    precalentar.anotar_uso("alternas", liga_sel_la)
     if not archivo_la:
         st.error("No hay archivo CSV mapeado para esta liga/temporada."); st.stop()
 
-    try:
-        df_radar = pd.read_csv(archivo_la)
-    except Exception:
-        df_radar = pd.read_csv(archivo_la, sep=";")
+    df_radar = cargar_csv(archivo_la, familia="alternas")
     df_radar.columns = df_radar.columns.str.strip()
 
     # =========================
@@ -5202,32 +3430,22 @@ if seleccion == "Radares Ligas Alternas":
     slug_temp = str(temp_sel_la).lower().replace(" ", "_").replace("/", "_")
     grupo = st.sidebar.radio("Grupo", grupos_posicion, index=0, key=f"la_radar3_grupo__{slug_liga}__{slug_temp}")
 
-    pos = df_radar["Posición específica"].astype(str)
-    if grupo == "Porteros":
-        df_radar = df_radar[pos.str.contains(r"\bGK\b", na=False)].copy()
-    elif grupo == "Centrales":
-        df_radar = df_radar[pos.str.contains("CB", na=False)].copy()
-    elif grupo == "Carrileros/Laterales":
-        df_radar = df_radar[pos.str.contains("RB|LB|RWB|LWB", na=False)].copy()
-    elif grupo == "Contenciones":
-        df_radar = df_radar[pos.str.contains("DM", na=False)].copy()
-    elif grupo == "Interiores":
-        df_radar = df_radar[pos.str.contains("CM", na=False)].copy()
-    elif grupo == "Volantes Ofensivos":
-        df_radar = df_radar[pos.str.contains("AM", na=False)].copy()
-    elif grupo == "Extremos":
-        df_radar = df_radar[pos.str.contains(r"\bLW\b|\bRW\b", na=False) & ~pos.str.contains("WB", na=False)].copy()
-    else:  # Delanteros
-        df_radar = df_radar[pos.str.contains(r"\bST\b|\bCF\b", na=False)].copy()
+    # Posiciones Wyscout -> grupo (posiciones.py); un jugador puede estar en varios grupos
+    # Filtros como máscaras (filtros.py); el subconjunto se materializa tras la nacionalidad
+    filtro_radar = filtros.filtrar(df_radar).donde(
+        ("posicion", grupo),
+        lambda d: posiciones.mascara(d["Posición específica"], grupo, "wyscout"),
+    )
+
+    # Cotas y opciones del sidebar: índice de filtros del archivo (datos.py)
+    filtros_grupo = resumen_filtros(archivo_la, "alternas", grupo)
 
     # Minutos
     st.sidebar.markdown("### Minutos Jugados")
     if "Minutos jugados" in df_radar.columns:
-        df_radar["Minutos jugados"] = pd.to_numeric(df_radar["Minutos jugados"], errors="coerce")
-        mins = df_radar["Minutos jugados"].dropna()
-        if mins.empty:
+        if filtros_grupo.minutos is None:
             st.warning("No hay datos válidos de minutos tras filtrar."); st.stop()
-        mn, mx = int(mins.min()), int(mins.max())
+        mn, mx = (int(v) for v in filtros_grupo.minutos)
         min_default = max(600, mn)
         if mn < mx:
             r_mins = st.sidebar.slider(
@@ -5235,13 +3453,13 @@ if seleccion == "Radares Ligas Alternas":
                 mn, mx, (min_default, mx),
                 key=f"la_radar3_mins__{slug_liga}__{slug_temp}"
             )
-            df_radar = df_radar[df_radar["Minutos jugados"].between(r_mins[0], r_mins[1])]
+            filtro_radar = filtro_radar.entre("Minutos jugados", r_mins[0], r_mins[1])
     else:
         st.warning("La base no contiene 'Minutos jugados'."); st.stop()
 
     # Nacionalidad
     st.sidebar.markdown("### Filtrar por Nacionalidad")
-    nats = sorted(df_radar["País de nacimiento"].dropna().astype(str).unique())
+    nats = list(filtros_grupo.nacionalidades)
     sel_all = st.sidebar.checkbox(
         "Seleccionar todas las nacionalidades",
         value=True,
@@ -5251,9 +3469,10 @@ if seleccion == "Radares Ligas Alternas":
         "Nacionalidades", nats, default=nats,
         key=f"la_radar3_natlist__{slug_liga}__{slug_temp}"
     )
-    df_radar = df_radar[df_radar["País de nacimiento"].isin(selected_nats)]
+    df_radar = filtro_radar.en("País de nacimiento", selected_nats).aplicar()
     if df_radar.empty:
         st.warning("No hay jugadores tras aplicar filtros."); st.stop()
+    df_radar["Minutos jugados"] = pd.to_numeric(df_radar["Minutos jugados"], errors="coerce")
 
     # =========================
     # Fases por grupo (3 fases) usando columnas en español
@@ -5424,82 +3643,291 @@ if seleccion == "Radares Ligas Alternas":
         fases_juego = {k: [c for c in v if c in df_radar.columns] for k, v in fases_st.items()}
         invertir_vars = inv_st
 
+    # Jugador, modo y render en un fragmento (como en Radares Estadísticos)
+    @st.fragment
+    def panel_radar_la(df_radar, fases_juego, invertir_vars):
+        # =========================
+        # Selección de jugador
+        # =========================
+        st.markdown("### Jugador")
+        jugadores_disp = sorted(df_radar["Jugador"].dropna().astype(str).unique())
+        if not jugadores_disp:
+            st.warning("No hay jugadores tras aplicar filtros."); return
+        jugador_sel = st.selectbox("Jugador", jugadores_disp, index=0)
+
+        df_radar = df_radar.copy()
+        df_radar["Name"] = df_radar["Jugador"]
+
+        # =========================
+        # Modo de variables para el radar
+        # =========================
+        st.markdown("### Modo de variables para el radar")
+        modo_radar_la = st.radio(
+            "Elige cómo quieres armar el radar:",
+            ["Radar predeterminado", "Seleccionar variables para el radar"],
+            index=0,
+            horizontal=True,
+            key=f"la_radar3_modo__{slug_liga}__{slug_temp}"
+        )
+
+        fases_activas = {}
+
+        if modo_radar_la == "Radar predeterminado":
+            # Usamos todas las variables definidas para el grupo, filtrando vacías
+            fases_activas = {fase: vars_f for fase, vars_f in fases_juego.items() if vars_f}
+        else:
+            # Modo personalizado: usuario elige variables por fase
+            st.markdown("#### Selecciona las variables por fase de juego")
+            st.caption("Solo se muestran variables que existen en la base filtrada.")
+
+            for fase, vars_fase in fases_juego.items():
+                disponibles = [v for v in vars_fase if v in df_radar.columns]
+                if not disponibles:
+                    continue
+
+                seleccionadas = st.multiselect(
+                    f"{fase}",
+                    options=disponibles,
+                    default=disponibles,  # si quieres obligar a elegir desde cero, pon default=[]
+                    key=f"la_ms_{fase}_{grupo}_{slug_liga}_{slug_temp}"
+                )
+                if seleccionadas:
+                    fases_activas[fase] = seleccionadas
+
+            if not fases_activas:
+                st.warning("No has seleccionado ninguna métrica para el radar."); return
+
+        # =========================
+        # Render
+        # =========================
+        if jugador_sel and fases_activas:
+            # Radar centrado
+            left, mid, right = st.columns([0.05, 0.90, 0.05])
+            with mid:
+                # Figura cacheada por subconjunto, jugador, fases e invertidas (figuras.py)
+                fig = figuras.radar(
+                    radar_barras_plotly,
+                    jugador=jugador_sel,
+                    df=df_radar,
+                    fases_juego=fases_activas,
+                    invertir_vars=invertir_vars,
+                    chart_height=640,
+                    show_silueta=False
+                )
+                if fig is not None:
+                    st.plotly_chart(fig, use_container_width=True, theme=None)
+
+            # Distribuciones 3×N
+            st.markdown("#### Distribuciones por métrica")
+            grilla = build_kde_grid(df=df_radar, jugador=jugador_sel, fases_juego=fases_activas, height_each=120)
+            if grilla is not None:
+                st.altair_chart(grilla, use_container_width=False, theme=None)
+
+    panel_radar_la(df_radar, fases_juego, invertir_vars)
+
+
+
+##############################################################################################################
+############################## Jugadores Similares ###########################################################
+##############################################################################################################
+
+# ================================
+# Jugadores similares entre ligas p90 (similitud.py)
+# ================================
+if seleccion == "Jugadores Similares":
+    import numpy as np
+    import pandas as pd
+
+    st.markdown("<h3 style='margin-bottom: 15px;'>Jugadores Similares</h3>", unsafe_allow_html=True)
+    st.caption(
+        "Busca en todas las ligas p90 los jugadores con el perfil más parecido, "
+        "sobre las métricas del radar del grupo (z-score dentro de cada liga)."
+    )
+
     # =========================
-    # Selección de jugador
+    # Sidebar: grupo + jugador de referencia
     # =========================
-    st.markdown("### Jugador")
-    jugadores_disp = sorted(df_radar["Jugador"].dropna().astype(str).unique())
-    if not jugadores_disp:
-        st.warning("No hay jugadores tras aplicar filtros."); st.stop()
-    jugador_sel = st.selectbox("Jugador", jugadores_disp, index=0)
+    st.sidebar.markdown("### Grupo de Posición")
+    grupo = st.sidebar.radio("Grupo", list(fases.RADAR_P90), index=0, key="sim_grupo")
+
+    with st.spinner("Armando índice de similitud…"):
+        indice = similitud.indice(grupo)
+    if indice.meta.empty:
+        st.warning("No hay jugadores de este grupo en las ligas p90."); st.stop()
+
+    st.sidebar.markdown("### Jugador de referencia")
+    liga_ref = st.sidebar.selectbox("Liga", catalogo.ligas("p90"), index=0, key="sim_liga")
+    temporada_ref = st.sidebar.selectbox("Temporada", catalogo.temporadas("p90", liga_ref), index=0, key="sim_temporada")
+
+    candidatos_ref = indice.jugadores(liga_ref, temporada_ref).sort_values("Name")
+    if candidatos_ref.empty:
+        st.warning("No hay jugadores de este grupo en esa liga y temporada."); st.stop()
+    fila_ref = st.selectbox(
+        "Jugador",
+        candidatos_ref.index.tolist(),
+        format_func=lambda i: f"{indice.meta.at[i, 'Name']} · {indice.meta.at[i, 'Team']}",
+        key="sim_jugador"
+    )
+
+    # =========================
+    # Parámetros de la búsqueda
+    # =========================
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        distancia = st.radio(
+            "Distancia", ["Coseno", "Mahalanobis"], index=0, horizontal=True,
+            help="Coseno compara la forma del perfil; Mahalanobis además su magnitud, "
+                 "descontando métricas correlacionadas."
+        )
+    with col_b:
+        fases_sel = st.multiselect("Fases", list(fases.RADAR_P90[grupo]), default=list(fases.RADAR_P90[grupo]))
+    with col_c:
+        k = st.slider("Cantidad de resultados", 5, 50, 20)
+
+    col_d, col_e, col_f = st.columns(3)
+    with col_d:
+        max_mins = int(np.nanmax(indice.meta["Minutes"])) if indice.meta["Minutes"].notna().any() else 0
+        minutos_sel = st.slider("Minutos jugados", 0, max(max_mins, 1), (min(600, max_mins), max(max_mins, 1)))
+    with col_e:
+        edades = indice.meta["Age"].dropna()
+        if not edades.empty:
+            edad_sel = st.slider("Edad", int(edades.min()), int(edades.max()), (int(edades.min()), int(edades.max())))
+        else:
+            edad_sel = None
+    with col_f:
+        ligas_todas = sorted(indice.meta["Liga"].unique())
+        ligas_sel = st.multiselect("Ligas", ligas_todas, default=ligas_todas)
 
-    df_radar = df_radar.copy()
-    df_radar["Name"] = df_radar["Jugador"]
+    if not fases_sel:
+        st.warning("Elige al menos una fase."); st.stop()
 
     # =========================
-    # Modo de variables para el radar
+    # Resultados
     # =========================
-    st.markdown("### Modo de variables para el radar")
-    modo_radar_la = st.radio(
-        "Elige cómo quieres armar el radar:",
-        ["Radar predeterminado", "Seleccionar variables para el radar"],
-        index=0,
-        horizontal=True,
-        key=f"la_radar3_modo__{slug_liga}__{slug_temp}"
+    ref = indice.meta.loc[fila_ref]
+    st.markdown(f"#### Similares a {ref['Name']} ({ref['Team']}, {ref['Liga']} {ref['Temporada']})")
+
+    res = similitud.similares(
+        indice, fila_ref, k=k,
+        distancia=distancia.lower(),
+        fases_usadas=fases_sel,
+        minutos=minutos_sel,
+        edad=edad_sel,
+        ligas=ligas_sel,
+    )
+    if res.empty:
+        st.info("Ningún jugador cumple los filtros."); st.stop()
+
+    col_puntaje = "Similitud" if "Similitud" in res.columns else "Distancia"
+    tabla = res.rename(columns={
+        "Name": "Jugador", "Team": "Equipo", "Minutes": "Minutos", "Age": "Edad", "Nationality": "Nacionalidad"
+    })[["Jugador", "Equipo", "Liga", "Temporada", "Minutos", "Edad", "Nacionalidad", col_puntaje]]
+    st.dataframe(
+        tabla.reset_index(drop=True),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Minutos": st.column_config.NumberColumn(format="%d"),
+            "Edad": st.column_config.NumberColumn(format="%d"),
+            col_puntaje: st.column_config.NumberColumn(format="%.2f"),
+        },
     )
 
-    fases_activas = {}
 
-    if modo_radar_la == "Radar predeterminado":
-        # Usamos todas las variables definidas para el grupo, filtrando vacías
-        fases_activas = {fase: vars_f for fase, vars_f in fases_juego.items() if vars_f}
-    else:
-        # Modo personalizado: usuario elige variables por fase
-        st.markdown("#### Selecciona las variables por fase de juego")
-        st.caption("Solo se muestran variables que existen en la base filtrada.")
+if seleccion == "Ficha de Jugador":
+    import pandas as pd
 
-        for fase, vars_fase in fases_juego.items():
-            disponibles = [v for v in vars_fase if v in df_radar.columns]
-            if not disponibles:
-                continue
+    st.markdown("<h3 style='margin-bottom: 15px;'>Ficha de Jugador</h3>", unsafe_allow_html=True)
+    st.caption(
+        "Reúne los datos de un jugador en las cinco fuentes (p90 y las cuatro de SkillCorner), "
+        "ligadas por el índice de identidad (id, nombre + fecha de nacimiento o nombre parecido)."
+    )
 
-            seleccionadas = st.multiselect(
-                f"{fase}",
-                options=disponibles,
-                default=disponibles,  # si quieres obligar a elegir desde cero, pon default=[]
-                key=f"la_ms_{fase}_{grupo}_{slug_liga}_{slug_temp}"
-            )
-            if seleccionadas:
-                fases_activas[fase] = seleccionadas
+    # =========================
+    # Sidebar: jugador p90
+    # =========================
+    st.sidebar.markdown("### Jugador")
+    liga_fj = st.sidebar.selectbox("Liga", catalogo.ligas("p90"), index=0, key="fj_liga")
+    temporada_fj = st.sidebar.selectbox("Temporada", catalogo.temporadas("p90", liga_fj), index=0, key="fj_temporada")
+    precalentar.anotar_uso("p90", liga_fj)
+
+    archivo_fj = catalogo.archivo("p90", liga_fj, temporada_fj)
+    if archivo_fj is None:
+        st.warning("No hay archivo p90 para esa liga y temporada."); st.stop()
+    df_fj = filtros.filtrar(cargar_columnas(archivo_fj, [], familia="p90")) \
+        .igual("Competition", catalogo.nombre_base_liga("p90", liga_fj, temporada_fj)) \
+        .igual("Season", temporada_fj) \
+        .aplicar()
+    jugadores_fj = df_fj[["Name", "Team", "Birth Date"]].drop_duplicates().sort_values(["Name", "Team"])
+    if jugadores_fj.empty:
+        st.warning("No hay jugadores en esa liga y temporada."); st.stop()
+    fila_fj = st.sidebar.selectbox(
+        "Jugador",
+        jugadores_fj.index.tolist(),
+        format_func=lambda i: f"{jugadores_fj.at[i, 'Name']} · {jugadores_fj.at[i, 'Team']}",
+        key="fj_jugador"
+    )
+    sel = jugadores_fj.loc[fila_fj]
 
-        if not fases_activas:
-            st.warning("No has seleccionado ninguna métrica para el radar."); st.stop()
+    with st.spinner("Armando índice de identidad…"):
+        try:
+            persona = identidad.buscar(
+                "p90", archivo_fj, sel["Name"], equipo=sel["Team"],
+                nacimiento=sel["Birth Date"] if pd.notna(sel["Birth Date"]) else None
+            )
+        except ValueError as e:
+            st.error(str(e)); st.stop()
+    if persona is None:
+        st.warning("El jugador no está en el índice de identidad."); st.stop()
 
     # =========================
-    # Render
+    # Apariciones
     # =========================
-    if jugador_sel and fases_activas:
-        # Radar centrado
-        left, mid, right = st.columns([0.05, 0.90, 0.05])
-        with mid:
-            fig = radar_barras_plotly(
-                jugador=jugador_sel,
-                df=df_radar,
-                fases_juego=fases_activas,
-                invertir_vars=invertir_vars,
-                chart_height=640,
-                show_silueta=False
-            )
-            if fig is not None:
-                st.plotly_chart(fig, use_container_width=True, theme=None)
+    st.markdown(f"#### {persona.nombre}")
+    st.caption(f"Nacimiento: {persona.nacimiento or 's/d'} · id: {persona.id}")
+    st.dataframe(
+        pd.DataFrame([
+            {"Familia": a.familia, "Liga": a.liga, "Temporada": a.temporada,
+             "Equipo": a.equipo, "Jugador": a.jugador, "Método": a.metodo}
+            for a in persona.apariciones
+        ]),
+        use_container_width=True,
+        hide_index=True,
+    )
 
-        # Distribuciones 3×N
-        st.markdown("#### Distribuciones por métrica")
-        charts = build_kde_charts(df=df_radar, jugador=jugador_sel, fases_juego=fases_activas, height_each=120)
-        if charts:
-            for i in range(0, len(charts), 3):
-                cols = st.columns(3, gap="large")
-                for j in range(3):
-                    if i + j < len(charts):
-                        with cols[j]:
-                            st.altair_chart(charts[i + j], use_container_width=True, theme=None)
+    # =========================
+    # Datos por fuente
+    # =========================
+    titulos_fj = {
+        "p90": "Estadísticas p90",
+        "fisico": "Estadísticas Físicas",
+        "presion": "Juego Bajo Presión",
+        "espacio": "Pases al Espacio",
+        "desmarque": "Movimientos sin Balón",
+    }
+    for familia in identidad.FAMILIAS:
+        st.markdown(f"##### {titulos_fj.get(familia, familia)}")
+        partes = []
+        for a in persona.en(familia):
+            filas_a = identidad.filas(a)
+            if filas_a.empty:
+                continue
+            if familia == "p90":
+                metricas = [
+                    m for g in filas_a["Grupo"].dropna().unique() if g in fases.RADAR_P90
+                    for vs in fases.RADAR_P90[g].values() for m in vs
+                ]
+                cols = ["Team", "Season", "Minutes", "Primary Position"] + list(dict.fromkeys(metricas))
+            else:
+                cols = [c for c in filas_a.columns
+                        if c not in ("Player ID", "_PlayerKey", "_Unica") and pd.api.types.is_numeric_dtype(filas_a[c])]
+            # p90: una columna por equipo (cambios a mitad de temporada); SkillCorner: por grupo
+            etiquetas = [f"{a.liga} {a.temporada} · {a.equipo}"] * len(filas_a) if familia == "p90" else \
+                [f"{a.liga} {a.temporada} · {g}" for g in filas_a["Grupo"].astype(str)]
+            filas_a = filas_a[[c for c in cols if c in filas_a.columns]].copy()
+            filas_a.index = etiquetas
+            partes.append(filas_a)
+        if not partes:
+            st.caption("Sin datos en esta fuente.")
+            continue
+        st.dataframe(pd.concat(partes).T.astype(str), use_container_width=True)
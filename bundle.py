@@ -0,0 +1,247 @@
+"""
+Bundle Arrow compartido entre procesos.
+
+Paso offline (`python bundle.py`): cada archivo del catálogo se tipa con su
+esquema (datos.ESQUEMAS) y se escribe como un segmento Arrow IPC dentro de UN
+solo archivo, `bundle-<generación>.arrow`, con un índice `bundle.json` de
+offsets por archivo. En tiempo de servicio cada proceso de Streamlit mapea el
+bundle en memoria (mmap) y lee los segmentos sin copiar: todos los workers
+comparten la misma copia física en el page cache y nadie vuelve a parsear un CSV.
+
+Para que to_pandas no tenga que copiar, cada columna se guarda en una forma
+que pandas pueda envolver tal cual: floats con NaN como valor (sin bitmap de
+nulos), categóricas como sus códigos enteros (las categorías van en los
+metadatos del esquema), fechas como int64, booleanos como uint8 y texto como
+large_string (el dtype str de pandas 3 es Arrow). a_pandas() rearma el
+DataFrame con vistas de solo lectura sobre el mmap; bytes_mapeados() dice
+cuánto de un DataFrame apunta de verdad al bundle.
+
+Un segmento solo se usa si coincide con la versión actual del CSV (mtime,
+tamaño), con ESQUEMA_VERSION y con FORMATO; si no, datos.py sigue su camino
+normal (snapshot Parquet / CSV).
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+# =========================
+# Configuración
+# =========================
+BUNDLE_DIR = os.environ.get(
+    "BUNDLE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots"),
+)
+INDICE = os.path.join(BUNDLE_DIR, "bundle.json")   # apunta al bundle vigente
+FORMATO = 2   # codificación de columnas de los segmentos (subir si cambia _a_arrow)
+
+_LOCK = threading.Lock()
+_MAPA = None   # (version del índice, buffer mapeado, índice) del proceso
+
+
+# =========================
+# Helpers
+# =========================
+def _clave(ruta: str, familia: str | None) -> str:
+    return f"{os.path.basename(ruta)}|{familia or 'raw'}"
+
+
+def _version_bundle() -> tuple[int, int] | None:
+    try:
+        st_ = os.stat(INDICE)
+    except OSError:
+        return None
+    return (st_.st_mtime_ns, st_.st_size)
+
+
+def _a_arrow(df: pd.DataFrame) -> pa.Table:
+    """Tabla Arrow sin bitmaps de nulos en las columnas de ancho fijo (ver docstring del módulo)."""
+    columnas, tipos = {}, {}
+    for c in df.columns:
+        s = df[c]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            columnas[c] = pa.array(s.cat.codes.to_numpy())
+            tipos[c] = {"tipo": "categoria", "categorias": s.cat.categories.tolist(),
+                        "ordenada": bool(s.cat.ordered)}
+        elif pd.api.types.is_datetime64_dtype(s.dtype):
+            columnas[c] = pa.array(s.to_numpy().view("int64"))
+            tipos[c] = {"tipo": "fecha", "dtype": s.dtype.str}
+        elif pd.api.types.is_bool_dtype(s.dtype) and s.dtype.kind == "b":
+            columnas[c] = pa.array(s.to_numpy().view("uint8"))
+            tipos[c] = {"tipo": "bool"}
+        elif s.dtype.kind in "fiu":
+            columnas[c] = pa.array(s.to_numpy(), from_pandas=False)   # NaN queda como valor
+        elif pd.api.types.is_string_dtype(s.dtype):
+            columnas[c] = pa.array(s, type=pa.large_string(), from_pandas=True)
+        else:
+            columnas[c] = pa.array(s, from_pandas=True)
+    meta = {b"datos": json.dumps(tipos, ensure_ascii=False).encode("utf-8")}
+    return pa.table(columnas).replace_schema_metadata(meta)
+
+
+def _abrir() -> tuple | None:
+    """Mapea bundle + índice una vez por proceso (se re-mapea si se reconstruyó)."""
+    global _MAPA
+    version = _version_bundle()
+    if version is None:
+        return None
+    with _LOCK:
+        if _MAPA is not None and _MAPA[0] == version:
+            return _MAPA
+        try:
+            with open(INDICE, encoding="utf-8") as fh:
+                indice = json.load(fh)
+            # read_buffer sobre un memory_map no copia: es una vista del archivo entero
+            buf = pa.memory_map(os.path.join(BUNDLE_DIR, indice["bundle"]), "r").read_buffer()
+        except (OSError, ValueError, KeyError):
+            return None
+        _MAPA = (version, buf, indice)
+        return _MAPA
+
+
+# =========================
+# API
+# =========================
+def leer_tabla(ruta: str, familia: str | None, version: tuple[int, int], esquema_version: int) -> pa.Table | None:
+    """
+    Tabla Arrow de `ruta` servida desde el bundle (zero-copy sobre el mmap),
+    o None si no hay bundle o el segmento no corresponde a la versión actual.
+    """
+    abierto = _abrir()
+    if abierto is None:
+        return None
+    _, buf, indice = abierto
+    seg = indice["archivos"].get(_clave(ruta, familia))
+    if (seg is None or seg["version"] != list(version) or seg["esquema"] != esquema_version
+            or seg.get("formato") != FORMATO):
+        return None
+    return pa.ipc.open_file(buf.slice(seg["offset"], seg["largo"])).read_all()
+
+
+def a_pandas(tabla: pa.Table) -> pd.DataFrame:
+    """
+    DataFrame de una tabla del bundle sin copiar: cada columna es una vista de
+    solo lectura sobre el mmap. Requiere pandas >= 3: su copy-on-write copia la
+    columna al mutarla, y su dtype str envuelve large_string sin pasar a object.
+    """
+    tipos = json.loads((tabla.schema.metadata or {}).get(b"datos", b"{}"))
+    series = {}
+    for nombre, col in zip(tabla.column_names, tabla.columns):
+        info = tipos.get(nombre)
+        if info is None:
+            if pa.types.is_large_string(col.type) or col.num_chunks != 1 or col.null_count:
+                series[nombre] = col.to_pandas()
+            else:
+                series[nombre] = pd.Series(col.chunk(0).to_numpy(zero_copy_only=True), copy=False)
+            continue
+        valores = col.chunk(0).to_numpy(zero_copy_only=True) if col.num_chunks == 1 else col.to_numpy()
+        if info["tipo"] == "categoria":
+            dtype = pd.CategoricalDtype(pd.Index(info["categorias"]), ordered=info["ordenada"])
+            series[nombre] = pd.Series(pd.Categorical.from_codes(valores, dtype=dtype, validate=False), copy=False)
+        elif info["tipo"] == "fecha":
+            series[nombre] = pd.Series(valores.view(info["dtype"]), copy=False)
+        else:
+            series[nombre] = pd.Series(valores.view(bool), copy=False)
+    return pd.DataFrame(series, copy=False)
+
+
+def _buffers(s: pd.Series) -> list:
+    """(dirección, bytes) de los buffers de datos de una columna."""
+    arr = s.array
+    if isinstance(arr, pd.Categorical):
+        arr = arr.codes
+    if hasattr(arr, "_pa_array"):
+        return [(b.address, b.size) for ch in arr._pa_array.chunks for b in ch.buffers() if b is not None]
+    arr = np.asarray(arr)
+    return [(arr.__array_interface__["data"][0], arr.nbytes)]
+
+
+def bytes_mapeados(df: pd.DataFrame) -> dict:
+    """Columna -> (bytes que apuntan al bundle mapeado, bytes totales de sus datos)."""
+    abierto = _abrir()
+    inicio, fin = (abierto[1].address, abierto[1].address + abierto[1].size) if abierto else (0, 0)
+    out = {}
+    for c in df.columns:
+        bufs = _buffers(df[c])
+        mapeados = sum(n for d, n in bufs if inicio <= d and d + n <= fin)
+        out[c] = (mapeados, sum(n for _, n in bufs))
+    return out
+
+
+def construir(entradas=None) -> dict:
+    """
+    Escribe un bundle nuevo con todos los archivos del catálogo (o solo
+    `entradas`) y devuelve el índice. Cada build es una generación aparte y el índice se reemplaza de
+    forma atómica al final: los procesos que tengan mapeada la generación
+    anterior siguen leyéndola hasta re-mapear.
+    """
+    import catalogo
+    import datos
+
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    nombre = f"bundle-{time.time_ns()}.arrow"
+    archivos = {}
+    with open(os.path.join(BUNDLE_DIR, nombre), "wb") as fh:
+        for entrada in (catalogo.catalogo() if entradas is None else entradas):
+            clave = _clave(entrada.ruta, entrada.familia)
+            if clave in archivos or not os.path.exists(entrada.ruta):
+                continue
+            df = datos.cargar_csv(entrada.ruta, familia=entrada.familia)
+            df = df.drop(columns=list(datos.COLUMNAS_EFIMERAS), errors="ignore")
+            tabla = _a_arrow(df)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_file(sink, tabla.schema) as writer:
+                writer.write_table(tabla)
+            segmento = sink.getvalue()
+            # Alineado a 64 bytes para que los buffers Arrow queden alineados en el mmap
+            fh.write(b"\0" * (-fh.tell() % 64))
+            archivos[clave] = {
+                "offset": fh.tell(),
+                "largo": segmento.size,
+                "version": list(datos.version_archivo(entrada.ruta)),
+                "esquema": datos.ESQUEMA_VERSION,
+                "formato": FORMATO,
+                "filas": tabla.num_rows,
+            }
+            fh.write(segmento)
+
+    indice = {"bundle": nombre, "archivos": archivos}
+    tmp = f"{INDICE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(indice, fh, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, INDICE)
+
+    # Generaciones anteriores: en Linux los procesos que las tengan mapeadas conservan su copia
+    for viejo in os.listdir(BUNDLE_DIR):
+        if viejo.startswith("bundle-") and viejo.endswith(".arrow") and viejo != nombre:
+            try:
+                os.remove(os.path.join(BUNDLE_DIR, viejo))
+            except OSError:
+                pass
+    return indice
+
+
+if __name__ == "__main__":
+    import bundle   # el módulo que usa datos.py (este corre como __main__ con su propio mmap)
+    import catalogo
+    import datos
+
+    t0 = time.perf_counter()
+    idx = construir()
+    ruta_bundle = os.path.join(BUNDLE_DIR, idx["bundle"])
+    total = os.path.getsize(ruta_bundle) / 2**20
+    print(f"{len(idx['archivos'])} archivos -> {ruta_bundle} ({total:.1f} MiB) en {time.perf_counter() - t0:.1f}s")
+
+    # Cuánto de lo que sirve datos.py apunta al mmap (el resto se copia por proceso)
+    datos.limpiar_cache()
+    mapeados = totales = 0
+    for entrada in catalogo.catalogo():
+        if os.path.exists(entrada.ruta):
+            for m, t in bundle.bytes_mapeados(datos.cargar_csv(entrada.ruta, familia=entrada.familia)).values():
+                mapeados, totales = mapeados + m, totales + t
+    print(f"mapeado: {mapeados / 2**20:.1f} de {totales / 2**20:.1f} MiB ({100 * mapeados / max(totales, 1):.0f}%)")
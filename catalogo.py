@@ -0,0 +1,276 @@
+"""
+Catálogo único de archivos del dashboard.
+
+Un registro por CSV: liga, temporada, familia (p90, fisico, presion, espacio,
+desmarque, alternas), proveedor, delimitador, filas, columnas y el nombre con el
+que la liga aparece dentro del archivo (`nombre_base_liga`). Se construye una
+sola vez por proceso; selectores, cargas y precálculos leen de aquí, así que
+agregar una liga es tocar este archivo y nada más.
+"""
+import csv
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from datos import formato_archivo
+
+
+# =========================
+# Configuración
+# =========================
+DATA_DIR = os.environ.get("DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+FAMILIAS_SKILLCORNER = ("fisico", "presion", "espacio", "desmarque")
+FAMILIAS = ("p90",) + FAMILIAS_SKILLCORNER + ("alternas",)
+
+PROVEEDORES = {
+    "p90": "StatsBomb",
+    "fisico": "SkillCorner",
+    "presion": "SkillCorner",
+    "espacio": "SkillCorner",
+    "desmarque": "SkillCorner",
+    "alternas": "Wyscout",
+}
+
+
+@dataclass(frozen=True)
+class Archivo:
+    liga: str
+    temporada: str
+    familia: str
+    archivo: str                 # nombre del CSV (relativo a DATA_DIR)
+    proveedor: str
+    nombre_base_liga: str | None  # valor de "Competition" dentro del CSV (solo p90)
+    sep: str = ","
+    filas: int = 0
+    columnas: tuple[str, ...] = ()
+
+    @property
+    def ruta(self) -> str:
+        return os.path.join(DATA_DIR, self.archivo)
+
+
+# =========================
+# Ligas p90 (StatsBomb)
+# =========================
+# (liga, temporada, archivo) en el orden en que se muestran en el selector
+_P90 = [
+    ("Liga MX", "2024/2025", "ligamxp902425.csv"),
+    ("Liga MX", "2025/2026", "ligamxp902526.csv"),
+    ("Liga Profesional, Argentina", "2025", "argp902025.csv"),
+    ("Liga Profesional, Argentina", "2026", "argp902026.csv"),
+    ("Jupiler Pro League, Bélgica", "2024/2025", "belp902425.csv"),
+    ("Jupiler Pro League, Bélgica", "2025/2026", "belp902526.csv"),
+    ("Serie A, Brasil", "2025", "brap902025.csv"),
+    ("Serie A, Brasil", "2026", "brap902026.csv"),
+    ("Primera División, Chile", "2025", "chip902025.csv"),
+    ("Primera División, Chile", "2026", "chip902026.csv"),
+    ("Primera A, Colombia", "2025", "colp902025.csv"),
+    ("Primera A, Colombia", "2026", "colp902026.csv"),
+    ("Liga Pro, Ecuador", "2025", "ecup902025.csv"),
+    ("Premier League, Inglaterra", "2024/2025", "engp902425.csv"),
+    ("Premier League, Inglaterra", "2025/2026", "engp902526.csv"),
+    ("Ligue 1, Francia", "2024/2025", "frap902425.csv"),
+    ("Ligue 1, Francia", "2025/2026", "frap902526.csv"),
+    ("1. Bundesliga, Alemania", "2024/2025", "gerp902425.csv"),
+    ("1. Bundesliga, Alemania", "2025/2026", "gerp902526.csv"),
+    ("Serie A, Italia", "2024/2025", "ita1p902425.csv"),
+    ("Serie A, Italia", "2025/2026", "ita1p902526.csv"),
+    ("Serie B, Italia", "2024/2025", "seriebp902425.csv"),
+    ("Serie B, Italia", "2025/2026", "ita2p902526.csv"),
+    ("Eredivisie, Países Bajos", "2024/2025", "nedp902425.csv"),
+    ("Eredivisie, Países Bajos", "2025/2026", "nedp902526.csv"),
+    ("División Profesional, Paraguay", "2025", "parp902025.csv"),
+    ("División Profesional, Paraguay", "2026", "parp902026.csv"),
+    ("Primeira Liga, Portugal", "2024/2025", "porp902425.csv"),
+    ("Primeira Liga, Portugal", "2025/2026", "porp902526.csv"),
+    ("Premier League, Rusia", "2024/2025", "rusp902425.csv"),
+    ("Premier League, Rusia", "2025/2026", "rusp902526.csv"),
+    ("Pro League, Arabia", "2024/2025", "arap902425.csv"),
+    ("Pro League, Arabia", "2025/2026", "arap902526.csv"),
+    ("La Liga, España", "2024/2025", "espp902425.csv"),
+    ("La Liga, España", "2025/2026", "laligap902526.csv"),
+    ("La Liga 2, España", "2024/2025", "esp2p902425.csv"),
+    ("La Liga 2, España", "2025/2026", "laliga22526.csv"),
+    ("Primera División, Uruguay", "2025", "urup902025.csv"),
+    ("MLS, Estados Unidos", "2025", "mlsp902025.csv"),
+    ("MLS, Estados Unidos", "2026", "mlsp902026.csv"),
+]
+
+# Mapeo de nombre visible a nombre real en la base de datos (columna Competition)
+_NOMBRE_BASE_LIGA = {
+    "Liga Profesional, Argentina": "Liga Profesional",
+    "Jupiler Pro League, Bélgica": "Jupiler Pro League",
+    "Primera División, Chile": "Primera División",
+    "Primera A, Colombia": "Primera A",
+    "Liga Pro, Ecuador": "Liga Pro",
+    "Premier League, Inglaterra": "Premier League",
+    "Ligue 1, Francia": "Ligue 1",
+    "1. Bundesliga, Alemania": "1. Bundesliga",
+    "Serie B, Italia": "Serie B",
+    "Eredivisie, Países Bajos": "Eredivisie",
+    "División Profesional, Paraguay": "División Profesional, Paraguay",
+    "Primeira Liga, Portugal": "Primeira Liga",
+    "Premier League, Rusia": "Premier League",
+    "Pro League, Arabia": "Pro League",
+    "La Liga, España": "La Liga",
+    "La Liga 2, España": "La Liga 2",
+    "Primera División, Uruguay": "Primera División",
+    "MLS, Estados Unidos": "Major League Soccer",
+}
+
+# =========================
+# Ligas SkillCorner (físico / presión / espacio / desmarque)
+# =========================
+# (liga, temporada, prefijo): el archivo es f"{prefijo}{familia}.csv"
+_SKILLCORNER = [
+    ("Liga MX", "2024/2025", "ligamx"),
+    ("Liga Profesional, Argentina", "2024", "arg"),
+    ("Jupiler Pro League, Bélgica", "2024/2025", "bel"),
+    ("Serie A, Brasil", "2024", "bra"),
+    ("Primera División, Chile", "2024", "chi"),
+    ("Primera A, Colombia", "2024", "col"),
+    ("Liga Pro, Ecuador", "2024", "ecu"),
+    ("Premier League, Inglaterra", "2024/2025", "eng"),
+    ("La Liga, España", "2024/2025", "esp"),
+    ("Ligue 1, Francia", "2024/2025", "fra"),
+    ("Bundesliga, Alemania", "2024/2025", "ger"),
+    ("Serie A, Italia", "2024/2025", "ita"),
+    ("Primeira Liga, Portugal", "2024/2025", "por"),
+    ("Primera División, Uruguay", "2024", "uru"),
+    ("MLS, Estados Unidos", "2024", "usa"),
+]
+
+# =========================
+# Ligas Alternas (Wyscout)
+# =========================
+_ALTERNAS = [
+    ("MLS Next Pro, USA", "2025", "nextpro2025.csv"),
+    ("Liga de Expansión, México", "24/25", "expansion2425.csv"),
+    ("Liga de Expansión, México", "25/26", "expansion2526.csv"),
+    ("Liga MX Sub-21, México", "25/26", "sub212526.csv"),
+    ("Liga MX Sub-23, México", "24/25", "sub232425.csv"),
+    ("Liga 1, Perú", "2025", "peru2025.csv"),
+    ("Copa Tigo, Bolivia", "2025", "bolivia2025.csv"),
+    ("Liga Futve, Venezuela", "2025", "venezuela2025.csv"),
+    ("Challenger Pro, Bélgica", "24/25", "challengerpro2425.csv"),
+    ("Challenger Pro, Bélgica", "25/26", "challengerpro2526.csv"),
+    ("Série B, Brasil", "2025", "serieb2025.csv"),
+    ("Primera División, Costa Rica", "24/25", "costarica2425.csv"),
+    ("Primera División, Costa Rica", "25/26", "costarica2526.csv"),
+    ("Superleague, Croacia", "24/25", "croacia2425.csv"),
+    ("Chance Liga, Rep. Checa", "24/25", "checa2425.csv"),
+    ("Superliga, Dinamarca", "24/25", "denmark2425.csv"),
+    ("Championship, Inglaterra", "24/25", "championship2425.csv"),
+    ("Ligue 2, Francia", "24/25", "ligue22425.csv"),
+    ("Bundesliga 2, Alemania", "24/25", "bundes22425.csv"),
+    ("Bundesliga 2, Alemania", "25/26", "bundes22526.csv"),
+    ("Super League, Grecia", "24/25", "grecia2425.csv"),
+    ("Super League, Grecia", "25/26", "grecia2526.csv"),
+    ("J1 League, Japón", "2025", "japan2025.csv"),
+    ("K League, Korea", "2025", "korea2025.csv"),
+    ("Liga Profesional, Panamá", "2025", "panama2025.csv"),
+    ("Primera División, Polonia", "24/25", "polonia2425.csv"),
+    ("Segunda Liga, Portugal", "24/25", "portugal22425.csv"),
+    ("Pro League, Arabia", "24/25", "arabia2425.csv"),
+    ("Premiership, Escocia", "24/25", "escocia2425.csv"),
+    ("Premiership, Escocia", "25/26", "escocia2526.csv"),
+    ("Primera RFEF, España", "24/25", "primerarfef2425.csv"),
+    ("Segunda RFEF, España", "24/25", "segundarfef2425.csv"),
+    ("Primera División, Turquía", "24/25", "turquia2425.csv"),
+    ("Bundesliga, Austria", "24/25", "austria2425.csv"),
+    ("Super League, Suiza", "24/25", "suiza2425.csv"),
+    ("Stars League, Qatar", "24/25", "qatar2425.csv"),
+    ("Pro League, Emiratos Árabes", "24/25", "uae2425.csv"),
+]
+
+
+# =========================
+# Construcción
+# =========================
+def _inspeccionar(ruta: str) -> tuple[str, int, tuple[str, ...]]:
+    """Delimitador (manifiesto de datos.py), número de filas y columnas sin parsear el CSV."""
+    try:
+        fmt = formato_archivo(ruta)
+        with open(ruta, encoding=fmt["encoding"], newline="") as fh:
+            cabecera = fh.readline()
+            filas = sum(1 for linea in fh if linea.strip())
+    except (OSError, UnicodeDecodeError):
+        return ",", 0, ()
+    columnas = next(csv.reader([cabecera], delimiter=fmt["sep"], quotechar=fmt["quotechar"]), [])
+    return fmt["sep"], filas, tuple(c.strip() for c in columnas)
+
+
+def _registro(liga, temporada, familia, archivo, nombre_base=None) -> Archivo:
+    sep, filas, columnas = _inspeccionar(os.path.join(DATA_DIR, archivo))
+    return Archivo(
+        liga=liga,
+        temporada=temporada,
+        familia=familia,
+        archivo=archivo,
+        proveedor=PROVEEDORES[familia],
+        nombre_base_liga=nombre_base,
+        sep=sep,
+        filas=filas,
+        columnas=columnas,
+    )
+
+
+@lru_cache(maxsize=1)
+def catalogo() -> tuple[Archivo, ...]:
+    """Todos los registros, en orden de familia y de selector. Se arma una vez por proceso."""
+    regs = []
+    for liga, temporada, archivo in _P90:
+        regs.append(_registro(liga, temporada, "p90", archivo,
+                              _NOMBRE_BASE_LIGA.get(liga, liga)))
+    for familia in FAMILIAS_SKILLCORNER:
+        for liga, temporada, prefijo in _SKILLCORNER:
+            regs.append(_registro(liga, temporada, familia, f"{prefijo}{familia}.csv"))
+    for liga, temporada, archivo in _ALTERNAS:
+        regs.append(_registro(liga, temporada, "alternas", archivo))
+    return tuple(regs)
+
+
+@lru_cache(maxsize=1)
+def _indice() -> dict[tuple[str, str, str], Archivo]:
+    return {(r.familia, r.liga, r.temporada): r for r in catalogo()}
+
+
+# =========================
+# API
+# =========================
+def entradas(familia: str | None = None) -> list[Archivo]:
+    """Registros del catálogo (opcionalmente de una sola familia)."""
+    return [r for r in catalogo() if familia is None or r.familia == familia]
+
+
+def ligas(familia: str) -> list[str]:
+    """Ligas de una familia, sin repetir y en orden de aparición."""
+    return list(dict.fromkeys(r.liga for r in entradas(familia)))
+
+
+def temporadas(familia: str, liga: str) -> list[str]:
+    """Temporadas disponibles para (familia, liga), en orden de aparición."""
+    return [r.temporada for r in entradas(familia) if r.liga == liga]
+
+
+def buscar(familia: str, liga: str, temporada: str) -> Archivo | None:
+    return _indice().get((familia, liga, temporada))
+
+
+def archivo(familia: str, liga: str, temporada: str) -> str | None:
+    """Ruta del CSV para (familia, liga, temporada) o None si no está mapeado."""
+    reg = buscar(familia, liga, temporada)
+    return reg.ruta if reg else None
+
+
+def nombre_base_liga(familia: str, liga: str, temporada: str) -> str:
+    """Valor de Competition dentro del CSV; por defecto el nombre visible."""
+    reg = buscar(familia, liga, temporada)
+    return (reg.nombre_base_liga if reg and reg.nombre_base_liga else liga)
+
+
+def refrescar() -> None:
+    """Vuelve a inspeccionar los archivos (filas/columnas) en el próximo acceso."""
+    catalogo.cache_clear()
+    _indice.cache_clear()
@@ -0,0 +1,671 @@
+"""
+Capa de acceso a datos del dashboard.
+
+Cada CSV se convierte UNA sola vez a un snapshot columnar (Parquet) y se sirve
+desde un cache de proceso indexado por ruta + versión del archivo (mtime, tamaño).
+Así los reruns de Streamlit (cada slider, cada selectbox) no vuelven a parsear
+el CSV.
+
+El formato de cada archivo (delimitador, comillas, BOM) se detecta una vez a
+partir de los primeros bytes y se guarda en un manifiesto junto a los
+snapshots; las lecturas siguientes son de una sola pasada con parámetros
+explícitos.
+
+Al ingerir se aplica el esquema de la familia de proveedor (ESQUEMAS): equipo,
+posición, nacionalidad, third/channel quedan como categóricas y las métricas
+como float32, de modo que el snapshot ya guarda los tipos finales. También se
+calculan ahí las columnas derivadas que antes se rehacían en cada rerun
+(Birth Date, PosPrim, Grupo según posiciones.py, _PlayerKey, y en SkillCorner
+la marca _Unica de la fila que se queda por jugador y grupo); Age sale de
+Birth Date al llenar el cache del proceso, para que no envejezca dentro del
+snapshot.
+
+Las vistas que solo usan unas pocas métricas piden sus columnas con
+cargar_columnas: se leen del Parquet únicamente esas (más las de identidad) y
+se cachean por (archivo, conjunto de columnas).
+
+Si existe un bundle Arrow compartido (bundle.py) con la versión vigente del
+archivo, se lee de ahí antes que del snapshot: es un mmap que todos los
+procesos del servidor comparten.
+
+Junto a cada snapshot se guarda un índice de filtros (`*.filtros.json`), armado
+en la misma ingesta: por grupo de posición, el rango de minutos, el de fechas
+de nacimiento (o de edad, si el archivo no trae la fecha), y las listas
+ordenadas de nacionalidades, jugadores y equipos. El sidebar toma de ahí las
+cotas de los sliders y las opciones de los multiselect (resumen_filtros) sin
+recorrer el DataFrame en cada rerun.
+"""
+import codecs
+import csv
+import json
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import bundle
+import posiciones
+
+
+# =========================
+# Configuración
+# =========================
+SNAPSHOT_DIR = os.environ.get(
+    "SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots"),
+)
+
+MANIFIESTO = os.path.join(SNAPSHOT_DIR, "formatos.json")
+BYTES_MUESTRA = 64 * 1024
+
+# =========================
+# Esquemas por familia de proveedor
+# =========================
+# categoricas -> category | texto -> str (strip) | ids -> se respetan tal cual
+# Cualquier otra columna es métrica: numérica (coerce) en float32.
+_ESQUEMA_SKILLCORNER = {
+    "categoricas": ["Position", "third", "channel"],
+    "texto": ["Player", "Short name", "Birthdate"],
+    "ids": ["Player ID"],
+}
+ESQUEMAS = {
+    "p90": {
+        "categoricas": ["Team", "Competition", "Season", "Primary Position",
+                        "Secondary Position", "Nationality", "Gender"],
+        "texto": ["Name", "Date of Birth"],
+        "ids": [],
+    },
+    "fisico": {
+        "categoricas": ["Position", "Position Group"],
+        "texto": ["Player", "Short Name", "Birthdate"],
+        "ids": ["Player ID"],
+    },
+    "presion": _ESQUEMA_SKILLCORNER,
+    "espacio": _ESQUEMA_SKILLCORNER,
+    "desmarque": _ESQUEMA_SKILLCORNER,
+    "alternas": {
+        "categoricas": ["Equipo", "Equipo durante el período seleccionado",
+                        "Posición específica", "País de nacimiento"],
+        "texto": ["Jugador"],
+        "ids": [],
+    },
+}
+ESQUEMA_VERSION = 5   # subir si cambia ESQUEMAS o derivar(): invalida los snapshots tipados
+
+# =========================
+# Columnas derivadas
+# =========================
+# Fecha de nacimiento de origen y su formato (StatsBomb: dd/mm/yy; SkillCorner: ISO)
+_NACIMIENTO = {
+    "p90": ("Date of Birth", "%d/%m/%y"),
+    "fisico": ("Birthdate", "%Y-%m-%d"),
+    "presion": ("Birthdate", "%Y-%m-%d"),
+    "espacio": ("Birthdate", "%Y-%m-%d"),
+    "desmarque": ("Birthdate", "%Y-%m-%d"),
+}
+
+# Se calculan al llenar el cache del proceso y nunca se persisten (snapshot / bundle)
+COLUMNAS_EFIMERAS = ("Age",)
+
+# Una fila por (jugador, grupo) en los archivos SkillCorner (un jugador puede
+# aparecer varias veces si cambió de equipo). Gana la fila con el mayor valor
+# de la primera columna de la lista que exista en el archivo y tenga datos
+# (una regex en la lista toma la primera columna cuyo nombre coincida);
+# empates -> la primera del archivo. La marca va en COLUMNA_UNICA (snapshot).
+COLUMNA_UNICA = "_Unica"
+_MINUTOS_PARTIDO = ("Minutes played per match", "Adjusted min TIP per match")
+# Cualquier otro encabezado de "minutos por partido" (p. ej. una exportación nueva)
+_MINUTOS_PARTIDO_REGEX = re.compile(r"(?=.*min)(?=.*(?:match|partido| per ))", re.IGNORECASE)
+DEDUPE = {   # familia -> (columna de jugador, prioridad de columnas de minutos)
+    "fisico": ("_PlayerKey", ("Minutes", "Minutes per Match", "Minutos por Partido", "Min/Match",
+                              "Minutes/Match", "Minutos promedio por partido", "Min per match", "MPM")
+               + _MINUTOS_PARTIDO + (_MINUTOS_PARTIDO_REGEX,)),
+    "presion": ("Player", _MINUTOS_PARTIDO + ("Count Pressures received in sample",)),
+    "espacio": ("Player", _MINUTOS_PARTIDO + ("Count opportunities to pass to Runs in sample",)),
+    "desmarque": ("Player", ("Minutes",) + _MINUTOS_PARTIDO),
+}
+
+# Columnas de identidad que toda vista necesita (filtros, tablas, tooltips);
+# cargar_columnas las agrega siempre a las métricas pedidas.
+COLUMNAS_ID = {
+    "p90": ["Name", "Team", "Competition", "Season", "Primary Position",
+            "Nationality", "Date of Birth", "Minutes", "Birth Date", "Age", "PosPrim", "Grupo"],
+    "alternas": ["Jugador", "Equipo", "Posición específica", "Edad",
+                 "País de nacimiento", "Minutos jugados"],
+}
+
+# Índice de filtros (resumen_filtros): columnas que se resumen por familia
+_FILTROS_SKILLCORNER = {"minutos": "Minutes", "nacimiento": "Birth Date", "jugador": "Player"}
+COLUMNAS_FILTROS = {
+    "p90": {"minutos": "Minutes", "nacimiento": "Birth Date", "nacionalidad": "Nationality",
+            "jugador": "Name", "equipo": "Team"},
+    "fisico": _FILTROS_SKILLCORNER,
+    "presion": _FILTROS_SKILLCORNER,
+    "espacio": _FILTROS_SKILLCORNER,
+    "desmarque": _FILTROS_SKILLCORNER,
+    "alternas": {"minutos": "Minutos jugados", "edad": "Edad", "nacionalidad": "País de nacimiento",
+                 "jugador": "Jugador", "equipo": "Equipo"},
+}
+FILTROS_VERSION = 1   # subir si cambia COLUMNAS_FILTROS o ResumenFiltros
+
+_LOCK = threading.RLock()
+_LOCKS_ARCHIVO = {}   # ruta -> Lock (dos hilos no parsean el mismo CSV a la vez)
+_CACHE = {}           # (ruta, familia) -> (version, DataFrame)
+_CACHE_COLS = {}      # (ruta, familia, frozenset(columnas)) -> (version, DataFrame)
+_RESUMENES = {}       # (ruta, familia) -> (version, {grupo o "*": ResumenFiltros})
+_FORMATOS = None      # manifiesto en memoria: nombre -> {version, sep, quotechar, encoding}
+_INVALIDADORES = []   # funciones (ruta) -> None de caches derivados (rankings, percentiles, KDE)
+
+
+@dataclass(frozen=True)
+class ResumenFiltros:
+    """Cotas y opciones de los filtros del sidebar para un grupo de un archivo."""
+    filas: int = 0
+    minutos: tuple | None = None      # (mín, máx)
+    nacimiento: tuple | None = None   # (más antigua, más reciente) como "AAAA-MM-DD"
+    edades: tuple | None = None       # (mín, máx) si el archivo trae la edad y no la fecha
+    nacionalidades: tuple = ()
+    jugadores: tuple = ()
+    equipos: tuple = ()
+
+    @property
+    def edad(self) -> tuple | None:
+        """(mín, máx) de edad en años; con fechas, a hoy (misma cuenta que Age en _con_edad)."""
+        if self.nacimiento is None:
+            return self.edades
+        hoy = pd.Timestamp("today")
+        antigua, reciente = (pd.Timestamp(f) for f in self.nacimiento)
+        return ((hoy - reciente).days / 365.25, (hoy - antigua).days / 365.25)
+
+
+# =========================
+# Helpers
+# =========================
+def version_archivo(ruta: str) -> tuple[int, int]:
+    """(mtime_ns, tamaño) del archivo: cambia en cuanto se reemplaza el CSV."""
+    st_ = os.stat(ruta)
+    return (st_.st_mtime_ns, st_.st_size)
+
+
+def _lock_archivo(ruta: str) -> threading.Lock:
+    with _LOCK:
+        return _LOCKS_ARCHIVO.setdefault(ruta, threading.Lock())
+
+
+def _ruta_snapshot(ruta: str, version: tuple[int, int], familia: str | None) -> str:
+    base = os.path.splitext(os.path.basename(ruta))[0]
+    tipo = f"{familia}.v{ESQUEMA_VERSION}" if familia else "raw"
+    return os.path.join(SNAPSHOT_DIR, f"{base}-{version[0]}-{version[1]}-{tipo}.parquet")
+
+
+def _esquema_vigente(nombre: str) -> bool:
+    """True si el snapshot `nombre` es crudo o del ESQUEMA_VERSION actual."""
+    tipo = nombre.removesuffix(".filtros.json").removesuffix(".parquet").rsplit("-", 1)[-1]
+    return tipo == "raw" or tipo.endswith(f".v{ESQUEMA_VERSION}")
+
+
+def _borrar_snapshots(obsoleto) -> None:
+    try:
+        nombres = os.listdir(SNAPSHOT_DIR)
+    except FileNotFoundError:
+        return
+    for nombre in nombres:
+        if nombre.endswith((".parquet", ".filtros.json")) and obsoleto(nombre):
+            try:
+                os.remove(os.path.join(SNAPSHOT_DIR, nombre))
+            except OSError:
+                pass
+
+
+def _borrar_snapshots_viejos(ruta: str, version: tuple[int, int]) -> None:
+    """
+    Elimina snapshots (e índices de filtros) del mismo CSV que sean de una
+    versión anterior del archivo o de otro ESQUEMA_VERSION.
+    """
+    base = os.path.splitext(os.path.basename(ruta))[0]
+    vigente = f"{base}-{version[0]}-{version[1]}-"
+    _borrar_snapshots(lambda nombre: nombre.startswith(f"{base}-")
+                      and not (nombre.startswith(vigente) and _esquema_vigente(nombre)))
+
+
+def detectar_formato(ruta: str) -> dict:
+    """Delimitador, comillas y BOM a partir de los primeros bytes del archivo."""
+    with open(ruta, "rb") as fh:
+        crudo = fh.read(BYTES_MUESTRA)
+    con_bom = crudo.startswith(codecs.BOM_UTF8)
+    encoding = "utf-8-sig" if con_bom else "utf-8"
+    texto = crudo.decode(encoding, errors="ignore")
+    # Solo líneas completas: la muestra puede cortar la última a la mitad
+    if len(crudo) == BYTES_MUESTRA and "\n" in texto:
+        texto = texto[: texto.rindex("\n")]
+    try:
+        dialecto = csv.Sniffer().sniff(texto, delimiters=";,")
+        sep, quotechar = dialecto.delimiter, dialecto.quotechar or '"'
+    except csv.Error:
+        cabecera = texto.split("\n", 1)[0]
+        sep = ";" if cabecera.count(";") > cabecera.count(",") else ","
+        quotechar = '"'
+    return {"sep": sep, "quotechar": quotechar, "encoding": encoding}
+
+
+def _cargar_manifiesto() -> dict:
+    global _FORMATOS
+    if _FORMATOS is None:
+        try:
+            with open(MANIFIESTO, encoding="utf-8") as fh:
+                _FORMATOS = json.load(fh)
+        except (OSError, ValueError):
+            _FORMATOS = {}
+    return _FORMATOS
+
+
+def _guardar_manifiesto(formatos: dict) -> None:
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp = f"{MANIFIESTO}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(formatos, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, MANIFIESTO)
+    except OSError:
+        pass
+
+
+def formato_archivo(ruta: str) -> dict:
+    """Formato del CSV según el manifiesto; se detecta (y se anota) si falta o cambió el archivo."""
+    nombre = os.path.basename(ruta)
+    version = list(version_archivo(ruta))
+    with _LOCK:
+        formatos = _cargar_manifiesto()
+        fmt = formatos.get(nombre)
+        if fmt is None or fmt.get("version") != version:
+            fmt = dict(detectar_formato(ruta), version=version)
+            formatos[nombre] = fmt
+            _guardar_manifiesto(formatos)
+        return fmt
+
+
+def _leer_csv(ruta: str) -> pd.DataFrame:
+    """Una sola pasada de read_csv con el formato del manifiesto."""
+    fmt = formato_archivo(ruta)
+    df = pd.read_csv(ruta, sep=fmt["sep"], quotechar=fmt["quotechar"], encoding=fmt["encoding"])
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def aplicar_esquema(df: pd.DataFrame, familia: str | None) -> pd.DataFrame:
+    """Castea `df` según ESQUEMAS[familia]; sin familia se devuelve igual."""
+    esquema = ESQUEMAS.get(familia)
+    if esquema is None:
+        return df
+    categoricas = set(esquema["categoricas"])
+    texto = set(esquema["texto"])
+    ids = set(esquema["ids"])
+    cols = {}
+    for c in df.columns:
+        s = df[c]
+        if c in ids:
+            continue
+        if c in categoricas:
+            if pd.api.types.is_numeric_dtype(s):   # p. ej. Season=2025 leído como int
+                s = s.astype(str)
+            cols[c] = s.astype("category")
+        elif c in texto:
+            cols[c] = s.where(s.isna(), s.astype(str).str.strip())
+        elif s.dtype != "float32":
+            cols[c] = pd.to_numeric(s, errors="coerce").astype("float32")
+    if cols:
+        # Un solo DataFrame nuevo (assign columna a columna fragmenta el bloque)
+        df = pd.DataFrame({c: cols.get(c, df[c]) for c in df.columns}, index=df.index)
+    return df
+
+
+def _fechas(texto: pd.Series, formato: str) -> pd.Series:
+    """Parseo vectorizado con formato fijo; lo que no calce se intenta con el parser genérico."""
+    fechas = pd.to_datetime(texto, format=formato, errors="coerce")
+    faltan = fechas.isna() & texto.notna()
+    if faltan.any():
+        fechas[faltan] = pd.to_datetime(texto[faltan], errors="coerce", dayfirst=formato.startswith("%d"))
+    return fechas
+
+
+def _texto_normalizado(s: pd.Series) -> pd.Series:
+    """Strip + sin acentos + espacios simples, calculado una vez por valor distinto."""
+    def norm(v) -> str:
+        v = "" if pd.isna(v) else str(v)
+        v = unicodedata.normalize("NFKD", v.strip())
+        v = "".join(ch for ch in v if not unicodedata.combining(ch))
+        return " ".join(v.split())
+    unicos = {v: norm(v) for v in pd.unique(s)}
+    return s.map(unicos).astype(str)
+
+
+def derivar(df: pd.DataFrame, familia: str | None) -> pd.DataFrame:
+    """Columnas derivadas que se guardan en el snapshot (una sola vez por archivo)."""
+    cols = {}
+    origen = _NACIMIENTO.get(familia)
+    if origen and origen[0] in df.columns:
+        cols["Birth Date"] = _fechas(df[origen[0]], origen[1])
+    if familia == "p90" and "Primary Position" in df.columns:
+        cols["PosPrim"] = df["Primary Position"].astype(str).str.strip().astype("category")
+        cols["Grupo"] = posiciones.grupo(cols["PosPrim"], "statsbomb")
+    if familia in ("fisico", "presion", "espacio", "desmarque") and "Position" in df.columns:
+        cols["Grupo"] = posiciones.grupo(df["Position"], "skillcorner")
+        if "Player ID" in df.columns and df["Player ID"].notna().any():
+            cols["_PlayerKey"] = df["Player ID"].astype(str).str.strip()
+        elif "Player" in df.columns:
+            cols["_PlayerKey"] = _texto_normalizado(df["Player"])
+        else:
+            cols["_PlayerKey"] = pd.Series([f"row_{i}" for i in range(len(df))], index=df.index)
+    if cols:
+        df = df.assign(**cols)
+    if familia in DEDUPE:
+        df = df.assign(**{COLUMNA_UNICA: filas_por_jugador(df, *DEDUPE[familia])})
+    return df
+
+
+def filas_por_jugador(df: pd.DataFrame, jugador: str, prioridad) -> pd.Series:
+    """
+    Marca (bool por fila) de la fila que se queda por (jugador, Grupo): la de
+    mayor valor en la primera columna de `prioridad` presente y con datos
+    (faltantes al final). Una regex en `prioridad` representa las columnas
+    cuyo nombre coincide, en el orden del archivo. Se calculan todos los
+    grupos en una sola pasada.
+    """
+    if jugador not in df.columns or "Grupo" not in df.columns:
+        return pd.Series(True, index=df.index)
+    candidatas = []
+    for p in prioridad:
+        if isinstance(p, re.Pattern):
+            candidatas.extend(c for c in df.columns if isinstance(c, str) and p.search(c))
+        else:
+            candidatas.append(p)
+    puntaje = pd.Series(-1e12, index=df.index, dtype=float)
+    for c in candidatas:
+        if c in df.columns and df[c].notna().any():
+            puntaje = pd.to_numeric(df[c], errors="coerce").astype(float).fillna(-1e12)
+            break
+    ganadoras = puntaje.groupby([df[jugador], df["Grupo"]], dropna=False, sort=False, observed=True).idxmax()
+    return pd.Series(df.index.isin(ganadoras.to_numpy()), index=df.index)
+
+
+def _con_edad(df: pd.DataFrame) -> pd.DataFrame:
+    """Age (años, float) a partir de Birth Date; se calcula al llenar el cache, no se persiste."""
+    if "Birth Date" in df.columns and "Age" not in df.columns:
+        edad = ((pd.Timestamp("today") - df["Birth Date"]).dt.days / 365.25).rename("Age")
+        # concat y no assign: el frame del bundle trae un bloque por columna (vistas del mmap)
+        df = pd.concat([df, edad], axis=1)
+    return df
+
+
+def _ingerir(ruta: str, familia: str | None) -> pd.DataFrame:
+    """CSV -> esquema de la familia -> columnas derivadas."""
+    return derivar(aplicar_esquema(_leer_csv(ruta), familia), familia)
+
+
+def _leer_bundle(ruta: str, familia: str | None, version: tuple[int, int], columnas=None) -> pd.DataFrame | None:
+    """DataFrame desde el bundle mapeado (vistas sobre el mmap, bundle.a_pandas), o None si no está vigente."""
+    tabla = bundle.leer_tabla(ruta, familia, version, ESQUEMA_VERSION)
+    if tabla is None:
+        return None
+    if columnas is not None:
+        tabla = tabla.select([c for c in tabla.column_names if c in columnas])
+    return bundle.a_pandas(tabla)
+
+
+def _leer_snapshot(ruta_snap: str) -> pd.DataFrame | None:
+    if not os.path.exists(ruta_snap):
+        return None
+    try:
+        return pd.read_parquet(ruta_snap)
+    except Exception:
+        return None
+
+
+def _escribir_snapshot(df: pd.DataFrame, ruta: str, version: tuple[int, int], ruta_snap: str,
+                       familia: str | None = None) -> None:
+    """
+    Escribe el snapshot de forma atómica, y a su lado el índice de filtros;
+    si no se puede, el cache en memoria basta.
+    """
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp = f"{ruta_snap}.{os.getpid()}.tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, ruta_snap)
+        _borrar_snapshots_viejos(ruta, version)
+    except Exception:
+        return
+    _escribir_resumen(indice_filtros(df, familia), _ruta_resumen(ruta_snap))
+
+
+def _ruta_resumen(ruta_snap: str) -> str:
+    return f"{os.path.splitext(ruta_snap)[0]}.filtros.json"
+
+
+def _resumir(df: pd.DataFrame, columnas: dict) -> ResumenFiltros:
+    def col(nombre):
+        c = columnas.get(nombre)
+        return df[c] if c in df.columns else None
+
+    def rango(s):
+        s = pd.to_numeric(s, errors="coerce").dropna() if s is not None else ()
+        return (float(s.min()), float(s.max())) if len(s) else None
+
+    def opciones(s):
+        return tuple(sorted(s.dropna().astype(str).unique())) if s is not None else ()
+
+    nacimiento = None
+    if col("nacimiento") is not None:
+        fechas = pd.to_datetime(col("nacimiento"), errors="coerce").dropna()
+        if len(fechas):
+            nacimiento = (str(fechas.min().date()), str(fechas.max().date()))
+    return ResumenFiltros(
+        filas=len(df),
+        minutos=rango(col("minutos")),
+        nacimiento=nacimiento,
+        edades=rango(col("edad")),
+        nacionalidades=opciones(col("nacionalidad")),
+        jugadores=opciones(col("jugador")),
+        equipos=opciones(col("equipo")),
+    )
+
+
+def indice_filtros(df: pd.DataFrame, familia: str | None) -> dict:
+    """
+    {"*": resumen del archivo, grupo: resumen de sus filas} con los mismos
+    grupos que filtran las secciones: la columna Grupo de la ingesta o, en
+    Ligas Alternas, posiciones.mascara sobre la posición Wyscout.
+    """
+    columnas = COLUMNAS_FILTROS.get(familia, {})
+    out = {"*": _resumir(df, columnas)}
+    if "Grupo" in df.columns:
+        mascaras = {g: df["Grupo"] == g for g in posiciones.GRUPOS}
+    elif familia == "alternas" and "Posición específica" in df.columns:
+        mascaras = {g: posiciones.mascara(df["Posición específica"], g, "wyscout") for g in posiciones.GRUPOS}
+    else:
+        mascaras = {}
+    for g, m in mascaras.items():
+        out[g] = _resumir(df[m.to_numpy()], columnas)
+    return out
+
+
+def _escribir_resumen(resumenes: dict, ruta_json: str) -> None:
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp = f"{ruta_json}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"formato": FILTROS_VERSION, "grupos": {g: asdict(r) for g, r in resumenes.items()}},
+                      fh, ensure_ascii=False)
+        os.replace(tmp, ruta_json)
+    except OSError:
+        pass
+
+
+def _leer_resumen(ruta_json: str) -> dict | None:
+    try:
+        with open(ruta_json, encoding="utf-8") as fh:
+            crudo = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if crudo.get("formato") != FILTROS_VERSION:
+        return None
+    return {
+        g: ResumenFiltros(**{k: tuple(v) if isinstance(v, list) else v for k, v in r.items()})
+        for g, r in crudo["grupos"].items()
+    }
+
+
+def _asegurar_snapshot(ruta: str, version: tuple[int, int], familia: str | None, ruta_snap: str) -> bool:
+    """Parsea el CSV y escribe su snapshot; si no queda en disco, el DataFrame completo va al cache."""
+    df = _ingerir(ruta, familia)
+    _escribir_snapshot(df, ruta, version, ruta_snap, familia)
+    if os.path.exists(ruta_snap):
+        return True
+    _CACHE[(ruta, familia)] = (version, _con_edad(df))
+    return False
+
+
+# =========================
+# API
+# =========================
+def cargar_csv(ruta: str, familia: str | None = None) -> pd.DataFrame:
+    """
+    Devuelve el DataFrame de `ruta` (tipado con el esquema de `familia`, si se da):
+    1) cache de proceso (misma versión del archivo),
+    2) bundle Arrow compartido (bundle.py),
+    3) snapshot Parquet en disco,
+    4) CSV (y se escribe el snapshot para la próxima vez).
+    Se entrega una copia superficial. Requiere pandas >= 3 (requirements.txt):
+    su copy-on-write es lo que permite que cada sección la mute sin tocar el
+    cache, y solo se copian las columnas que toca (las del bundle siguen siendo
+    vistas sobre el mmap compartido);
+    df.attrs["origen"] = (ruta, familia, versión) identifica el archivo en los
+    caches derivados (normalizacion.py) y se conserva al filtrar.
+    """
+    version = version_archivo(ruta)
+    clave = (ruta, familia)
+    with _lock_archivo(ruta):
+        hit = _CACHE.get(clave)
+        if hit is not None and hit[0] == version:
+            return hit[1].copy(deep=False)
+
+        ruta_snap = _ruta_snapshot(ruta, version, familia)
+        df = _leer_bundle(ruta, familia, version)
+        if df is None:
+            df = _leer_snapshot(ruta_snap)
+        if df is None:
+            df = _ingerir(ruta, familia)
+            _escribir_snapshot(df, ruta, version, ruta_snap, familia)
+
+        df = _con_edad(df)
+        df.attrs["origen"] = (ruta, familia, version)   # clave de los caches derivados
+        _CACHE[clave] = (version, df)
+        return df.copy(deep=False)
+
+
+def cargar_columnas(ruta: str, columnas, familia: str | None = None) -> pd.DataFrame:
+    """
+    Como cargar_csv (misma copia superficial, requiere pandas >= 3), pero solo
+    con `columnas` + COLUMNAS_ID[familia].
+    Lee del bundle o del snapshot Parquet únicamente esas columnas y cachea el
+    resultado por (archivo, conjunto de columnas). Las columnas pedidas que no
+    existen en el archivo se omiten; el orden es el del archivo.
+    """
+    pedidas = frozenset(COLUMNAS_ID.get(familia, [])) | frozenset(columnas)
+    version = version_archivo(ruta)
+    clave = (ruta, familia, pedidas)
+    with _lock_archivo(ruta):
+        hit = _CACHE_COLS.get(clave)
+        if hit is not None and hit[0] == version:
+            return hit[1].copy(deep=False)
+
+        completo = _CACHE.get((ruta, familia))
+        if completo is not None and completo[0] == version:
+            df = completo[1]
+            df = df[[c for c in df.columns if c in pedidas]]
+        else:
+            df = _leer_bundle(ruta, familia, version, pedidas)
+
+        if df is None:
+            ruta_snap = _ruta_snapshot(ruta, version, familia)
+            if os.path.exists(ruta_snap) or _asegurar_snapshot(ruta, version, familia, ruta_snap):
+                # Orden del archivo (read_parquet devolvería el orden pedido)
+                presentes = [c for c in pq.read_schema(ruta_snap).names if c in pedidas]
+                df = pd.read_parquet(ruta_snap, columns=presentes)
+            else:
+                df = _CACHE[(ruta, familia)][1]
+                df = df[[c for c in df.columns if c in pedidas]]
+
+        df = _con_edad(df)
+        df.attrs["origen"] = (ruta, familia, version)
+        _CACHE_COLS[clave] = (version, df)
+        return df.copy(deep=False)
+
+
+def resumen_filtros(ruta: str, familia: str | None = None, grupo: str | None = None) -> ResumenFiltros:
+    """
+    Índice de filtros de `grupo` (o de todo el archivo) para armar el sidebar:
+    1) cache de proceso, 2) `*.filtros.json` junto al snapshot, 3) se arma con
+    cargar_columnas y se guarda. Un grupo sin filas da un resumen vacío.
+    """
+    version = version_archivo(ruta)
+    clave = (ruta, familia)
+    with _LOCK:
+        hit = _RESUMENES.get(clave)
+    if hit is None or hit[0] != version:
+        ruta_json = _ruta_resumen(_ruta_snapshot(ruta, version, familia))
+        resumenes = _leer_resumen(ruta_json)
+        if resumenes is None:
+            columnas = list(COLUMNAS_FILTROS.get(familia, {}).values()) + ["Grupo", "Posición específica"]
+            resumenes = indice_filtros(cargar_columnas(ruta, columnas, familia=familia), familia)
+            _escribir_resumen(resumenes, ruta_json)
+        hit = (version, resumenes)
+        with _LOCK:
+            _RESUMENES[clave] = hit
+    return hit[1].get(grupo or "*", ResumenFiltros())
+
+
+def filas_unicas(df: pd.DataFrame) -> pd.DataFrame:
+    """Una fila por (jugador, grupo) según la deduplicación de la ingesta (sin la marca)."""
+    if COLUMNA_UNICA not in df.columns:
+        return df
+    return df.loc[df[COLUMNA_UNICA].to_numpy(), [c for c in df.columns if c != COLUMNA_UNICA]]
+
+
+def borrar_snapshots_obsoletos() -> None:
+    """Barre SNAPSHOT_DIR: borra los snapshots tipados con otro ESQUEMA_VERSION (de cualquier CSV)."""
+    _borrar_snapshots(lambda nombre: not _esquema_vigente(nombre))
+
+
+def registrar_invalidador(funcion) -> None:
+    """Engancha un cache derivado: funcion(ruta) debe soltar lo calculado a partir de `ruta`."""
+    with _LOCK:
+        if funcion not in _INVALIDADORES:
+            _INVALIDADORES.append(funcion)
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta del cache todo lo que sale de `ruta` (cargas y caches derivados registrados)."""
+    with _lock_archivo(ruta):
+        for clave in [k for k in _CACHE if k[0] == ruta]:
+            del _CACHE[clave]
+        for clave in [k for k in _CACHE_COLS if k[0] == ruta]:
+            del _CACHE_COLS[clave]
+        for clave in [k for k in _RESUMENES if k[0] == ruta]:
+            del _RESUMENES[clave]
+    for funcion in list(_INVALIDADORES):
+        funcion(ruta)
+
+
+def limpiar_cache() -> None:
+    """Vacía el cache en memoria (los snapshots y el manifiesto en disco se conservan)."""
+    global _FORMATOS
+    with _LOCK:
+        _CACHE.clear()
+        _CACHE_COLS.clear()
+        _RESUMENES.clear()
+        _FORMATOS = None
@@ -0,0 +1,229 @@
+"""
+Densidades (KDE) calculadas en el servidor para los gráficos de distribución.
+
+Antes cada gráfico mandaba la serie completa al navegador y Vega corría
+transform_density (200 pasos, dos veces: área y línea). Ahora la curva se
+calcula aquí con un KDE gaussiano binned: los valores se reparten con
+binning lineal sobre una grilla fina, se convolucionan con el kernel por FFT
+y la curva se interpola a los `pasos` puntos del dominio. Al cliente solo
+viajan esos puntos, y de forma compacta (base_altair, grilla_altair): solo la columna de
+densidades en float32 (Streamlit la manda como Arrow); x se reconstruye en
+Vega a partir del inicio y el paso de la grilla, que son constantes del spec.
+
+Mismo resultado que Vega: ancho de banda de vega-statistics
+(1.06 * min(desvío, IQR/1.34) * n^-0.2) y dominio = rango de la métrica con
+10% de margen. Las curvas se cachean por (archivo y versión, subconjunto
+filtrado, métrica, pasos), igual que los percentiles de normalizacion.py.
+"""
+import threading
+from collections import OrderedDict
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+import datos
+import normalizacion
+
+
+# =========================
+# Configuración
+# =========================
+PASOS = 200           # puntos de la curva que se envían al cliente
+MARGEN = 0.10         # margen del dominio a cada lado (fracción del rango)
+BINS_MIN, BINS_MAX = 512, 16384
+BINS_POR_BANDA = 4    # resolución de la grilla: al menos 4 bins por ancho de banda
+MAX_ENTRADAS = 2048
+ANCHO_PANEL = 240     # px por panel en la grilla (alt.concat no admite ancho "container")
+
+_LOCK = threading.Lock()
+_CURVAS = OrderedDict()   # (origen, firma, métrica, pasos) -> DataFrame x/density (o None)
+
+
+# =========================
+# KDE
+# =========================
+def ancho_banda(valores: np.ndarray) -> float:
+    """Regla de vega-statistics (estimateBandwidth)."""
+    n = len(valores)
+    d = float(np.std(valores, ddof=1)) if n > 1 else 0.0
+    q1, q3 = np.quantile(valores, [0.25, 0.75])
+    v = min(d, (q3 - q1) / 1.34) or d or abs(float(q1)) or 1.0
+    return 1.06 * v * n ** -0.2
+
+
+def dominio(valores: np.ndarray) -> tuple[float, float]:
+    mn, mx = float(valores.min()), float(valores.max())
+    pad = max(abs(mn), 1.0) * MARGEN if mn == mx else (mx - mn) * MARGEN
+    return mn - pad, mx + pad
+
+
+def kde(valores: np.ndarray, extent: tuple[float, float], pasos: int = PASOS) -> tuple[np.ndarray, np.ndarray]:
+    """(x, densidad) en `pasos` puntos uniformes de `extent` (KDE gaussiano binned + FFT)."""
+    valores = np.asarray(valores, dtype=float)
+    lo, hi = extent
+    bw = ancho_banda(valores)
+    m = int(np.clip(np.ceil((hi - lo) / (bw / BINS_POR_BANDA)) + 1, BINS_MIN, BINS_MAX))
+    delta = (hi - lo) / (m - 1)
+
+    # Binning lineal: cada valor reparte su peso entre los dos nodos vecinos
+    pos = (valores - lo) / delta
+    izq = np.clip(np.floor(pos).astype(int), 0, m - 2)
+    frac = pos - izq
+    pesos = np.bincount(izq, 1 - frac, minlength=m) + np.bincount(izq + 1, frac, minlength=m)
+
+    # Kernel gaussiano truncado a 4 anchos de banda y convolución por FFT
+    L = min(m - 1, int(np.ceil(4 * bw / delta)))
+    k = np.exp(-0.5 * (np.arange(-L, L + 1) * delta / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    nfft = 1 << int(np.ceil(np.log2(m + 2 * L + 1)))
+    conv = np.fft.irfft(np.fft.rfft(pesos, nfft) * np.fft.rfft(k, nfft), nfft)
+    grilla = np.maximum(conv[L:L + m], 0) / len(valores)
+
+    x = np.linspace(lo, hi, pasos)
+    return x, np.interp(x, lo + delta * np.arange(m), grilla)
+
+
+def _calcular(serie: pd.Series, pasos: int) -> pd.DataFrame | None:
+    valores = pd.to_numeric(serie, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    valores = valores[np.isfinite(valores)]
+    if len(valores) == 0:
+        return None
+    x, densidad = kde(valores, dominio(valores), pasos)
+    return pd.DataFrame({"x": x, "density": densidad})
+
+
+# =========================
+# API
+# =========================
+def curva(df: pd.DataFrame, metrica: str, pasos: int = PASOS) -> pd.DataFrame | None:
+    """
+    Curva KDE de `metrica` sobre las filas de df: DataFrame con columnas
+    x/density (`pasos` filas), o None si no hay valores válidos. Cacheada;
+    no modificar el resultado.
+    """
+    if metrica not in df.columns:
+        return None
+    origen = df.attrs.get("origen")
+    if origen is None:
+        return _calcular(df[metrica], pasos)
+
+    clave = (origen, normalizacion.firma(df), metrica, pasos)
+    with _LOCK:
+        if clave in _CURVAS:
+            _CURVAS.move_to_end(clave)
+            return _CURVAS[clave]
+    out = _calcular(df[metrica], pasos)
+    with _LOCK:
+        _CURVAS[clave] = out
+        while len(_CURVAS) > MAX_ENTRADAS:
+            _CURVAS.popitem(last=False)
+    return out
+
+
+def _eje_x(chart: alt.Chart, x0: float, paso: float) -> alt.Chart:
+    """Campo x reconstruido en Vega a partir del número de fila de la curva."""
+    return chart.transform_window(i="row_number()").transform_calculate(
+        x=f"{x0!r} + (datum.i - 1) * {paso!r}"
+    )
+
+
+def _grilla_x(c: pd.DataFrame) -> tuple[float, float]:
+    x = c["x"].to_numpy()
+    return float(x[0]), float((x[-1] - x[0]) / (len(x) - 1))
+
+
+def base_altair(df: pd.DataFrame, metrica: str, pasos: int = PASOS) -> alt.Chart | None:
+    """
+    alt.Chart con los campos x/density de la curva de `metrica`, listo para
+    mark_area/mark_line; None si no hay curva. El dataset es solo la columna
+    de densidades en float32 (4 bytes por punto).
+    """
+    c = curva(df, metrica, pasos)
+    if c is None:
+        return None
+    densidades = pd.DataFrame({"density": c["density"].to_numpy(dtype=np.float32)})
+    return _eje_x(alt.Chart(densidades), *_grilla_x(c))
+
+
+def tabla(df: pd.DataFrame, metricas, pasos: int = PASOS) -> tuple[pd.DataFrame, dict]:
+    """
+    Curvas de `metricas` en formato largo (metrica, density) para un único
+    dataset compartido, más {métrica: (x inicial, paso)}. Las métricas sin
+    curva se omiten.
+    """
+    partes, ejes = [], {}
+    for m in dict.fromkeys(metricas):
+        c = curva(df, m, pasos)
+        if c is None:
+            continue
+        ejes[m] = _grilla_x(c)
+        partes.append(c["density"].to_numpy(dtype=np.float32))
+    larga = pd.DataFrame({
+        "metrica": pd.Categorical(np.repeat(list(ejes), pasos), categories=list(ejes)),
+        "density": np.concatenate(partes) if partes else np.empty(0, dtype=np.float32),
+    })
+    return larga, ejes
+
+
+def grilla_altair(
+    df: pd.DataFrame,
+    valores: dict,
+    invertir=(),
+    columnas: int = 3,
+    alto: int = 120,
+    relleno: str = "#F59E0B",
+    linea: str = "#000000",
+    opacidad: float = 0.28,
+    grosor: float = 1.2,
+) -> alt.ConcatChart | None:
+    """
+    Grilla de distribuciones como UNA sola especificación (alt.concat en
+    `columnas` columnas): un panel por métrica de `valores` ({métrica: valor
+    del jugador}) con la curva, el relleno hasta el jugador y su marca. Todas
+    las curvas viajan en un dataset largo compartido y las marcas en otro;
+    cada panel filtra su métrica. Las métricas en `invertir` dan vuelta el
+    eje x. None si no hay ningún panel.
+    """
+    valores = {m: float(v) for m, v in valores.items() if pd.notna(v)}
+    larga, ejes = tabla(df, valores)
+    if not ejes:
+        return None
+    marcas = pd.DataFrame({"metrica": list(ejes), "x": [valores[m] for m in ejes]})
+    invertir = set(invertir or ())
+
+    paneles = []
+    for m, (x0, paso) in ejes.items():
+        escala = alt.Scale(reverse=m in invertir)
+        base = _eje_x(alt.Chart(larga).transform_filter(alt.datum.metrica == m), x0, paso)
+        area = base.transform_filter(alt.datum.x <= valores[m]).mark_area(opacity=opacidad, color=relleno).encode(
+            x=alt.X("x:Q", title=None, scale=escala), y=alt.Y("density:Q", title=None)
+        )
+        line = base.mark_line(color=linea, size=grosor).encode(x=alt.X("x:Q", scale=escala), y="density:Q")
+        rule = alt.Chart(marcas).transform_filter(alt.datum.metrica == m).mark_rule(color=linea, strokeWidth=2).encode(
+            x=alt.X("x:Q", scale=escala), tooltip=[alt.Tooltip("x:Q", title="Valor", format=".3f")]
+        )
+        title = alt.TitleParams(m, fontSize=12, anchor="middle", color="#1F2937")
+        paneles.append((area + line + rule).properties(width=ANCHO_PANEL, height=alto, title=title))
+
+    return alt.concat(*paneles, columns=columnas).configure_axis(
+        grid=False, domain=True, domainColor="#E6E6E6", labelColor="#2B2B2B"
+    ).configure_view(
+        strokeWidth=0
+    ).configure_title(
+        font="Inter", color="#111111", anchor="middle"
+    )
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta las curvas calculadas a partir de `ruta`."""
+    with _LOCK:
+        for clave in [k for k in _CURVAS if k[0][0] == ruta]:
+            del _CURVAS[clave]
+
+
+def limpiar() -> None:
+    with _LOCK:
+        _CURVAS.clear()
+
+
+datos.registrar_invalidador(invalidar)
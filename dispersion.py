@@ -0,0 +1,149 @@
+"""
+Scatter de los perfiles (ejes X/Y, tamaño, resaltados) como spec Altair.
+
+El spec viaja entero al navegador: el dataset va embebido en el JSON de
+Vega-Lite. Por eso datos_scatter() poda el frame filtrado a las columnas que
+el gráfico usa (ejes, tamaño, tooltip, selección) y todas las capas de puntos
+y etiquetas comparten UN dataset (alt.layer(..., data=df)); las demás
+métricas del perfil no se serializan. scatter_altair() solo arma el chart,
+sin Streamlit, para poder medir el spec (tests/test_dispersion.py).
+"""
+import altair as alt
+import pandas as pd
+
+
+# =========================
+# Estilo
+# =========================
+COLOR_SEL = "#f9ae34"    # resaltados (naranja del proyecto)
+COLOR_BASE = "#C5C5C5"
+_EJES = "#2B2B2B"
+_PROMEDIO = "#9A9A9A"
+
+
+# =========================
+# API
+# =========================
+def datos_scatter(df, columnas, id_col, highlight_names=None):
+    """
+    Dataset de un scatter: solo `columnas` (ejes, tamaño, tooltip, selección;
+    las ausentes o None se ignoran, sin repetir) más la bandera is_highlight.
+    El resto de las métricas del df no se serializa al navegador.
+    """
+    cols = [c for c in dict.fromkeys(columnas) if c is not None and c in df.columns]
+    # Primera aparición de cada columna (algunos CSV repiten nombres)
+    d = df.iloc[:, [df.columns.get_indexer_for([c])[0] for c in cols]].copy()
+    d["is_highlight"] = d[id_col].isin(set(highlight_names or []))
+    return d
+
+
+def scatter_altair(
+    df,
+    x,
+    y,
+    size_col="Minutes",
+    tooltip_cols=("Name", "Team", "Primary Position", "Age", "Nationality", "Minutes"),
+    color_sel=COLOR_SEL,
+    color_base=COLOR_BASE,
+    highlight_names=None,  # lista de jugadores a resaltar desde un multiselect
+) -> alt.LayerChart:
+    """Scatter con promedios, resaltados por lista y por clic (Name, Team), sobre un solo dataset."""
+    # Solo las columnas del gráfico (+ is_highlight para los resaltados por lista)
+    df = datos_scatter(df, [x, y, size_col, "Name", "Team", *tooltip_cols], "Name", highlight_names)
+
+    # Promedios
+    x_mean = float(df[x].mean())
+    y_mean = float(df[y].mean())
+
+    # Selección por clic (multi)
+    sel = alt.selection_multi(
+        fields=["Name", "Team"],
+        on="click",
+        clear="dblclick",
+        empty="none"
+    )
+
+    # Base chart
+    base_chart = alt.Chart().encode(
+        x=alt.X(x, title=x, axis=alt.Axis(format=",.0f")),
+        y=alt.Y(y, title=y, axis=alt.Axis(format=",.0f")),
+        tooltip=[c for c in tooltip_cols if c in df.columns]
+    )
+
+    # Tamaño
+    if size_col in df.columns:
+        size_enc = alt.Size(size_col, legend=None, scale=alt.Scale(range=[30, 500]))
+    else:
+        size_enc = alt.value(120)
+
+    # 1) Base gris
+    pts_base = base_chart.mark_circle().encode(
+        size=size_enc,
+        color=alt.value(color_base),
+        opacity=alt.value(0.35)
+    )
+
+    # 2) Resaltados por multiselect (lista)
+    pts_list = base_chart.transform_filter(
+        alt.datum.is_highlight
+    ).mark_circle().encode(
+        size=size_enc,
+        color=alt.value(color_sel),
+        opacity=alt.value(1.0)
+    )
+
+    # 3) Resaltados por clic (selección)
+    pts_click = base_chart.mark_circle().encode(
+        size=size_enc,
+        color=alt.value(color_sel),
+        opacity=alt.value(1.0)
+    ).add_selection(sel).transform_filter(sel)
+
+    # Labels por lista
+    labels_list = base_chart.transform_filter(
+        alt.datum.is_highlight
+    ).mark_text(
+        dx=6, dy=-6, fontWeight="bold", color="#000000", clip=False
+    ).encode(text="Name")
+
+    # Labels por clic
+    labels_click = base_chart.transform_filter(
+        sel
+    ).mark_text(
+        dx=6, dy=-6, fontWeight="bold", color="#000000", clip=False
+    ).encode(text="Name")
+
+    # Líneas de promedio
+    vline = alt.Chart(pd.DataFrame({"v": [x_mean]})).mark_rule(
+        strokeDash=[5, 5], color=_PROMEDIO, opacity=0.8
+    ).encode(x="v:Q")
+
+    hline = alt.Chart(pd.DataFrame({"h": [y_mean]})).mark_rule(
+        strokeDash=[5, 5], color=_PROMEDIO, opacity=0.8
+    ).encode(y="h:Q")
+
+    # Un solo dataset para todas las capas de puntos/labels
+    return alt.layer(
+        pts_base,
+        pts_list,
+        pts_click,
+        labels_list,
+        labels_click,
+        vline,
+        hline,
+        data=df,
+    ).properties(
+        height=520,
+        background="transparent",
+        padding={"left": 10, "right": 160, "top": 40, "bottom": 30}
+    ).configure_view(
+        strokeWidth=0
+    ).configure_axis(
+        grid=False,
+        domain=False,
+        tickColor=_EJES,
+        labelColor=_EJES,
+        titleColor=_EJES
+    ).configure_title(
+        color=_EJES
+    )
@@ -0,0 +1,165 @@
+"""
+Fases de juego de los radares p90 (StatsBomb) por grupo de posición.
+
+Definen las métricas del radar, qué columnas se cargan en esa sección y el
+espacio de métricas de la búsqueda de similares (similitud.py): ambos leen de
+aquí para que un cambio de métricas no quede a medias.
+"""
+
+
+# =========================
+# Fases por grupo
+# =========================
+RADAR_P90 = {
+    "Porteros": {
+        "Defensivas": [
+            "PSxG Faced", "GSAA", "Save%", "xSv%", "Shot Stopping%", "Shots Faced", "Shots Faced OT%"
+        ],
+        "Posesión": [
+            "GK Aggressive Dist.", "Claims%", "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
+            "Carries", "Successful Dribbles"
+        ],
+        "Ofensivas": [
+            "Pass OBV", "Goalkeeper OBV"
+        ],
+    },
+    "Centrales": {
+        "Defensivas": [
+            "PAdj Tackles", "PAdj Interceptions", "Blocks/Shot", "Clearances",
+            "Aerial Win%", "Aerial Wins", "Dribbles Stopped%", "DA OBV",
+            "Aggressive Actions", "PAdj Pressures", "Ball Recoveries", "Counterpress Regains"
+        ],
+        "Posesión": [
+            "Pass OBV", "xGBuildup", "xGChain", "OP Passes", "OP F3 Passes",
+            "Pass Forward%", "Passing%", "Passes Pressured%",
+            "Long Balls", "Long Ball%", "Carries"
+        ],
+        "Ofensivas": [
+            "Assists", "xG Assisted", "Key Passes", "D&C OBV", "OBV", "Shot OBV", "Throughballs"
+        ],
+    },
+    "Carrileros/Laterales": {
+        "Defensivas": [
+            "PAdj Interceptions", "PAdj Clearances",
+            "Defensive Regains", "Ball Recoveries", "PAdj Tackles",
+            "Dribbles Stopped%", "Counterpress Regains",
+            "DA OBV"
+        ],
+        "Posesión": [
+            "OP Passes", "Passing%",
+            "Carries", "Successful Dribbles", "Deep Progressions",
+            "xGBuildup", "xGChain", "Long Ball%",
+            "Pass OBV", "D&C OBV"
+        ],
+        "Ofensivas": [
+            "xG Assisted", "Key Passes", "Assists", "Successful Crosses", "Successful Box Cross%",
+            "Passes Inside Box", "PintoB", "Shot OBV", "OBV"
+        ],
+    },
+    "Contenciones": {
+        "Defensivas": [
+            "PAdj Interceptions", "Defensive Regains", "PAdj Tackles",
+            "Dribbles Stopped%", "PAdj Pressures", "Counterpress Regains",
+            "Blocks/Shot", "DA OBV", "Aggressive Actions", "Ball Recoveries"
+        ],
+        "Posesión": [
+            "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
+            "Carries", "Successful Dribbles", "Deep Progressions",
+            "xGBuildup", "xGChain", "Pass OBV", "D&C OBV"
+        ],
+        "Ofensivas": [
+            "Assists", "xG Assisted", "Key Passes",
+            "Throughballs", "PintoB", "Shot OBV", "OBV",
+            "xG", "Shooting%"
+        ],
+    },
+    "Interiores": {
+        "Defensivas": [
+            "PAdj Interceptions", "Defensive Regains", "PAdj Tackles",
+            "Dribbles Stopped%", "PAdj Pressures", "Counterpress Regains",
+            "Blocks/Shot", "DA OBV", "Aggressive Actions", "Ball Recoveries"
+        ],
+        "Posesión": [
+            "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
+            "Carries", "Successful Dribbles", "Deep Progressions",
+            "xGBuildup", "xGChain", "Pass OBV", "D&C OBV"
+        ],
+        "Ofensivas": [
+            "Assists", "xG Assisted", "Key Passes",
+            "Throughballs", "PintoB", "Shot OBV", "OBV",
+            "xG", "Shooting%"
+        ],
+    },
+    "Volantes Ofensivos": {
+        "Defensivas": [
+            "Counterpress Regains", "PAdj Pressures", "Pressures",
+            "Ball Recoveries", "PAdj Tackles", "PAdj Interceptions"
+        ],
+        "Posesión": [
+            "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
+            "Carries", "Successful Dribbles", "Deep Progressions",
+            "xGBuildup", "xGChain", "OP F3 Passes", "F3 Pass Forward%",
+            "Passes Inside Box", "PintoB",
+            "Pass OBV", "D&C OBV"
+        ],
+        "Ofensivas": [
+            "Assists", "xG Assisted", "Key Passes", "Throughballs",
+            "OBV", "Shot OBV",
+            "NP Goals", "xG/Shot", "PSxG", "Shots", "Goal Conversion%"
+        ],
+    },
+    "Extremos": {
+        "Defensivas": [
+            "Counterpress Regains", "Pressures", "PAdj Pressures",
+            "Defensive Regains", "Ball Recoveries",
+            "PAdj Tackles", "PAdj Interceptions", "Dribbles Stopped%"
+        ],
+        "Posesión": [
+            "Carries", "Successful Dribbles", "Deep Progressions",
+            "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
+            "OP F3 Passes", "F3 Pass Forward%",
+            "xGBuildup", "xGChain",
+            "Pass OBV", "D&C OBV"
+        ],
+        "Ofensivas": [
+            "xG Assisted", "Key Passes", "Assists",
+            "Successful Crosses", "Successful Box Cross%",
+            "Passes Inside Box", "PintoB",
+            "OBV", "Shot OBV",
+            "NP Goals", "xG/Shot", "PSxG", "Shots", "Goal Conversion%"
+        ],
+    },
+    "Delanteros": {
+        "Defensivas": [
+            "Counterpress Regains", "Pressures", "PAdj Pressures",
+            "Ball Recoveries", "PAdj Tackles", "PAdj Interceptions",
+            "Dribbles Stopped%", "Aerial Wins", "Aerial Win%"
+        ],
+        "Posesión": [
+            "Carries", "Successful Dribbles", "Deep Progressions",
+            "OP Passes", "Passing%", "Passes Pressured%", "Pass Forward%",
+            "OP F3 Passes", "F3 Pass Forward%",
+            "Passes Inside Box", "xGBuildup", "xGChain",
+            "PintoB", "Pass OBV", "D&C OBV"
+        ],
+        "Ofensivas": [
+            "Shot OBV", "OBV",
+            "NP Goals", "xG/Shot", "PSxG", "Shots", "Goal Conversion%",
+            "xG Assisted", "Key Passes", "Assists", "Throughballs"
+        ],
+    },
+}
+
+
+# =========================
+# Métricas invertidas (menor = mejor)
+# =========================
+INVERTIR_P90 = {
+    "Porteros": {"PSxG Faced", "Shots Faced", "Shots Faced OT%"},
+}
+INVERTIR_P90_DEFECTO = {"Dribbled Past", "Errors Leading to Shots"}
+
+
+def invertidas_p90(grupo: str) -> set:
+    """Métricas de `grupo` donde menor = mejor."""
+    return set(INVERTIR_P90.get(grupo, INVERTIR_P90_DEFECTO))
@@ -0,0 +1,124 @@
+"""
+Cache de figuras Plotly de los radares, serializadas a JSON.
+
+Un radar depende solo de las filas del grupo filtrado, el jugador, las fases
+activas (métricas y su orden), las métricas invertidas y el estilo; cualquier
+otro widget que dispare un rerun no lo cambia. radar() arma la clave con
+(archivo y versión, firma del subconjunto, builder, argumentos) y guarda la
+figura como JSON: en un acierto se reconstruye sin volver a validar (ya se
+validó al construirla), en vez de recalcular percentiles y trazas. Ir y
+volver entre dos jugadores que se están comparando es entonces una búsqueda
+en el cache.
+
+Se guarda el JSON y no el objeto go.Figure para que nadie comparta una figura
+mutable entre sesiones y para poder medir la memoria: el LRU desaloja por
+cantidad de entradas y por bytes totales (FIGURAS_MAX_MB).
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+import datos
+import normalizacion
+
+
+# =========================
+# Configuración
+# =========================
+MAX_ENTRADAS = 256
+MAX_BYTES = int(float(os.environ.get("FIGURAS_MAX_MB", "64")) * 2**20)
+
+_LOCK = threading.Lock()
+_FIGURAS = OrderedDict()   # (origen, firma, builder, argumentos) -> JSON de la figura
+_ESTADO = {"bytes": 0, "aciertos": 0, "fallos": 0}
+
+
+# =========================
+# Helpers
+# =========================
+def _congelar(valor):
+    """
+    Versión hashable y estable de los argumentos (dicts ordenados, sets
+    ordenados). Un objeto con `firma` (poblaciones.Poblacion) entra por su
+    firma: la clave no retiene el objeto y una población rearmada igual acierta.
+    """
+    firma = getattr(valor, "firma", None)
+    if isinstance(firma, tuple):
+        return (type(valor).__name__,) + firma
+    if isinstance(valor, dict):
+        return tuple((k, _congelar(v)) for k, v in valor.items())
+    if isinstance(valor, (set, frozenset)):
+        return ("set",) + tuple(sorted(map(str, valor)))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def _guardar(clave: tuple, figura_json: str) -> None:
+    with _LOCK:
+        anterior = _FIGURAS.pop(clave, None)
+        if anterior is not None:
+            _ESTADO["bytes"] -= len(anterior)
+        _FIGURAS[clave] = figura_json
+        _ESTADO["bytes"] += len(figura_json)
+        while _FIGURAS and (len(_FIGURAS) > MAX_ENTRADAS or _ESTADO["bytes"] > MAX_BYTES):
+            _, viejo = _FIGURAS.popitem(last=False)
+            _ESTADO["bytes"] -= len(viejo)
+
+
+# =========================
+# API
+# =========================
+def radar(construir, df, **kwargs):
+    """
+    construir(df=df, **kwargs) cacheado: `construir` es el builder del radar
+    (devuelve go.Figure o None) y kwargs todo lo demás que lo define
+    (jugador, fases, invertidas, colores, alto...). Los None no se cachean,
+    así los avisos del builder se siguen mostrando. Devuelve una figura nueva
+    en cada llamada.
+    """
+    origen = df.attrs.get("origen")
+    if origen is None:
+        return construir(df=df, **kwargs)
+
+    clave = (origen, normalizacion.firma(df), construir.__name__, _congelar(kwargs))
+    with _LOCK:
+        figura_json = _FIGURAS.get(clave)
+        if figura_json is not None:
+            _FIGURAS.move_to_end(clave)
+            _ESTADO["aciertos"] += 1
+        else:
+            _ESTADO["fallos"] += 1
+    if figura_json is not None:
+        # ~0.5 ms contra ~8 ms de plotly.io.from_json, que revalida cada traza
+        return go.Figure(json.loads(figura_json), _validate=False)
+
+    fig = construir(df=df, **kwargs)
+    if fig is not None:
+        _guardar(clave, fig.to_json())
+    return fig
+
+
+def estado() -> dict:
+    """Entradas, bytes y aciertos/fallos del cache (para diagnóstico)."""
+    with _LOCK:
+        return dict(_ESTADO, entradas=len(_FIGURAS))
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta las figuras construidas a partir de `ruta`."""
+    with _LOCK:
+        for clave in [k for k in _FIGURAS if k[0][0] == ruta]:
+            _ESTADO["bytes"] -= len(_FIGURAS.pop(clave))
+
+
+def limpiar() -> None:
+    with _LOCK:
+        _FIGURAS.clear()
+        _ESTADO["bytes"] = 0
+
+
+datos.registrar_invalidador(invalidar)
@@ -0,0 +1,132 @@
+"""
+Filtros del sidebar como máscaras booleanas sobre el frame base.
+
+Antes cada perfil encadenaba df = df[...] por liga, grupo, minutos, edad y
+nacionalidad (y los radares agregaban .copy() en casi cada paso): una copia
+del frame por filtro y por rerun. Aquí cada dimensión es una máscara
+booleana sobre las filas del frame base, tal como lo entrega datos.py; las
+máscaras se cachean por (archivo y versión, filas del base, dimensión y sus
+parámetros), se combinan con & y el frame filtrado se materializa UNA sola
+vez en aplicar(). Si solo se mueve el slider de edad, las máscaras de liga,
+grupo, minutos y nacionalidad salen del cache y solo se calcula la de edad.
+
+El resultado conserva el índice del base, así que la firma del subconjunto
+(normalizacion.firma) y los caches derivados (rankings, percentiles, KDE)
+siguen viendo las mismas filas que con el filtrado encadenado.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import datos
+import normalizacion
+
+
+# =========================
+# Configuración
+# =========================
+MAX_MASCARAS = 2048
+
+_LOCK = threading.Lock()
+_MASCARAS = OrderedDict()   # (origen, firma del base, dimensión) -> np.ndarray bool
+
+
+# =========================
+# Helpers
+# =========================
+def _texto_igual(s: pd.Series, valor) -> np.ndarray:
+    """s (sin espacios a los lados) == valor; en categóricas se compara sobre las categorías."""
+    valor = str(valor)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        aciertos = np.asarray(s.cat.categories.astype(str).str.strip() == valor)
+        codigos = s.cat.codes.to_numpy()
+        return (codigos >= 0) & aciertos[codigos]
+    return (s.astype(str).str.strip() == valor).to_numpy()
+
+
+def _numerico(s: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_numeric_dtype(s):
+        s = pd.to_numeric(s, errors="coerce")
+    return s.to_numpy(dtype=float, na_value=np.nan)
+
+
+# =========================
+# API
+# =========================
+@dataclass(frozen=True, eq=False)
+class Filtro:
+    """Filas elegidas de `base` (máscara combinada); cada paso devuelve un Filtro nuevo."""
+    base: pd.DataFrame
+    mascara: np.ndarray
+    clave: tuple | None        # (origen, firma del base); None = sin cache
+
+    def _con(self, dimension: tuple, calcular) -> "Filtro":
+        if self.clave is None:
+            m = calcular(self.base)
+        else:
+            clave = self.clave + (dimension,)
+            with _LOCK:
+                m = _MASCARAS.get(clave)
+                if m is not None:
+                    _MASCARAS.move_to_end(clave)
+            if m is None:
+                m = np.asarray(calcular(self.base), dtype=bool)
+                with _LOCK:
+                    _MASCARAS[clave] = m
+                    while len(_MASCARAS) > MAX_MASCARAS:
+                        _MASCARAS.popitem(last=False)
+        return Filtro(self.base, self.mascara & m, self.clave)
+
+    def igual(self, columna: str, valor) -> "Filtro":
+        """Filas con `columna` == `valor` (como texto, sin espacios a los lados)."""
+        return self._con(("igual", columna, str(valor)), lambda d: _texto_igual(d[columna], valor))
+
+    def entre(self, columna: str, minimo, maximo, truncar: bool = False) -> "Filtro":
+        """Filas con minimo <= `columna` <= maximo (NaN queda fuera); truncar = años cumplidos."""
+        def calcular(d):
+            v = _numerico(d[columna])
+            if truncar:
+                v = np.trunc(v)
+            return (v >= minimo) & (v <= maximo)
+        return self._con(("entre", columna, minimo, maximo, truncar), calcular)
+
+    def en(self, columna: str, valores) -> "Filtro":
+        """Filas con `columna` en `valores` (como Series.isin)."""
+        valores = list(valores)
+        return self._con(("en", columna, frozenset(valores)), lambda d: d[columna].isin(valores).to_numpy())
+
+    def donde(self, dimension: tuple, calcular) -> "Filtro":
+        """Máscara propia: calcular(base) -> bool por fila; `dimension` la identifica en el cache."""
+        return self._con(("donde",) + tuple(dimension), calcular)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.mascara))
+
+    def aplicar(self) -> pd.DataFrame:
+        """Las filas elegidas como UN frame nuevo (mismo índice y attrs que el base)."""
+        return self.base[self.mascara]
+
+
+def filtrar(df: pd.DataFrame) -> Filtro:
+    """Filtro vacío (todas las filas) sobre `df`; con df.attrs["origen"] las máscaras se cachean."""
+    origen = df.attrs.get("origen")
+    clave = (origen, normalizacion.firma(df)) if origen is not None else None
+    return Filtro(df, np.ones(len(df), dtype=bool), clave)
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta las máscaras calculadas sobre `ruta`."""
+    with _LOCK:
+        for clave in [k for k in _MASCARAS if k[0][0] == ruta]:
+            del _MASCARAS[clave]
+
+
+def limpiar() -> None:
+    with _LOCK:
+        _MASCARAS.clear()
+
+
+datos.registrar_invalidador(invalidar)
@@ -0,0 +1,412 @@
+"""
+Índice de identidad de jugadores entre fuentes (p90, físico, presión, espacio
+y desmarque).
+
+El mismo jugador aparece como `Name` + `Date of Birth` en los CSV de StatsBomb
+y como `Player` / `Short name` + `Player ID` + `Birthdate` en los de
+SkillCorner, sin nada que los una. Aquí cada jugador recibe un id de persona:
+- "sc:<Player ID>" si aparece en algún archivo SkillCorner con su ID;
+- "n:<nombre normalizado>|<fecha>" si no (fila sin ID, o jugador que solo
+  está en StatsBomb).
+Cada fila StatsBomb se liga en tres pasos: nombre normalizado + fecha contra
+SkillCorner (nombre completo o corto); si no, comparación difusa de nombres
+SOLO entre los jugadores nacidos esos días (bloqueo por fecha, con margen
+contra el segundo mejor; por tokens, exigiendo la misma inicial del nombre y
+los mismos apellidos, y nunca con un apodo de un solo token); si no,
+persona propia. Las fechas de StatsBomb
+suelen venir un día antes que las de SkillCorner para el mismo jugador (huso
+horario al exportar), así que la fecha se compara con ±TOLERANCIA_DIAS.
+
+El índice se arma offline (`python identidad.py`) y se guarda en
+SNAPSHOT_DIR/identidad.json con la versión de cada archivo usado; en el
+proceso se carga una vez como dos diccionarios (persona y aparición -> ids),
+así una página de jugador resuelve las cinco familias con búsquedas O(1). Si
+falta el JSON o algún archivo cambió, se rearma en la primera consulta.
+La sección "Ficha de Jugador" lo usa: buscar() desde el jugador p90 elegido
+y filas() para traer sus datos de cada familia.
+
+Un nombre no identifica a nadie dentro de un archivo: hay homónimos (dos
+"José Rodríguez" de equipos y fechas distintas en la misma liga). Por eso
+una aparición (familia, archivo, jugador) guarda TODOS sus ids; candidatos()
+los devuelve y buscar() desempata por equipo y/o fecha de nacimiento, o
+lanza ValueError si sigue habiendo más de uno.
+Ligas Alternas (Wyscout) no entra: solo trae la edad, no la fecha.
+"""
+import json
+import os
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+import catalogo
+import datos
+
+
+# =========================
+# Configuración
+# =========================
+RUTA = os.path.join(datos.SNAPSHOT_DIR, "identidad.json")
+FORMATO = 2          # subir si cambia la estructura del JSON o las reglas de enlace
+FAMILIAS = ("p90",) + catalogo.FAMILIAS_SKILLCORNER
+
+UMBRAL = 0.8         # similitud mínima del enlace difuso
+MARGEN = 0.1         # ventaja mínima sobre el segundo candidato del mismo bloque
+TOLERANCIA_DIAS = 1  # StatsBomb vs SkillCorner: misma persona, fecha corrida un día
+_PARTICULAS = {"de", "del", "la", "las", "los", "y", "da", "das", "do", "dos", "di", "van", "von", "der", "le"}
+# Letras que NFKD no descompone en base + acento (Yıldız, Đurđević, Ødegaard...)
+_LETRAS = str.maketrans({"ı": "i", "đ": "d", "ð": "d", "ø": "o", "ł": "l", "æ": "ae", "œ": "oe", "ß": "ss", "þ": "th"})
+
+_LOCK = threading.Lock()
+_LOCK_ARMADO = threading.Lock()   # un solo hilo arma el índice a la vez
+_INDICE = None                    # Indice del proceso
+
+
+@dataclass(frozen=True)
+class Aparicion:
+    familia: str
+    liga: str
+    temporada: str
+    archivo: str       # nombre del CSV (catalogo.Archivo.archivo)
+    jugador: str       # Name (p90) o Player (SkillCorner), tal como viene en el archivo
+    equipo: str        # Team en p90; vacío en SkillCorner
+    metodo: str        # "id", "nombre+fecha", "difuso" o "propio"
+
+
+@dataclass(frozen=True)
+class Persona:
+    id: str
+    nombre: str
+    nacimiento: str | None      # "AAAA-MM-DD"
+    apariciones: tuple          # Aparicion, en el orden del catálogo
+
+    def en(self, familia: str) -> list:
+        """Apariciones de la persona en `familia`."""
+        return [a for a in self.apariciones if a.familia == familia]
+
+
+@dataclass(frozen=True, eq=False)
+class Indice:
+    personas: dict        # id -> Persona
+    por_jugador: dict     # (familia, archivo, jugador) -> ids (varios si hay homónimos)
+    versiones: dict       # ruta -> (mtime, tamaño) de los archivos usados
+
+
+# =========================
+# Helpers
+# =========================
+def normalizar(nombre) -> str:
+    """Minúsculas, sin acentos ni puntuación, sin partículas (de, da, van...)."""
+    if nombre is None or pd.isna(nombre):
+        return ""
+    v = unicodedata.normalize("NFKD", str(nombre).lower().translate(_LETRAS))
+    v = "".join(ch if ch.isalnum() else " " for ch in v if not unicodedata.combining(ch))
+    return " ".join(t for t in v.split() if t not in _PARTICULAS)
+
+
+def _token_igual(t: str, u: str) -> bool:
+    """
+    Mismo token: igual, inicial contra nombre, prefijo (Leo/Leonardo) o, con
+    la misma primera letra, difflib >= 0.85 (Hernández no es Fernández).
+    """
+    if t == u:
+        return True
+    if len(t) == 1 or len(u) == 1:
+        return t[0] == u[0]
+    if min(len(t), len(u)) >= 3 and (t.startswith(u) or u.startswith(t)):
+        return True
+    return t[0] == u[0] and min(len(t), len(u)) > 3 and SequenceMatcher(None, t, u).ratio() >= 0.85
+
+
+def similitud(a: str, b: str) -> float:
+    """
+    0..1 entre dos nombres normalizados: fracción de tokens del más corto
+    presentes en el otro. Solo por tokens, y 0 si:
+    - alguno tiene un solo token (apodo o nombre corto: no alcanza solo);
+    - algún apellido del más corto (todo salvo su primer token) no está entre
+      los tokens del otro después del primero;
+    - el nombre de pila del más corto no coincide con ninguno de los nombres
+      del otro (los tokens antes de su primer apellido coincidente): así
+      "A. García" no es "Raúl García", pero "Stiven Barreiro" sí puede ser
+      "Jaine Stiven Barreiro Solís".
+    """
+    ta, tb = a.split(), b.split()
+    if len(ta) < 2 or len(tb) < 2:
+        return 0.0
+    if len(ta) > len(tb):
+        ta, tb = tb, ta
+
+    def presente(t, tokens):
+        return any(_token_igual(t, u) for u in tokens)
+
+    if not all(presente(t, tb[1:]) for t in ta[1:]):
+        return 0.0
+    primer_apellido = next(j for j in range(1, len(tb)) if _token_igual(ta[1], tb[j]))
+    if not presente(ta[0], tb[:primer_apellido]):
+        return 0.0
+    return sum(presente(t, tb) for t in ta) / len(ta)
+
+
+def _fecha(v) -> str | None:
+    return None if pd.isna(v) else str(pd.Timestamp(v).date())
+
+
+def _vecinas(fecha: str) -> list:
+    """`fecha` y las fechas a ±TOLERANCIA_DIAS (la exacta primero)."""
+    dia = pd.Timestamp(fecha)
+    otras = [dia + pd.Timedelta(days=d * signo) for d in range(1, TOLERANCIA_DIAS + 1) for signo in (-1, 1)]
+    return [fecha] + [str(f.date()) for f in otras]
+
+
+def _id_nombre(nombre: str, fecha: str | None) -> str:
+    return f"n:{nombre}|{fecha or ''}"
+
+
+def _filas(entrada) -> pd.DataFrame:
+    """Identidad de un archivo: jugador, nombre corto, Player ID, fecha y equipo."""
+    df = datos.cargar_columnas(
+        entrada.ruta, ["Name", "Team", "Player", "Player ID", "Short name", "Short Name", "Birth Date"],
+        familia=entrada.familia,
+    )
+    jugador = df["Name"] if entrada.familia == "p90" else df["Player"]
+    corto = df["Short name"] if "Short name" in df.columns else df.get("Short Name")
+    corto = corto.fillna("") if corto is not None else None
+    return pd.DataFrame({
+        "jugador": jugador.astype(str).to_numpy(),
+        "corto": corto.astype(str).to_numpy() if corto is not None else "",
+        "player_id": df["Player ID"].to_numpy() if "Player ID" in df.columns else None,
+        "fecha": [_fecha(v) for v in df["Birth Date"]] if "Birth Date" in df.columns else None,
+        "equipo": df["Team"].astype(str).to_numpy() if "Team" in df.columns else "",
+    }).drop_duplicates(["jugador", "player_id", "fecha", "equipo"])
+
+
+def _mejor_candidato(nombre: str, candidatos: list) -> str | None:
+    """Id del candidato (id, nombres) más parecido a `nombre`, si supera UMBRAL y MARGEN."""
+    puntajes = sorted(
+        ((max(similitud(nombre, n) for n in nombres), pid) for pid, nombres in candidatos),
+        reverse=True,
+    )
+    if not puntajes or puntajes[0][0] < UMBRAL:
+        return None
+    if len(puntajes) > 1 and puntajes[0][0] - puntajes[1][0] < MARGEN:
+        return None
+    return puntajes[0][1]
+
+
+def _armar(entradas: list) -> dict:
+    """{id: {"nombre", "nacimiento", "apariciones": [...]}} con las reglas del módulo."""
+    personas = {}
+    exactos = {}    # (nombre normalizado, fecha) -> id (SkillCorner)
+    bloques = {}    # fecha -> {id: nombres normalizados} (SkillCorner)
+
+    def agregar(pid, nombre, fecha, entrada, fila, metodo):
+        p = personas.setdefault(pid, {"nombre": nombre, "nacimiento": fecha, "apariciones": []})
+        aparicion = [entrada.familia, entrada.liga, entrada.temporada, entrada.archivo,
+                     fila.jugador, fila.equipo, metodo]
+        if aparicion not in p["apariciones"]:
+            p["apariciones"].append(aparicion)
+
+    # 1) SkillCorner: Player ID o, sin él, nombre + fecha
+    for e in entradas:
+        if e.familia == "p90":
+            continue
+        for fila in _filas(e).itertuples(index=False):
+            nombres = {n for n in (normalizar(fila.jugador), normalizar(fila.corto)) if n}
+            if fila.player_id is not None and not pd.isna(fila.player_id):
+                pid, metodo = f"sc:{int(fila.player_id)}", "id"
+            else:
+                pid, metodo = _id_nombre(normalizar(fila.jugador), fila.fecha), "nombre+fecha"
+            agregar(pid, fila.jugador, fila.fecha, e, fila, metodo)
+            for n in nombres:
+                exactos.setdefault((n, fila.fecha), pid)
+            if fila.fecha:
+                bloques.setdefault(fila.fecha, {}).setdefault(pid, set()).update(nombres)
+
+    # 2) StatsBomb: exacto -> difuso dentro del bloque de fecha -> persona propia
+    for e in entradas:
+        if e.familia != "p90":
+            continue
+        for fila in _filas(e).itertuples(index=False):
+            nombre = normalizar(fila.jugador)
+            fechas = _vecinas(fila.fecha) if fila.fecha else [None]
+            pid = next((exactos[(nombre, f)] for f in fechas if (nombre, f) in exactos), None)
+            metodo = "nombre+fecha"
+            if pid is None and fila.fecha:
+                candidatos = [c for f in fechas for c in bloques.get(f, {}).items()]
+                pid = _mejor_candidato(nombre, candidatos) if candidatos else None
+                metodo = "difuso"
+            if pid is None:
+                pid, metodo = _id_nombre(nombre, fila.fecha), "propio"
+            agregar(pid, fila.jugador, fila.fecha, e, fila, metodo)
+    return personas
+
+
+def _entradas() -> list:
+    return [e for e in catalogo.catalogo() if e.familia in FAMILIAS and os.path.exists(e.ruta)]
+
+
+def _desde_json(crudo: dict) -> Indice:
+    personas, por_jugador = {}, {}
+    for pid, p in crudo["personas"].items():
+        apariciones = tuple(Aparicion(*a) for a in p["apariciones"])
+        personas[pid] = Persona(pid, p["nombre"], p["nacimiento"], apariciones)
+        for a in apariciones:
+            ids = por_jugador.setdefault((a.familia, a.archivo, a.jugador), [])
+            if pid not in ids:
+                ids.append(pid)
+    versiones = {r: tuple(v) for r, v in crudo["versiones"].items()}
+    return Indice(personas, {k: tuple(v) for k, v in por_jugador.items()}, versiones)
+
+
+def _leer() -> dict | None:
+    try:
+        with open(RUTA, encoding="utf-8") as fh:
+            crudo = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return crudo if crudo.get("formato") == FORMATO else None
+
+
+def _vigente(crudo: dict, entradas: list) -> bool:
+    return crudo["versiones"] == {e.ruta: list(datos.version_archivo(e.ruta)) for e in entradas}
+
+
+# =========================
+# API
+# =========================
+def construir() -> Indice:
+    """Arma el índice con todo el catálogo y lo escribe de forma atómica (paso offline)."""
+    entradas = _entradas()
+    crudo = {
+        "formato": FORMATO,
+        "versiones": {e.ruta: list(datos.version_archivo(e.ruta)) for e in entradas},
+        "personas": _armar(entradas),
+    }
+    try:
+        os.makedirs(datos.SNAPSHOT_DIR, exist_ok=True)
+        tmp = f"{RUTA}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(crudo, fh, ensure_ascii=False)
+        os.replace(tmp, RUTA)
+    except OSError:
+        pass
+    return _desde_json(crudo)
+
+
+def indice() -> Indice:
+    """Índice del proceso: del JSON si está vigente; si no, se rearma (una vez)."""
+    global _INDICE
+    with _LOCK:
+        hit = _INDICE
+    if hit is not None:
+        return hit
+    with _LOCK_ARMADO:
+        with _LOCK:
+            if _INDICE is not None:
+                return _INDICE
+        crudo = _leer()
+        nuevo = _desde_json(crudo) if crudo is not None and _vigente(crudo, _entradas()) else construir()
+        with _LOCK:
+            _INDICE = nuevo
+        return nuevo
+
+
+def persona(pid: str) -> Persona | None:
+    """Persona por id ("sc:<Player ID>" o "n:<nombre>|<fecha>")."""
+    return indice().personas.get(pid)
+
+
+def candidatos(familia: str, archivo: str, jugador: str) -> list:
+    """Personas con `jugador` (Name o Player, como viene) en el CSV `archivo` (nombre o ruta)."""
+    ind = indice()
+    ids = ind.por_jugador.get((familia, os.path.basename(archivo), str(jugador)), ())
+    return [ind.personas[pid] for pid in ids]
+
+
+def buscar(familia: str, archivo: str, jugador: str, equipo=None, nacimiento=None) -> Persona | None:
+    """
+    Persona de `jugador` en `archivo`. Con homónimos se desempata por `equipo`
+    (el de esa aparición) y/o `nacimiento` (±TOLERANCIA_DIAS); si aún quedan
+    varios, ValueError. None si el jugador no está.
+    """
+    nombre = os.path.basename(archivo)
+    personas = candidatos(familia, nombre, jugador)
+    if equipo is not None:
+        personas = [
+            p for p in personas
+            if any(a.equipo == str(equipo) for a in p.apariciones
+                   if (a.familia, a.archivo, a.jugador) == (familia, nombre, str(jugador)))
+        ]
+    if nacimiento is not None:
+        fecha = _fecha(nacimiento)
+        personas = [p for p in personas if p.nacimiento and fecha in _vecinas(p.nacimiento)]
+    if len(personas) > 1:
+        ids = ", ".join(p.id for p in personas)
+        raise ValueError(f"{jugador!r} es ambiguo en {nombre}: {ids} (indicar equipo o nacimiento)")
+    return personas[0] if personas else None
+
+
+def filas(aparicion: Aparicion) -> pd.DataFrame:
+    """
+    Filas de `aparicion` en su archivo (la ficha de jugador las muestra): en
+    p90 las de su equipo y temporada; en SkillCorner una por grupo de
+    posición (datos.filas_unicas). Vacío si el archivo ya no está.
+    """
+    entrada = catalogo.buscar(aparicion.familia, aparicion.liga, aparicion.temporada)
+    if entrada is None or entrada.archivo != aparicion.archivo or not os.path.exists(entrada.ruta):
+        return pd.DataFrame()
+    df = datos.filas_unicas(datos.cargar_csv(entrada.ruta, familia=aparicion.familia))
+    if aparicion.familia == "p90":
+        mascara = (
+            (df["Name"].astype(str) == aparicion.jugador)
+            & (df["Team"].astype(str) == aparicion.equipo)
+            & (df["Season"].astype(str).str.strip() == aparicion.temporada)
+        )
+    else:
+        mascara = df["Player"].astype(str) == aparicion.jugador
+    return df[mascara.to_numpy()]
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta el índice del proceso si usa `ruta` (se revalida contra el JSON en la próxima consulta)."""
+    global _INDICE
+    with _LOCK:
+        if _INDICE is not None and ruta in _INDICE.versiones:
+            _INDICE = None
+
+
+def limpiar() -> None:
+    global _INDICE
+    with _LOCK:
+        _INDICE = None
+
+
+datos.registrar_invalidador(invalidar)
+
+
+# =========================
+# Paso offline
+# =========================
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    ind = construir()
+    t_armar = time.perf_counter() - t0
+    metodos = {}
+    for p in ind.personas.values():
+        for a in p.apariciones:
+            metodos[(a.familia, a.metodo)] = metodos.get((a.familia, a.metodo), 0) + 1
+    print(f"{len(ind.personas)} personas, {len(ind.por_jugador)} apariciones -> {RUTA} en {t_armar:.1f}s")
+    homonimos = sum(len(ids) > 1 for ids in ind.por_jugador.values())
+    print(f"  apariciones con homónimos: {homonimos}")
+    for (familia, metodo), n in sorted(metodos.items()):
+        print(f"  {familia:10s} {metodo:13s} {n:6d}")
+    multi = sum(len({a.familia for a in p.apariciones}) == len(FAMILIAS) for p in ind.personas.values())
+    print(f"  con las {len(FAMILIAS)} familias: {multi}")
+    t0 = time.perf_counter()
+    claves = list(ind.por_jugador)
+    for clave in claves:
+        candidatos(*clave)
+    print(f"  búsqueda: {(time.perf_counter() - t0) / max(len(claves), 1) * 1e6:.2f} µs")
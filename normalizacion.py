@@ -0,0 +1,224 @@
+"""
+Normalización de bloques de métricas para radares y rankings.
+
+Kernel único (escalar): recibe el bloque de métricas como UNA matriz float32
+(filas x métricas) y devuelve min-max, z-score o percentil para todas las
+columnas a la vez; la inversión (menor = mejor) es un vector booleano por
+columna. normalizar() lo memoiza por (archivo y versión, subconjunto
+filtrado, conjunto de métricas, método, invertidas), así que un rerun o un
+radar de otro jugador del mismo grupo es solo una búsqueda de fila.
+
+Para percentiles se guarda además, por (archivo, subconjunto, métrica), el
+vector ordenado de valores válidos: el percentil sale de np.searchsorted
+(rango medio en empates) y los vectores se reusan entre conjuntos de métricas.
+
+El subconjunto (grupo de posición + filtros de edad, minutos, etc.) se
+identifica por el hash de su índice: dos vistas con las mismas filas del
+mismo archivo comparten resultados. El archivo sale de df.attrs["origen"],
+que datos.py pone en cada carga; sin origen no se cachea. Para comparar
+contra otra población (varias ligas) se pasan sus vectores ordenados.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import datos
+
+
+# =========================
+# Configuración
+# =========================
+METODOS = ("minmax", "zscore", "percentil")
+MAX_ENTRADAS = 4096      # vectores ordenados en memoria (uno por métrica y subconjunto)
+MAX_MATRICES = 256       # matrices normalizadas memoizadas
+
+_LOCK = threading.Lock()
+_ORDENADOS = OrderedDict()     # (origen, firma, métrica) -> np.ndarray ordenado sin NaN
+_NORMALIZADOS = OrderedDict()  # (origen, firma, métricas, método, invertidas) -> matriz float32
+
+
+# =========================
+# Helpers
+# =========================
+def firma(df: pd.DataFrame) -> str:
+    """Firma del subconjunto de filas (grupo + filtros aplicados) a partir del índice."""
+    h = pd.util.hash_array(df.index.to_numpy())
+    return hashlib.blake2b(h.tobytes(), digest_size=16).hexdigest()
+
+
+def bloque(df: pd.DataFrame, metricas: list) -> np.ndarray:
+    """Bloque de métricas como matriz float32 (no numérico -> NaN)."""
+    out = np.empty((len(df), len(metricas)), dtype=np.float32)
+    for j, m in enumerate(metricas):
+        s = df[m]
+        if not pd.api.types.is_numeric_dtype(s):
+            s = pd.to_numeric(s, errors="coerce")
+        out[:, j] = s.to_numpy(dtype=np.float32, na_value=np.nan)
+    return out
+
+
+def _ordenado(columna: np.ndarray) -> np.ndarray:
+    return np.sort(columna[~np.isnan(columna)])
+
+
+def _vectores(df: pd.DataFrame, metricas: list, matriz: np.ndarray) -> list[np.ndarray]:
+    """
+    Vectores ordenados por métrica de un df con origen (`matriz` es su bloque
+    de métricas); solo se ordenan las columnas que no están en cache.
+    """
+    base = (df.attrs["origen"], firma(df))
+    with _LOCK:
+        hits = [_ORDENADOS.get(base + (m,)) for m in metricas]
+        for m, h in zip(metricas, hits):
+            if h is not None:
+                _ORDENADOS.move_to_end(base + (m,))
+    nuevos = {m: _ordenado(matriz[:, j]) for j, (m, h) in enumerate(zip(metricas, hits)) if h is None}
+    if nuevos:
+        with _LOCK:
+            for m, v in nuevos.items():
+                _ORDENADOS[base + (m,)] = v
+            while len(_ORDENADOS) > MAX_ENTRADAS:
+                _ORDENADOS.popitem(last=False)
+    return [h if h is not None else nuevos[m] for m, h in zip(metricas, hits)]
+
+
+def _mascara_inversion(metricas: list, invertir) -> np.ndarray:
+    invertir = set(invertir or ())
+    return np.fromiter((m in invertir for m in metricas), dtype=bool, count=len(metricas))
+
+
+# =========================
+# Kernel
+# =========================
+def escalar(matriz: np.ndarray, metodo: str = "minmax", invertir=None, ordenados=None) -> np.ndarray:
+    """
+    Escala todas las columnas de `matriz` (n x k) en una pasada, en float32:
+    - minmax: 0–1; columna constante o valor faltante -> 0.5.
+    - zscore: (x - media) / desvío; constante o faltante -> 0.
+    - percentil: 0–100 por rango medio; faltante o columna vacía -> 50.
+    `invertir` es un vector booleano (k,) de métricas donde menor = mejor.
+    `ordenados` (opcional, percentil): vectores ordenados por columna ya calculados.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido: {metodo!r} (usa uno de {METODOS})")
+    x = np.asarray(matriz, dtype=np.float32)
+    inv = np.zeros(x.shape[1], dtype=bool) if invertir is None else np.asarray(invertir, dtype=bool)
+    if x.shape[0] == 0:
+        return x.copy()
+    faltan = np.isnan(x)
+    validas = (~faltan).any(axis=0)
+
+    if metodo == "minmax":
+        mn = np.nanmin(np.where(validas, x, 0), axis=0)
+        mx = np.nanmax(np.where(validas, x, 0), axis=0)
+        rango = mx - mn
+        ok = validas & (rango > 0)
+        out = (x - mn) / np.where(ok, rango, 1)
+        out = np.where(inv, 1 - out, out)
+        out[faltan | ~ok] = 0.5
+        return out.astype(np.float32, copy=False)
+
+    if metodo == "zscore":
+        media = np.nanmean(np.where(validas, x, 0), axis=0)
+        desvio = np.nanstd(np.where(validas, x, 0), axis=0)
+        ok = validas & (desvio > 0)
+        out = (x - media) / np.where(ok, desvio, 1)
+        out = np.where(inv, -out, out)
+        out[faltan | ~ok] = 0
+        return out.astype(np.float32, copy=False)
+
+    if ordenados is None:
+        orden = np.sort(x, axis=0)                 # NaN quedan al final de cada columna
+        ordenados = [orden[:n, j] for j, n in enumerate((~faltan).sum(axis=0))]
+    out = np.full(x.shape, 50.0, dtype=np.float32)
+    for j, orden in enumerate(ordenados):
+        if len(orden) == 0:
+            continue
+        ok = ~faltan[:, j]
+        v = x[ok, j]
+        p = (np.searchsorted(orden, v, side="left") + np.searchsorted(orden, v, side="right")) * (50.0 / len(orden))
+        out[ok, j] = 100.0 - p if inv[j] else p
+    return out
+
+
+# =========================
+# API
+# =========================
+def normalizar(df: pd.DataFrame, metricas, metodo: str = "percentil", invertir=()) -> np.ndarray:
+    """
+    Matriz (len(df), len(metricas)) float32 con `metricas` escaladas por
+    `metodo` dentro de `df` (ver escalar). Memoizada por origen, subconjunto
+    de filas, conjunto de métricas, método e invertidas. No modificar el
+    resultado: es compartido.
+    """
+    metricas = list(metricas)
+    inv = _mascara_inversion(metricas, invertir)
+    origen = df.attrs.get("origen")
+    clave = None
+    if origen is not None:
+        clave = (origen, firma(df), tuple(metricas), metodo, tuple(np.flatnonzero(inv)))
+        with _LOCK:
+            hit = _NORMALIZADOS.get(clave)
+            if hit is not None:
+                _NORMALIZADOS.move_to_end(clave)
+                return hit
+
+    x = bloque(df, metricas)
+    ordenados = _vectores(df, metricas, x) if metodo == "percentil" and clave is not None else None
+    out = escalar(x, metodo, inv, ordenados)
+    out.flags.writeable = False
+    if clave is not None:
+        with _LOCK:
+            _NORMALIZADOS[clave] = out
+            while len(_NORMALIZADOS) > MAX_MATRICES:
+                _NORMALIZADOS.popitem(last=False)
+    return out
+
+
+def percentiles(df: pd.DataFrame, metricas, filas=None, invertir=()) -> np.ndarray:
+    """
+    Percentil 0–100 de `filas` (máscara booleana o posiciones; por defecto
+    todas) en cada métrica, respecto de todas las filas de `df`. Empates
+    cuentan la mitad (rango medio); las métricas en `invertir` se dan vuelta
+    (menor = mejor). Valor faltante o métrica sin datos -> 50.
+    Devuelve una matriz (len(filas), len(metricas)).
+    """
+    out = normalizar(df, metricas, "percentil", invertir)
+    if filas is None:
+        return out
+    filas = np.asarray(filas)
+    return out[np.flatnonzero(filas) if filas.dtype == bool else filas]
+
+
+def percentiles_jugador(df: pd.DataFrame, mascara, metricas, invertir=(), ordenados=None) -> list[float]:
+    """
+    Percentiles de la primera fila de `mascara` en cada métrica (para el
+    radar). Por defecto contra las filas de df; con `ordenados` (un vector
+    ordenado por métrica, p. ej. de una población multi-liga de
+    poblaciones.py) contra esa población.
+    """
+    if ordenados is None:
+        return percentiles(df, metricas, np.flatnonzero(np.asarray(mascara))[:1], invertir)[0].tolist()
+    metricas = list(metricas)
+    fila = bloque(df.iloc[np.flatnonzero(np.asarray(mascara))[:1]], metricas)
+    return escalar(fila, "percentil", _mascara_inversion(metricas, invertir), ordenados)[0].tolist()
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta los vectores y matrices calculados a partir de `ruta`."""
+    with _LOCK:
+        for cache in (_ORDENADOS, _NORMALIZADOS):
+            for clave in [k for k in cache if k[0][0] == ruta]:
+                del cache[clave]
+
+
+def limpiar() -> None:
+    with _LOCK:
+        _ORDENADOS.clear()
+        _NORMALIZADOS.clear()
+
+
+datos.registrar_invalidador(invalidar)
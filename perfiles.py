@@ -0,0 +1,363 @@
+"""
+Perfiles por grupo de posición: variables y rankings PCA.
+
+Dos secciones: los perfiles p90 (StatsBomb) y Ligas Alternas (Wyscout).
+Para cada una se definen las variables de cada perfil (y qué columnas se
+cargan en esa sección), los dos rankings que se ajustan sobre ellas y los
+valores por defecto de los sliders. Las secciones y el precalentamiento leen
+de aquí para que no se desalineen: calentar() y calentar_alternas() ajustan
+con rankings.por_grupo, en una pasada por archivo, los rankings de todos los
+grupos sobre el subconjunto que la sección muestra con los filtros por
+defecto, y así el primer ranking que abre un analista sale del cache.
+"""
+import pandas as pd
+
+import catalogo
+import datos
+import filtros
+import posiciones
+import precalentar
+import rankings
+
+
+# =========================
+# Variables por grupo
+# =========================
+VARIABLES_P90 = {
+    "Porteros": {
+        "def": [
+            "PSxG Faced", "GSAA", "Save%", "xSv%", "Shot Stopping%", "Shots Faced", "Shots Faced OT%",
+            "Goalkeeper OBV"
+        ],
+        "ball": [
+            "GK Aggressive Dist.", "Claims%", "Pass OBV", "OP Passes", "Passing%", "Passes Pressured%",
+            "Pass Forward%", "Carries", "Successful Dribbles"
+        ],
+    },
+    "Centrales": {
+        "def": [
+            "PAdj Tackles", "PAdj Interceptions", "Blocks/Shot", "Clearances", "Aerial Win%",
+            "Aerial Wins", "Dribbles Stopped%", "DA OBV", "Aggressive Actions", "PAdj Pressures",
+            "Ball Recoveries", "Counterpress Regains"
+        ],
+        "ball": [
+            "xGBuildup", "xGChain", "OBV", "Pass OBV", "Long Ball%", "Long Balls", "Passing%",
+            "Passes Pressured%", "OP F3 Passes", "Pass Forward%", "OP Passes"
+        ],
+    },
+    "Carrileros/Laterales": {
+        "def": [
+            "PAdj Interceptions", "PAdj Clearances", "Blocks/Shot", "Defensive Regains",
+            "Ball Recoveries", "PAdj Tackles", "Dribbles Stopped%", "Pressure Regains",
+            "Counterpress Regains", "DA OBV"
+        ],
+        "ball": [
+            "Assists", "xG Assisted", "Key Passes", "Successful Dribbles", "Dribble%", "OP Passes",
+            "Passing%", "Deep Progressions", "xGBuildup", "xGChain", "Carries", "PintoB", "PinTin",
+            "Successful Box Cross%", "Successful Crosses", "Deep Completions", "Pass OBV", "D&C OBV",
+            "OBV"
+        ],
+    },
+    "Contenciones": {
+        "def": [
+            "PAdj Interceptions", "Defensive Regains", "PAdj Tackles", "Dribbles Stopped%",
+            "PAdj Pressures", "Counterpress Regains", "Blocks/Shot", "DA OBV", "Aggressive Actions"
+        ],
+        "ball": [
+            "xG", "Shooting%", "Assists", "xG Assisted", "Key Passes", "Successful Dribbles", "OP Passes",
+            "Deep Progressions", "xGBuildup", "xGChain", "Carries", "PintoB", "Throughballs", "Pass OBV",
+            "Shot OBV", "OBV"
+        ],
+    },
+    "Interiores": {
+        "def": [
+            "PAdj Interceptions", "Defensive Regains", "PAdj Tackles", "Dribbles Stopped%",
+            "PAdj Pressures", "Counterpress Regains", "Blocks/Shot", "Dribbles Stopped%", "DA OBV",
+            "Aggressive Actions"
+        ],
+        "ball": [
+            "xG", "Shooting%", "Assists", "xG Assisted", "Key Passes", "Successful Dribbles", "OP Passes",
+            "Deep Progressions", "xGBuildup", "xGChain", "Carries", "PintoB", "Throughballs", "Pass OBV",
+            "Shot OBV", "OBV"
+        ],
+    },
+    "Volantes Ofensivos": {
+        "def": [
+            "xG Assisted", "Key Passes", "Assists", "Throughballs", "OP F3 Passes", "F3 Pass Forward%",
+            "Passes Inside Box", "PintoB", "xGChain", "OBV", "Pass OBV", "D&C OBV",
+            "Counterpress Regains", "Pressures", "Deep Progressions", "Carries", "Dribbles"
+        ],
+        "ball": [
+            "Shot OBV", "NP Goals", "xG/Shot", "Shot Touch%", "PSxG", "Shots", "Goal Conversion%"
+        ],
+    },
+    "Extremos": {
+        "def": [
+            "xG Assisted", "Key Passes", "Assists", "Throughballs", "OP F3 Passes", "F3 Pass Forward%",
+            "Passes Inside Box", "PintoB", "xGChain", "OBV", "Pass OBV", "D&C OBV",
+            "Counterpress Regains", "Pressures", "Deep Progressions", "Carries", "Successful Dribbles",
+            "Defensive Regains"
+        ],
+        "ball": [
+            "Shot OBV", "NP Goals", "xG/Shot", "Shot Touch%", "PSxG", "Shots", "Goal Conversion%"
+        ],
+    },
+    "Delanteros": {
+        "def": [
+            "xG Assisted", "Key Passes", "Assists", "Throughballs", "OP F3 Passes", "F3 Pass Forward%",
+            "Passes Inside Box", "PintoB", "xGChain", "OBV", "Pass OBV", "D&C OBV",
+            "Counterpress Regains", "Pressures", "Deep Progressions", "Carries", "Dribbles",
+            "Aerial Win%"
+        ],
+        "ball": [
+            "Shot OBV", "NP Goals", "xG/Shot", "Shot Touch%", "PSxG", "Shots", "Goal Conversion%"
+        ],
+    },
+}
+
+# Rankings de cada perfil: {nombre: "def" | "ball"} (qué lista de variables ajusta)
+_DEF_BALL = {"Ranking General Defensivo": "def", "Ranking General Con Balón": "ball"}
+_CREACION = {"Ranking General Creación": "def", "Ranking General Definición": "ball"}
+RANKINGS_P90 = {
+    "Porteros": {"Ranking General Atajadas": "def", "Ranking Juego de Pies": "ball"},
+    "Centrales": _DEF_BALL,
+    "Carrileros/Laterales": {"Ranking General Defensivo": "def", "Ranking General Ofensivo": "ball"},
+    "Contenciones": _DEF_BALL,
+    "Interiores": _DEF_BALL,
+    "Volantes Ofensivos": _CREACION,
+    "Extremos": _CREACION,
+    "Delanteros": _CREACION,
+}
+
+# =========================
+# Filtros por defecto del sidebar
+# =========================
+MINUTOS_DEFECTO = 600   # mínimo del rango de minutos (o el mínimo del grupo, si es mayor)
+EDAD_DEFECTO = {g: (17, 36) if g == "Porteros" else (17, 37) for g in VARIABLES_P90}
+
+
+# =========================
+# Ligas Alternas (Wyscout)
+# =========================
+# Listas que comparten varios perfiles
+_DEF_MEDIOS_LA = [
+    "Acciones defensivas realizadas/90", "Duelos defensivos ganados, %", "Entradas/90",
+    "Posesión conquistada después de una entrada", "Interceptaciones/90",
+    "Posesión conquistada después de una interceptación"
+]
+_BALL_MEDIOS_LA = [
+    "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %", "Pases hacia adelante/90",
+    "Pases largos/90", "Precisión pases largos, %", "Pases en profundidad/90", "Pases progresivos/90",
+    "Acciones de ataque exitosas/90", "Remates/90", "Asistencias/90", "Pases recibidos /90", "Second assists/90",
+    "Third assists/90", "Jugadas claves/90", "Pases en el último tercio/90", "Pases al área de penalti/90",
+    "Precisión pases, %", "Pases recibidos /90", "Pases largos/90", "Precisión pases largos, %",
+    "Longitud media pases, m"
+]
+_DEFINICION_LA = [
+    "Goles", "xG", "Asistencias", "xA", "Remates", "Tiros a la portería, %",
+    "Goles hechos, %", "Second assists/90", "Third assists/90", "Jugadas claves/90",
+    "Remates/90", "Centros/90", "Precisión centros, %", "Pases hacía el área pequeña, %"
+]
+_CREACION_LA = [
+    "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %",
+    "Pases en profundidad/90", "Pases progresivos/90", "Acciones de ataque exitosas/90",
+    "Pases recibidos /90", "Pases en el último tercio/90", "Pases al área de penalti/90",
+    "Regates/90", "Regates realizados, %", "Duelos atacantes ganados, %",
+    "Desmarques/90", "Precisión desmarques, %"
+]
+
+VARIABLES_ALTERNAS = {
+    "Porteros": {
+        "def": [
+            "Porterías imbatidas en los 90", "Paradas, %", "xG en contra", "Goles evitados", "Salidas/90",
+            "Duelos aéreos en los 90"
+        ],
+        "ball": [
+            "Pases/90", "Pases recibidos /90", "Precisión pases, %", "Pases largos/90", "Precisión pases largos, %",
+            "Pases progresivos/90", "Precisión pases progresivos, %"
+        ],
+    },
+    "Centrales": {
+        "def": [
+            "Acciones defensivas realizadas/90", "Duelos defensivos/90", "Duelos defensivos ganados, %",
+            "Duelos aéreos en los 90", "Duelos aéreos ganados, %", "Entradas/90",
+            "Posesión conquistada después de una entrada", "Tiros interceptados/90", "Interceptaciones/90",
+            "Posesión conquistada después de una interceptación"
+        ],
+        "ball": [
+            "Carreras en progresión/90", "Aceleraciones/90", "Pases/90", "Precisión pases, %",
+            "Pases hacia adelante/90", "Pases largos/90", "Precisión pases largos, %", "Pases en profundidad/90",
+            "Pases progresivos/90"
+        ],
+    },
+    "Carrileros/Laterales": {
+        "def": [
+            "Acciones defensivas realizadas/90", "Duelos defensivos ganados, %", "Entradas/90",
+            "Posesión conquistada después de una entrada", "Interceptaciones/90",
+            "Posesión conquistada después de una interceptación", "Duelos defensivos/90", "Tiros interceptados/90"
+        ],
+        "ball": [
+            "Carreras en progresión/90", "Aceleraciones/90", "Acciones de ataque exitosas/90",
+            "Goles (excepto los penaltis)", "xG/90", "Remates", "Remates/90", "Tiros a la portería, %",
+            "Asistencias/90", "Centros/90", "Precisión centros, %", "Regates/90", "Duelos atacantes ganados, %",
+            "Toques en el área de penalti/90", "Pases/90", "Pases hacia adelante/90", "xA/90",
+            "Second assists/90", "Third assists/90", "Desmarques/90", "Precisión desmarques, %",
+            "Jugadas claves/90", "Pases en el último tercio/90", "Centros desde el último tercio/90",
+            "Pases progresivos/90"
+        ],
+    },
+    "Contenciones": {
+        "def": _DEF_MEDIOS_LA,
+        "ball": _BALL_MEDIOS_LA,
+    },
+    "Interiores": {
+        "def": _DEF_MEDIOS_LA,
+        "ball": _BALL_MEDIOS_LA,
+    },
+    "Volantes Ofensivos": {
+        "def": [
+            "Goles", "xG", "Asistencias", "xA", "Remates", "Tiros a la portería, %",
+            "Goles hechos, %", "Second assists/90", "Third assists/90", "Jugadas claves/90"
+        ],
+        "ball": _BALL_MEDIOS_LA,
+    },
+    "Extremos": {
+        "def": _DEFINICION_LA,
+        "ball": _CREACION_LA,
+    },
+    "Delanteros": {
+        "def": _CREACION_LA,
+        "ball": _DEFINICION_LA,
+    },
+}
+
+# Rankings de cada perfil: {nombre: "def" | "ball"}
+_DEF_BALL_LA = {"Ranking General Defensivo": "def", "Ranking Con Balón": "ball"}
+_CREACION_DEFINICION_LA = {"Ranking Creación": "ball", "Ranking Definición": "def"}
+RANKINGS_ALTERNAS = {
+    "Porteros": {"Ranking General Atajadas": "def", "Ranking Juego de Pies": "ball"},
+    "Centrales": _DEF_BALL_LA,
+    "Carrileros/Laterales": _DEF_BALL_LA,
+    "Contenciones": _DEF_BALL_LA,
+    "Interiores": _DEF_BALL_LA,
+    "Volantes Ofensivos": _CREACION_DEFINICION_LA,
+    "Extremos": _CREACION_DEFINICION_LA,
+    "Delanteros": {"Ranking Definición": "ball", "Ranking Creación": "def"},
+}
+
+# Menos = mejor: el ranking usa la columna negada con este nombre
+INVERTIDAS_ALTERNAS = {"xG en contra": "xG en contra (inv)"}
+
+EDAD_DEFECTO_ALTERNAS = (17, 36)
+
+
+# =========================
+# API
+# =========================
+def bloques(grupo: str) -> dict:
+    """{nombre del ranking: variables} de `grupo`, tal como lo recibe rankings.rankings."""
+    return {nombre: VARIABLES_P90[grupo][lado] for nombre, lado in RANKINGS_P90[grupo].items()}
+
+
+def columnas(grupo: str) -> list:
+    """Variables del perfil de `grupo` (las columnas que carga la sección)."""
+    return VARIABLES_P90[grupo]["def"] + VARIABLES_P90[grupo]["ball"]
+
+
+def calentar(entrada) -> None:
+    """
+    Precálculo de precalentar.py: rankings de todos los grupos de `entrada`
+    (p90) con los filtros por defecto de la sección, en un solo por_grupo.
+    """
+    if entrada.familia != "p90":
+        return
+    todas = list(dict.fromkeys(c for g in VARIABLES_P90 for c in columnas(g)))
+    df = datos.cargar_columnas(entrada.ruta, todas, familia="p90")
+    grupos = {}
+    for e in catalogo.entradas("p90"):
+        if e.ruta != entrada.ruta:
+            continue
+        base = (
+            filtros.filtrar(df)
+            .igual("Competition", catalogo.nombre_base_liga("p90", e.liga, e.temporada))
+            .igual("Season", e.temporada)
+        )
+        for grupo in VARIABLES_P90:
+            resumen = datos.resumen_filtros(entrada.ruta, "p90", grupo)
+            if resumen.minutos is None or resumen.edad is None:
+                continue
+            min_mins, max_mins = (int(v) for v in resumen.minutos)
+            edad = EDAD_DEFECTO[grupo]
+            filtro = (
+                base.igual("Grupo", grupo)
+                .entre("Minutes", max(MINUTOS_DEFECTO, min_mins), max_mins)
+                .entre("Age", edad[0], edad[1], truncar=True)
+                .en("Nationality", resumen.nacionalidades)
+            )
+            if len(filtro):
+                grupos[(e.liga, e.temporada, grupo)] = (filtro.mascara, bloques(grupo))
+    if grupos:
+        rankings.por_grupo(df, grupos)
+
+
+def columnas_alternas(grupo: str) -> list:
+    """Variables del perfil de `grupo` en Ligas Alternas (las columnas que carga la sección)."""
+    return VARIABLES_ALTERNAS[grupo]["def"] + VARIABLES_ALTERNAS[grupo]["ball"]
+
+
+def invertir_alternas(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega a df las columnas negadas de INVERTIDAS_ALTERNAS presentes (y lo devuelve)."""
+    for columna, invertida in INVERTIDAS_ALTERNAS.items():
+        if columna in df.columns:
+            df[invertida] = -pd.to_numeric(df[columna], errors="coerce")
+    return df
+
+
+def bloques_alternas(grupo: str, disponibles) -> dict:
+    """
+    {nombre del ranking: variables} de `grupo` en Ligas Alternas: solo las
+    `disponibles` (columnas del archivo), sin repetir y con las invertidas
+    ya renombradas (invertir_alternas agrega esas columnas).
+    """
+    disponibles = set(disponibles)
+    return {
+        nombre: [INVERTIDAS_ALTERNAS.get(c, c) for c in dict.fromkeys(VARIABLES_ALTERNAS[grupo][lado])
+                 if c in disponibles]
+        for nombre, lado in RANKINGS_ALTERNAS[grupo].items()
+    }
+
+
+def calentar_alternas(entrada) -> None:
+    """
+    Precálculo de precalentar.py: rankings de todos los grupos de `entrada`
+    (alternas) con los filtros por defecto de la sección, en un solo por_grupo.
+    La sección no filtra por liga ni temporada: usa todo el archivo.
+    """
+    if entrada.familia != "alternas":
+        return
+    todas = list(dict.fromkeys(c for g in VARIABLES_ALTERNAS for c in columnas_alternas(g)))
+    df = invertir_alternas(datos.cargar_columnas(entrada.ruta, todas, familia="alternas"))
+    base = filtros.filtrar(df)
+    grupos = {}
+    for grupo in VARIABLES_ALTERNAS:
+        cotas = datos.resumen_filtros(entrada.ruta, "alternas", grupo)
+        if cotas.minutos is None or cotas.edad is None:
+            continue
+        min_mins, max_mins = (int(v) for v in cotas.minutos)
+        filtro = (
+            base.donde(
+                ("posicion", grupo),
+                lambda d, g=grupo: posiciones.mascara(d["Posición específica"], g, "wyscout"),
+            )
+            .entre("Minutos jugados", max(MINUTOS_DEFECTO, min_mins), max_mins)
+            .entre("Edad", EDAD_DEFECTO_ALTERNAS[0], EDAD_DEFECTO_ALTERNAS[1])
+            .en("País de nacimiento", cotas.nacionalidades)
+        )
+        if len(filtro):
+            grupos[grupo] = (filtro.mascara, bloques_alternas(grupo, df.columns))
+    if grupos:
+        rankings.por_grupo(df, grupos)
+
+
+precalentar.registrar(calentar)
+precalentar.registrar(calentar_alternas)
@@ -0,0 +1,167 @@
+"""
+Poblaciones de referencia multi-liga para los percentiles de los radares p90.
+
+Por defecto un radar compara al jugador con su grupo dentro de su liga y
+temporada. Aquí se arma una población combinada: el mismo grupo de posición
+en varias ligas/temporadas (por ejemplo, las top-5 europeas), como UNA matriz
+columnar concatenada (filas de todas las ligas x métricas del grupo) con sus
+columnas ya ordenadas. normalizacion.percentiles_jugador(..., ordenados=...)
+saca el percentil contra esa población con np.searchsorted.
+
+La población aplica los mismos filtros que el radar (rango de minutos, edad
+y nacionalidades elegidas) en cada liga. Las poblaciones se cachean a nivel
+de proceso (compartidas entre sesiones) por esa firma (grupo, archivos y
+versiones, filtros), se sueltan cuando datos.py invalida alguno de sus
+archivos y los caches que dependen de una población (figuras.py) se indexan
+por la firma, no por el objeto.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import catalogo
+import datos
+import fases
+import normalizacion
+
+
+# =========================
+# Configuración
+# =========================
+MAX_POBLACIONES = 32
+
+# Presets de población: nombre -> ligas (se usa la última temporada de cada una)
+PRESETS = {
+    "Top-5 ligas europeas": (
+        "Premier League, Inglaterra", "La Liga, España", "Serie A, Italia",
+        "1. Bundesliga, Alemania", "Ligue 1, Francia",
+    ),
+}
+
+_LOCK = threading.Lock()
+_POBLACIONES = OrderedDict()   # firma (grupo, versiones, minutos, edad, nacionalidades) -> Poblacion
+
+
+@dataclass(frozen=True, eq=False)
+class Poblacion:
+    grupo: str
+    metricas: tuple
+    entradas: tuple          # Archivo del catálogo que la forman
+    matriz: np.ndarray       # (n, len(metricas)) float32, todas las ligas concatenadas
+    ordenados: dict          # métrica -> valores válidos ordenados
+    filas_por_liga: dict     # (liga, temporada) -> filas aportadas
+    firma: tuple = ()        # (grupo, versiones, minutos, edad, nacionalidades): clave estable
+
+    def vectores(self, metricas) -> list[np.ndarray]:
+        """Vectores ordenados para `metricas` (vacío si la métrica no está: percentil 50)."""
+        vacio = np.empty(0, dtype=np.float32)
+        return [self.ordenados.get(m, vacio) for m in metricas]
+
+    @property
+    def descripcion(self) -> str:
+        _, _, minutos, edad, nacionalidades = self.firma or (None,) * 5
+        partes = [" + ".join(f"{liga} {temp}" for liga, temp in self.filas_por_liga)]
+        if minutos is not None:
+            partes.append(f"{minutos[0]}–{minutos[1]} min")
+        if edad is not None:
+            partes.append(f"{edad[0]}–{edad[1]} años")
+        if nacionalidades is not None:
+            partes.append(f"{len(nacionalidades)} nacionalidades")
+        return " · ".join(partes)
+
+
+# =========================
+# Helpers
+# =========================
+def filas_grupo(entrada, grupo: str, metricas) -> pd.DataFrame:
+    """Filas de `grupo` de un archivo p90 (su liga y temporada), con identidad + `metricas`."""
+    df = datos.cargar_columnas(entrada.ruta, metricas, familia="p90")
+    return df[
+        (df["Competition"].astype(str).str.strip()
+         == catalogo.nombre_base_liga("p90", entrada.liga, entrada.temporada))
+        & (df["Season"].astype(str).str.strip() == entrada.temporada)
+        & (df["Grupo"] == grupo)
+    ]
+
+
+def _armar(firma: tuple, entradas: tuple) -> Poblacion:
+    grupo, _, minutos, edad, nacionalidades = firma
+    metricas = tuple(dict.fromkeys(m for vs in fases.RADAR_P90[grupo].values() for m in vs))
+    bloques, filas = [], {}
+    for e in entradas:
+        df = filas_grupo(e, grupo, metricas)
+        if minutos is not None:
+            df = df[pd.to_numeric(df["Minutes"], errors="coerce").between(*minutos)]
+        if edad is not None:
+            df = df[np.trunc(pd.to_numeric(df["Age"], errors="coerce")).between(*edad)]   # años cumplidos
+        if nacionalidades is not None:
+            df = df[df["Nationality"].astype(str).str.strip().isin(nacionalidades)]
+        x = np.full((len(df), len(metricas)), np.nan, dtype=np.float32)
+        presentes = [j for j, m in enumerate(metricas) if m in df.columns]
+        if presentes:
+            x[:, presentes] = normalizacion.bloque(df, [metricas[j] for j in presentes])
+        bloques.append(x)
+        filas[(e.liga, e.temporada)] = len(df)
+    matriz = np.vstack(bloques) if bloques else np.zeros((0, len(metricas)), dtype=np.float32)
+    ordenados = {m: np.sort(matriz[~np.isnan(matriz[:, j]), j]) for j, m in enumerate(metricas)}
+    return Poblacion(grupo, metricas, entradas, matriz, ordenados, filas, firma)
+
+
+# =========================
+# API
+# =========================
+def entradas_preset(nombre: str) -> list:
+    """Archivos p90 de un preset: la última temporada de cada liga (las que existen)."""
+    out = []
+    for liga in PRESETS[nombre]:
+        regs = [e for e in catalogo.entradas("p90") if e.liga == liga and os.path.exists(e.ruta)]
+        if regs:
+            out.append(regs[-1])
+    return out
+
+
+def poblacion(entradas, grupo: str, minutos=None, edad=None, nacionalidades=None) -> Poblacion:
+    """
+    Población combinada de `grupo` en `entradas` (registros p90 del catálogo),
+    con los filtros del radar: `minutos` y `edad` (mín, máx; edad en años
+    cumplidos) y `nacionalidades` (None = todas). Cacheada y compartida entre
+    sesiones; no modificar el resultado.
+    """
+    entradas = tuple(e for e in entradas if os.path.exists(e.ruta))
+    versiones = tuple((e.ruta, datos.version_archivo(e.ruta)) for e in entradas)
+    clave = (
+        grupo, versiones,
+        tuple(minutos) if minutos is not None else None,
+        tuple(edad) if edad is not None else None,
+        tuple(sorted(set(map(str, nacionalidades)))) if nacionalidades is not None else None,
+    )
+    with _LOCK:
+        hit = _POBLACIONES.get(clave)
+        if hit is not None:
+            _POBLACIONES.move_to_end(clave)
+            return hit
+    out = _armar(clave, entradas)
+    with _LOCK:
+        _POBLACIONES[clave] = out
+        while len(_POBLACIONES) > MAX_POBLACIONES:
+            _POBLACIONES.popitem(last=False)
+    return out
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta las poblaciones que incluyen `ruta`."""
+    with _LOCK:
+        for clave in [k for k in _POBLACIONES if any(r == ruta for r, _ in k[1])]:
+            del _POBLACIONES[clave]
+
+
+def limpiar() -> None:
+    with _LOCK:
+        _POBLACIONES.clear()
+
+
+datos.registrar_invalidador(invalidar)
@@ -0,0 +1,127 @@
+"""
+Taxonomía única de posiciones -> los ocho grupos del dashboard.
+
+Tres vocabularios, uno por proveedor:
+- StatsBomb (p90): nombres completos en "Primary Position" ("Left Centre Back").
+- SkillCorner: códigos cortos en "Position" ("LCB").
+- Wyscout (alternas): listas de códigos en "Posición específica" ("RCB, CB");
+  un jugador con varias posiciones puede caer en varios grupos.
+
+Las máscaras se calculan una vez sobre las categorías (valores distintos) y
+se expanden con los códigos de la categórica: una sola pasada vectorizada en
+lugar de .apply o regex fila a fila.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# Grupos y vocabularios
+# =========================
+GRUPOS = (
+    "Porteros", "Centrales", "Carrileros/Laterales", "Contenciones",
+    "Interiores", "Volantes Ofensivos", "Extremos", "Delanteros",
+)
+OTROS = "Otros"
+
+STATSBOMB = {
+    "Porteros": ["Goalkeeper"],
+    "Centrales": ["Left Centre Back", "Centre Back", "Right Centre Back"],
+    "Carrileros/Laterales": ["Left Back", "Left Wing Back", "Right Back", "Right Wing Back"],
+    "Contenciones": ["Centre Defensive Midfielder", "Left Defensive Midfielder", "Right Defensive Midfielder"],
+    "Interiores": ["Centre Midfielder", "Central Midfielder", "Left Centre Midfielder", "Right Centre Midfielder"],
+    "Volantes Ofensivos": ["Centre Attacking Midfielder", "Right Attacking Midfielder", "Left Attacking Midfielder"],
+    "Extremos": ["Left Wing", "Right Wing", "Left Winger", "Right Winger", "Left Midfielder", "Right Midfielder"],
+    "Delanteros": ["Centre Forward", "Left Centre Forward", "Right Centre Forward", "Striker",
+                   "Second Striker", "Left Forward", "Right Forward", "Forward"],
+}
+
+SKILLCORNER = {
+    "Porteros": ["GK", "GKP", "GOALKEEPER"],
+    "Centrales": ["CB", "LCB", "RCB"],
+    "Carrileros/Laterales": ["LB", "LWB", "RB", "RWB"],
+    "Contenciones": ["DM", "CDM", "LDM", "RDM"],
+    "Interiores": ["CM", "LCM", "RCM", "CMF", "LM", "RM"],
+    "Volantes Ofensivos": ["AM", "CAM"],
+    "Extremos": ["LW", "RW"],
+    "Delanteros": ["CF", "ST", "LF", "RF", "SS", "FW", "FWD"],
+}
+
+WYSCOUT = {
+    "Porteros": ["GK"],
+    "Centrales": ["CB", "LCB", "RCB"],
+    "Carrileros/Laterales": ["LB", "RB", "LWB", "RWB"],
+    "Contenciones": ["DMF", "LDMF", "RDMF"],
+    "Interiores": ["CMF", "LCMF", "RCMF"],
+    "Volantes Ofensivos": ["AMF", "LAMF", "RAMF"],
+    "Extremos": ["LW", "RW"],
+    "Delanteros": ["CF", "ST"],
+}
+# Un extremo que también figura como carrilero no cuenta como extremo
+WYSCOUT_EXCLUYE = {"Extremos": {"LWB", "RWB"}}
+
+_VOCABULARIOS = {"statsbomb": STATSBOMB, "skillcorner": SKILLCORNER, "wyscout": WYSCOUT}
+
+
+# =========================
+# Helpers
+# =========================
+def _grupos_de(valor: str, proveedor: str) -> frozenset:
+    """Grupos a los que pertenece un valor del vocabulario de `proveedor`."""
+    vocab = _VOCABULARIOS[proveedor]
+    if proveedor == "wyscout":
+        codigos = {c.strip().upper() for c in valor.split(",")}
+        return frozenset(
+            g for g, cods in vocab.items()
+            if codigos & set(cods) and not codigos & WYSCOUT_EXCLUYE.get(g, set())
+        )
+    v = valor.strip()
+    if proveedor == "skillcorner":
+        v = v.upper()
+    return frozenset(g for g, vals in vocab.items() if v in vals)
+
+
+@lru_cache(maxsize=512)
+def _tabla(proveedor: str, categorias: tuple) -> dict[str, np.ndarray]:
+    """grupo -> vector booleano por categoría (cacheado por conjunto de categorías)."""
+    pertenencia = [_grupos_de(str(c), proveedor) for c in categorias]
+    return {g: np.array([g in p for p in pertenencia], dtype=bool) for g in GRUPOS}
+
+
+def _categorica(serie: pd.Series) -> pd.Series:
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    return serie.astype("category")
+
+
+# =========================
+# API
+# =========================
+def mascara(serie: pd.Series, grupo: str, proveedor: str) -> pd.Series:
+    """Filas de `serie` que pertenecen a `grupo` (NaN nunca pertenece)."""
+    cat = _categorica(serie)
+    tabla = _tabla(proveedor, tuple(cat.cat.categories))
+    codigos = cat.cat.codes.to_numpy()
+    fila = tabla[grupo][codigos] if len(tabla[grupo]) else np.zeros(len(codigos), dtype=bool)
+    return pd.Series(fila & (codigos >= 0), index=serie.index)
+
+
+def grupo(serie: pd.Series, proveedor: str) -> pd.Series:
+    """
+    Grupo único por fila como categórica (OTROS si no calza). Para Wyscout,
+    donde un jugador puede estar en varios grupos, se toma el primero en
+    orden de GRUPOS; para filtrar conviene mascara().
+    """
+    cat = _categorica(serie)
+    tabla = _tabla(proveedor, tuple(cat.cat.categories))
+    etiquetas = np.full(len(cat.cat.categories), OTROS, dtype=object)
+    for g in reversed(GRUPOS):
+        etiquetas[tabla[g]] = g
+    codigos = cat.cat.codes.to_numpy()
+    valores = np.where(codigos >= 0, etiquetas[codigos] if len(etiquetas) else OTROS, OTROS)
+    return pd.Series(
+        pd.Categorical(valores, categories=list(GRUPOS) + [OTROS]),
+        index=serie.index,
+    )
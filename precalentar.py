@@ -0,0 +1,172 @@
+"""
+Precalentamiento de caches al arrancar el servidor.
+
+Al primer rerun de cada proceso la app llama a iniciar(): un hilo en segundo
+plano recorre el catálogo con un pool de hilos y deja cada archivo cargado en
+el cache de datos.py (snapshot incluido), de modo que el primer analista que
+abre una liga no paga el parseo. Los caches derivados se enganchan con
+registrar(): cada función registrada se corre sobre cada archivo ya cargado.
+Este módulo registra el índice de filtros del sidebar (datos.resumen_filtros);
+los módulos de caches derivados registran los suyos al importarse (perfiles.py:
+rankings de los perfiles p90 y de Ligas Alternas).
+
+Con PRECALENTAR_TOP_N > 0 solo se precalientan las N ligas más usadas según el
+conteo de uso que la app anota en `uso.json` (junto a los snapshots).
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import catalogo
+import datos
+
+
+# =========================
+# Configuración
+# =========================
+ACTIVO = os.environ.get("PRECALENTAR", "1") != "0"
+TOP_N = int(os.environ.get("PRECALENTAR_TOP_N", "0"))   # 0 = todas las ligas
+HILOS = int(os.environ.get("PRECALENTAR_HILOS", str(min(4, os.cpu_count() or 1))))
+
+USO = os.path.join(datos.SNAPSHOT_DIR, "uso.json")
+SEGUNDOS_GUARDADO = 30   # el conteo de uso se persiste como mucho cada 30 s
+
+_LOCK = threading.Lock()
+_USO = None              # "familia|liga" -> veces que se abrió
+_USO_GUARDADO = 0.0
+_CALENTADORES = []       # funciones (Archivo) -> None para caches derivados
+_ESTADO = {"total": 0, "hechos": 0, "errores": 0, "activo": False, "iniciado": False}
+
+
+# =========================
+# Conteo de uso
+# =========================
+def _cargar_uso() -> dict:
+    global _USO
+    if _USO is None:
+        try:
+            with open(USO, encoding="utf-8") as fh:
+                _USO = json.load(fh)
+        except (OSError, ValueError):
+            _USO = {}
+    return _USO
+
+
+def _guardar_uso(uso: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(USO), exist_ok=True)
+        tmp = f"{USO}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(uso, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, USO)
+    except OSError:
+        pass
+
+
+def anotar_uso(familia: str, liga: str) -> None:
+    """Suma una apertura de (familia, liga); la app la llama al resolver el archivo."""
+    global _USO_GUARDADO
+    with _LOCK:
+        uso = _cargar_uso()
+        clave = f"{familia}|{liga}"
+        uso[clave] = uso.get(clave, 0) + 1
+        ahora = time.monotonic()
+        if ahora - _USO_GUARDADO >= SEGUNDOS_GUARDADO:
+            _USO_GUARDADO = ahora
+            _guardar_uso(dict(uso))
+
+
+def ligas_mas_usadas(n: int) -> list[tuple[str, str]]:
+    """Las `n` (familia, liga) con más aperturas, de más a menos usada."""
+    with _LOCK:
+        uso = dict(_cargar_uso())
+    orden = sorted(uso.items(), key=lambda kv: -kv[1])[:n]
+    return [tuple(k.split("|", 1)) for k, _ in orden]
+
+
+# =========================
+# Precalentamiento
+# =========================
+def registrar(funcion) -> None:
+    """Engancha un precálculo derivado: funcion(Archivo) se corre tras cargar cada archivo."""
+    if funcion not in _CALENTADORES:
+        _CALENTADORES.append(funcion)
+
+
+def tareas(top_n: int = TOP_N) -> list:
+    """Entradas del catálogo a precalentar (una por archivo), las más usadas primero."""
+    with _LOCK:
+        uso = dict(_cargar_uso())
+    entradas, vistos = [], set()
+    for e in catalogo.catalogo():
+        if (e.ruta, e.familia) not in vistos and os.path.exists(e.ruta):
+            vistos.add((e.ruta, e.familia))
+            entradas.append(e)
+    entradas.sort(key=lambda e: -uso.get(f"{e.familia}|{e.liga}", 0))
+    if top_n > 0:
+        elegidas = ligas_mas_usadas(top_n)
+        # Sin historial suficiente se completa con las primeras ligas del catálogo
+        for e in catalogo.catalogo():
+            if len(elegidas) >= top_n:
+                break
+            if (e.familia, e.liga) not in elegidas:
+                elegidas.append((e.familia, e.liga))
+        elegidas = set(elegidas)
+        entradas = [e for e in entradas if (e.familia, e.liga) in elegidas]
+    return entradas
+
+
+def calentar(entrada) -> None:
+    """Carga un archivo del catálogo y corre sobre él los precálculos registrados."""
+    datos.cargar_csv(entrada.ruta, familia=entrada.familia)
+    for funcion in list(_CALENTADORES):
+        funcion(entrada)
+
+
+def _resumen_filtros(entrada) -> None:
+    """Índice de filtros del archivo (cotas de minutos/edad y nacionalidades de cada grupo)."""
+    datos.resumen_filtros(entrada.ruta, familia=entrada.familia)
+
+
+def _calentar(entrada) -> None:
+    try:
+        calentar(entrada)
+    except Exception:
+        with _LOCK:
+            _ESTADO["errores"] += 1
+    finally:
+        with _LOCK:
+            _ESTADO["hechos"] += 1
+
+
+def _correr(entradas: list) -> None:
+    datos.borrar_snapshots_obsoletos()   # snapshots de un ESQUEMA_VERSION anterior
+    with ThreadPoolExecutor(max_workers=max(1, HILOS), thread_name_prefix="precalentar") as pool:
+        list(pool.map(_calentar, entradas))
+    with _LOCK:
+        _ESTADO["activo"] = False
+
+
+def iniciar(top_n: int = TOP_N) -> dict:
+    """Lanza el precalentamiento en segundo plano (una sola vez por proceso)."""
+    with _LOCK:
+        if _ESTADO["iniciado"] or not ACTIVO:
+            return dict(_ESTADO)
+        _ESTADO["iniciado"] = True
+    entradas = tareas(top_n)
+    with _LOCK:
+        _ESTADO.update(total=len(entradas), hechos=0, errores=0, activo=bool(entradas))
+    if entradas:
+        threading.Thread(target=_correr, args=(entradas,), name="precalentar", daemon=True).start()
+    return estado()
+
+
+def estado() -> dict:
+    """Progreso actual: total, hechos, errores y si sigue activo."""
+    with _LOCK:
+        return dict(_ESTADO)
+
+
+registrar(_resumen_filtros)
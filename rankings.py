@@ -0,0 +1,241 @@
+"""
+Rankings PCA de los perfiles ("Ranking General …").
+
+Cada ranking es el primer componente principal del bloque de variables
+(faltantes -> 0, escaladas min-max) llevado a 0–100. El ajuste (cargas y
+puntajes) se cachea por (archivo y versión, subconjunto filtrado, variables):
+el subconjunto es el grupo de posición más los filtros de minutos, edad y
+nacionalidad, identificado por la firma del índice (normalizacion.firma).
+Cambiar el eje X/Y o los jugadores resaltados no cambia las filas, así que
+esos reruns son solo búsquedas en el cache.
+
+Solo hace falta el primer componente de matrices chicas (n <= ~5000,
+p <= ~15): se resuelve con la covarianza y np.linalg.eigh, sin sklearn.
+Varios ajustes se resuelven juntos apilando sus covarianzas (con relleno de
+ceros hasta el p mayor) en un solo eigh; así por_grupo() calcula todos los
+grupos de un archivo en una pasada (perfiles.calentar lo usa al precalentar).
+Signo: las cargas suman >= 0, de modo que "más alto = mejor" no se invierte al
+cambiar filtros.
+
+`python rankings.py` compara contra sklearn.PCA (tiempo y diferencias).
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import datos
+import normalizacion
+
+
+# =========================
+# Configuración
+# =========================
+MAX_ENTRADAS = 512
+MIN_VARIABLES = 2    # con menos variables presentes el ranking queda plano (50)
+TOLERANCIA = 1e-12   # varianza mínima del componente para considerarlo ajustado
+
+_LOCK = threading.Lock()
+_AJUSTES = OrderedDict()   # (origen, firma, variables) -> Ajuste
+
+
+@dataclass(frozen=True)
+class Ajuste:
+    variables: tuple
+    cargas: np.ndarray | None     # primer componente (None si no hubo ajuste)
+    puntajes: np.ndarray          # proyección cruda por fila
+    ranking: np.ndarray           # puntajes llevados a 0–100
+
+
+# =========================
+# Primer componente
+# =========================
+def _orientar(cargas: np.ndarray) -> np.ndarray:
+    """Signo determinista: suma de cargas >= 0 (desempate: primera carga no nula > 0)."""
+    total = cargas.sum()
+    if total < 0 or (total == 0 and cargas[np.flatnonzero(cargas)[:1]].sum() < 0):
+        return -cargas
+    return cargas
+
+
+def primeros_componentes(matrices: list) -> list[tuple[np.ndarray, np.ndarray] | None]:
+    """
+    Primer componente de cada matriz (n_i x p_i) en una sola descomposición:
+    las covarianzas se apilan en (G, P, P) con ceros de relleno y se pasa
+    todo a np.linalg.eigh. Devuelve (cargas, puntajes) por matriz, o None si
+    la matriz no tiene varianza.
+    """
+    if not matrices:
+        return []
+    P = max(x.shape[1] for x in matrices)
+    cov = np.zeros((len(matrices), P, P))
+    centradas = []
+    for g, x in enumerate(matrices):
+        xc = np.asarray(x, dtype=float)
+        xc = xc - xc.mean(axis=0)
+        centradas.append(xc)
+        p = xc.shape[1]
+        cov[g, :p, :p] = xc.T @ xc / max(len(xc) - 1, 1)
+    valores, vectores = np.linalg.eigh(cov)   # autovalores en orden ascendente
+
+    out = []
+    for g, xc in enumerate(centradas):
+        if valores[g, -1] <= TOLERANCIA:
+            out.append(None)
+            continue
+        cargas = _orientar(vectores[g, :xc.shape[1], -1])
+        out.append((cargas, xc @ cargas))
+    return out
+
+
+# =========================
+# Helpers
+# =========================
+def _a_0_100(x: np.ndarray) -> np.ndarray:
+    lo, hi = np.nanmin(x), np.nanmax(x)
+    if not np.isfinite(lo) or not np.isfinite(hi) or hi == lo:
+        return np.full(len(x), 50.0)
+    return 100.0 * (x - lo) / (hi - lo)
+
+
+def _plano(df: pd.DataFrame, variables: tuple) -> Ajuste:
+    return Ajuste(variables, None, np.zeros(len(df)), np.full(len(df), 50.0))
+
+
+def _ajustar(tareas: list) -> list[Ajuste]:
+    """[(df, variables)] -> [Ajuste], resolviendo todas las PCA en un solo eigh."""
+    out = [None] * len(tareas)
+    pendientes, matrices = [], []
+    for i, (df, variables) in enumerate(tareas):
+        if len(variables) < MIN_VARIABLES or len(df) < 2:
+            out[i] = _plano(df, variables)
+            continue
+        x = np.nan_to_num(normalizacion.bloque(df, list(variables)), nan=0.0)
+        pendientes.append(i)
+        matrices.append(normalizacion.escalar(x, "minmax"))
+    for i, res in zip(pendientes, primeros_componentes(matrices)):
+        df, variables = tareas[i]
+        if res is None:
+            out[i] = _plano(df, variables)
+        else:
+            cargas, puntajes = res
+            out[i] = Ajuste(variables, cargas, puntajes, _a_0_100(puntajes))
+    return out
+
+
+def _variables(df: pd.DataFrame, variables) -> tuple:
+    return tuple(v for v in dict.fromkeys(variables) if v in df.columns)
+
+
+def _ajustes(tareas: list) -> list[Ajuste]:
+    """Como _ajustar, pero sirviendo del cache lo ya calculado y guardando lo nuevo."""
+    tareas = [(df, _variables(df, variables)) for df, variables in tareas]
+    claves = [
+        (df.attrs["origen"], normalizacion.firma(df), variables) if "origen" in df.attrs else None
+        for df, variables in tareas
+    ]
+    out = [None] * len(tareas)
+    with _LOCK:
+        for i, clave in enumerate(claves):
+            if clave is not None and clave in _AJUSTES:
+                _AJUSTES.move_to_end(clave)
+                out[i] = _AJUSTES[clave]
+    faltan = [i for i, a in enumerate(out) if a is None]
+    if faltan:
+        for i, a in zip(faltan, _ajustar([tareas[i] for i in faltan])):
+            out[i] = a
+        with _LOCK:
+            for i in faltan:
+                if claves[i] is not None:
+                    _AJUSTES[claves[i]] = out[i]
+            while len(_AJUSTES) > MAX_ENTRADAS:
+                _AJUSTES.popitem(last=False)
+    return out
+
+
+# =========================
+# API
+# =========================
+def ajuste(df: pd.DataFrame, variables) -> Ajuste:
+    """Ajuste PCA de `variables` (presentes en df, sin repetir) sobre las filas de df, cacheado."""
+    return _ajustes([(df, variables)])[0]
+
+
+def rankings(df: pd.DataFrame, bloques: dict) -> pd.DataFrame:
+    """
+    {nombre del ranking: variables} -> DataFrame con un ranking 0–100 por
+    columna, alineado al índice de df (listo para df.assign(**...)).
+    """
+    ajustes = _ajustes([(df, variables) for variables in bloques.values()])
+    return pd.DataFrame({n: a.ranking for n, a in zip(bloques, ajustes)}, index=df.index)
+
+
+def por_grupo(df: pd.DataFrame, grupos: dict) -> dict[str, pd.DataFrame]:
+    """
+    Lote: {grupo: (máscara de filas, bloques)} -> {grupo: rankings(df[máscara], bloques)}.
+    Todos los grupos y bloques de un archivo se ajustan en una sola pasada.
+    """
+    subsets = {g: (df[mascara], bloques) for g, (mascara, bloques) in grupos.items()}
+    tareas = [(sub, variables) for sub, bloques in subsets.values() for variables in bloques.values()]
+    ajustes = iter(_ajustes(tareas))
+    return {
+        g: pd.DataFrame({n: next(ajustes).ranking for n in bloques}, index=sub.index)
+        for g, (sub, bloques) in subsets.items()
+    }
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta los ajustes calculados a partir de `ruta`."""
+    with _LOCK:
+        for clave in [k for k in _AJUSTES if k[0][0] == ruta]:
+            del _AJUSTES[clave]
+
+
+def limpiar() -> None:
+    with _LOCK:
+        _AJUSTES.clear()
+
+
+datos.registrar_invalidador(invalidar)
+
+
+# =========================
+# Benchmark contra sklearn
+# =========================
+if __name__ == "__main__":
+    import time
+
+    from sklearn.decomposition import PCA
+
+    import catalogo
+    import posiciones
+
+    entrada = next(e for e in catalogo.catalogo() if e.familia == "p90")
+    base = datos.cargar_csv(entrada.ruta, familia="p90")
+    metricas = [c for c in base.columns if pd.api.types.is_float_dtype(base[c]) and c not in datos.COLUMNAS_ID["p90"]]
+    rng = np.random.default_rng(0)
+    grupos = {}
+    for g in posiciones.GRUPOS:
+        elegidas = rng.choice(metricas, size=(2, 12), replace=False)
+        grupos[g] = (base["Grupo"] == g, {"A": list(elegidas[0]), "B": list(elegidas[1])})
+
+    tareas = [(base[m], tuple(v)) for m, bloques in grupos.values() for v in bloques.values()]
+    matrices = [normalizacion.escalar(np.nan_to_num(normalizacion.bloque(d, list(v)), nan=0.0), "minmax") for d, v in tareas]
+
+    t0 = time.perf_counter()
+    ref = [PCA(n_components=1).fit_transform(x)[:, 0] for x in matrices]
+    t_sk = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    res = primeros_componentes(matrices)
+    t_eigh = time.perf_counter() - t0
+
+    difs = []
+    for r, o in zip(ref, res):
+        r100, o100 = _a_0_100(r), _a_0_100(o[1])
+        difs.append(min(np.abs(r100 - o100).max(), np.abs(r100 - (100 - o100)).max()))
+    print(f"{entrada.ruta}: {len(matrices)} ajustes (8 grupos x 2 bloques, p=12)")
+    print(f"  sklearn PCA : {t_sk * 1e3:8.2f} ms")
+    print(f"  eigh apilado: {t_eigh * 1e3:8.2f} ms  ({t_sk / t_eigh:.1f}x)")
+    print(f"  máx. diferencia en 0–100 (módulo signo): {max(difs):.2e}")
@@ -0,0 +1,266 @@
+"""
+Búsqueda de jugadores similares entre ligas ("jugadores como X").
+
+Por grupo de posición se arma un índice con TODAS las ligas p90 del catálogo:
+una fila por jugador y liga/temporada, una columna por métrica de las fases
+del radar del grupo (fases.RADAR_P90). Cada métrica se lleva a z-score dentro
+de su propia liga y grupo (normalizacion.escalar), así "alto" quiere decir
+alto respecto de su liga; faltantes -> 0 (la media) y las métricas de menor =
+mejor se invierten.
+
+El índice guarda la matriz ya preparada para las dos distancias:
+- coseno: filas con norma 1, la similitud es un producto matriz-vector;
+- mahalanobis: filas blanqueadas con la covarianza del grupo (Σ^-1/2 por
+  eigh, con un poco de ridge), la distancia es euclídea.
+Una consulta es O(jugadores x métricas) más un argpartition: milisegundos
+para los ~3000 jugadores de un grupo. Si se eligen solo algunas fases, la
+vista de esas columnas se deriva de los z-scores y se memoiza.
+
+Cada índice se arma una vez por proceso y grupo; se rearma si cambia la
+versión de algún archivo y se suelta cuando datos.py invalida uno de ellos.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import catalogo
+import datos
+import fases
+import normalizacion
+import poblaciones
+
+
+# =========================
+# Configuración
+# =========================
+DISTANCIAS = ("coseno", "mahalanobis")
+RIDGE = 1e-3          # regularización de la covarianza antes de invertirla
+MAX_VISTAS = 64       # vistas por subconjunto de fases memoizadas
+
+_LOCK = threading.Lock()
+_LOCK_ARMADO = threading.Lock()   # un solo hilo arma índices a la vez
+_INDICES = {}                     # grupo -> Indice
+_VISTAS = OrderedDict()           # (grupo, versiones, columnas) -> (unitarios, blanqueados)
+
+
+@dataclass(frozen=True)
+class Indice:
+    grupo: str
+    metricas: tuple
+    meta: pd.DataFrame        # Name, Team, Liga, Temporada, Minutes, Age, Nationality (fila i = jugador i)
+    z: np.ndarray             # (n, p) z-scores dentro de cada liga, float32
+    unitarios: np.ndarray     # z con filas de norma 1 (coseno)
+    blanqueados: np.ndarray   # z @ Σ^-1/2 (mahalanobis)
+    versiones: tuple          # ((ruta, versión), ...) de los archivos usados
+
+    def jugadores(self, liga: str, temporada: str) -> pd.DataFrame:
+        """Filas del índice de una liga/temporada (para elegir el jugador de referencia)."""
+        m = self.meta
+        return m[(m["Liga"] == liga) & (m["Temporada"] == temporada)]
+
+
+# =========================
+# Helpers
+# =========================
+def _metricas(grupo: str) -> tuple:
+    return tuple(dict.fromkeys(m for vars_fase in fases.RADAR_P90[grupo].values() for m in vars_fase))
+
+
+def _entradas() -> list:
+    return [e for e in catalogo.entradas("p90") if os.path.exists(e.ruta)]
+
+
+def _versiones(entradas: list) -> tuple:
+    return tuple((e.ruta, datos.version_archivo(e.ruta)) for e in entradas)
+
+
+def _unitarios(z: np.ndarray) -> np.ndarray:
+    normas = np.linalg.norm(z, axis=1, keepdims=True)
+    return (z / np.where(normas > 0, normas, 1)).astype(np.float32)
+
+
+def _blanqueados(z: np.ndarray) -> np.ndarray:
+    if len(z) < 2:
+        return z.copy()
+    cov = np.cov(z, rowvar=False).reshape(z.shape[1], z.shape[1])
+    valores, vectores = np.linalg.eigh(cov)
+    w = vectores / np.sqrt(np.maximum(valores, 0) + RIDGE)
+    return (z @ w @ vectores.T).astype(np.float32)
+
+
+def _bloque_liga(df: pd.DataFrame, metricas: tuple, invertir: np.ndarray) -> np.ndarray:
+    """z-scores del grupo dentro de una liga; métricas ausentes del archivo -> 0."""
+    x = np.full((len(df), len(metricas)), np.nan, dtype=np.float32)
+    presentes = [j for j, m in enumerate(metricas) if m in df.columns]
+    if presentes:
+        x[:, presentes] = normalizacion.bloque(df, [metricas[j] for j in presentes])
+    return normalizacion.escalar(x, "zscore", invertir)
+
+
+def _armar(grupo: str, entradas: list, versiones: tuple) -> Indice:
+    metricas = _metricas(grupo)
+    invertir = np.array([m in fases.invertidas_p90(grupo) for m in metricas], dtype=bool)
+    metas, bloques = [], []
+    for e in entradas:
+        df = poblaciones.filas_grupo(e, grupo, metricas)
+        if df.empty:
+            continue
+        bloques.append(_bloque_liga(df, metricas, invertir))
+        metas.append(pd.DataFrame({
+            "Name": df["Name"].astype(str).to_numpy(),
+            "Team": df["Team"].astype(str).to_numpy(),
+            "Liga": e.liga,
+            "Temporada": e.temporada,
+            "Minutes": pd.to_numeric(df["Minutes"], errors="coerce").to_numpy(),
+            "Age": pd.to_numeric(df["Age"], errors="coerce").to_numpy() if "Age" in df.columns else np.nan,
+            "Nationality": df["Nationality"].astype(str).to_numpy(),
+        }))
+    if bloques:
+        z = np.vstack(bloques)
+        meta = pd.concat(metas, ignore_index=True)
+    else:
+        z = np.zeros((0, len(metricas)), dtype=np.float32)
+        meta = pd.DataFrame(columns=["Name", "Team", "Liga", "Temporada", "Minutes", "Age", "Nationality"])
+    return Indice(grupo, metricas, meta, z, _unitarios(z), _blanqueados(z), versiones)
+
+
+def _vista(indice: Indice, columnas: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """(unitarios, blanqueados) restringidos a `columnas`; memoizado."""
+    if len(columnas) == len(indice.metricas):
+        return indice.unitarios, indice.blanqueados
+    clave = (indice.grupo, indice.versiones, columnas)
+    with _LOCK:
+        hit = _VISTAS.get(clave)
+        if hit is not None:
+            _VISTAS.move_to_end(clave)
+            return hit
+    z = indice.z[:, list(columnas)]
+    out = (_unitarios(z), _blanqueados(z))
+    with _LOCK:
+        _VISTAS[clave] = out
+        while len(_VISTAS) > MAX_VISTAS:
+            _VISTAS.popitem(last=False)
+    return out
+
+
+# =========================
+# API
+# =========================
+def indice(grupo: str) -> Indice:
+    """Índice del grupo con todas las ligas p90 (se arma la primera vez o si cambió algún archivo)."""
+    if grupo not in fases.RADAR_P90:
+        raise ValueError(f"Grupo desconocido: {grupo!r}")
+    entradas = _entradas()
+    versiones = _versiones(entradas)
+    with _LOCK:
+        hit = _INDICES.get(grupo)
+    if hit is not None and hit.versiones == versiones:
+        return hit
+    with _LOCK_ARMADO:
+        with _LOCK:
+            hit = _INDICES.get(grupo)
+        if hit is not None and hit.versiones == versiones:
+            return hit
+        nuevo = _armar(grupo, entradas, versiones)
+        with _LOCK:
+            _INDICES[grupo] = nuevo
+        return nuevo
+
+
+def similares(
+    indice: Indice,
+    fila: int,
+    k: int = 20,
+    distancia: str = "coseno",
+    fases_usadas=None,
+    minutos=None,
+    edad=None,
+    ligas=None,
+) -> pd.DataFrame:
+    """
+    Los `k` jugadores más parecidos a la fila `fila` del índice (excluida),
+    entre los que cumplen `minutos` y `edad` ((mín, máx), opcionales; la edad
+    en años cumplidos, como los demás filtros de edad) y
+    están en `ligas` (opcional). `fases_usadas` restringe las métricas a esas
+    fases del radar. Devuelve meta + "Similitud" (coseno, -100..100) o
+    "Distancia" (mahalanobis), ordenado del más al menos parecido.
+    """
+    if distancia not in DISTANCIAS:
+        raise ValueError(f"Distancia desconocida: {distancia!r} (usa una de {DISTANCIAS})")
+    fases_grupo = fases.RADAR_P90[indice.grupo]
+    elegidas = set(fases_usadas or fases_grupo)
+    usadas = {m for f, vs in fases_grupo.items() if f in elegidas for m in vs}
+    columnas = tuple(j for j, m in enumerate(indice.metricas) if m in usadas)
+    if not columnas:
+        return indice.meta.iloc[:0].assign(**{"Similitud" if distancia == "coseno" else "Distancia": []})
+
+    meta = indice.meta
+    candidatos = np.ones(len(meta), dtype=bool)
+    candidatos[fila] = False
+    if minutos is not None:
+        candidatos &= meta["Minutes"].between(*minutos).to_numpy()
+    if edad is not None:
+        candidatos &= np.trunc(meta["Age"]).between(*edad).to_numpy()   # años cumplidos
+    if ligas is not None:
+        candidatos &= meta["Liga"].isin(list(ligas)).to_numpy()
+    pos = np.flatnonzero(candidatos)
+
+    unitarios, blanqueados = _vista(indice, columnas)
+    if distancia == "coseno":
+        puntaje = -(unitarios[pos] @ unitarios[fila])        # menor = más parecido
+    else:
+        puntaje = np.linalg.norm(blanqueados[pos] - blanqueados[fila], axis=1)
+
+    k = min(k, len(pos))
+    if k == 0:
+        return meta.iloc[:0].assign(**{"Similitud" if distancia == "coseno" else "Distancia": []})
+    mejores = np.argpartition(puntaje, k - 1)[:k]
+    mejores = mejores[np.argsort(puntaje[mejores], kind="stable")]
+    out = meta.iloc[pos[mejores]].copy()
+    if distancia == "coseno":
+        out["Similitud"] = -100.0 * puntaje[mejores]
+    else:
+        out["Distancia"] = puntaje[mejores]
+    return out
+
+
+def invalidar(ruta: str) -> None:
+    """Suelta los índices (y sus vistas) que usan `ruta`."""
+    with _LOCK:
+        for grupo in [g for g, ind in _INDICES.items() if any(r == ruta for r, _ in ind.versiones)]:
+            del _INDICES[grupo]
+        for clave in [k for k in _VISTAS if any(r == ruta for r, _ in k[1])]:
+            del _VISTAS[clave]
+
+
+def limpiar() -> None:
+    with _LOCK:
+        _INDICES.clear()
+        _VISTAS.clear()
+
+
+datos.registrar_invalidador(invalidar)
+
+
+# =========================
+# Benchmark
+# =========================
+if __name__ == "__main__":
+    import time
+
+    for g in fases.RADAR_P90:
+        t0 = time.perf_counter()
+        ind = indice(g)
+        t_armar = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for d in DISTANCIAS:
+            for fila in range(0, len(ind.meta), max(1, len(ind.meta) // 50)):
+                similares(ind, fila, distancia=d, minutos=(600, 1e9))
+        n_consultas = 2 * len(range(0, len(ind.meta), max(1, len(ind.meta) // 50)))
+        t_consulta = (time.perf_counter() - t0) / max(n_consultas, 1)
+        print(f"{g:22s} {ind.z.shape[0]:5d} x {ind.z.shape[1]:2d}  armado {t_armar:6.2f} s  "
+              f"consulta {t_consulta * 1e3:5.2f} ms")
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+import bundle
+import datos
+
+
+def _bundle_chico(tmp_path, monkeypatch):
+    monkeypatch.setattr(datos, "SNAPSHOT_DIR", str(tmp_path / "snap"))
+    monkeypatch.setattr(datos, "MANIFIESTO", str(tmp_path / "snap" / "formatos.json"))
+    monkeypatch.setattr(bundle, "BUNDLE_DIR", str(tmp_path / "bundle"))
+    monkeypatch.setattr(bundle, "INDICE", str(tmp_path / "bundle" / "bundle.json"))
+    monkeypatch.setattr(bundle, "_MAPA", None)
+    (tmp_path / "snap").mkdir()
+    csv = tmp_path / "liga.csv"
+    csv.write_text(
+        "Name,Team,Competition,Primary Position,Date of Birth,Minutes,Goals\n"
+        "Ana,A,Liga,Centre Forward,01/02/00,900,3\n"
+        "Bea,B,Liga,Left Wing,,450,\n"
+        "Cris,A,Liga,,15/07/98,,1\n",
+        encoding="utf-8",
+    )
+    entrada = SimpleNamespace(ruta=str(csv), familia="p90")
+    datos.limpiar_cache()
+    bundle.construir(entradas=[entrada])
+    datos.limpiar_cache()
+    return str(csv)
+
+
+def test_columnas_del_bundle_son_vistas_del_mmap(tmp_path, monkeypatch):
+    ruta = _bundle_chico(tmp_path, monkeypatch)
+    df = datos.cargar_csv(ruta, familia="p90")
+
+    assert np.isnan(df["Goals"].iloc[1])                    # NaN como valor, sin bitmap
+    assert df["Team"].dtype == "category"
+    assert df["Birth Date"].isna().iloc[1]
+    mapeados = bundle.bytes_mapeados(df.drop(columns=list(datos.COLUMNAS_EFIMERAS)))
+    assert len(mapeados) == len(df.columns) - len(datos.COLUMNAS_EFIMERAS)
+    for col, (m, total) in mapeados.items():
+        assert total > 0 and m == total, col
+
+    parcial = datos.cargar_columnas(ruta, ["Goals"], familia="p90")
+    parcial = parcial.drop(columns=list(datos.COLUMNAS_EFIMERAS), errors="ignore")
+    assert all(m == t for m, t in bundle.bytes_mapeados(parcial).values())
+    datos.limpiar_cache()
+
+
+def test_mutar_la_copia_no_toca_el_cache(tmp_path, monkeypatch):
+    ruta = _bundle_chico(tmp_path, monkeypatch)
+    df = datos.cargar_csv(ruta, familia="p90")
+    df.loc[0, "Goals"] = 99
+    assert datos.cargar_csv(ruta, familia="p90")["Goals"].iloc[0] == 3
+    datos.limpiar_cache()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+import datos
+
+
+def test_borrar_snapshots_viejos_quita_otras_versiones_y_esquemas(tmp_path, monkeypatch):
+    monkeypatch.setattr(datos, "SNAPSHOT_DIR", str(tmp_path))
+    v = datos.ESQUEMA_VERSION
+    nombres = [
+        f"liga-1-10-p90.v{v}.parquet",          # vigente
+        f"liga-1-10-p90.v{v}.filtros.json",     # vigente
+        "liga-1-10-raw.parquet",                # crudo: no depende del esquema
+        f"liga-1-10-p90.v{v - 1}.parquet",      # mismo CSV, esquema anterior
+        f"liga-1-10-p90.v{v - 1}.filtros.json",
+        f"liga-0-9-p90.v{v}.parquet",           # versión anterior del CSV
+        f"otra-1-10-p90.v{v - 1}.parquet",      # otro CSV: no se toca
+        "formatos.json",
+    ]
+    for n in nombres:
+        (tmp_path / n).write_text("")
+
+    datos._borrar_snapshots_viejos("/datos/liga.csv", (1, 10))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([
+        f"liga-1-10-p90.v{v}.parquet",
+        f"liga-1-10-p90.v{v}.filtros.json",
+        "liga-1-10-raw.parquet",
+        f"otra-1-10-p90.v{v - 1}.parquet",
+        "formatos.json",
+    ])
+
+
+def test_borrar_snapshots_obsoletos_barre_todos_los_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(datos, "SNAPSHOT_DIR", str(tmp_path))
+    v = datos.ESQUEMA_VERSION
+    for n in [f"a-1-2-fisico.v{v}.parquet", f"a-1-2-fisico.v{v - 1}.parquet",
+              f"b-3-4-alternas.v{v - 1}.filtros.json", "uso.json"]:
+        (tmp_path / n).write_text("")
+
+    datos.borrar_snapshots_obsoletos()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([f"a-1-2-fisico.v{v}.parquet", "uso.json"])
+
+
+def test_filas_por_jugador_empate_se_queda_con_la_primera_fila():
+    df = pd.DataFrame({
+        "Player": ["Ana", "Ana", "Ana", "Bea"],
+        "Grupo": ["Centrales"] * 4,
+        "Minutes": [900.0, 1200.0, 1200.0, 300.0],
+    }, index=[10, 11, 12, 13])
+    marca = datos.filas_por_jugador(df, "Player", ("Minutes",))
+    assert marca.index.equals(df.index)
+    assert marca.tolist() == [False, True, False, True]
+
+
+def test_filas_por_jugador_columna_vacia_pasa_a_la_siguiente():
+    df = pd.DataFrame({
+        "Player": ["Ana", "Ana", "Bea", "Bea"],
+        "Grupo": ["Extremos"] * 4,
+        "Minutes": [np.nan] * 4,                      # primera prioridad sin datos
+        "Minutes played per match": [40.0, 85.0, np.nan, 60.0],
+    })
+    marca = datos.filas_por_jugador(df, "Player", ("Minutes", "Falta", "Minutes played per match"))
+    assert marca.tolist() == [False, True, False, True]   # faltantes al final
+
+
+def test_filas_por_jugador_sin_datos_en_ninguna_columna_deja_la_primera():
+    df = pd.DataFrame({"Player": ["Ana", "Ana"], "Grupo": ["Interiores"] * 2, "Minutes": [np.nan, np.nan]})
+    assert datos.filas_por_jugador(df, "Player", ("Minutes",)).tolist() == [True, False]
+
+
+def test_filas_por_jugador_una_fila_por_grupo():
+    df = pd.DataFrame({
+        "Player": ["Ana", "Ana", "Ana", "Bea"],
+        "Grupo": ["Extremos", "Delanteros", "Extremos", "Delanteros"],
+        "Minutes": [500.0, 100.0, 800.0, 50.0],
+    })
+    marca = datos.filas_por_jugador(df, "Player", ("Minutes",))
+    assert marca.tolist() == [False, True, True, True]
+    assert datos.filas_por_jugador(df.drop(columns="Grupo"), "Player", ("Minutes",)).all()
+
+
+def test_filas_por_jugador_fisico_encabezado_desconocido_cae_en_la_regex():
+    df = pd.DataFrame({
+        "_PlayerKey": ["ana", "ana", "bea", "bea"],
+        "Grupo": ["Centrales"] * 4,
+        "Distance per Match": [9000.0, 12000.0, 8000.0, 7000.0],   # no es de minutos
+        "Avg. Minutes / Match (P90)": [35.0, 80.0, np.nan, 70.0],   # exportación nueva
+    })
+    marca = datos.filas_por_jugador(df, *datos.DEDUPE["fisico"])
+    assert marca.tolist() == [False, True, False, True]
@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import densidades
+
+METRICAS = ["xG", "Pass OBV", "PAdj Tackles", "Aerial Win%"]
+
+
+def _kde_directo(valores, x):
+    """Suma gaussiana exacta con el mismo ancho de banda que usa densidades.kde."""
+    bw = densidades.ancho_banda(valores)
+    z = (x[:, None] - valores[None, :]) / bw
+    return np.exp(-0.5 * z ** 2).sum(axis=1) / (len(valores) * bw * np.sqrt(2 * np.pi))
+
+
+def test_kde_binned_igual_a_la_suma_directa():
+    rng = np.random.default_rng(0)
+    for valores in (rng.normal(5, 2, 800), rng.gamma(2.0, 1.5, 3000), rng.uniform(0, 1, 50)):
+        extent = densidades.dominio(valores)
+
+        x, densidad = densidades.kde(valores, extent)
+
+        assert len(x) == densidades.PASOS
+        assert x[0] == extent[0] and x[-1] == extent[1]
+        esperado = _kde_directo(valores, x)
+        np.testing.assert_allclose(densidad, esperado, atol=1e-3 * esperado.max())
+
+
+def test_kde_de_un_solo_valor_o_valores_iguales():
+    for valores in (np.array([3.0]), np.full(25, 3.0)):
+        extent = densidades.dominio(valores)
+        assert extent[0] < 3.0 < extent[1]
+
+        x, densidad = densidades.kde(valores, extent)
+
+        assert np.isfinite(densidad).all() and (densidad >= 0).all()
+        assert abs(x[np.argmax(densidad)] - 3.0) <= x[1] - x[0]
+        np.testing.assert_allclose(densidad, _kde_directo(valores, x), atol=1e-3 * densidad.max())
+
+
+def _jugadores(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame({m: rng.normal(size=n) for m in METRICAS})
+    df.attrs["origen"] = ("/datos/liga.csv", "p90", (n, 1))
+    return df
+
+
+def test_grilla_un_panel_por_metrica_con_ancho_fijo():
+    densidades.limpiar()
+    df = _jugadores(300)
+    valores = {m: 0.5 for m in METRICAS} | {"Sin datos": np.nan}
+
+    spec = densidades.grilla_altair(df, valores, invertir=["xG"], columnas=3).to_dict()
+
+    assert spec["columns"] == 3
+    assert len(spec["concat"]) == len(METRICAS)   # la métrica sin valor no tiene panel
+    for panel, m in zip(spec["concat"], METRICAS):
+        assert panel["width"] == densidades.ANCHO_PANEL
+        assert panel["title"]["text"] == m
+    densidades.limpiar()
+
+
+def test_grilla_payload_acotado_por_pasos_y_no_por_filas():
+    densidades.limpiar()
+    valores = {m: 0.0 for m in METRICAS}
+
+    tamanos = []
+    for n in (200, 20000):
+        spec = densidades.grilla_altair(_jugadores(n), valores).to_dict()
+        filas = sum(len(d) for d in spec["datasets"].values())
+        assert filas == len(METRICAS) * densidades.PASOS + len(METRICAS)   # curvas + marcas
+        tamanos.append(len(json.dumps(spec)))
+
+    assert abs(tamanos[1] - tamanos[0]) < 0.05 * tamanos[0]
+    assert tamanos[1] < 100 * len(METRICAS) * densidades.PASOS   # un registro chico por punto
+    densidades.limpiar()
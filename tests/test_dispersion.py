@@ -0,0 +1,47 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import dispersion
+
+# Cota acordada del spec serializado: ~9 campos por jugador + capas y estilo
+MAX_BYTES_POR_FILA = 320
+
+
+def _perfil(n=300, metricas=150):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Name": [f"Jugador {i}" for i in range(n)],
+        "Team": rng.choice(["Club América", "Cruz Azul", "Tigres"], n),
+        "Primary Position": "Centre Back",
+        "Age": rng.integers(17, 37, n),
+        "Nationality": rng.choice(["Mexico", "Argentina"], n),
+        "Minutes": rng.uniform(600, 3000, n).astype("float32"),
+    })
+    valores = rng.normal(size=(n, metricas)).astype("float32")
+    return pd.concat([df, pd.DataFrame(valores, columns=[f"M{j}" for j in range(metricas)])], axis=1)
+
+
+def test_spec_del_scatter_solo_lleva_las_columnas_del_grafico():
+    df = _perfil()
+    spec = dispersion.scatter_altair(
+        df, "M0", "M1", size_col="Minutes", tooltip_cols=["Name", "Team", "Age", "M2"],
+        highlight_names=["Jugador 3"],
+    ).to_dict()
+
+    filas = [d for d in spec["datasets"].values() if len(d) == len(df)]
+    assert len(filas) == 1   # un solo dataset para todas las capas de puntos
+    assert set(filas[0][0]) == {"M0", "M1", "Minutes", "Name", "Team", "Age", "M2", "is_highlight"}
+    assert sum(r["is_highlight"] for r in filas[0]) == 1
+
+    tamano = len(json.dumps(spec))
+    assert tamano <= MAX_BYTES_POR_FILA * len(df)
+    assert tamano < len(df.to_json(orient="records")) / 10   # vs. mandar el frame entero
+
+
+def test_datos_scatter_toma_la_primera_columna_repetida_e_ignora_ausentes():
+    df = pd.DataFrame([[1, 2, 3, "a"]], columns=["X", "Y", "X", "Player"])
+    d = dispersion.datos_scatter(df, ["X", "Y", None, "Falta", "Player", "X"], "Player", ["a"])
+    assert list(d.columns) == ["X", "Y", "Player", "is_highlight"]
+    assert d["X"].iloc[0] == 1 and bool(d["is_highlight"].iloc[0])
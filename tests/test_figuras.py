@@ -0,0 +1,66 @@
+import pandas as pd
+import plotly.graph_objects as go
+
+import figuras
+
+
+def _grupo(filas=(0, 1, 2)):
+    df = pd.DataFrame({"Name": ["A", "B", "C"], "xG": [0.1, 0.4, 0.2]}).loc[list(filas)]
+    df.attrs["origen"] = ("/datos/liga.csv", "p90", (1, 1))
+    return df
+
+
+def _builder(llamadas):
+    def construir_radar(df, jugador, fases, invertir=()):
+        llamadas.append(jugador)
+        fila = df[df["Name"] == jugador]
+        return go.Figure(go.Barpolar(r=fila["xG"].tolist(), theta=list(fases)))
+    return construir_radar
+
+
+def test_mismos_argumentos_salen_del_cache():
+    figuras.limpiar()
+    llamadas = []
+    construir = _builder(llamadas)
+    kwargs = dict(jugador="B", fases={"Ataque": ["xG"]}, invertir={"xG"})
+    aciertos = figuras.estado()["aciertos"]
+
+    primera = figuras.radar(construir, _grupo(), **kwargs)
+    segunda = figuras.radar(construir, _grupo(), **kwargs)
+
+    assert llamadas == ["B"]
+    assert segunda is not primera   # figura nueva en cada llamada
+    assert segunda.to_json() == primera.to_json()
+    assert figuras.estado()["aciertos"] == aciertos + 1
+    figuras.limpiar()
+
+
+def test_otra_firma_del_subconjunto_es_un_fallo():
+    figuras.limpiar()
+    llamadas = []
+    construir = _builder(llamadas)
+
+    figuras.radar(construir, _grupo(), jugador="B", fases={"Ataque": ["xG"]})
+    figuras.radar(construir, _grupo((0, 1)), jugador="B", fases={"Ataque": ["xG"]})   # otro filtro
+    figuras.radar(construir, _grupo(), jugador="A", fases={"Ataque": ["xG"]})         # otro jugador
+
+    assert llamadas == ["B", "B", "A"]
+    assert figuras.estado()["entradas"] == 3
+    figuras.limpiar()
+
+
+def test_desaloja_las_mas_viejas_por_bytes(monkeypatch):
+    figuras.limpiar()
+    construir = _builder([])
+    tamano = len(figuras.radar(construir, _grupo(), jugador="A", fases={"Ataque": ["xG"]}).to_json())
+    figuras.limpiar()
+    monkeypatch.setattr(figuras, "MAX_BYTES", int(2.5 * tamano))
+
+    for jugador in ("A", "B", "C"):
+        figuras.radar(construir, _grupo(), jugador=jugador, fases={"Ataque": ["xG"]})
+
+    est = figuras.estado()
+    assert est["entradas"] == 2
+    assert est["bytes"] <= figuras.MAX_BYTES
+    assert [k[3][0][1] for k in figuras._FIGURAS] == ["B", "C"]   # se fue "A", la más vieja
+    figuras.limpiar()
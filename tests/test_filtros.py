@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+import datos
+import filtros
+
+RUTA = "/datos/liga.csv"
+
+
+def _base():
+    df = pd.DataFrame({
+        "Competition": pd.Categorical(["Liga MX", "Liga MX ", "MLS", "Liga MX", "Liga MX", "Liga MX"]),
+        "Grupo": ["Centrales", "Centrales", "Centrales", "Extremos", "Centrales", "Centrales"],
+        "Minutes": [900.0, 1500.0, 2000.0, 1200.0, np.nan, 300.0],
+        "Age": [22.0, 34.9, 28.0, 25.0, 30.0, np.nan],
+        "Nationality": ["Mexico", "Argentina", "Mexico", "Mexico", "Chile", "Mexico"],
+    }, index=[10, 11, 12, 13, 14, 15])
+    df.attrs["origen"] = (RUTA, "p90", (1, 1))
+    return df
+
+
+def _cadena(df, minutos=(600, 3000), edad=(18, 34)):
+    return (
+        filtros.filtrar(df)
+        .igual("Competition", "Liga MX")
+        .igual("Grupo", "Centrales")
+        .entre("Minutes", *minutos)
+        .entre("Age", *edad, truncar=True)
+        .en("Nationality", ["Mexico", "Argentina"])
+    )
+
+
+def test_cadena_igual_que_el_filtrado_de_pandas():
+    filtros.limpiar()
+    df = _base()
+
+    out = _cadena(df, edad=(18, 40)).aplicar()
+
+    esperado = df[
+        (df["Competition"].astype(str).str.strip() == "Liga MX")
+        & (df["Grupo"] == "Centrales")
+        & df["Minutes"].between(600, 3000)
+        & df["Age"].between(18, 40)
+        & df["Nationality"].isin(["Mexico", "Argentina"])
+    ]
+    pd.testing.assert_frame_equal(out, esperado)
+    assert out.attrs["origen"] == df.attrs["origen"]
+
+
+def test_entre_con_truncar_cuenta_anios_cumplidos():
+    filtros.limpiar()
+    df = _base()
+
+    truncada = filtros.filtrar(df).entre("Age", 18, 34, truncar=True).aplicar()
+    exacta = filtros.filtrar(df).entre("Age", 18, 34).aplicar()
+
+    assert 11 in truncada.index      # 34.9 años cumple el máximo de 34
+    assert 11 not in exacta.index
+
+
+def test_nan_queda_fuera():
+    filtros.limpiar()
+    df = _base()
+
+    out = filtros.filtrar(df).entre("Minutes", 0, 5000).entre("Age", 0, 100).aplicar()
+
+    assert list(out.index) == [10, 11, 12, 13]
+
+
+def test_misma_dimension_sale_del_cache(monkeypatch):
+    filtros.limpiar()
+    df = _base()
+    _cadena(df).aplicar()
+    guardadas = len(filtros._MASCARAS)
+
+    llamadas = []
+    original = filtros._numerico
+    monkeypatch.setattr(filtros, "_numerico", lambda s: llamadas.append(s.name) or original(s))
+    _cadena(df).aplicar()
+    assert llamadas == []
+    assert len(filtros._MASCARAS) == guardadas
+
+    _cadena(df, edad=(20, 30)).aplicar()   # solo cambia la edad
+    assert llamadas == ["Age"]
+    filtros.limpiar()
+
+
+def test_invalidar_suelta_las_mascaras_del_archivo():
+    filtros.limpiar()
+    df = _base()
+    otro = _base()
+    otro.attrs["origen"] = ("/datos/otra.csv", "p90", (1, 1))
+    _cadena(df).aplicar()
+    _cadena(otro).aplicar()
+
+    datos.invalidar(RUTA)
+
+    assert filtros._MASCARAS
+    assert all(clave[0][0] == "/datos/otra.csv" for clave in filtros._MASCARAS)
+    filtros.limpiar()
@@ -0,0 +1,115 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import identidad
+
+
+def _entrada(familia, archivo):
+    return SimpleNamespace(familia=familia, liga="Liga MX", temporada="2024/2025", archivo=archivo,
+                           ruta=f"/datos/{archivo}")
+
+
+_FILAS = {
+    "fisico.csv": pd.DataFrame({
+        "jugador": ["José Rodríguez", "José Rodríguez"], "corto": ["J. Rodríguez", "J. Rodríguez"],
+        "player_id": [12070, 23403], "fecha": ["1998-06-19", "1996-06-17"], "equipo": ["", ""],
+    }),
+    # StatsBomb: mismos nombres en el mismo archivo, fechas un día antes (huso al exportar)
+    "p90.csv": pd.DataFrame({
+        "jugador": ["José Rodríguez", "José Rodríguez"], "corto": ["", ""], "player_id": [None, None],
+        "fecha": ["1998-06-18", "1996-06-16"], "equipo": ["Juárez", "Necaxa"],
+    }),
+}
+
+
+@pytest.fixture
+def homonimos(monkeypatch):
+    entradas = [_entrada("fisico", "fisico.csv"), _entrada("p90", "p90.csv")]
+    monkeypatch.setattr(identidad, "_filas", lambda e: _FILAS[e.archivo])
+    crudo = {"personas": identidad._armar(entradas), "versiones": {}}
+    monkeypatch.setattr(identidad, "_INDICE", identidad._desde_json(crudo))
+
+
+def test_homonimos_del_mismo_archivo_quedan_como_candidatos(homonimos):
+    personas = identidad.candidatos("p90", "p90.csv", "José Rodríguez")
+    assert [p.id for p in personas] == ["sc:12070", "sc:23403"]
+    # cada fila StatsBomb se ligó a su persona por la fecha, no a la del homónimo
+    assert [a.equipo for a in personas[0].en("p90")] == ["Juárez"]
+    assert [a.equipo for a in personas[1].en("p90")] == ["Necaxa"]
+
+
+def test_buscar_desempata_por_equipo_o_fecha_y_si_no_falla(homonimos):
+    with pytest.raises(ValueError, match="ambiguo"):
+        identidad.buscar("p90", "/datos/p90.csv", "José Rodríguez")
+    assert identidad.buscar("p90", "p90.csv", "José Rodríguez", equipo="Necaxa").id == "sc:23403"
+    assert identidad.buscar("p90", "p90.csv", "José Rodríguez", nacimiento="1998-06-18").id == "sc:12070"
+    assert identidad.buscar("fisico", "fisico.csv", "José Rodríguez", nacimiento=pd.Timestamp("1996-06-17")).id \
+        == "sc:23403"
+    assert identidad.buscar("p90", "p90.csv", "José Rodríguez", equipo="Tigres") is None
+    assert identidad.buscar("p90", "p90.csv", "Nadie") is None
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Raúl García", "Alejandro Marcelo García Bauter"),
+    ("Raúl García", "A. García"),                        # iniciales en conflicto
+    ("Pablo Ezequiel Calderón", "Franco Ezequiel Calderón"),
+    ("Angelo Giovanni Araos Llanos", "Angeliño"),        # apodo de un solo token
+    ("Javier Hernandez", "J. Fernández"),
+])
+def test_similitud_rechaza_jugadores_distintos(a, b):
+    assert identidad.similitud(identidad.normalizar(a), identidad.normalizar(b)) < identidad.UMBRAL
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Stiven Barreiro", "Jaine Stiven Barreiro Solís"),
+    ("Leo Balerdi", "Leonardo Balerdi Rosa"),
+    ("Kenan Yildiz", "Kenan Yıldız"),
+    ("Uroš Đurđević", "Uros Djurdjevic"),
+    ("Raúl García", "R. García"),
+])
+def test_similitud_acepta_variantes_del_mismo_nombre(a, b):
+    assert identidad.similitud(identidad.normalizar(a), identidad.normalizar(b)) >= identidad.UMBRAL
+
+
+def test_misma_fecha_y_apellido_no_se_ligan(monkeypatch):
+    filas = {
+        "fisico.csv": pd.DataFrame({
+            "jugador": ["Franco Ezequiel Calderón", "Angelo Giovanni Araos Llanos"],
+            "corto": ["F. Calderón", "Angeliño"],
+            "player_id": [26245, 555], "fecha": ["1998-05-13", "1997-01-06"], "equipo": ["", ""],
+        }),
+        "p90.csv": pd.DataFrame({
+            "jugador": ["Pablo Ezequiel Calderón", "Angelo Araos"], "corto": ["", ""],
+            "player_id": [None, None], "fecha": ["1998-05-12", "1997-01-05"], "equipo": ["Ñublense", "Puebla"],
+        }),
+    }
+    monkeypatch.setattr(identidad, "_filas", lambda e: filas[e.archivo])
+    personas = identidad._armar([_entrada("fisico", "fisico.csv"), _entrada("p90", "p90.csv")])
+
+    assert [a[4] for a in personas["sc:26245"]["apariciones"]] == ["Franco Ezequiel Calderón"]
+    propio = personas["n:pablo ezequiel calderon|1998-05-12"]["apariciones"]
+    assert [(a[4], a[6]) for a in propio] == [("Pablo Ezequiel Calderón", "propio")]
+    # el control: mismo jugador con nombre abreviado sí pasa por el difuso
+    assert [(a[4], a[6]) for a in personas["sc:555"]["apariciones"]][1] == ("Angelo Araos", "difuso")
+
+
+def test_filas_trae_la_fila_de_cada_aparicion(monkeypatch, tmp_path):
+    (tmp_path / "p90.csv").write_text("")
+    entrada = SimpleNamespace(archivo="p90.csv", ruta=str(tmp_path / "p90.csv"))
+    df = pd.DataFrame({
+        "Name": ["José Rodríguez", "José Rodríguez", "José Rodríguez"],
+        "Team": ["Juárez", "Necaxa", "Necaxa"],
+        "Season": ["2024/2025", "2024/2025 ", "2023/2024"],
+        "Goals": [1, 2, 3],
+    })
+    monkeypatch.setattr(identidad.catalogo, "buscar", lambda familia, liga, temporada: entrada)
+    monkeypatch.setattr(identidad.datos, "cargar_csv", lambda ruta, familia: df)
+    monkeypatch.setattr(identidad.datos, "filas_unicas", lambda d: d)
+
+    a = identidad.Aparicion("p90", "Liga MX", "2024/2025", "p90.csv", "José Rodríguez", "Necaxa", "propio")
+    assert identidad.filas(a)["Goals"].tolist() == [2]
+    # otro archivo en el catálogo para esa liga/temporada: la aparición quedó vieja
+    assert identidad.filas(replace(a, archivo="viejo.csv")).empty
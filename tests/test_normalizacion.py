@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+import normalizacion
+
+
+def _frame():
+    df = pd.DataFrame({
+        "Goals": [1.0, 2.0, 2.0, 3.0, np.nan],
+        "xG": [0.5, 0.1, 0.9, 0.3, 0.7],
+        "Fouls": [4.0, 4.0, 4.0, 4.0, 4.0],
+    }, index=[20, 21, 22, 23, 24])
+    df.attrs["origen"] = ("/datos/liga.csv", "p90", (1, 1))
+    return df
+
+
+def test_minmax_igual_a_la_formula_por_columna():
+    df = _frame()
+    metricas = ["Goals", "xG"]
+
+    out = normalizacion.escalar(normalizacion.bloque(df, metricas), "minmax", [False, True])
+
+    for j, m in enumerate(metricas):
+        s = df[m]
+        z = (s - s.min()) / (s.max() - s.min())
+        esperado = ((1 - z) if m == "xG" else z).fillna(0.5)
+        np.testing.assert_allclose(out[:, j], esperado.to_numpy(), rtol=1e-6)
+    assert out.dtype == np.float32
+
+
+def test_zscore_igual_a_la_formula_por_columna():
+    df = _frame()
+    metricas = ["Goals", "xG", "Fouls"]
+
+    out = normalizacion.escalar(normalizacion.bloque(df, metricas), "zscore")
+
+    for j, m in enumerate(metricas[:2]):
+        s = df[m]
+        esperado = ((s - s.mean()) / s.std(ddof=0)).fillna(0)
+        np.testing.assert_allclose(out[:, j], esperado.to_numpy(), rtol=1e-5, atol=1e-6)
+    assert (out[:, 2] == 0).all()   # columna constante
+
+
+def test_percentil_con_empates_por_rango_medio():
+    df = _frame()
+
+    out = normalizacion.escalar(normalizacion.bloque(df, ["Goals", "Fouls"]), "percentil")
+
+    # Goals = 1, 2, 2, 3 (+ NaN): (menores + menores o iguales) / 2 sobre 4 valores
+    np.testing.assert_allclose(out[:, 0], [12.5, 50.0, 50.0, 87.5, 50.0])
+    np.testing.assert_allclose(out[:, 1], 50.0)   # todos empatados
+
+    invertida = normalizacion.escalar(normalizacion.bloque(df, ["Goals"]), "percentil", [True])
+    np.testing.assert_allclose(invertida[:4, 0], [87.5, 50.0, 50.0, 12.5])
+
+
+def test_percentiles_jugador_contra_la_poblacion_dada():
+    normalizacion.limpiar()
+    df = _frame()
+    mascara = df.index == 23   # Goals 3, xG 0.3
+    poblacion = [np.array([1.0, 2.0, 3.0, 3.0, 5.0]), np.array([0.1, 0.2, 0.4, 0.8])]
+
+    propios = normalizacion.percentiles_jugador(df, mascara, ["Goals", "xG"])
+    contra_pool = normalizacion.percentiles_jugador(df, mascara, ["Goals", "xG"], ordenados=poblacion)
+
+    assert propios == [87.5, 30.0]   # xG 0.3: 1 menor y 2 menores o iguales de 5
+    # Goals 3: 2 menores y 4 menores o iguales de 5; xG 0.3: 2 menores de 4
+    np.testing.assert_allclose(contra_pool, [60.0, 50.0])
+
+
+def test_memo_por_firma_del_subconjunto():
+    normalizacion.limpiar()
+    df = _frame()
+
+    primera = normalizacion.normalizar(df, ["Goals", "xG"], "percentil")
+    assert normalizacion.normalizar(df, ["Goals", "xG"], "percentil") is primera
+
+    sub = df[df["xG"] > 0.2]   # otras filas -> otra firma
+    assert normalizacion.firma(sub) != normalizacion.firma(df)
+    otra = normalizacion.normalizar(sub, ["Goals", "xG"], "percentil")
+    assert otra is not primera
+    assert otra.shape == (4, 2)
+
+    corrido = df.set_axis(df.index + 100)   # mismas filas, otro índice
+    assert normalizacion.normalizar(corrido, ["Goals", "xG"], "percentil") is not primera
+    normalizacion.limpiar()
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+import catalogo
+import datos
+import filtros
+import perfiles
+import precalentar
+import rankings
+
+
+def _p90(n=120, semilla=0):
+    rng = np.random.default_rng(semilla)
+    grupos = list(perfiles.VARIABLES_P90)
+    df = pd.DataFrame({
+        "Name": [f"J{i}" for i in range(n)],
+        "Competition": "Liga MX",
+        "Season": "2024/2025",
+        "Grupo": [grupos[i % len(grupos)] for i in range(n)],
+        "Minutes": rng.integers(100, 3000, n).astype("float32"),
+        "Age": rng.uniform(16, 40, n),
+        "Nationality": rng.choice(["Mexico", "Argentina", "Colombia"], n),
+    })
+    variables = dict.fromkeys(c for g in perfiles.VARIABLES_P90 for c in perfiles.columnas(g))
+    metricas = pd.DataFrame(rng.normal(size=(n, len(variables))).astype("float32"), columns=list(variables))
+    df = pd.concat([df, metricas], axis=1)
+    df.attrs["origen"] = ("/datos/ligamx.csv", "p90", (1, 1))
+    return df
+
+
+def _entorno(monkeypatch, df):
+    entrada = SimpleNamespace(ruta="/datos/ligamx.csv", familia="p90", liga="Liga MX", temporada="2024/2025",
+                              nombre_base_liga=None)
+    resumen = datos.ResumenFiltros(filas=len(df), minutos=(100, 2999), edades=(16, 40),
+                                   nacionalidades=("Argentina", "Colombia", "Mexico"))
+    monkeypatch.setattr(catalogo, "entradas", lambda familia=None: [entrada])
+    monkeypatch.setattr(catalogo, "nombre_base_liga", lambda familia, liga, temporada: liga)
+    monkeypatch.setattr(datos, "cargar_columnas", lambda ruta, columnas, familia=None: df)
+    monkeypatch.setattr(datos, "resumen_filtros", lambda ruta, familia=None, grupo=None: resumen)
+    rankings.limpiar()
+    filtros.limpiar()
+    return entrada, resumen
+
+
+def _como_la_seccion(df, grupo, resumen):
+    """El subconjunto y los rankings que pide la sección de perfiles con los sliders por defecto."""
+    min_mins, max_mins = (int(v) for v in resumen.minutos)
+    edad = perfiles.EDAD_DEFECTO[grupo]
+    sub = (
+        filtros.filtrar(df)
+        .igual("Competition", "Liga MX")
+        .igual("Season", "2024/2025")
+        .igual("Grupo", grupo)
+        .entre("Minutes", max(perfiles.MINUTOS_DEFECTO, min_mins), max_mins)
+        .entre("Age", edad[0], edad[1], truncar=True)
+        .en("Nationality", list(resumen.nacionalidades))
+        .aplicar()
+    )
+    return rankings.rankings(sub, perfiles.bloques(grupo))
+
+
+def test_calentar_deja_los_rankings_de_la_seccion_en_cache(monkeypatch):
+    df = _p90()
+    entrada, resumen = _entorno(monkeypatch, df)
+    assert perfiles.calentar in precalentar._CALENTADORES
+
+    perfiles.calentar(entrada)
+
+    ajustados = []
+    original = rankings._ajustar
+    monkeypatch.setattr(rankings, "_ajustar", lambda tareas: ajustados.extend(tareas) or original(tareas))
+    for grupo in perfiles.VARIABLES_P90:
+        esperado = _como_la_seccion(df, grupo, resumen)
+        assert list(esperado.columns) == list(perfiles.RANKINGS_P90[grupo])
+    assert ajustados == []   # todo salió del cache
+    rankings.limpiar()
+    filtros.limpiar()
+
+
+def test_calentar_ignora_otras_familias(monkeypatch):
+    df = _p90()
+    entrada, _ = _entorno(monkeypatch, df)
+    perfiles.calentar(SimpleNamespace(**dict(vars(entrada), familia="fisico")))
+    assert len(rankings._AJUSTES) == 0
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+import fases
+import figuras
+import poblaciones
+
+GRUPO = "Centrales"
+
+
+def _entradas(tmp_path):
+    out = []
+    for liga in ("Premier League, Inglaterra", "La Liga, España"):
+        ruta = tmp_path / f"{liga[:3]}.csv"
+        ruta.write_text("x")
+        out.append(SimpleNamespace(ruta=str(ruta), liga=liga, temporada="2024/2025"))
+    return out
+
+
+def _filas(entrada, grupo, metricas):
+    metrica = metricas[0]
+    return pd.DataFrame({
+        "Minutes": [300, 900, 1500, 2500],
+        "Age": [18.5, 24.9, 31.2, 36.7],
+        "Nationality": ["England", "Spain ", "France", "Spain"],
+        metrica: [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+def test_poblacion_aplica_minutos_edad_y_nacionalidad(tmp_path, monkeypatch):
+    monkeypatch.setattr(poblaciones, "filas_grupo", _filas)
+    poblaciones.limpiar()
+    entradas = _entradas(tmp_path)
+
+    todas = poblaciones.poblacion(entradas, GRUPO)
+    filtrada = poblaciones.poblacion(entradas, GRUPO, minutos=(600, 3000), edad=(20, 36),
+                                     nacionalidades=["Spain"])
+
+    assert len(todas.matriz) == 8
+    # Por liga: 900 min ("Spain " sin espacios) y 2500 min (36.7 -> 36 años cumplidos)
+    assert len(filtrada.matriz) == 4
+    metrica = next(iter(fases.RADAR_P90[GRUPO].values()))[0]
+    assert list(filtrada.ordenados[metrica]) == [2.0, 2.0, 4.0, 4.0]
+    assert "600–3000 min" in filtrada.descripcion and "1 nacionalidades" in filtrada.descripcion
+    poblaciones.limpiar()
+
+
+def test_figuras_indexa_la_poblacion_por_firma(tmp_path, monkeypatch):
+    monkeypatch.setattr(poblaciones, "filas_grupo", _filas)
+    poblaciones.limpiar()
+    entradas = _entradas(tmp_path)
+
+    a = poblaciones.poblacion(entradas, GRUPO, minutos=(600, 3000), nacionalidades={"Spain", "England"})
+    assert poblaciones.poblacion(entradas, GRUPO, minutos=[600, 3000], nacionalidades=["England", "Spain"]) is a
+    poblaciones.limpiar()
+    b = poblaciones.poblacion(entradas, GRUPO, minutos=(600, 3000), nacionalidades=["England", "Spain"])
+
+    assert b is not a
+    clave = figuras._congelar({"jugador": "X", "poblacion": a})
+    assert clave == figuras._congelar({"jugador": "X", "poblacion": b})
+    assert clave[1][1] == ("Poblacion",) + a.firma   # la clave no retiene el objeto
+    assert figuras._congelar(poblaciones.poblacion(entradas, GRUPO)) != figuras._congelar(a)
+    poblaciones.limpiar()
@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+import datos
+import filtros
+import perfiles
+import posiciones
+import precalentar
+import rankings
+
+
+def _entrada(ruta="/datos/liga.csv", familia="p90"):
+    return SimpleNamespace(ruta=ruta, familia=familia, liga="Liga", temporada="2024/2025")
+
+
+def test_calentar_carga_y_corre_los_registrados_en_orden(monkeypatch):
+    llamadas = []
+    monkeypatch.setattr(datos, "cargar_csv", lambda ruta, familia=None: llamadas.append(("cargar", ruta)))
+    monkeypatch.setattr(precalentar, "_CALENTADORES", [])
+    precalentar.registrar(lambda e: llamadas.append(("a", e.ruta)))
+    segundo = lambda e: llamadas.append(("b", e.familia))
+    precalentar.registrar(segundo)
+    precalentar.registrar(segundo)   # registrar dos veces no duplica
+
+    precalentar.calentar(_entrada())
+
+    assert llamadas == [("cargar", "/datos/liga.csv"), ("a", "/datos/liga.csv"), ("b", "p90")]
+
+
+def test_indice_de_filtros_registrado_por_defecto(monkeypatch):
+    assert precalentar._resumen_filtros in precalentar._CALENTADORES
+    pedidos = []
+    monkeypatch.setattr(datos, "cargar_csv", lambda ruta, familia=None: None)
+    monkeypatch.setattr(datos, "resumen_filtros", lambda ruta, familia=None, grupo=None: pedidos.append((ruta, familia)))
+    monkeypatch.setattr(precalentar, "_CALENTADORES", [precalentar._resumen_filtros])
+
+    precalentar.calentar(_entrada(familia="fisico"))
+
+    assert pedidos == [("/datos/liga.csv", "fisico")]
+
+
+def test_un_calentador_que_falla_cuenta_como_error(monkeypatch):
+    monkeypatch.setattr(datos, "cargar_csv", lambda ruta, familia=None: None)
+    monkeypatch.setattr(precalentar, "_CALENTADORES", [lambda e: 1 / 0])
+    monkeypatch.setattr(precalentar, "_ESTADO", dict(precalentar._ESTADO, hechos=0, errores=0))
+
+    precalentar._calentar(_entrada())
+
+    assert precalentar.estado()["hechos"] == 1
+    assert precalentar.estado()["errores"] == 1
+
+
+def _alternas(n=160, semilla=0):
+    """Archivo de Ligas Alternas (Wyscout) con todas las variables de los perfiles."""
+    rng = np.random.default_rng(semilla)
+    codigos = ["GK", "CB", "LB", "DMF", "CMF", "AMF", "LW", "CF", "RCB, CB", "LW, CF"]
+    df = pd.DataFrame({
+        "Jugador": [f"J{i}" for i in range(n)],
+        "Equipo": "Equipo",
+        "Posición específica": [codigos[i % len(codigos)] for i in range(n)],
+        "Edad": rng.integers(16, 41, n).astype("float32"),
+        "País de nacimiento": rng.choice(["España", "Marruecos"], n),
+        "Minutos jugados": rng.integers(100, 3000, n).astype("float32"),
+    })
+    variables = list(dict.fromkeys(c for g in perfiles.VARIABLES_ALTERNAS for c in perfiles.columnas_alternas(g)))
+    metricas = pd.DataFrame(rng.normal(size=(n, len(variables))).astype("float32"), columns=variables)
+    df = pd.concat([df, metricas], axis=1)
+    df.attrs["origen"] = ("/datos/segundarfef2425.csv", "alternas", (1, 1))
+    return df
+
+
+def _como_la_seccion_alternas(df, grupo, resumen):
+    """Rankings que pide el perfil de Ligas Alternas con los sliders por defecto."""
+    min_mins, max_mins = (int(v) for v in resumen.minutos)
+    edad = perfiles.EDAD_DEFECTO_ALTERNAS
+    sub = (
+        filtros.filtrar(df)
+        .donde(("posicion", grupo), lambda d: posiciones.mascara(d["Posición específica"], grupo, "wyscout"))
+        .entre("Minutos jugados", max(perfiles.MINUTOS_DEFECTO, min_mins), max_mins)
+        .entre("Edad", edad[0], edad[1])
+        .en("País de nacimiento", list(resumen.nacionalidades))
+        .aplicar()
+    )
+    sub = perfiles.invertir_alternas(sub)
+    return rankings.rankings(sub, perfiles.bloques_alternas(grupo, sub.columns))
+
+
+def test_entrada_alterna_deja_los_rankings_de_la_seccion_en_cache(monkeypatch):
+    df = _alternas()
+    entrada = _entrada(ruta="/datos/segundarfef2425.csv", familia="alternas")
+    resumen = datos.ResumenFiltros(filas=len(df), minutos=(100, 2999), edades=(16, 40),
+                                   nacionalidades=("España", "Marruecos"))
+    monkeypatch.setattr(datos, "cargar_csv", lambda ruta, familia=None: None)
+    monkeypatch.setattr(datos, "cargar_columnas", lambda ruta, columnas, familia=None: df.copy())
+    monkeypatch.setattr(datos, "resumen_filtros", lambda ruta, familia=None, grupo=None: resumen)
+    rankings.limpiar()
+    filtros.limpiar()
+    assert perfiles.calentar_alternas in precalentar._CALENTADORES
+
+    precalentar.calentar(entrada)
+
+    assert len(rankings._AJUSTES) == 2 * len(perfiles.VARIABLES_ALTERNAS)
+    ajustados = []
+    original = rankings._ajustar
+    monkeypatch.setattr(rankings, "_ajustar", lambda tareas: ajustados.extend(tareas) or original(tareas))
+    for grupo in perfiles.VARIABLES_ALTERNAS:
+        esperado = _como_la_seccion_alternas(df, grupo, resumen)
+        assert list(esperado.columns) == list(perfiles.RANKINGS_ALTERNAS[grupo])
+    assert ajustados == []   # todo salió del cache
+    rankings.limpiar()
+    filtros.limpiar()
+
+
+def test_bloques_alternas_usan_la_columna_invertida():
+    df = perfiles.invertir_alternas(_alternas(n=4))
+    bloques = perfiles.bloques_alternas("Porteros", df.columns)
+    assert "xG en contra (inv)" in bloques["Ranking General Atajadas"]
+    assert "xG en contra" not in bloques["Ranking General Atajadas"]
+    assert (df["xG en contra (inv)"] == -df["xG en contra"]).all()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+
+import rankings
+
+
+def test_primeros_componentes_igual_a_sklearn_modulo_signo():
+    rng = np.random.default_rng(0)
+    matrices = [rng.random((60, p)) * rng.uniform(0.5, 3, p) for p in (3, 7, 12)]
+
+    resultados = rankings.primeros_componentes(matrices)
+
+    for x, (cargas, puntajes) in zip(matrices, resultados):
+        pca = PCA(n_components=1).fit(x)
+        ref_cargas, ref_puntajes = pca.components_[0], pca.transform(x)[:, 0]
+        assert cargas.shape == (x.shape[1],)
+        signo = np.sign(ref_cargas @ cargas)
+        np.testing.assert_allclose(cargas, signo * ref_cargas, atol=1e-8)
+        np.testing.assert_allclose(puntajes, signo * ref_puntajes, atol=1e-8)
+
+
+def test_cargas_orientadas_suman_no_negativo():
+    rng = np.random.default_rng(1)
+    matrices = [rng.random((40, p)) for p in (2, 5, 9)]
+    matrices.append(-matrices[0])   # mismo componente con el signo contrario
+
+    for cargas, _ in rankings.primeros_componentes(matrices):
+        assert cargas.sum() >= 0
+
+    np.testing.assert_array_equal(rankings._orientar(np.array([-0.6, -0.2])), [0.6, 0.2])
+    np.testing.assert_array_equal(rankings._orientar(np.array([0.5, -0.5])), [0.5, -0.5])
+    np.testing.assert_array_equal(rankings._orientar(np.array([0.0, -0.5, 0.5])), [0.0, 0.5, -0.5])
+
+
+def test_matriz_sin_varianza_no_se_ajusta():
+    constante = np.ones((10, 3))
+    assert rankings.primeros_componentes([constante]) == [None]
+
+
+def test_pocas_variables_dejan_el_ranking_plano():
+    rankings.limpiar()
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [3.0, 1.0, 2.0]})
+
+    # Menos de MIN_VARIABLES presentes -> 50 para todos
+    out = rankings.rankings(df, {"Una": ["a"], "Faltante": ["a", "no_existe"], "Dos": ["a", "b"]})
+
+    assert (out["Una"] == 50.0).all()
+    assert (out["Faltante"] == 50.0).all()   # solo "a" está presente
+    assert out["Dos"].min() == 0.0 and out["Dos"].max() == 100.0
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+import fases
+import similitud
+
+
+def _indice(edades):
+    grupo = "Delanteros"
+    metricas = tuple(dict.fromkeys(m for vs in fases.RADAR_P90[grupo].values() for m in vs))
+    n = len(edades)
+    z = np.random.default_rng(0).normal(size=(n, len(metricas))).astype(np.float32)
+    meta = pd.DataFrame({
+        "Name": [f"J{i}" for i in range(n)], "Team": "A", "Liga": "Liga MX", "Temporada": "2025/2026",
+        "Minutes": 1000.0, "Age": edades, "Nationality": "Mexico",
+    })
+    return similitud.Indice(grupo, metricas, meta, z, similitud._unitarios(z), similitud._blanqueados(z), ())
+
+
+def test_filtro_de_edad_en_anios_cumplidos():
+    indice = _indice([25.0, 19.6, 30.2, 45.17])
+    edades = indice.meta["Age"]
+    # el rango completo del slider (enteros) no deja a nadie afuera
+    todos = similitud.similares(indice, 0, edad=(int(edades.min()), int(edades.max())))
+    assert sorted(todos["Name"]) == ["J1", "J2", "J3"]
+    acotado = similitud.similares(indice, 0, edad=(20, 30))
+    assert sorted(acotado["Name"]) == ["J2"]   # 30.2 -> 30 años cumplidos; 19.6 -> 19 queda fuera
@@ -0,0 +1,106 @@
+"""
+Vigilancia de archivos de datos para invalidación incremental.
+
+Un hilo revisa cada VIGILANCIA_SEGUNDOS la versión (mtime, tamaño) de los CSV
+de DATA_DIR. Cuando un archivo cambia, aparece o desaparece se invalida SOLO
+lo que sale de él: su carga en datos.py y los caches derivados que se hayan
+registrado con datos.registrar_invalidador (rankings, percentiles, KDE). Si
+el archivo está en el catálogo se vuelve a calentar en el mismo hilo, así que
+la siguiente visita lo encuentra listo. El resto del cache no se toca.
+
+Se usa sondeo con os.scandir en lugar de notificaciones del sistema: son
+~140 archivos y el reemplazo semanal suele llegar como copia o rename, que el
+sondeo detecta igual en cualquier sistema de archivos.
+"""
+import os
+import threading
+import time
+
+import catalogo
+import datos
+import precalentar
+
+
+# =========================
+# Configuración
+# =========================
+INTERVALO = float(os.environ.get("VIGILANCIA_SEGUNDOS", "30"))
+EXTENSIONES = (".csv",)
+
+_LOCK = threading.Lock()
+_FIRMAS = None        # ruta -> (mtime_ns, tamaño) del último escaneo
+_INICIADO = False
+
+
+# =========================
+# Helpers
+# =========================
+def _escanear() -> dict[str, tuple[int, int]]:
+    firmas = {}
+    try:
+        with os.scandir(catalogo.DATA_DIR) as it:
+            for e in it:
+                if e.is_file() and e.name.lower().endswith(EXTENSIONES):
+                    st_ = e.stat()
+                    firmas[e.path] = (st_.st_mtime_ns, st_.st_size)
+    except OSError:
+        pass
+    return firmas
+
+
+def _recalentar(rutas: list[str]) -> None:
+    rutas = set(rutas)
+    for entrada in catalogo.catalogo():
+        if entrada.ruta in rutas and os.path.exists(entrada.ruta):
+            try:
+                precalentar.calentar(entrada)
+            except Exception:
+                pass
+
+
+# =========================
+# API
+# =========================
+def revisar() -> list[str]:
+    """
+    Compara con el escaneo anterior e invalida los archivos cambiados,
+    agregados o borrados. Devuelve sus rutas (vacío en el primer escaneo).
+    """
+    global _FIRMAS
+    with _LOCK:
+        actuales = _escanear()
+        if _FIRMAS is None:
+            _FIRMAS = actuales
+            return []
+        cambiados = sorted(
+            r for r in set(actuales) | set(_FIRMAS)
+            if actuales.get(r) != _FIRMAS.get(r)
+        )
+        _FIRMAS = actuales
+
+    if cambiados:
+        catalogo.refrescar()          # filas/columnas del catálogo salen del archivo
+        for ruta in cambiados:
+            datos.invalidar(ruta)
+        _recalentar(cambiados)
+    return cambiados
+
+
+def _bucle() -> None:
+    while True:
+        time.sleep(INTERVALO)
+        try:
+            revisar()
+        except Exception:
+            pass
+
+
+def iniciar() -> None:
+    """Toma la foto inicial y lanza el hilo de vigilancia (una sola vez por proceso)."""
+    global _INICIADO
+    with _LOCK:
+        if _INICIADO or INTERVALO <= 0:
+            return
+        _INICIADO = True
+    revisar()
+    threading.Thread(target=_bucle, name="vigilancia", daemon=True).start()